@@ -1,8 +1,9 @@
 """Audio API endpoints."""
 
+import re
 from typing import Any
 
-from fastapi import APIRouter, Depends, File, Form, HTTPException, UploadFile
+from fastapi import APIRouter, Depends, File, Form, Header, HTTPException, UploadFile
 from fastapi.responses import Response
 from sqlalchemy.orm import Session
 
@@ -13,15 +14,14 @@ from app.models.meeting import AudioChunk, Meeting
 from app.schemas.audio_chunk import AudioChunkResponse
 from app.schemas.strict_validation import StrictAudioChunkUpload
 from app.schemas.websocket_events import (
-    InterventionQuestionEvent,
-    InterventionTriggeredEvent,
     TranscriptionCompletedEvent,
     TranscriptionFailedEvent,
     TranscriptionStartedEvent,
     WebSocketEventType,
 )
 from app.services.audio_service import AudioService
-from app.services.claude_service import get_claude_service
+from app.services.intervention_engine import get_intervention_engine
+from app.services.transcript_service import TranscriptService
 from app.services.transcription_service import TranscriptionService
 
 # Initialize transcription service (lazy loads model on first use)
@@ -29,6 +29,9 @@ transcription_service = TranscriptionService()
 
 router = APIRouter()
 
+# Single range of the bytes unit, e.g. "bytes=0-1023" or "bytes=-500"
+_BYTE_RANGE = re.compile(r"bytes\s*=\s*(\d*)\s*-\s*(\d*)", re.IGNORECASE)
+
 
 @router.post("/meetings/{meeting_id}/audio-chunks", response_model=AudioChunkResponse)
 async def upload_audio_chunk(
@@ -58,6 +61,10 @@ async def upload_audio_chunk(
         chunk_number=chunk_number,
         duration_seconds=duration_seconds
     )
+
+    meeting = db.query(Meeting).filter(Meeting.id == meeting_id).first()
+    if not meeting:
+        raise HTTPException(status_code=404, detail="Meeting not found")
     
     # Validate file security
     is_valid, error_msg = FileUploadSecurity.validate_audio_file(audio_file)
@@ -127,11 +134,11 @@ async def upload_audio_chunk(
             ),
         )
 
-        # Analyze transcription for triggers (only for active meetings)
-        if meeting.status == "active":  # type: ignore[attr-defined]
-            await analyze_and_send_interventions(
-                meeting_id, meeting, transcription, db  # type: ignore[arg-type]
-            )
+        # Analyze transcription for triggers in the background (only for active meetings)
+        if meeting.status == "active":
+            engine = get_intervention_engine()
+            if await engine.claim_meeting(meeting_id):
+                engine.submit(meeting, chunk_number, transcription)
 
     except Exception as e:
         print(f"Transcription failed: {e}")
@@ -166,44 +173,90 @@ async def list_audio_chunks(
     if not meeting:
         raise HTTPException(status_code=404, detail="Meeting not found")
 
-    # Get all audio chunks for this meeting
-    chunks = (
-        db.query(AudioChunk)
-        .filter(AudioChunk.meeting_id == meeting_id)
-        .order_by(AudioChunk.chunk_number)
-        .all()
-    )
-
-    return chunks
+    # Get all audio chunks for this meeting, decrypting transcripts in one pass
+    return TranscriptService.load_chunks(db, meeting_id)
 
 
 @router.get("/audio-chunks/{chunk_id}/audio")
 async def get_audio_chunk_blob(
-    chunk_id: str, db: Session = Depends(get_db)
+    chunk_id: str,
+    range_header: str | None = Header(None, alias="Range"),
+    db: Session = Depends(get_db),
 ) -> Response:
     """
     Get audio blob for a specific chunk.
 
+    Supports single-range ``Range: bytes=start-end`` requests so the browser
+    can seek; only the encrypted frames covering the range are decrypted.
+    Other Range headers are ignored and get the whole blob (RFC 7233).
+
     Args:
         chunk_id: Audio chunk ID
+        range_header: Optional HTTP Range header
         db: Database session
 
     Returns:
-        Audio blob as WebM file
+        Audio blob as WebM file (206 Partial Content for range requests)
     """
     chunk = db.query(AudioChunk).filter(AudioChunk.id == chunk_id).first()
     if not chunk:
         raise HTTPException(status_code=404, detail="Audio chunk not found")
 
+    headers = {
+        "Content-Disposition": f'inline; filename="chunk-{chunk.chunk_number}.webm"',
+        "Accept-Ranges": "bytes",
+    }
+
+    total = chunk.audio_size
+    byte_range = _parse_range_header(range_header, total) if range_header else None
+    if byte_range is None:
+        return Response(content=chunk.audio_blob, media_type="audio/webm", headers=headers)
+
+    start, end = byte_range
+    headers["Content-Range"] = f"bytes {start}-{end - 1}/{total}"
     return Response(
-        content=chunk.audio_blob,
+        content=chunk.audio_range(start, end),
+        status_code=206,
         media_type="audio/webm",
-        headers={
-            "Content-Disposition": f'inline; filename="chunk-{chunk.chunk_number}.webm"'
-        },
+        headers=headers,
     )
 
 
+def _parse_range_header(range_header: str, total: int) -> tuple[int, int] | None:
+    """
+    Parse a single ``bytes=`` range into a half-open ``(start, end)`` tuple.
+
+    Returns None if the header should be ignored: another unit, several
+    ranges or a malformed range.
+
+    Raises:
+        HTTPException: 416 if the range is well-formed but not satisfiable
+    """
+    match = _BYTE_RANGE.fullmatch(range_header.strip())
+    if match is None:
+        return None
+    first, last = match.group(1), match.group(2)
+    if not first and not last:
+        return None
+    if first and last and int(last) < int(first):
+        return None
+
+    if first:
+        start = int(first)
+        end = min(int(last) + 1, total) if last else total
+    else:
+        # Suffix range: last N bytes
+        start = max(0, total - int(last))
+        end = total
+    if start >= end:
+        raise HTTPException(
+            status_code=416,
+            detail="Requested range not satisfiable",
+            headers={"Content-Range": f"bytes */{total}"},
+        )
+    return start, end
+
+
 @router.post("/meetings/{meeting_id}/upload-recording")
 async def upload_recording(
     meeting_id: str,
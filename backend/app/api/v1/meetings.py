@@ -1,18 +1,29 @@
 """Meetings API endpoints."""
 
+import asyncio
 from typing import Any
 
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, File, Form, HTTPException, UploadFile
 from sqlalchemy.orm import Session
 
+from app.core.websocket import websocket_manager
 from app.db.session import get_db
-from app.models.meeting import Meeting
-from app.schemas.meeting import MeetingCreate, MeetingResponse
+from app.models.meeting import Meeting, MeetingTemplate
+from app.schemas.meeting import MeetingCreate, MeetingFromTemplate, MeetingResponse
 from app.schemas.strict_validation import StrictMeetingCreate
-from app.services.idoarrt_service import IDOARRTParseError, IDOARRTService
+from app.services.idoarrt_service import IDOARRTParseError, get_idoarrt_service
+from app.services.intervention_engine import get_intervention_engine
+from app.services.meeting_import import (
+    MAX_ARCHIVE_BYTES,
+    MeetingImportError,
+    get_meeting_import_service,
+    read_archive,
+)
+from app.services.meeting_templates import get_meeting_template_service
+from app.services.meeting_timer import get_meeting_timer
+from app.services.protocol_service import get_protocol_service
 
 router = APIRouter()
-idoarrt_service = IDOARRTService()
 
 
 @router.post("/meetings", response_model=dict[str, Any])
@@ -27,11 +38,12 @@ async def create_meeting(
     Returns the created meeting with validation status.
     """
     try:
-        # Parse IDOARRT markdown
-        parsed_data = idoarrt_service.parse_idoarrt(meeting_data.idoarrt_markdown)
+        # Parsed once during request validation
+        idoarrt_service = get_idoarrt_service()
+        parsed_data = idoarrt_service.document_data(meeting_data.document)
 
         # Validate parsed data
-        validation_errors = idoarrt_service.validate_idoarrt(parsed_data)
+        validation_errors = idoarrt_service.validate_document(meeting_data.document)
 
         if validation_errors:
             return {
@@ -57,20 +69,7 @@ async def create_meeting(
 
         return {
             "success": True,
-            "meeting": {
-                "id": meeting.id,
-                "created_at": meeting.created_at.isoformat(),
-                "intent": meeting.intent,
-                "desired_outcomes": meeting.desired_outcomes,
-                "agenda": meeting.agenda,
-                "roles": meeting.roles,
-                "rules": meeting.rules,
-                "total_duration_minutes": meeting.total_duration_minutes,
-                "status": meeting.status,
-                "started_at": meeting.started_at.isoformat() if meeting.started_at else None,
-                "ended_at": meeting.ended_at.isoformat() if meeting.ended_at else None,
-                "time_extensions_seconds": meeting.time_extensions_seconds,
-            },
+            "meeting": _meeting_dict(meeting),
             "validation_errors": [],
             "parsed_idoarrt": parsed_data,
         }
@@ -78,7 +77,7 @@ async def create_meeting(
     except IDOARRTParseError as e:
         return {
             "success": False,
-            "validation_errors": [str(e)],
+            "validation_errors": [str(d) for d in e.diagnostics] or [str(e)],
             "parsed_idoarrt": None,
         }
     except Exception as e:
@@ -87,6 +86,71 @@ async def create_meeting(
         ) from e
 
 
+@router.post("/meetings/from-template", response_model=dict[str, Any])
+async def create_meeting_from_template(
+    request: MeetingFromTemplate,
+    db: Session = Depends(get_db),
+) -> dict[str, Any]:
+    """
+    Create a new meeting from a stored template plus overrides.
+
+    Skips markdown parsing; the result is validated like a parsed
+    document. Same response shape as creating from markdown.
+    """
+    template = db.query(MeetingTemplate).filter(MeetingTemplate.id == request.template_id).first()
+    if not template:
+        raise HTTPException(status_code=404, detail="Template not found")
+
+    meeting, data, validation_errors = get_meeting_template_service().create_meeting(
+        db, template, request.overrides
+    )
+    if meeting is None:
+        return {
+            "success": False,
+            "validation_errors": validation_errors,
+            "parsed_idoarrt": data,
+        }
+    return {
+        "success": True,
+        "meeting": _meeting_dict(meeting),
+        "validation_errors": [],
+        "parsed_idoarrt": data,
+    }
+
+
+@router.post("/meetings/import", response_model=dict[str, Any])
+async def import_meetings(
+    archive: UploadFile = File(...),
+    dry_run: bool = Form(False),
+    db: Session = Depends(get_db),
+) -> dict[str, Any]:
+    """
+    Create meetings from a zip or tar archive of IDOARRT markdown files.
+
+    Every valid document becomes a meeting in one transaction; invalid
+    documents are reported per file and do not stop the others.
+
+    Args:
+        archive: .zip, .tar or .tar.gz with .md files
+        dry_run: Only validate, create nothing
+        db: Database session
+
+    Returns:
+        Counts and per-file results in archive name order
+    """
+    try:
+        # Read one byte past the limit so read_archive rejects oversize uploads
+        # without the whole body being held in memory
+        files = read_archive(await archive.read(MAX_ARCHIVE_BYTES + 1))
+    except MeetingImportError as e:
+        raise HTTPException(status_code=400, detail=str(e)) from e
+
+    service = get_meeting_import_service()
+    # Parsing is CPU-bound; keep the event loop free
+    await asyncio.to_thread(service.parse, files)
+    return service.store(db, files, dry_run)
+
+
 @router.get("/meetings/{meeting_id}", response_model=MeetingResponse)
 async def get_meeting(
     meeting_id: str,
@@ -121,6 +185,8 @@ async def start_meeting(
     db.commit()
     db.refresh(meeting)
 
+    await get_meeting_timer().announce(meeting)
+
     return {
         "id": meeting.id,
         "status": meeting.status,
@@ -144,11 +210,21 @@ async def end_meeting(
     if meeting.status != "active":
         raise HTTPException(status_code=400, detail="Meeting not active")
 
+    # Let chunks still in flight reach the protocol before it is frozen
+    engine = get_intervention_engine()
+    if not await engine.drain(meeting_id):
+        # Updates landing after completion are dropped; rebuild from the transcript
+        get_protocol_service().mark_incomplete(meeting_id)
+
     meeting.status = "completed"  # type: ignore[assignment]
     meeting.ended_at = datetime.utcnow()  # type: ignore[assignment]
     db.commit()
     db.refresh(meeting)
 
+    engine.forget_meeting(meeting_id)
+    await get_meeting_timer().announce(meeting)
+    websocket_manager.forget_meeting(meeting_id)
+
     return {
         "id": meeting.id,
         "status": meeting.status,
@@ -175,7 +251,27 @@ async def extend_meeting(
     db.commit()
     db.refresh(meeting)
 
+    await get_meeting_timer().announce(meeting)
+
+    return {
+        "id": meeting.id,
+        "time_extensions_seconds": meeting.time_extensions_seconds,
+    }
+
+
+def _meeting_dict(meeting: Meeting) -> dict[str, Any]:
+    """Serialize a newly created meeting for the create endpoints."""
     return {
         "id": meeting.id,
+        "created_at": meeting.created_at.isoformat(),
+        "intent": meeting.intent,
+        "desired_outcomes": meeting.desired_outcomes,
+        "agenda": meeting.agenda,
+        "roles": meeting.roles,
+        "rules": meeting.rules,
+        "total_duration_minutes": meeting.total_duration_minutes,
+        "status": meeting.status,
+        "started_at": meeting.started_at.isoformat() if meeting.started_at else None,
+        "ended_at": meeting.ended_at.isoformat() if meeting.ended_at else None,
         "time_extensions_seconds": meeting.time_extensions_seconds,
     }
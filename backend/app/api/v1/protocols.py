@@ -1,7 +1,54 @@
 """Protocol API endpoints."""
 
-from fastapi import APIRouter
+from fastapi import APIRouter, Depends, HTTPException
+from sqlalchemy.orm import Session
+
+from app.db.session import get_db
+from app.models.meeting import Meeting, Protocol
+from app.schemas.meeting import ProtocolResponse
+from app.services.protocol_service import get_protocol_service
 
 router = APIRouter()
 
-# TODO: Implement protocol generation endpoints
+
+@router.get("/meetings/{meeting_id}/protocol", response_model=ProtocolResponse)
+async def get_protocol(
+    meeting_id: str,
+    db: Session = Depends(get_db)
+    # current_user: dict = Depends(get_current_user)  # Temporarily disabled
+) -> Protocol:
+    """
+    Get a meeting's protocol.
+
+    While the meeting runs this is the protocol so far: agenda summary,
+    key decisions and action items are updated after every chunk.
+    """
+    protocol = get_protocol_service().get(db, meeting_id)
+    if not protocol:
+        raise HTTPException(status_code=404, detail="Protocol not found")
+    return protocol
+
+
+@router.post("/meetings/{meeting_id}/protocol/generate", response_model=ProtocolResponse)
+async def generate_protocol(
+    meeting_id: str,
+    rebuild: bool = False,
+    db: Session = Depends(get_db)
+    # current_user: dict = Depends(get_current_user)  # Temporarily disabled
+) -> Protocol:
+    """
+    Finish the protocol of an ended meeting.
+
+    Only the final pass runs here (full transcription, goal assessment and
+    markdown export); everything else was built during the meeting. Meetings
+    without incremental data, or any meeting with ``rebuild=true``, are
+    summarized from the whole transcript instead.
+    """
+    meeting = db.query(Meeting).filter(Meeting.id == meeting_id).first()
+    if not meeting:
+        raise HTTPException(status_code=404, detail="Meeting not found")
+
+    if meeting.status != "completed":
+        raise HTTPException(status_code=400, detail="Meeting not completed")
+
+    return await get_protocol_service().finalize(db, meeting, rebuild)
@@ -0,0 +1,52 @@
+"""Meeting template API endpoints."""
+
+from typing import Any
+
+from fastapi import APIRouter, Depends, HTTPException
+from sqlalchemy.orm import Session
+
+from app.db.session import get_db
+from app.models.meeting import MeetingTemplate
+from app.schemas.meeting import MeetingTemplateCreate, MeetingTemplateResponse
+from app.services.meeting_templates import get_meeting_template_service
+
+router = APIRouter()
+
+
+@router.post("/meeting-templates", response_model=dict[str, Any])
+async def create_template(
+    template_data: MeetingTemplateCreate,
+    db: Session = Depends(get_db),
+) -> dict[str, Any]:
+    """
+    Store an IDOARRT document as a template.
+
+    The document is parsed and validated now; meetings created from the
+    template later skip parsing. Returns validation errors like meeting
+    creation does.
+    """
+    template, validation_errors = get_meeting_template_service().create_template(
+        db, template_data.name, template_data.idoarrt_markdown
+    )
+    if template is None:
+        return {"success": False, "validation_errors": validation_errors}
+    return {
+        "success": True,
+        "template": MeetingTemplateResponse.model_validate(template).model_dump(mode="json"),
+        "validation_errors": [],
+    }
+
+
+@router.get("/meeting-templates", response_model=list[MeetingTemplateResponse])
+async def list_templates(db: Session = Depends(get_db)) -> list[MeetingTemplate]:
+    """List templates by name."""
+    return db.query(MeetingTemplate).order_by(MeetingTemplate.name).all()
+
+
+@router.get("/meeting-templates/{template_id}", response_model=MeetingTemplateResponse)
+async def get_template(template_id: str, db: Session = Depends(get_db)) -> MeetingTemplate:
+    """Get template by ID."""
+    template = db.query(MeetingTemplate).filter(MeetingTemplate.id == template_id).first()
+    if not template:
+        raise HTTPException(status_code=404, detail="Template not found")
+    return template
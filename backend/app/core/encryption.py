@@ -2,17 +2,257 @@
 
 import os
 import base64
+import struct
+from collections.abc import Iterable, Iterator
+from concurrent.futures import ThreadPoolExecutor
+
+from cryptography.exceptions import InvalidTag
 from cryptography.fernet import Fernet
 from cryptography.hazmat.primitives import hashes
+from cryptography.hazmat.primitives.ciphers.aead import AESGCM
+from cryptography.hazmat.primitives.kdf.hkdf import HKDF
 from cryptography.hazmat.primitives.kdf.pbkdf2 import PBKDF2HMAC
 
 
+# Leading byte of binary-encoded text fields. Legacy base64-of-Fernet values
+# always start with an ASCII character, so the two formats cannot collide.
+FIELD_VERSION = b'\x01'
+
+
+class BlobDecryptionError(Exception):
+    """Raised when an encrypted blob is malformed or fails authentication."""
+    pass
+
+
+class StreamingBlobCipher:
+    """
+    Chunked AES-GCM encryption for large binary blobs (audio).
+
+    Layout: a 16 byte header followed by frames of up to ``frame_size``
+    plaintext bytes, each sealed with its own 16 byte GCM tag.
+
+        header = MAGIC (4) | VERSION (1) | frame_size (4, BE) | nonce_prefix (7)
+        nonce  = nonce_prefix (7) | frame_index (4, BE) | final_flag (1)
+
+    The header is authenticated as associated data of every frame, and the
+    final flag in the nonce prevents truncation or frame reordering. Because
+    every frame has a fixed ciphertext size, any plaintext byte range can be
+    decrypted by touching only the frames that cover it.
+    """
+
+    MAGIC = b"MFA1"
+    VERSION = 1
+    HEADER_SIZE = 16
+    TAG_SIZE = 16
+    NONCE_PREFIX_SIZE = 7
+    DEFAULT_FRAME_SIZE = 64 * 1024
+    MAX_FRAMES = 2**32
+
+    _HEADER_STRUCT = struct.Struct(">4sBI7s")
+    _NONCE_STRUCT = struct.Struct(">7sIB")
+
+    def __init__(self, key: bytes, frame_size: int = DEFAULT_FRAME_SIZE) -> None:
+        """
+        Initialize cipher.
+
+        Args:
+            key: 32 byte AES-256 key
+            frame_size: Plaintext bytes per frame
+        """
+        if len(key) != 32:
+            raise ValueError("StreamingBlobCipher requires a 32 byte key")
+        if frame_size <= 0:
+            raise ValueError("frame_size must be positive")
+        self._aead = AESGCM(key)
+        self.frame_size = frame_size
+
+    # ------------------------------------------------------------------
+    # Whole-blob helpers
+    # ------------------------------------------------------------------
+
+    def encrypt(self, data: bytes) -> bytes:
+        """Encrypt a complete blob."""
+        return b"".join(self.encrypt_stream(self._iter_slices(data, self.frame_size)))
+
+    def decrypt(self, blob: bytes) -> bytes:
+        """Decrypt a complete blob."""
+        return b"".join(self.decrypt_stream([blob]))
+
+    @classmethod
+    def is_encrypted(cls, blob: bytes | None) -> bool:
+        """Check whether ``blob`` starts with the streaming cipher header."""
+        return bool(blob) and blob[:4] == cls.MAGIC  # type: ignore[index]
+
+    # ------------------------------------------------------------------
+    # Streaming
+    # ------------------------------------------------------------------
+
+    def encrypt_stream(self, chunks: Iterable[bytes]) -> Iterator[bytes]:
+        """
+        Encrypt an iterable of plaintext chunks of any size.
+
+        Yields the header followed by one sealed frame at a time. Only one
+        frame of plaintext is buffered, so memory use is bounded by
+        ``frame_size`` regardless of the blob size.
+        """
+        nonce_prefix = os.urandom(self.NONCE_PREFIX_SIZE)
+        header = self._HEADER_STRUCT.pack(self.MAGIC, self.VERSION, self.frame_size, nonce_prefix)
+        yield header
+
+        buffer = bytearray()
+        index = 0
+        for chunk in chunks:
+            buffer += chunk
+            # Keep at least one full frame back: we only know a frame is final
+            # once the input is exhausted.
+            while len(buffer) > self.frame_size:
+                frame = bytes(buffer[: self.frame_size])
+                del buffer[: self.frame_size]
+                yield self._seal(header, nonce_prefix, index, frame, final=False)
+                index += 1
+
+        yield self._seal(header, nonce_prefix, index, bytes(buffer), final=True)
+
+    def decrypt_stream(self, chunks: Iterable[bytes]) -> Iterator[bytes]:
+        """
+        Decrypt an iterable of ciphertext chunks of any size.
+
+        Yields plaintext frame by frame.
+
+        Raises:
+            BlobDecryptionError: If the header is invalid, a frame fails
+                authentication, or the stream is truncated
+        """
+        buffer = bytearray()
+        header: bytes | None = None
+        nonce_prefix = b""
+        frame_size = 0
+        index = 0
+
+        for chunk in chunks:
+            buffer += chunk
+            if header is None:
+                if len(buffer) < self.HEADER_SIZE:
+                    continue
+                header = bytes(buffer[: self.HEADER_SIZE])
+                del buffer[: self.HEADER_SIZE]
+                frame_size, nonce_prefix = self._parse_header(header)
+
+            sealed_size = frame_size + self.TAG_SIZE
+            # Hold back the last frame until we know whether more data follows
+            while len(buffer) > sealed_size:
+                sealed = bytes(buffer[:sealed_size])
+                del buffer[:sealed_size]
+                yield self._open(header, nonce_prefix, index, sealed, final=False)
+                index += 1
+
+        if header is None:
+            raise BlobDecryptionError("Encrypted blob is missing its header")
+
+        yield self._open(header, nonce_prefix, index, bytes(buffer), final=True)
+
+    # ------------------------------------------------------------------
+    # Random access
+    # ------------------------------------------------------------------
+
+    def plaintext_length(self, blob: bytes) -> int:
+        """Return the plaintext size of an encrypted blob without decrypting it."""
+        frame_size, _ = self._parse_header(blob[: self.HEADER_SIZE])
+        body = len(blob) - self.HEADER_SIZE
+        sealed_size = frame_size + self.TAG_SIZE
+        full_frames, remainder = divmod(body, sealed_size)
+        if remainder == 0:
+            if full_frames == 0:
+                raise BlobDecryptionError("Encrypted blob has no frames")
+            return full_frames * frame_size
+        if remainder < self.TAG_SIZE:
+            raise BlobDecryptionError("Encrypted blob is truncated")
+        return full_frames * frame_size + remainder - self.TAG_SIZE
+
+    def decrypt_range(self, blob: bytes, start: int, end: int) -> bytes:
+        """
+        Decrypt plaintext bytes ``[start, end)`` of an encrypted blob.
+
+        Only the frames overlapping the range are authenticated and
+        decrypted.
+        """
+        header = blob[: self.HEADER_SIZE]
+        frame_size, nonce_prefix = self._parse_header(header)
+        total = self.plaintext_length(blob)
+
+        start = max(0, start)
+        end = min(end, total)
+        if start >= end:
+            return b""
+
+        sealed_size = frame_size + self.TAG_SIZE
+        last_index = (total - 1) // frame_size if total else 0
+        first = start // frame_size
+        last = (end - 1) // frame_size
+
+        parts = []
+        for index in range(first, last + 1):
+            offset = self.HEADER_SIZE + index * sealed_size
+            sealed = blob[offset : offset + sealed_size]
+            parts.append(
+                self._open(header, nonce_prefix, index, sealed, final=index == last_index)
+            )
+
+        plaintext = b"".join(parts)
+        skip = start - first * frame_size
+        return plaintext[skip : skip + (end - start)]
+
+    # ------------------------------------------------------------------
+    # Internals
+    # ------------------------------------------------------------------
+
+    def _parse_header(self, header: bytes) -> tuple[int, bytes]:
+        if len(header) < self.HEADER_SIZE:
+            raise BlobDecryptionError("Encrypted blob is missing its header")
+        magic, version, frame_size, nonce_prefix = self._HEADER_STRUCT.unpack(
+            header[: self.HEADER_SIZE]
+        )
+        if magic != self.MAGIC:
+            raise BlobDecryptionError("Not a streaming-encrypted blob")
+        if version != self.VERSION:
+            raise BlobDecryptionError(f"Unsupported blob format version: {version}")
+        if frame_size <= 0:
+            raise BlobDecryptionError("Invalid frame size in blob header")
+        return frame_size, nonce_prefix
+
+    def _nonce(self, nonce_prefix: bytes, index: int, final: bool) -> bytes:
+        if index >= self.MAX_FRAMES:
+            raise BlobDecryptionError("Blob exceeds maximum number of frames")
+        return self._NONCE_STRUCT.pack(nonce_prefix, index, 1 if final else 0)
+
+    def _seal(
+        self, header: bytes, nonce_prefix: bytes, index: int, frame: bytes, final: bool
+    ) -> bytes:
+        return self._aead.encrypt(self._nonce(nonce_prefix, index, final), frame, header)
+
+    def _open(
+        self, header: bytes, nonce_prefix: bytes, index: int, sealed: bytes, final: bool
+    ) -> bytes:
+        if len(sealed) < self.TAG_SIZE:
+            raise BlobDecryptionError("Encrypted blob is truncated")
+        try:
+            return self._aead.decrypt(self._nonce(nonce_prefix, index, final), sealed, header)
+        except InvalidTag as e:
+            raise BlobDecryptionError(f"Authentication failed for frame {index}") from e
+
+    @staticmethod
+    def _iter_slices(data: bytes, size: int) -> Iterator[bytes]:
+        view = memoryview(data)
+        for offset in range(0, len(data), size):
+            yield bytes(view[offset : offset + size])
+
+
 class DatabaseEncryption:
     """Handle encryption/decryption of sensitive database fields."""
     
-    def __init__(self):
+    def __init__(self) -> None:
         """Initialize encryption with key from environment."""
-        key = os.getenv("DB_ENCRYPTION_KEY")
+        key: str | bytes | None = os.getenv("DB_ENCRYPTION_KEY")
         if not key:
             # Generate a key for development (NOT for production)
             key = base64.urlsafe_b64encode(b'development-key-change-in-production-32bytes!')
@@ -27,6 +267,19 @@ class DatabaseEncryption:
         key_bytes = kdf.derive(key.encode() if isinstance(key, str) else key)
         
         self.cipher = Fernet(base64.urlsafe_b64encode(key_bytes))
+
+        # Separate subkeys for GCM so the Fernet key is never reused
+        self.blob_cipher = StreamingBlobCipher(
+            self._derive_subkey(key_bytes, b'meeting_facilitator_audio_blob')
+        )
+        self.field_cipher = AESGCM(
+            self._derive_subkey(key_bytes, b'meeting_facilitator_text_field')
+        )
+
+    @staticmethod
+    def _derive_subkey(key_bytes: bytes, info: bytes) -> bytes:
+        """Derive a purpose-bound 32 byte subkey from the master key."""
+        return HKDF(algorithm=hashes.SHA256(), length=32, salt=None, info=info).derive(key_bytes)
     
     def encrypt(self, data: bytes) -> bytes:
         """Encrypt binary data."""
@@ -46,6 +299,83 @@ class DatabaseEncryption:
         encrypted_bytes = base64.b64decode(encrypted_text.encode('utf-8'))
         decrypted_bytes = self.decrypt(encrypted_bytes)
         return decrypted_bytes.decode('utf-8')
+    
+    def encrypt_field(self, text: str) -> bytes:
+        """
+        Encrypt text into the compact binary field format.
+
+        Layout: FIELD_VERSION (1) | nonce (12) | AES-GCM ciphertext + tag.
+        Overhead is a fixed 29 bytes, versus ~1.8x for base64-of-Fernet.
+        """
+        nonce = os.urandom(12)
+        ciphertext = self.field_cipher.encrypt(nonce, text.encode('utf-8'), FIELD_VERSION)
+        return FIELD_VERSION + nonce + ciphertext
+
+    def decrypt_field(self, value: bytes | str) -> str:
+        """
+        Decrypt a value written by ``encrypt_field``.
+
+        Values still in the legacy base64-of-Fernet text format (rows not yet
+        converted by ``migrate_binary_ciphertext.py``) are decrypted with
+        ``decrypt_text``.
+        """
+        if isinstance(value, str):
+            return self.decrypt_text(value)
+        if value[:1] != FIELD_VERSION:
+            return self.decrypt_text(value.decode('ascii'))
+        return self.field_cipher.decrypt(value[1:13], value[13:], FIELD_VERSION).decode('utf-8')
+
+    def decrypt_fields(
+        self, values: list[bytes | str], max_workers: int | None = None
+    ) -> list[str]:
+        """
+        Decrypt many field values in one pass.
+
+        Args:
+            values: Encrypted values (binary or legacy format)
+            max_workers: Use a thread pool of this size; AES-GCM releases the
+                GIL, so this helps for large values. None decrypts inline,
+                which is faster for typical chunk-sized transcripts.
+
+        Returns:
+            Plaintexts in the same order as ``values``
+        """
+        if not max_workers or len(values) < 2:
+            return [self.decrypt_field(value) for value in values]
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            return list(executor.map(self.decrypt_field, values))
+
+    @staticmethod
+    def is_legacy_field(value: bytes | str) -> bool:
+        """Check whether a stored value uses the legacy base64-of-Fernet format."""
+        return isinstance(value, str) or value[:1] != FIELD_VERSION
+
+    def encrypt_blob(self, data: bytes) -> bytes:
+        """Encrypt a large binary blob with the streaming AEAD format."""
+        return self.blob_cipher.encrypt(data)
+
+    def decrypt_blob(self, blob: bytes) -> bytes:
+        """
+        Decrypt a blob written by ``encrypt_blob``.
+
+        Blobs stored before audio encryption was introduced lack the format
+        header and are returned unchanged.
+        """
+        if not StreamingBlobCipher.is_encrypted(blob):
+            return blob
+        return self.blob_cipher.decrypt(blob)
+
+    def blob_length(self, blob: bytes) -> int:
+        """Return the plaintext size of a (possibly legacy) blob."""
+        if not StreamingBlobCipher.is_encrypted(blob):
+            return len(blob)
+        return self.blob_cipher.plaintext_length(blob)
+
+    def decrypt_blob_range(self, blob: bytes, start: int, end: int) -> bytes:
+        """Decrypt plaintext bytes ``[start, end)`` of a (possibly legacy) blob."""
+        if not StreamingBlobCipher.is_encrypted(blob):
+            return blob[start:end]
+        return self.blob_cipher.decrypt_range(blob, start, end)
 
 
 # Global encryption instance
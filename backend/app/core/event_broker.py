@@ -0,0 +1,230 @@
+"""
+Stand-in pub/sub broker for multi-worker deployments without Redis.
+
+Speaks the subset of the Redis protocol that ``RedisEventBus`` uses
+(SUBSCRIBE, UNSUBSCRIBE, PUBLISH, SET, GET, INCRBY, PEXPIRE, PING, AUTH),
+over a Unix socket or TCP. Keys live in memory only; the bus seeds a
+missing sequence counter with the current time, so numbers still
+increase after a broker restart. Run one per host:
+
+    python -m app.core.event_broker --unix /tmp/meeting-events.sock
+
+and start the workers with
+``WEBSOCKET_EVENT_BUS_URL=unix:///tmp/meeting-events.sock``. For
+several hosts point them at a real Redis instead.
+
+With ``EVENT_BROKER_PASSWORD`` set, clients must ``AUTH`` first (put the
+password in the bus URL: ``redis://:password@host:port``). Without one
+the broker only listens on a Unix socket or a loopback address.
+"""
+
+import argparse
+import asyncio
+import hmac
+import ipaddress
+import logging
+import os
+import time
+
+from app.core.event_bus import read_reply
+
+logger = logging.getLogger(__name__)
+
+
+class EventBroker:
+    """Minimal Redis-protocol pub/sub server."""
+
+    def __init__(self, password: str | None = None) -> None:
+        """
+        Initialize broker.
+
+        Args:
+            password: Password clients must send with AUTH (None = no authentication)
+        """
+        self.password = password
+        self._subscribers: dict[bytes, set[asyncio.StreamWriter]] = {}
+        self._values: dict[bytes, bytes] = {}
+        self._expires: dict[bytes, float] = {}
+        self._server: asyncio.AbstractServer | None = None
+
+    async def start_unix(self, path: str) -> None:
+        """Listen on a Unix socket (replacing a stale socket file)."""
+        if os.path.exists(path):
+            os.unlink(path)
+        self._server = await asyncio.start_unix_server(self._handle, path=path)
+
+    async def start_tcp(self, host: str, port: int) -> int:
+        """
+        Listen on TCP and return the bound port (useful with port 0).
+
+        Raises:
+            ValueError: If ``host`` is not a loopback address and no password is set
+        """
+        if self.password is None and not _is_loopback(host):
+            raise ValueError(f"Refusing to listen on {host} without a password")
+        self._server = await asyncio.start_server(self._handle, host, port)
+        bound: int = self._server.sockets[0].getsockname()[1]
+        return bound
+
+    async def close(self) -> None:
+        """Stop listening and disconnect clients."""
+        if self._server is not None:
+            self._server.close()
+            await self._server.wait_closed()
+        for writers in self._subscribers.values():
+            for writer in writers:
+                writer.close()
+        self._subscribers.clear()
+
+    async def _handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        channels: set[bytes] = set()
+        authenticated = self.password is None
+        try:
+            while True:
+                command = await read_reply(reader)
+                if not isinstance(command, list) or not command:
+                    continue
+                name, args = command[0].upper(), command[1:]
+
+                if name == b"AUTH":
+                    authenticated = self._authenticate(args)
+                    writer.write(
+                        b"+OK\r\n" if authenticated else b"-WRONGPASS invalid password\r\n"
+                    )
+                elif not authenticated:
+                    writer.write(b"-NOAUTH Authentication required\r\n")
+                elif name == b"PUBLISH" and len(args) == 2:
+                    receivers = self._publish(args[0], args[1])
+                    writer.write(b":%d\r\n" % receivers)
+                elif name == b"SUBSCRIBE":
+                    for channel in args:
+                        channels.add(channel)
+                        self._subscribers.setdefault(channel, set()).add(writer)
+                        writer.write(
+                            b"*3\r\n$9\r\nsubscribe\r\n$%d\r\n%s\r\n:%d\r\n"
+                            % (len(channel), channel, len(channels))
+                        )
+                elif name == b"UNSUBSCRIBE":
+                    for channel in args or list(channels):
+                        channels.discard(channel)
+                        self._remove(channel, writer)
+                        writer.write(
+                            b"*3\r\n$11\r\nunsubscribe\r\n$%d\r\n%s\r\n:%d\r\n"
+                            % (len(channel), channel, len(channels))
+                        )
+                elif name in (b"SET", b"GET", b"INCRBY", b"PEXPIRE") and args:
+                    try:
+                        writer.write(self._keyspace(name, args))
+                    except (IndexError, ValueError):
+                        writer.write(b"-ERR syntax error or value is not an integer\r\n")
+                elif name == b"PING":
+                    writer.write(b"+PONG\r\n")
+                else:
+                    writer.write(b"-ERR unknown command\r\n")
+                await writer.drain()
+        except (asyncio.IncompleteReadError, ConnectionError, OSError):
+            pass
+        finally:
+            for channel in channels:
+                self._remove(channel, writer)
+            writer.close()
+
+    def _authenticate(self, args: list[bytes]) -> bool:
+        # Also refused when no password is configured, like Redis does
+        if self.password is None or len(args) != 1:
+            return False
+        return hmac.compare_digest(args[0], self.password.encode())
+
+    def _keyspace(self, name: bytes, args: list[bytes]) -> bytes:
+        """SET [NX] [EX s | PX ms], GET, INCRBY and PEXPIRE; expired keys are dropped on access."""
+        key = args[0]
+        expires = self._expires.get(key)
+        if expires is not None and expires <= time.monotonic():
+            self._values.pop(key, None)
+            del self._expires[key]
+
+        if name == b"GET":
+            value = self._values.get(key)
+            return b"$-1\r\n" if value is None else b"$%d\r\n%s\r\n" % (len(value), value)
+        if name == b"INCRBY":
+            number = int(self._values.get(key, b"0")) + int(args[1])
+            self._values[key] = b"%d" % number
+            return b":%d\r\n" % number
+        if name == b"PEXPIRE":
+            if key not in self._values:
+                return b":0\r\n"
+            self._expires[key] = time.monotonic() + int(args[1]) / 1000
+            return b":1\r\n"
+
+        options = [arg.upper() for arg in args[2:]]
+        if b"NX" in options and key in self._values:
+            return b"$-1\r\n"
+        self._values[key] = args[1]
+        self._expires.pop(key, None)
+        for unit, scale in ((b"EX", 1.0), (b"PX", 0.001)):
+            if unit in options:
+                seconds = int(args[2 + options.index(unit) + 1]) * scale
+                self._expires[key] = time.monotonic() + seconds
+        return b"+OK\r\n"
+
+    def _publish(self, channel: bytes, message: bytes) -> int:
+        writers = self._subscribers.get(channel, ())
+        if not writers:
+            return 0
+        frame = (
+            b"*3\r\n$7\r\nmessage\r\n$%d\r\n%s\r\n$%d\r\n%s\r\n"
+            % (len(channel), channel, len(message), message)
+        )
+        for subscriber in list(writers):
+            # Buffered write; a subscriber that stops reading only grows its own buffer
+            subscriber.write(frame)
+        return len(writers)
+
+    def _remove(self, channel: bytes, writer: asyncio.StreamWriter) -> None:
+        writers = self._subscribers.get(channel)
+        if writers is not None:
+            writers.discard(writer)
+            if not writers:
+                del self._subscribers[channel]
+
+
+def _is_loopback(host: str) -> bool:
+    if host == "localhost":
+        return True
+    try:
+        return ipaddress.ip_address(host).is_loopback
+    except ValueError:
+        return False
+
+
+async def serve(unix_path: str | None, host: str, port: int, password: str | None = None) -> None:
+    """Run the broker until cancelled."""
+    broker = EventBroker(password)
+    if unix_path:
+        await broker.start_unix(unix_path)
+        logger.info(f"Event broker listening on {unix_path}")
+    else:
+        bound = await broker.start_tcp(host, port)
+        logger.info(f"Event broker listening on {host}:{bound}")
+    try:
+        await asyncio.Event().wait()
+    finally:
+        await broker.close()
+
+
+def main() -> None:
+    """Command-line entry point."""
+    parser = argparse.ArgumentParser(description="Pub/sub broker for WebSocket events")
+    parser.add_argument("--unix", help="Unix socket path")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=6380)
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO)
+    # From the environment so the password does not show up in the process list
+    password = os.getenv("EVENT_BROKER_PASSWORD") or None
+    asyncio.run(serve(args.unix, args.host, args.port, password))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,415 @@
+"""Pub/sub backends that carry WebSocket events between worker processes."""
+
+import asyncio
+import logging
+import os
+import time
+from abc import ABC, abstractmethod
+from collections import deque
+from collections.abc import Awaitable, Callable
+from typing import Any
+from urllib.parse import unquote, urlparse
+
+logger = logging.getLogger(__name__)
+
+MessageHandler = Callable[[str, bytes], Awaitable[None]]
+
+# Idle sequence counters expire; a re-created counter starts above the old one
+SEQUENCE_TTL_SECONDS = 86400
+
+
+def _sequence_base() -> int:
+    """Starting value of a new counter (epoch milliseconds)."""
+    return int(time.time() * 1000)
+
+
+class EventBus(ABC):
+    """
+    Topic-based pub/sub used by ``WebSocketManager``.
+
+    Handlers receive every message published to a topic they subscribed
+    to, including messages published through the same bus instance;
+    callers that deliver locally filter their own messages out.
+    """
+
+    @abstractmethod
+    async def publish(self, topic: str, message: bytes) -> None:
+        """Publish a message to a topic without waiting for delivery."""
+
+    @abstractmethod
+    async def subscribe(self, topic: str, handler: MessageHandler) -> None:
+        """Start calling ``handler`` for messages on ``topic``."""
+
+    @abstractmethod
+    async def unsubscribe(self, topic: str, handler: MessageHandler) -> None:
+        """Stop calling ``handler`` for messages on ``topic``."""
+
+    @abstractmethod
+    async def next_sequence(self, key: str, count: int = 1) -> int:
+        """
+        Reserve ``count`` consecutive numbers of a counter shared by all workers.
+
+        A new counter starts at the current epoch milliseconds, so numbers
+        keep increasing when it is re-created.
+
+        Returns:
+            The last reserved number
+
+        Raises:
+            ConnectionError: If the counter cannot be reached
+        """
+
+    @abstractmethod
+    async def claim(self, key: str, owner: str, ttl_seconds: float) -> bool:
+        """
+        Take or renew a lease shared by all workers.
+
+        Args:
+            key: Lease name
+            owner: Identifies the claiming worker
+            ttl_seconds: Lease lifetime from now
+
+        Returns:
+            True if ``owner`` holds the lease (it was free or already theirs)
+
+        Raises:
+            ConnectionError: If the broker cannot be reached
+        """
+
+    @abstractmethod
+    async def close(self) -> None:
+        """Release connections."""
+
+
+class InProcessEventBus(EventBus):
+    """Event bus for a single process (one worker, or several managers in tests)."""
+
+    def __init__(self) -> None:
+        self._handlers: dict[str, list[MessageHandler]] = {}
+        self._counters: dict[str, int] = {}
+        self._leases: dict[str, tuple[str, float]] = {}
+        self._prune_leases_at = 1024
+
+    async def publish(self, topic: str, message: bytes) -> None:
+        for handler in list(self._handlers.get(topic, ())):
+            try:
+                await handler(topic, message)
+            except Exception as e:
+                logger.error(f"Event bus handler failed for {topic}: {e!r}")
+
+    async def subscribe(self, topic: str, handler: MessageHandler) -> None:
+        self._handlers.setdefault(topic, []).append(handler)
+
+    async def unsubscribe(self, topic: str, handler: MessageHandler) -> None:
+        handlers = self._handlers.get(topic)
+        if handlers and handler in handlers:
+            handlers.remove(handler)
+            if not handlers:
+                del self._handlers[topic]
+
+    async def next_sequence(self, key: str, count: int = 1) -> int:
+        value = self._counters.get(key)
+        value = (_sequence_base() if value is None else value) + count
+        self._counters[key] = value
+        return value
+
+    async def claim(self, key: str, owner: str, ttl_seconds: float) -> bool:
+        now = time.monotonic()
+        lease = self._leases.get(key)
+        if lease is not None and lease[0] != owner and lease[1] > now:
+            return False
+        self._leases[key] = (owner, now + ttl_seconds)
+        if len(self._leases) >= self._prune_leases_at:
+            self._leases = {k: v for k, v in self._leases.items() if v[1] > now}
+            self._prune_leases_at = max(1024, 2 * len(self._leases))
+        return True
+
+    async def close(self) -> None:
+        """Nothing to release; there are no connections."""
+
+
+# Redis serialization protocol (RESP), the subset pub/sub needs
+
+
+def encode_command(*args: str | bytes) -> bytes:
+    """Encode a command as a RESP array of bulk strings."""
+    parts = [b"*%d\r\n" % len(args)]
+    for arg in args:
+        data = arg.encode() if isinstance(arg, str) else arg
+        parts.append(b"$%d\r\n%s\r\n" % (len(data), data))
+    return b"".join(parts)
+
+
+async def read_reply(reader: asyncio.StreamReader) -> bytes | int | list | None:
+    """Read one RESP value; error replies raise ``RuntimeError``."""
+    line = await reader.readuntil(b"\r\n")
+    kind, body = line[:1], line[1:-2]
+    if kind == b"+":
+        return body
+    if kind == b"-":
+        raise RuntimeError(body.decode(errors="replace"))
+    if kind == b":":
+        return int(body)
+    if kind == b"$":
+        length = int(body)
+        if length < 0:
+            return None
+        data = await reader.readexactly(length + 2)
+        return data[:-2]
+    if kind == b"*":
+        length = int(body)
+        if length < 0:
+            return None
+        return [await read_reply(reader) for _ in range(length)]
+    raise RuntimeError(f"Unexpected RESP reply: {line!r}")
+
+
+class RedisEventBus(EventBus):
+    """
+    Event bus over Redis pub/sub, or the stand-in broker in ``event_broker``.
+
+    One connection publishes (pipelined: replies are drained by a reader
+    task, so ``publish`` never waits for the broker) and one connection
+    subscribes to exactly the topics this process has handlers for.
+    Sequence numbers (``SET key <now> NX EX`` and ``INCRBY``) and leases
+    (``SET NX PX``, ``GET``, ``PEXPIRE``) are requested on the publishing
+    connection too, so every worker draws from the same broker state.
+    Both connect lazily and reconnect with backoff; the subscriber
+    resubscribes its topics after a reconnect. Messages published while
+    the broker is unreachable are dropped.
+    """
+
+    def __init__(
+        self, url: str, reconnect_max_seconds: float = 5.0, request_timeout_seconds: float = 1.0
+    ) -> None:
+        """
+        Initialize bus.
+
+        Args:
+            url: ``redis://[:password@]host[:port]`` or ``unix:///path/to/socket``
+            reconnect_max_seconds: Max delay between reconnect attempts
+            request_timeout_seconds: Max wait for a ``next_sequence`` or ``claim`` reply
+        """
+        parsed = urlparse(url)
+        if parsed.scheme not in ("redis", "unix"):
+            raise ValueError(f"Unsupported event bus URL: {url}")
+        self.url = url
+        self._parsed = parsed
+        self.reconnect_max_seconds = reconnect_max_seconds
+        self.request_timeout_seconds = request_timeout_seconds
+
+        self._handlers: dict[str, list[MessageHandler]] = {}
+        self._publisher: asyncio.StreamWriter | None = None
+        # One entry per command in flight on the publisher; None where the reply is ignored
+        self._replies: deque[asyncio.Future[Any] | None] = deque()
+        self._publisher_lock = asyncio.Lock()
+        self._publisher_drain: asyncio.Task[None] | None = None
+        self._subscriber: asyncio.StreamWriter | None = None
+        self._listener: asyncio.Task[None] | None = None
+        self._closed = False
+
+        self.published = 0
+        self.received = 0
+        self.publish_failures = 0
+
+    async def publish(self, topic: str, message: bytes) -> None:
+        try:
+            writer = await self._get_publisher()
+            writer.write(encode_command("PUBLISH", topic, message))
+            self._replies.append(None)
+            await writer.drain()
+            self.published += 1
+        except (OSError, ConnectionError) as e:
+            self.publish_failures += 1
+            logger.warning(f"Event bus publish to {topic} failed: {e!r}")
+            self._drop_publisher()
+
+    async def next_sequence(self, key: str, count: int = 1) -> int:
+        value = await self._request(
+            ("SET", key, str(_sequence_base()), "NX", "EX", str(SEQUENCE_TTL_SECONDS)),
+            ("INCRBY", key, str(count)),
+        )
+        if not isinstance(value, int):
+            raise ConnectionError(f"Unexpected INCRBY reply for {key}: {value!r}")
+        return value
+
+    async def claim(self, key: str, owner: str, ttl_seconds: float) -> bool:
+        ttl = str(int(ttl_seconds * 1000))
+        holder = await self._request(("SET", key, owner, "NX", "PX", ttl), ("GET", key))
+        if holder != owner.encode():
+            return False
+        # Renew; a lease just taken by SET gets the same expiry again
+        await self._request(("PEXPIRE", key, ttl))
+        return True
+
+    async def subscribe(self, topic: str, handler: MessageHandler) -> None:
+        handlers = self._handlers.setdefault(topic, [])
+        handlers.append(handler)
+        if len(handlers) > 1:
+            return
+        if self._listener is None or self._listener.done():
+            self._listener = asyncio.create_task(self._listen())
+        elif self._subscriber is not None:
+            self._send_subscriber("SUBSCRIBE", topic)
+
+    async def unsubscribe(self, topic: str, handler: MessageHandler) -> None:
+        handlers = self._handlers.get(topic)
+        if not handlers or handler not in handlers:
+            return
+        handlers.remove(handler)
+        if not handlers:
+            del self._handlers[topic]
+            if self._subscriber is not None:
+                self._send_subscriber("UNSUBSCRIBE", topic)
+
+    async def close(self) -> None:
+        self._closed = True
+        for task in (self._listener, self._publisher_drain):
+            if task is not None:
+                task.cancel()
+        for writer in (self._subscriber, self._publisher):
+            if writer is not None:
+                writer.close()
+        self._subscriber = self._publisher = None
+
+    def stats(self) -> dict[str, int]:
+        """Return counters for logging or metrics endpoints."""
+        return {
+            "topics": len(self._handlers),
+            "published": self.published,
+            "received": self.received,
+            "publish_failures": self.publish_failures,
+        }
+
+    async def _connect(self) -> tuple[asyncio.StreamReader, asyncio.StreamWriter]:
+        parsed = self._parsed
+        if parsed.scheme == "unix":
+            reader, writer = await asyncio.open_unix_connection(unquote(parsed.path))
+        else:
+            reader, writer = await asyncio.open_connection(
+                parsed.hostname or "localhost", parsed.port or 6379
+            )
+        if parsed.password:
+            writer.write(encode_command("AUTH", unquote(parsed.password)))
+            await writer.drain()
+            try:
+                await read_reply(reader)
+            except RuntimeError as e:
+                writer.close()
+                raise ConnectionError(f"Event bus authentication failed: {e}") from e
+        return reader, writer
+
+    async def _request(self, *commands: tuple[str, ...]) -> Any:
+        """Pipeline ``commands`` on the publisher connection; returns the last one's reply."""
+        try:
+            writer = await self._get_publisher()
+            reply: asyncio.Future[Any] = asyncio.get_running_loop().create_future()
+            writer.write(b"".join(encode_command(*command) for command in commands))
+            self._replies.extend([None] * (len(commands) - 1))
+            self._replies.append(reply)
+            await writer.drain()
+            async with asyncio.timeout(self.request_timeout_seconds):
+                return await reply
+        except (OSError, ConnectionError, TimeoutError) as e:
+            self._drop_publisher()
+            raise ConnectionError(f"Event bus request failed: {e!r}") from e
+
+    async def _get_publisher(self) -> asyncio.StreamWriter:
+        if self._publisher is not None:
+            return self._publisher
+        async with self._publisher_lock:
+            if self._publisher is None:
+                reader, writer = await self._connect()
+                self._publisher = writer
+                self._publisher_drain = asyncio.create_task(self._drain_replies(reader))
+        return self._publisher
+
+    async def _drain_replies(self, reader: asyncio.StreamReader) -> None:
+        replies = self._replies
+        try:
+            while True:
+                try:
+                    reply: Any = await read_reply(reader)
+                except RuntimeError as e:
+                    reply = e  # Error reply to one command; the connection is still usable
+                waiter = replies.popleft() if replies else None
+                if waiter is None or waiter.done():
+                    continue
+                if isinstance(reply, RuntimeError):
+                    waiter.set_exception(ConnectionError(f"Broker refused the request: {reply}"))
+                else:
+                    waiter.set_result(reply)
+        except (asyncio.IncompleteReadError, OSError, ConnectionError) as e:
+            logger.warning(f"Event bus publisher connection lost: {e!r}")
+            self._drop_publisher()
+
+    def _drop_publisher(self) -> None:
+        if self._publisher is not None:
+            self._publisher.close()
+            self._publisher = None
+        # Replies of the old connection will never come
+        for waiter in self._replies:
+            if waiter is not None and not waiter.done():
+                waiter.set_exception(ConnectionError("Event bus publisher connection lost"))
+        self._replies = deque()
+
+    def _send_subscriber(self, command: str, topic: str) -> None:
+        assert self._subscriber is not None
+        try:
+            self._subscriber.write(encode_command(command, topic))
+        except (OSError, ConnectionError) as e:
+            # The listener notices the broken connection and resubscribes
+            logger.warning(f"Event bus {command} {topic} failed: {e!r}")
+
+    async def _listen(self) -> None:
+        delay = 0.1
+        while not self._closed and self._handlers:
+            try:
+                reader, writer = await self._connect()
+                self._subscriber = writer
+                if self._handlers:
+                    writer.write(encode_command("SUBSCRIBE", *self._handlers))
+                await writer.drain()
+                delay = 0.1
+                while True:
+                    reply = await read_reply(reader)
+                    if isinstance(reply, list) and len(reply) == 3 and reply[0] == b"message":
+                        await self._dispatch(reply[1].decode(), reply[2])
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.warning(f"Event bus subscriber connection lost: {e!r}")
+            finally:
+                if self._subscriber is not None:
+                    self._subscriber.close()
+                    self._subscriber = None
+            await asyncio.sleep(delay)
+            delay = min(self.reconnect_max_seconds, delay * 2)
+
+    async def _dispatch(self, topic: str, message: bytes) -> None:
+        self.received += 1
+        for handler in list(self._handlers.get(topic, ())):
+            try:
+                await handler(topic, message)
+            except Exception as e:
+                logger.error(f"Event bus handler failed for {topic}: {e!r}")
+
+
+def create_event_bus(url: str | None) -> EventBus:
+    """
+    Create the event bus for a URL.
+
+    Args:
+        url: Broker URL (``redis://`` or ``unix://``); empty or None for in-process
+
+    Returns:
+        Event bus instance (connects lazily)
+    """
+    if not url:
+        return InProcessEventBus()
+    return RedisEventBus(url)
+
+
+def event_bus_from_env() -> EventBus:
+    """Create the event bus configured by ``WEBSOCKET_EVENT_BUS_URL``."""
+    return create_event_bus(os.getenv("WEBSOCKET_EVENT_BUS_URL"))
@@ -0,0 +1,129 @@
+"""Merge high-frequency WebSocket events while they wait to be flushed."""
+
+from collections.abc import Callable, Hashable
+from datetime import datetime
+from typing import Any
+
+from app.schemas.websocket_events import WebSocketEventType
+
+EventData = dict[str, Any]
+
+
+def merge_latest(previous: EventData, current: EventData) -> EventData:
+    """Keep only the newest event (e.g. a partial transcript superseding the last)."""
+    return current
+
+
+def merge_progress(previous: EventData, current: EventData) -> EventData:
+    """Keep the newest event but never let its percentage go backwards."""
+    return {**current, "percent": max(previous.get("percent", 0), current.get("percent", 0))}
+
+
+def merge_delta(previous: EventData, current: EventData) -> EventData:
+    """Concatenate streamed text fragments; the index is the last one merged."""
+    return {**current, "delta": previous.get("delta", "") + current.get("delta", "")}
+
+
+def field_key(name: str) -> Callable[[EventData], Hashable | None]:
+    """Key events by one data field; events without it are not coalesced."""
+    return lambda data: data.get(name)
+
+
+def _question_delta_key(data: EventData) -> Hashable | None:
+    # The final question shares the stream ID but must go out unmerged
+    return data.get("stream_id") if "delta" in data else None
+
+
+class CoalesceRule:
+    """How one event type is held back and merged before it is sent."""
+
+    __slots__ = ("interval", "key", "merge")
+
+    def __init__(
+        self,
+        interval: float,
+        key: Callable[[EventData], Hashable | None],
+        merge: Callable[[EventData, EventData], EventData] = merge_latest,
+    ) -> None:
+        """
+        Initialize rule.
+
+        Args:
+            interval: Max seconds an event waits before it is flushed
+            key: What an event updates (events with equal keys merge; None = send now)
+            merge: Combines a pending event's data with a newer one's
+        """
+        self.interval = interval
+        self.key = key
+        self.merge = merge
+
+
+# Flush intervals stay below what a person notices in the live view
+DEFAULT_COALESCE_RULES: dict[str, CoalesceRule] = {
+    WebSocketEventType.TRANSCRIPTION_PARTIAL.value: CoalesceRule(0.1, field_key("chunk_number")),
+    WebSocketEventType.TRANSCRIPTION_PROGRESS.value: CoalesceRule(
+        0.25, field_key("chunk_number"), merge_progress
+    ),
+    WebSocketEventType.INTERVENTION_QUESTION.value: CoalesceRule(
+        0.05, _question_delta_key, merge_delta
+    ),
+}
+
+
+class PendingEvent:
+    """A merged event waiting for its flush deadline."""
+
+    __slots__ = ("event_type", "data", "timestamp", "due")
+
+    def __init__(self, event_type: str, data: EventData, timestamp: datetime, due: float) -> None:
+        self.event_type = event_type
+        self.data = data
+        self.timestamp = timestamp
+        self.due = due
+
+
+class CoalescingBuffer:
+    """
+    Pending events of one meeting, merged by (event type, key).
+
+    An event keeps the position and deadline of the first event it was
+    merged into, so a steady stream of updates is still flushed once per
+    interval instead of being postponed indefinitely. A new event joins
+    the earliest pending flush when that comes before its own deadline.
+    """
+
+    def __init__(self) -> None:
+        self.entries: dict[tuple[str, Hashable], PendingEvent] = {}
+        self.merged = 0
+
+    def add(
+        self, event_type: str, key: Hashable, data: EventData, rule: CoalesceRule, now: float
+    ) -> float:
+        """Merge an event into the buffer and return when it is due."""
+        timestamp = datetime.utcnow()
+        pending = self.entries.get((event_type, key))
+        if pending is not None:
+            pending.data = rule.merge(pending.data, data)
+            pending.timestamp = timestamp
+            self.merged += 1
+            return pending.due
+        # Ride along with an earlier flush so events due close together share a frame
+        due = now + rule.interval
+        earliest = self.next_due()
+        if earliest is not None and earliest < due:
+            due = earliest
+        self.entries[(event_type, key)] = PendingEvent(event_type, data, timestamp, due)
+        return due
+
+    def pop_due(self, now: float | None = None) -> list[PendingEvent]:
+        """Remove and return events due by ``now`` (all of them if None), oldest first."""
+        if now is None:
+            events = list(self.entries.values())
+            self.entries.clear()
+            return events
+        due = [entry for entry, pending in self.entries.items() if pending.due <= now]
+        return [self.entries.pop(entry) for entry in due]
+
+    def next_due(self) -> float | None:
+        """Earliest deadline among pending events."""
+        return min((pending.due for pending in self.entries.values()), default=None)
@@ -0,0 +1,78 @@
+"""Encode WebSocket events once and share the bytes across subscribers."""
+
+from datetime import date, datetime, time
+from enum import Enum
+from typing import Any
+
+import orjson
+
+try:
+    import msgpack
+except ImportError:  # Optional: only needed for the binary subprotocol
+    msgpack = None
+
+# Subprotocol a client requests to receive msgpack binary frames instead of JSON text
+MSGPACK_SUBPROTOCOL = "meeting-events.msgpack"
+
+
+def msgpack_available() -> bool:
+    """Whether the msgpack subprotocol can be offered."""
+    return msgpack is not None
+
+
+def _default(obj: Any) -> Any:
+    """Fallback for values neither codec handles natively."""
+    if isinstance(obj, datetime | date | time):
+        return obj.isoformat()
+    if isinstance(obj, Enum):
+        return obj.value
+    return str(obj)
+
+
+class EncodedEvent:
+    """
+    A WebSocket message encoded at most once per wire format.
+
+    The JSON text and msgpack bytes are produced on first use and then
+    shared by every subscriber the message is queued for.
+    """
+
+    __slots__ = ("payload", "_json", "_text", "_binary")
+
+    def __init__(self, payload: dict[str, Any]) -> None:
+        self.payload = payload
+        self._json: bytes | None = None
+        self._text: str | None = None
+        self._binary: bytes | None = None
+
+    @classmethod
+    def from_json(cls, data: bytes) -> "EncodedEvent":
+        """Wrap a JSON message received from another process, keeping its encoding."""
+        event = cls(orjson.loads(data))
+        event._json = data
+        return event
+
+    @property
+    def json(self) -> bytes:
+        """JSON encoding as bytes (for the event bus)."""
+        if self._json is None:
+            self._json = orjson.dumps(
+                self.payload, default=_default, option=orjson.OPT_NON_STR_KEYS
+            )
+        return self._json
+
+    @property
+    def text(self) -> str:
+        """JSON encoding for text frames."""
+        if self._text is None:
+            self._text = self.json.decode()
+        return self._text
+
+    @property
+    def binary(self) -> bytes:
+        """msgpack encoding for binary frames."""
+        if self._binary is None:
+            if msgpack is None:
+                raise RuntimeError("msgpack is not installed")
+            self._binary = msgpack.packb(self.payload, default=_default)
+        return self._binary
@@ -1,56 +1,445 @@
 """WebSocket connection manager for real-time meeting updates."""
 
-import json
+import asyncio
+import contextlib
 import logging
-from typing import Any
+import time
+import uuid
+from collections import deque
+from collections.abc import Callable
+from datetime import datetime
+from enum import Enum
+from typing import Any, Literal
 
 from fastapi import WebSocket
 from pydantic import BaseModel
 
-from app.schemas.websocket_events import WebSocketEvent, WebSocketEventType
+from app.core.event_bus import EventBus, InProcessEventBus, event_bus_from_env
+from app.core.event_coalescing import DEFAULT_COALESCE_RULES, CoalesceRule, CoalescingBuffer
+from app.core.event_encoding import MSGPACK_SUBPROTOCOL, EncodedEvent, msgpack_available
+from app.schemas.websocket_events import WebSocketEventType
 
 logger = logging.getLogger(__name__)
 
+OverflowPolicy = Literal["drop_oldest", "drop_newest"]
+
+# Events where a newer one makes a queued older one obsolete
+COALESCED_EVENTS = {
+    WebSocketEventType.TIME_WARNING.value,
+    WebSocketEventType.MEETING_EXTENDED.value,
+}
+
+# Close code sent to evicted slow consumers ("try again later")
+SLOW_CONSUMER_CLOSE_CODE = 1013
+
+# Event bus topic carrying one meeting's events between workers
+TOPIC_PREFIX = "meeting:"
+
+
+class OutgoingMessage:
+    """Encoded message waiting in a client's send queue."""
+
+    __slots__ = ("event", "coalesce_key", "droppable", "enqueued_at")
+
+    def __init__(self, event: EncodedEvent, coalesce_key: str | None, droppable: bool) -> None:
+        self.event = event  # Shared by every subscriber the message is queued for
+        self.coalesce_key = coalesce_key
+        # Question deltas can be lost: the final question event carries the full text
+        self.droppable = droppable
+        self.enqueued_at = time.perf_counter()
+
+
+class SequencedFrame:
+    """A frame sent to clients, with the sequence number of each event in it."""
+
+    __slots__ = ("encoded", "events")
+
+    def __init__(self, encoded: EncodedEvent, events: list[tuple[int, EncodedEvent]]) -> None:
+        self.encoded = encoded
+        # One entry for a single event, one per event for a batch
+        self.events = events
+
+    @property
+    def first(self) -> int:
+        return self.events[0][0]
+
+    @property
+    def last(self) -> int:
+        return self.events[-1][0]
+
+
+class MeetingLog:
+    """
+    Ring buffer of a meeting's recent events for resuming clients.
+
+    Frames are released in sequence order: a frame arriving after a gap
+    is held until the frames before it arrive, or until the gap is given
+    up on with ``release_held``.
+    """
+
+    __slots__ = ("events", "floor", "next_seq", "held")
+
+    def __init__(self, size: int) -> None:
+        self.events: deque[tuple[int, EncodedEvent]] = deque(maxlen=size)
+        # Highest sequence number no longer (or never) buffered; None until the first event
+        self.floor: int | None = None
+        # Next sequence number to release; None until the first frame
+        self.next_seq: int | None = None
+        self.held: dict[int, SequencedFrame] = {}
+
+    def offer(self, frame: SequencedFrame) -> list[SequencedFrame]:
+        """Buffer a frame in sequence order; returns the frames now ready to send."""
+        if self.next_seq is not None and frame.first > self.next_seq:
+            self.held[frame.first] = frame
+            return []
+        released = [frame]
+        self._release(frame)
+        while self.next_seq in self.held:
+            frame = self.held.pop(self.next_seq)
+            released.append(frame)
+            self._release(frame)
+        return released
+
+    def release_held(self) -> list[SequencedFrame]:
+        """Give up on missing frames and release the held ones in order."""
+        released = [self.held.pop(first) for first in sorted(self.held)]
+        for frame in released:
+            self._release(frame)
+        return released
+
+    def _release(self, frame: SequencedFrame) -> None:
+        # Batched events are buffered one by one so a resuming client can start mid-batch
+        for seq, event in frame.events:
+            self.append(seq, event)
+        self.next_seq = max(self.next_seq or 0, frame.last + 1)
+
+    def append(self, seq: int, event: EncodedEvent) -> None:
+        """Buffer an event, evicting the oldest when full."""
+        if self.floor is None:
+            self.floor = seq - 1
+        elif len(self.events) == self.events.maxlen:
+            self.floor = max(self.floor, self.events[0][0])
+        self.events.append((seq, event))
+
+    def since(self, last_seq: int) -> list[EncodedEvent] | None:
+        """Events after ``last_seq``, or None if some of them are no longer buffered."""
+        if self.floor is None or last_seq < self.floor:
+            return None
+        return [event for seq, event in self.events if seq > last_seq]
+
+
+class MeetingMetrics:
+    """Delivery counters and recent send latencies for one meeting."""
+
+    def __init__(self, latency_samples: int = 256) -> None:
+        self.sent = 0
+        self.dropped = 0
+        self.coalesced = 0
+        self.evicted = 0
+        self.replayed = 0
+        self.snapshots = 0
+        self.latencies: deque[float] = deque(maxlen=latency_samples)
+
+    def record_sent(self, latency_seconds: float) -> None:
+        """Record a message written to a client, queued time included."""
+        self.sent += 1
+        self.latencies.append(latency_seconds)
+
+    def latency_ms(self) -> dict[str, float]:
+        """Percentiles over the recent send latencies."""
+        if not self.latencies:
+            return {"p50": 0.0, "p95": 0.0, "max": 0.0}
+        ordered = sorted(self.latencies)
+        return {
+            "p50": round(ordered[len(ordered) // 2] * 1000, 2),
+            "p95": round(ordered[min(len(ordered) - 1, int(len(ordered) * 0.95))] * 1000, 2),
+            "max": round(ordered[-1] * 1000, 2),
+        }
+
+
+class ClientConnection:
+    """One subscriber with its own bounded send queue and writer task."""
+
+    def __init__(
+        self,
+        websocket: WebSocket,
+        meeting_id: str,
+        manager: "WebSocketManager",
+        binary: bool = False,
+    ) -> None:
+        self.websocket = websocket
+        self.meeting_id = meeting_id
+        self.manager = manager
+        self.binary = binary  # msgpack binary frames instead of JSON text
+        self.queue: deque[OutgoingMessage] = deque()
+        self.ready = asyncio.Event()
+        self.full_since: float | None = None
+        self.sending_since: float | None = None  # Checked by the manager's send watchdog
+        self.metrics = manager.meeting_metrics(meeting_id)
+        self.writer = asyncio.create_task(self._write())
+
+    def enqueue(self, message: OutgoingMessage) -> None:
+        """Queue a message without waiting, applying coalesce and overflow rules."""
+        metrics = self.metrics
+
+        if message.coalesce_key is not None:
+            for index, queued in enumerate(self.queue):
+                if queued.coalesce_key == message.coalesce_key:
+                    message.enqueued_at = queued.enqueued_at
+                    self.queue[index] = message
+                    metrics.coalesced += 1
+                    return
+
+        if len(self.queue) >= self.manager.max_queue_size:
+            now = time.perf_counter()
+            if self.full_since is None:
+                self.full_since = now
+            elif now - self.full_since >= self.manager.slow_consumer_seconds:
+                self.manager.evict(self, "send queue full")
+                return
+
+            metrics.dropped += 1
+            victim = next((queued for queued in self.queue if queued.droppable), None)
+            if victim is not None:
+                self.queue.remove(victim)
+            elif message.droppable or self.manager.overflow == "drop_newest":
+                return
+            else:
+                self.queue.popleft()
+        else:
+            self.full_since = None
+
+        self.queue.append(message)
+        self.ready.set()
+
+    async def _write(self) -> None:
+        while True:
+            if not self.queue:
+                self.ready.clear()
+                await self.ready.wait()
+                continue
+
+            message = self.queue.popleft()
+            send = (
+                self.websocket.send_bytes(message.event.binary)
+                if self.binary
+                else self.websocket.send_text(message.event.text)
+            )
+            self.sending_since = time.perf_counter()
+            try:
+                await send
+            except Exception as e:
+                logger.error(f"Error sending message to WebSocket: {e}")
+                self.manager.disconnect(self.websocket, self.meeting_id)
+                return
+            self.sending_since = None
+            self.metrics.record_sent(time.perf_counter() - message.enqueued_at)
+
 
 class WebSocketManager:
-    """Manage WebSocket connections for meetings."""
-
-    def __init__(self) -> None:
-        # Map meeting_id -> list of active connections
-        self.active_connections: dict[str, list[WebSocket]] = {}
-
-    async def connect(self, websocket: WebSocket, meeting_id: str) -> None:
-        """Accept WebSocket connection and subscribe to meeting."""
-        await websocket.accept()
-        if meeting_id not in self.active_connections:
-            self.active_connections[meeting_id] = []
-        self.active_connections[meeting_id].append(websocket)
+    """
+    Manage WebSocket connections for meetings.
+
+    Every connection gets a bounded send queue drained by its own writer
+    task, so broadcasting only serializes the message once and enqueues
+    it: a slow client delays nobody else, and neither does the request
+    that produced the event. Time warnings and extensions replace an
+    older queued event of the same type. When a queue is full, queued
+    question deltas are dropped first, then the oldest (or the new)
+    message per ``overflow``. A client whose queue stays full for
+    ``slow_consumer_seconds`` or whose send blocks for
+    ``send_timeout_seconds`` is disconnected with close code 1013.
+
+    Each event is encoded once (JSON via orjson, or msgpack for clients
+    that request the ``meeting-events.msgpack`` subprotocol) and the
+    same buffer is queued for every subscriber.
+
+    With several workers, events also go out on ``bus`` under a
+    per-meeting topic. A worker subscribes to a meeting's topic while it
+    has clients for that meeting and delivers events published by other
+    workers to them; its own events are delivered locally right away and
+    skipped when they come back from the bus.
+
+    Every event carries a per-meeting ``seq``, reserved from a counter on
+    the bus that all workers share, so numbers are unique and dense per
+    meeting (the counter starts at the epoch milliseconds, so they also
+    keep increasing across restarts). Each worker releases a meeting's
+    events to its clients in ``seq`` order, holding an event that
+    overtook an earlier one for up to ``reorder_window_seconds``; a
+    client's ``last_seq`` therefore covers everything before it. If the
+    bus is unreachable, numbers continue locally. While a worker is
+    subscribed to a meeting it buffers the last ``replay_buffer_size``
+    events; a client reconnecting with ``last_seq`` is sent the events it
+    missed, or a snapshot if they are no longer buffered. The
+    subscription and buffer are kept for ``resume_grace_seconds`` after
+    the last client leaves so short drop-outs can resume.
+
+    Event types in ``coalesce_rules`` (partial transcripts, progress,
+    question deltas) are held back for their rule's flush interval and
+    merged by key, so only the latest partial of a chunk is sent and
+    deltas arrive a few words at a time. Everything due at once goes out
+    as one ``batch`` frame whose events keep their own ``seq``. Any other
+    event flushes the meeting's pending events first, so order is kept.
+    """
+
+    def __init__(
+        self,
+        max_queue_size: int = 256,
+        overflow: OverflowPolicy = "drop_oldest",
+        send_timeout_seconds: float = 5.0,
+        slow_consumer_seconds: float = 10.0,
+        bus: EventBus | None = None,
+        replay_buffer_size: int = 200,
+        resume_grace_seconds: float = 120.0,
+        coalesce_rules: dict[str, CoalesceRule] | None = None,
+        reorder_window_seconds: float = 0.1,
+    ) -> None:
+        """
+        Initialize manager.
+
+        Args:
+            max_queue_size: Max queued messages per connection
+            overflow: Which message to drop when a queue is full
+            send_timeout_seconds: Max time a single send may block
+            slow_consumer_seconds: How long a queue may stay full before eviction
+            bus: Pub/sub between workers (None = this process only)
+            replay_buffer_size: Events buffered per meeting for resuming clients
+            resume_grace_seconds: How long a meeting stays buffered without clients
+            coalesce_rules: Flush interval, key and merge per event type ({} = send all at once)
+            reorder_window_seconds: How long an event waits for an earlier one still missing
+        """
+        self.max_queue_size = max_queue_size
+        self.overflow = overflow
+        self.send_timeout_seconds = send_timeout_seconds
+        self.slow_consumer_seconds = slow_consumer_seconds
+        self.bus = bus if bus is not None else InProcessEventBus()
+        self.replay_buffer_size = replay_buffer_size
+        self.resume_grace_seconds = resume_grace_seconds
+        self.coalesce_rules = DEFAULT_COALESCE_RULES if coalesce_rules is None else coalesce_rules
+        self.reorder_window_seconds = reorder_window_seconds
+        # Prefixed to published messages so this worker can skip its own
+        self._origin = uuid.uuid4().hex.encode()
+
+        # Map meeting_id -> active connections by socket
+        self.active_connections: dict[str, dict[WebSocket, ClientConnection]] = {}
+        self._metrics: dict[str, MeetingMetrics] = {}
+        # Meetings this worker is subscribed to, with their replay buffers
+        self._logs: dict[str, MeetingLog] = {}
+        self._expiry: dict[str, asyncio.Task[None]] = {}
+        self._sequences: dict[str, int] = {}
+        self._pending: dict[str, CoalescingBuffer] = {}
+        self._flush_timers: dict[str, tuple[float, asyncio.TimerHandle]] = {}
+        self._gap_timers: dict[str, asyncio.TimerHandle] = {}
+        self._background: set[asyncio.Task[None]] = set()
+        self._watchdog: asyncio.Task[None] | None = None
+
+    async def connect(
+        self,
+        websocket: WebSocket,
+        meeting_id: str,
+        last_seq: int | None = None,
+        snapshot: Callable[[], BaseModel | dict[str, Any] | None] | None = None,
+    ) -> None:
+        """
+        Accept WebSocket connection and subscribe to meeting.
+
+        Args:
+            websocket: Client connection
+            meeting_id: Meeting ID
+            last_seq: Last sequence number the client received before reconnecting
+            snapshot: Builds the meeting snapshot sent when missed events are gone
+        """
+        requested = getattr(websocket, "scope", {}).get("subprotocols", [])
+        binary = MSGPACK_SUBPROTOCOL in requested and msgpack_available()
+        await websocket.accept(subprotocol=MSGPACK_SUBPROTOCOL if binary else None)
+
+        expiry = self._expiry.pop(meeting_id, None)
+        if expiry is not None:
+            expiry.cancel()
+        if meeting_id not in self._logs:
+            self._logs[meeting_id] = MeetingLog(self.replay_buffer_size)
+            await self.bus.subscribe(TOPIC_PREFIX + meeting_id, self._on_bus_message)
+
+        # No awaits from here on, so no live event can overtake the replay
+        connection = ClientConnection(websocket, meeting_id, self, binary=binary)
+        if last_seq is not None:
+            self._resume(connection, last_seq, snapshot)
+        self.active_connections.setdefault(meeting_id, {})[websocket] = connection
+        if self._watchdog is None or self._watchdog.done():
+            self._watchdog = asyncio.create_task(self._watch_sends())
         logger.info(f"WebSocket connected for meeting {meeting_id}")
 
     def disconnect(self, websocket: WebSocket, meeting_id: str) -> None:
         """Remove WebSocket connection."""
-        if meeting_id in self.active_connections:
-            if websocket in self.active_connections[meeting_id]:
-                self.active_connections[meeting_id].remove(websocket)
-            if not self.active_connections[meeting_id]:
+        connections = self.active_connections.get(meeting_id)
+        if connections is not None:
+            connection = connections.pop(websocket, None)
+            if connection is not None and connection.writer is not asyncio.current_task():
+                connection.writer.cancel()
+            if not connections:
                 del self.active_connections[meeting_id]
+                self._metrics.pop(meeting_id, None)
+                if meeting_id in self._logs and meeting_id not in self._expiry:
+                    self._expiry[meeting_id] = asyncio.create_task(self._expire(meeting_id))
         logger.info(f"WebSocket disconnected for meeting {meeting_id}")
 
+    def evict(self, connection: ClientConnection, reason: str) -> None:
+        """Disconnect a slow consumer and close its socket in the background."""
+        self.meeting_metrics(connection.meeting_id).evicted += 1
+        logger.warning(
+            f"Evicting slow WebSocket client from meeting {connection.meeting_id}: {reason}"
+        )
+        self.disconnect(connection.websocket, connection.meeting_id)
+        self._run_in_background(self._close(connection.websocket))
+
     async def broadcast(self, meeting_id: str, message: dict[str, Any]) -> None:
-        """Broadcast message to all clients subscribed to a meeting."""
-        if meeting_id in self.active_connections:
-            message_json = json.dumps(message, default=str)
-            disconnected = []
-            for connection in self.active_connections[meeting_id]:
-                try:
-                    await connection.send_text(message_json)
-                except Exception as e:
-                    logger.error(f"Error sending message to WebSocket: {e}")
-                    disconnected.append(connection)
-
-            # Clean up disconnected clients
-            for connection in disconnected:
-                self.disconnect(connection, meeting_id)
+        """Queue message for this worker's clients and publish it to the other workers."""
+        await self.flush(meeting_id)
+        seq = await self._reserve_seqs(meeting_id, 1)
+        encoded = EncodedEvent({**message, "seq": seq})
+        await self._publish(meeting_id, SequencedFrame(encoded, [(seq, encoded)]))
+
+    async def flush(self, meeting_id: str, until: float | None = None) -> None:
+        """
+        Send a meeting's pending coalesced events.
+
+        Args:
+            meeting_id: Meeting ID
+            until: Only send events due by this event loop time (None = all)
+        """
+        buffer = self._pending.get(meeting_id)
+        if buffer is None or not buffer.entries:
+            return
+        pending = buffer.pop_due(until)
+        self._schedule_flush(meeting_id, buffer)
+        if not pending:
+            return
+
+        first = await self._reserve_seqs(meeting_id, len(pending))
+        messages = [
+            {"type": event.event_type, "data": event.data, "timestamp": event.timestamp, "seq": seq}
+            for seq, event in enumerate(pending, first)
+        ]
+        if len(messages) == 1:
+            encoded = EncodedEvent(messages[0])
+            events = [(first, encoded)]
+        else:
+            encoded = EncodedEvent({
+                "type": WebSocketEventType.BATCH,
+                "data": {"events": messages},
+                "timestamp": datetime.utcnow(),
+                "seq": first + len(messages) - 1,
+            })
+            events = [(seq, EncodedEvent(message)) for seq, message in enumerate(messages, first)]
+        await self._publish(meeting_id, SequencedFrame(encoded, events))
+
+    async def send_personal(
+        self, websocket: WebSocket, meeting_id: str, message: dict[str, Any]
+    ) -> None:
+        """Queue a message for one client (e.g. a heartbeat reply)."""
+        connection = self.active_connections.get(meeting_id, {}).get(websocket)
+        if connection is not None:
+            connection.enqueue(OutgoingMessage(EncodedEvent(message), None, False))
 
     async def send_event(
         self, meeting_id: str, event_type: WebSocketEventType, data: BaseModel | dict[str, Any]
@@ -66,10 +455,216 @@ class WebSocketManager:
         # Convert Pydantic model to dict if needed
         data_dict = data.model_dump() if isinstance(data, BaseModel) else data
 
-        event = WebSocketEvent(type=event_type, data=data_dict)
-        await self.broadcast(meeting_id, event.model_dump())
+        rule = self.coalesce_rules.get(event_type.value)
+        if rule is not None and (key := rule.key(data_dict)) is not None:
+            buffer = self._pending.get(meeting_id)
+            if buffer is None:
+                buffer = self._pending[meeting_id] = CoalescingBuffer()
+            buffer.add(event_type.value, key, data_dict, rule, asyncio.get_running_loop().time())
+            self._schedule_flush(meeting_id, buffer)
+            return
+
+        # Same shape as WebSocketEvent, without validating and dumping it again
+        await self.broadcast(
+            meeting_id, {"type": event_type, "data": data_dict, "timestamp": datetime.utcnow()}
+        )
         logger.debug(f"Sent {event_type} event to meeting {meeting_id}")
 
+    def meeting_metrics(self, meeting_id: str) -> MeetingMetrics:
+        """Get or create the delivery metrics of a meeting."""
+        metrics = self._metrics.get(meeting_id)
+        if metrics is None:
+            metrics = self._metrics[meeting_id] = MeetingMetrics()
+        return metrics
+
+    def metrics(self) -> dict[str, dict[str, Any]]:
+        """Return queue depth, delivery counters and send latency per connected meeting."""
+        report = {}
+        for meeting_id, metrics in self._metrics.items():
+            depths = [len(c.queue) for c in self.active_connections.get(meeting_id, {}).values()]
+            report[meeting_id] = {
+                "clients": len(depths),
+                "queue_depth": sum(depths),
+                "max_queue_depth": max(depths, default=0),
+                "sent": metrics.sent,
+                "dropped": metrics.dropped,
+                "coalesced": metrics.coalesced,
+                "evicted": metrics.evicted,
+                "replayed": metrics.replayed,
+                "snapshots": metrics.snapshots,
+                "merged": self._pending[meeting_id].merged if meeting_id in self._pending else 0,
+                "send_latency_ms": metrics.latency_ms(),
+            }
+        return report
+
+    def forget_meeting(self, meeting_id: str) -> None:
+        """Drop the sequence counter and coalescing state of an ended meeting."""
+        self._sequences.pop(meeting_id, None)
+        self._pending.pop(meeting_id, None)
+        timer = self._flush_timers.pop(meeting_id, None)
+        if timer is not None:
+            timer[1].cancel()
+
+    async def aclose(self) -> None:
+        """Close the event bus (called on application shutdown)."""
+        for task in self._expiry.values():
+            task.cancel()
+        for _, handle in self._flush_timers.values():
+            handle.cancel()
+        for handle in self._gap_timers.values():
+            handle.cancel()
+        await self.bus.close()
+
+    def _resume(
+        self,
+        connection: ClientConnection,
+        last_seq: int,
+        snapshot: Callable[[], BaseModel | dict[str, Any] | None] | None,
+    ) -> None:
+        metrics = self.meeting_metrics(connection.meeting_id)
+        missed = self._logs[connection.meeting_id].since(last_seq)
+        if missed is not None and len(missed) < self.max_queue_size:
+            for event in missed:
+                connection.enqueue(OutgoingMessage(event, None, False))
+            metrics.replayed += len(missed)
+            return
+
+        data = snapshot() if snapshot is not None else None
+        if data is None:
+            return
+        metrics.snapshots += 1
+        connection.enqueue(OutgoingMessage(EncodedEvent({
+            "type": WebSocketEventType.SNAPSHOT,
+            "data": data.model_dump() if isinstance(data, BaseModel) else data,
+            "timestamp": datetime.utcnow(),
+            # Resume point: the snapshot covers everything up to here
+            "seq": self._sequences.get(connection.meeting_id, 0),
+        }), None, False))
+
+    async def _reserve_seqs(self, meeting_id: str, count: int) -> int:
+        """Reserve ``count`` consecutive sequence numbers; returns the first."""
+        try:
+            last = await self.bus.next_sequence(TOPIC_PREFIX + meeting_id, count)
+        except ConnectionError as e:
+            # No other worker can be reached either, so local numbers are enough
+            logger.warning(f"Sequence numbers for meeting {meeting_id} continue locally: {e}")
+            previous = self._sequences.get(meeting_id)
+            last = (int(time.time() * 1000) if previous is None else previous) + count
+        self._sequences[meeting_id] = max(self._sequences.get(meeting_id, 0), last)
+        return last - count + 1
+
+    async def _publish(self, meeting_id: str, frame: SequencedFrame) -> None:
+        self._accept(meeting_id, frame)
+        await self.bus.publish(TOPIC_PREFIX + meeting_id, self._origin + b" " + frame.encoded.json)
+
+    def _accept(self, meeting_id: str, frame: SequencedFrame) -> None:
+        """Buffer and deliver a frame from this or another worker in sequence order."""
+        self._sequences[meeting_id] = max(self._sequences.get(meeting_id, 0), frame.last)
+        log = self._logs.get(meeting_id)
+        if log is None:
+            # Not subscribed: this worker has no clients for the meeting
+            return
+        for ready in log.offer(frame):
+            self._deliver(meeting_id, ready.encoded)
+
+        timer = self._gap_timers.get(meeting_id)
+        if log.held and timer is None:
+            self._gap_timers[meeting_id] = asyncio.get_running_loop().call_later(
+                self.reorder_window_seconds, self._release_held, meeting_id
+            )
+        elif not log.held and timer is not None:
+            timer.cancel()
+            del self._gap_timers[meeting_id]
+
+    def _release_held(self, meeting_id: str) -> None:
+        self._gap_timers.pop(meeting_id, None)
+        log = self._logs.get(meeting_id)
+        if log is None or not log.held:
+            return
+        logger.debug(f"Gave up on missing events of meeting {meeting_id} before {min(log.held)}")
+        for frame in log.release_held():
+            self._deliver(meeting_id, frame.encoded)
+
+    def _schedule_flush(self, meeting_id: str, buffer: CoalescingBuffer) -> None:
+        due = buffer.next_due()
+        timer = self._flush_timers.get(meeting_id)
+        if timer is not None:
+            if timer[0] == due:
+                return
+            timer[1].cancel()
+            del self._flush_timers[meeting_id]
+        if due is not None:
+            handle = asyncio.get_running_loop().call_at(due, self._flush_due, meeting_id, due)
+            self._flush_timers[meeting_id] = (due, handle)
+
+    def _flush_due(self, meeting_id: str, due: float) -> None:
+        self._flush_timers.pop(meeting_id, None)
+        self._run_in_background(self.flush(meeting_id, until=due))
+
+    async def _expire(self, meeting_id: str) -> None:
+        await asyncio.sleep(self.resume_grace_seconds)
+        if meeting_id in self.active_connections:
+            return
+        self._expiry.pop(meeting_id, None)
+        self._logs.pop(meeting_id, None)
+        timer = self._gap_timers.pop(meeting_id, None)
+        if timer is not None:
+            timer.cancel()
+        await self.bus.unsubscribe(TOPIC_PREFIX + meeting_id, self._on_bus_message)
+
+    def _deliver(self, meeting_id: str, encoded: EncodedEvent) -> None:
+        connections = self.active_connections.get(meeting_id)
+        if not connections:
+            return
+
+        event_type = encoded.payload.get("type")
+        if isinstance(event_type, Enum):
+            event_type = event_type.value
+        data = encoded.payload.get("data")
+        coalesce_key = event_type if event_type in COALESCED_EVENTS else None
+        droppable = isinstance(data, dict) and "delta" in data
+
+        for connection in list(connections.values()):
+            connection.enqueue(OutgoingMessage(encoded, coalesce_key, droppable))
+
+    async def _on_bus_message(self, topic: str, message: bytes) -> None:
+        origin, _, body = message.partition(b" ")
+        if origin == self._origin:
+            return
+        meeting_id = topic.removeprefix(TOPIC_PREFIX)
+        encoded = EncodedEvent.from_json(body)
+        payload = encoded.payload
+        if payload.get("type") == WebSocketEventType.BATCH.value:
+            messages = payload["data"]["events"]
+            events = [(message["seq"], EncodedEvent(message)) for message in messages]
+        else:
+            events = [(payload["seq"], encoded)]
+        self._accept(meeting_id, SequencedFrame(encoded, events))
+
+    def _run_in_background(self, coro: Any) -> None:
+        task = asyncio.create_task(coro)
+        self._background.add(task)
+        task.add_done_callback(self._background.discard)
+
+    async def _watch_sends(self) -> None:
+        # One sweep for all clients instead of a timeout around every send
+        interval = min(1.0, self.send_timeout_seconds / 4)
+        while self.active_connections:
+            await asyncio.sleep(interval)
+            now = time.perf_counter()
+            for connections in list(self.active_connections.values()):
+                for connection in list(connections.values()):
+                    started = connection.sending_since
+                    if started is not None and now - started >= self.send_timeout_seconds:
+                        self.evict(connection, "send timed out")
+
+    async def _close(self, websocket: WebSocket) -> None:
+        with contextlib.suppress(Exception):
+            await asyncio.wait_for(
+                websocket.close(code=SLOW_CONSUMER_CLOSE_CODE, reason="Client too slow"),
+                self.send_timeout_seconds,
+            )
+
 
 # Global WebSocket manager instance
-websocket_manager = WebSocketManager()
+websocket_manager = WebSocketManager(bus=event_bus_from_env())
@@ -1,19 +1,44 @@
 """Main FastAPI application for Meeting Facilitator."""
 
+from collections.abc import AsyncIterator
+from contextlib import asynccontextmanager
+from typing import Any
+
 from fastapi import FastAPI, WebSocket, WebSocketDisconnect, Depends
 from fastapi.middleware.cors import CORSMiddleware
 
-from app.api.v1 import audio, auth, meetings, protocols
+from app.api.v1 import audio, auth, meetings, protocols, templates
 from app.core.websocket import websocket_manager
-from app.db.session import Base, engine
+from app.db.session import Base, SessionLocal, engine
+from app.schemas.websocket_events import MeetingSnapshotEvent
+from app.services.claude_service import close_async_claude_service
+from app.services.intervention_engine import close_intervention_engine
+from app.services.meeting_snapshot import MeetingSnapshotService
+from app.services.meeting_timer import close_meeting_timer, get_meeting_timer
 
 # Create database tables
 Base.metadata.create_all(bind=engine)
 
+
+@asynccontextmanager
+async def lifespan(app: FastAPI) -> AsyncIterator[None]:
+    """Start and stop process-wide background resources."""
+    meeting_timer = get_meeting_timer()
+    # Every worker tracks every meeting; due deadlines are claimed on the event bus
+    meeting_timer.load_active_meetings(SessionLocal)
+    meeting_timer.start()
+    yield
+    await close_meeting_timer()
+    await close_intervention_engine()
+    await close_async_claude_service()
+    await websocket_manager.aclose()
+
+
 app = FastAPI(
     title="Meeting Facilitator API",
     description="AI-powered meeting facilitation using IDOARRT and GROW model",
     version="0.1.0",
+    lifespan=lifespan,
 )
 
 # CORS middleware
@@ -28,6 +53,7 @@ app.add_middleware(
 # Include routers
 app.include_router(auth.router, prefix="/api/v1", tags=["authentication"])
 app.include_router(meetings.router, prefix="/api/v1", tags=["meetings"])
+app.include_router(templates.router, prefix="/api/v1", tags=["templates"])
 app.include_router(audio.router, prefix="/api/v1", tags=["audio"])
 app.include_router(protocols.router, prefix="/api/v1", tags=["protocols"])
 
@@ -38,9 +64,22 @@ async def root() -> dict[str, str]:
     return {"status": "ok", "service": "Meeting Facilitator API"}
 
 
+@app.get("/metrics/websocket")
+async def websocket_metrics() -> dict[str, dict[str, Any]]:
+    """WebSocket queue depth, drops, evictions and send latency per meeting."""
+    return websocket_manager.metrics()
+
+
 @app.websocket("/ws/meetings/{meeting_id}")
-async def websocket_endpoint(websocket: WebSocket, meeting_id: str, token: str = None) -> None:
-    """WebSocket endpoint for real-time meeting updates with authentication."""
+async def websocket_endpoint(
+    websocket: WebSocket, meeting_id: str, token: str = None, last_seq: int | None = None
+) -> None:
+    """
+    WebSocket endpoint for real-time meeting updates with authentication.
+
+    Reconnecting clients pass the ``seq`` of the last event they received
+    as ``last_seq`` to get the events they missed, or a snapshot.
+    """
     # Verify JWT token if provided
     if token:
         try:
@@ -55,7 +94,14 @@ async def websocket_endpoint(websocket: WebSocket, meeting_id: str, token: str =
         # TODO: Remove this in production
         pass
     
-    await websocket_manager.connect(websocket, meeting_id)
+    def snapshot() -> MeetingSnapshotEvent | None:
+        db = SessionLocal()
+        try:
+            return MeetingSnapshotService.build(db, meeting_id)
+        finally:
+            db.close()
+
+    await websocket_manager.connect(websocket, meeting_id, last_seq=last_seq, snapshot=snapshot)
     try:
         while True:
             data = await websocket.receive_json()
@@ -65,6 +111,8 @@ async def websocket_endpoint(websocket: WebSocket, meeting_id: str, token: str =
                 pass
             elif data.get("type") == "ping":
                 # Heartbeat
-                await websocket.send_json({"type": "pong", "timestamp": data.get("timestamp")})
+                await websocket_manager.send_personal(
+                    websocket, meeting_id, {"type": "pong", "timestamp": data.get("timestamp")}
+                )
     except WebSocketDisconnect:
         websocket_manager.disconnect(websocket, meeting_id)
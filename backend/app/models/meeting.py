@@ -22,6 +22,46 @@ from app.core.encryption import db_encryption
 from app.db.session import Base
 
 
+class DecryptedFieldCache:
+    """
+    Mixin that memoizes decrypted values of encrypted columns per instance.
+
+    ORM instances live in the identity map of the request's session, so the
+    cache is request-scoped: repeated attribute access within one request
+    decrypts once. Entries are keyed on the ciphertext, so they can never
+    go stale when the column is reloaded or reassigned.
+    """
+
+    def _get_decrypted(self, column: str) -> str:
+        """Return decrypted value of ``column``, decrypting at most once."""
+        ciphertext = getattr(self, column)
+        if not ciphertext:
+            return ""
+        cache = self.__dict__.setdefault("_decrypted_cache", {})
+        cached = cache.get(column)
+        if cached is not None and cached[0] == ciphertext:
+            return cached[1]
+        plaintext = db_encryption.decrypt_field(ciphertext)
+        cache[column] = (ciphertext, plaintext)
+        return plaintext
+
+    def _set_encrypted(self, column: str, value: str | None) -> None:
+        """Encrypt and store ``value`` in ``column``, caching the plaintext."""
+        cache = self.__dict__.setdefault("_decrypted_cache", {})
+        if value is not None:
+            ciphertext = db_encryption.encrypt_field(value)
+            cache[column] = (ciphertext, value)
+        else:
+            ciphertext = None
+            cache.pop(column, None)
+        setattr(self, column, ciphertext)
+
+    def _prime_decrypted(self, column: str, plaintext: str) -> None:
+        """Seed the cache with a value decrypted elsewhere (bulk decryption)."""
+        cache = self.__dict__.setdefault("_decrypted_cache", {})
+        cache[column] = (getattr(self, column), plaintext)
+
+
 class Meeting(Base):
     """Meeting model with IDOARRT framework."""
 
@@ -57,7 +97,25 @@ class Meeting(Base):
     )
 
 
-class AudioChunk(Base):
+class MeetingTemplate(Base):
+    """Pre-parsed IDOARRT document that meetings can be created from without parsing."""
+
+    __tablename__ = "meeting_templates"
+
+    id = Column(String, primary_key=True, default=lambda: str(uuid.uuid4()))
+    created_at = Column(DateTime, default=datetime.utcnow, nullable=False)
+    name = Column(String, nullable=False)
+
+    # Parsed IDOARRT data, same shape as on Meeting
+    intent = Column(Text, nullable=False)
+    desired_outcomes = Column(JSON, nullable=False)
+    agenda = Column(JSON, nullable=False)
+    roles = Column(JSON, nullable=False)
+    rules = Column(JSON, nullable=False)
+    total_duration_minutes = Column(Integer, nullable=False)
+
+
+class AudioChunk(DecryptedFieldCache, Base):
     """Audio chunk with transcription."""
 
     __tablename__ = "audio_chunks"
@@ -68,27 +126,63 @@ class AudioChunk(Base):
     created_at = Column(DateTime, default=datetime.utcnow, nullable=False)
 
     # Audio data (encrypted)
-    audio_blob = Column(LargeBinary, nullable=False)  # Encrypted WebM/Opus format
+    _audio_blob = Column("audio_blob", LargeBinary, nullable=False)  # Encrypted WebM/Opus format
     duration_seconds = Column(Float, nullable=False)
 
     # Transcription (encrypted)
-    _transcription = Column("transcription", Text, nullable=True)  # Encrypted text
+    _transcription = Column("transcription", LargeBinary, nullable=True)  # Encrypted text
     transcribed_at = Column(DateTime, nullable=True)
     
     @property
     def transcription(self) -> str:
         """Get decrypted transcription."""
-        if self._transcription:
-            return db_encryption.decrypt_text(self._transcription)
-        return ""
+        return self._get_decrypted("_transcription")
     
     @transcription.setter
     def transcription(self, value: str):
         """Set encrypted transcription."""
-        if value:
-            self._transcription = db_encryption.encrypt_text(value)
-        else:
-            self._transcription = None
+        self._set_encrypted("_transcription", value or None)
+
+    @staticmethod
+    def prefetch_transcriptions(
+        chunks: "list[AudioChunk]", max_workers: int | None = None
+    ) -> list[str]:
+        """
+        Decrypt the transcriptions of many chunks in one pass.
+
+        Args:
+            chunks: Chunks to decrypt (typically all chunks of a meeting)
+            max_workers: Decrypt on a thread pool of this size (None = inline)
+
+        Returns:
+            Decrypted transcriptions in the same order as ``chunks``
+        """
+        pending = [chunk for chunk in chunks if chunk._transcription]
+        plaintexts = db_encryption.decrypt_fields(
+            [chunk._transcription for chunk in pending], max_workers=max_workers
+        )
+        for chunk, plaintext in zip(pending, plaintexts, strict=True):
+            chunk._prime_decrypted("_transcription", plaintext)
+        return [chunk.transcription for chunk in chunks]
+
+    @property
+    def audio_blob(self) -> bytes:
+        """Get decrypted audio data."""
+        return db_encryption.decrypt_blob(self._audio_blob)
+
+    @audio_blob.setter
+    def audio_blob(self, value: bytes):
+        """Set encrypted audio data."""
+        self._audio_blob = db_encryption.encrypt_blob(value)
+
+    @property
+    def audio_size(self) -> int:
+        """Get decrypted audio size without decrypting the blob."""
+        return db_encryption.blob_length(self._audio_blob)
+
+    def audio_range(self, start: int, end: int) -> bytes:
+        """Get decrypted audio bytes ``[start, end)``, decrypting only the covering frames."""
+        return db_encryption.decrypt_blob_range(self._audio_blob, start, end)
 
     # Relationships
     meeting = relationship("Meeting", back_populates="audio_chunks")
@@ -128,7 +222,7 @@ class Intervention(Base):
     )
 
 
-class Protocol(Base):
+class Protocol(DecryptedFieldCache, Base):
     """Meeting protocol and summary."""
 
     __tablename__ = "protocols"
@@ -138,34 +232,34 @@ class Protocol(Base):
     created_at = Column(DateTime, default=datetime.utcnow, nullable=False)
 
     # Protocol content (encrypted)
-    _full_transcription = Column("full_transcription", Text, nullable=False)  # Encrypted
+    _full_transcription = Column("full_transcription", LargeBinary, nullable=False)  # Encrypted
     agenda_summary = Column(JSON, nullable=True)  # Summary per agenda item
     goal_assessment = Column(JSON, nullable=True)  # For each desired outcome
     key_decisions = Column(JSON, nullable=True)
     action_items = Column(JSON, nullable=True)
 
     # Export (encrypted)
-    _markdown_content = Column("markdown_content", Text, nullable=False)  # Encrypted
+    _markdown_content = Column("markdown_content", LargeBinary, nullable=False)  # Encrypted
     
     @property
     def full_transcription(self) -> str:
         """Get decrypted full transcription."""
-        return db_encryption.decrypt_text(self._full_transcription)
+        return self._get_decrypted("_full_transcription")
     
     @full_transcription.setter
     def full_transcription(self, value: str):
         """Set encrypted full transcription."""
-        self._full_transcription = db_encryption.encrypt_text(value)
+        self._set_encrypted("_full_transcription", value)
     
     @property
     def markdown_content(self) -> str:
         """Get decrypted markdown content."""
-        return db_encryption.decrypt_text(self._markdown_content)
+        return self._get_decrypted("_markdown_content")
     
     @markdown_content.setter
     def markdown_content(self, value: str):
         """Set encrypted markdown content."""
-        self._markdown_content = db_encryption.encrypt_text(value)
+        self._set_encrypted("_markdown_content", value)
 
     # Relationships
     meeting = relationship("Meeting", back_populates="protocol")
@@ -3,7 +3,7 @@
 from datetime import datetime
 from typing import Any
 
-from pydantic import BaseModel
+from pydantic import BaseModel, Field
 
 
 class AgendaItem(BaseModel):
@@ -27,6 +27,38 @@ class MeetingCreate(BaseModel):
     idoarrt_markdown: str
 
 
+class MeetingTemplateCreate(BaseModel):
+    """Store an IDOARRT document as a reusable template."""
+    name: str = Field(..., min_length=1, max_length=200)
+    idoarrt_markdown: str = Field(..., min_length=50, max_length=10000)
+
+
+class MeetingTemplateResponse(IDOARRTData):
+    """Stored meeting template."""
+    id: str
+    created_at: datetime
+    name: str
+
+    class Config:
+        from_attributes = True
+
+
+class MeetingTemplateOverrides(BaseModel):
+    """Fields replacing the template's; roles are merged into the template's roles."""
+    intent: str | None = None
+    desired_outcomes: list[str] | None = None
+    agenda: list[AgendaItem] | None = None
+    roles: dict[str, str] | None = None
+    rules: list[str] | None = None
+    total_duration_minutes: int | None = None
+
+
+class MeetingFromTemplate(BaseModel):
+    """Create meeting from a stored template."""
+    template_id: str
+    overrides: MeetingTemplateOverrides = Field(default_factory=MeetingTemplateOverrides)
+
+
 class MeetingResponse(BaseModel):
     """Meeting response."""
     id: str
@@ -0,0 +1,65 @@
+"""Structured meeting memory and protocol output from Claude."""
+
+from typing import Literal
+
+from pydantic import BaseModel, Field
+
+GoalStatus = Literal["achieved", "partial", "not_achieved"]
+
+
+class ActionItem(BaseModel):
+    """Task someone took on or was given in the meeting."""
+
+    task: str
+    owner: str = Field("", description="Ansvarig, tom sträng om ingen nämns")
+
+
+class MemoryUpdate(BaseModel):
+    """Rolling summary update for one agenda item, used as the tool input schema for Claude."""
+
+    summary: str = Field(..., description="Omskriven sammanfattning av agendapunkten")
+    speakers: list[str] = Field(default_factory=list)
+    decisions: list[str] = Field(default_factory=list)
+    action_items: list[ActionItem] = Field(default_factory=list)
+
+
+class OutcomeAssessment(BaseModel):
+    """Assessment of one desired outcome."""
+
+    status: GoalStatus
+    comment: str = Field("", description="Motivering på en mening")
+
+
+class NumberedOutcomeAssessment(OutcomeAssessment):
+    """Assessment of a desired outcome, by its number in the prompt."""
+
+    outcome: int = Field(..., ge=1)
+
+
+class GoalAssessment(BaseModel):
+    """Final goal assessment of a meeting."""
+
+    assessments: list[NumberedOutcomeAssessment] = Field(default_factory=list)
+
+
+class AgendaItemNote(BaseModel):
+    """What one part of the transcript says about an agenda item."""
+
+    item: int = Field(..., ge=1)
+    summary: str
+
+
+class OutcomeNote(BaseModel):
+    """What one part of the transcript says about a desired outcome."""
+
+    outcome: int = Field(..., ge=1)
+    evidence: str
+
+
+class TranscriptNotes(BaseModel):
+    """Notes on one group of chunks (protocol map step)."""
+
+    agenda_items: list[AgendaItemNote] = Field(default_factory=list)
+    outcomes: list[OutcomeNote] = Field(default_factory=list)
+    decisions: list[str] = Field(default_factory=list)
+    action_items: list[ActionItem] = Field(default_factory=list)
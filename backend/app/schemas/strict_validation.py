@@ -1,8 +1,11 @@
 """Enhanced Pydantic schemas with strict validation."""
 
-from typing import Any
-from pydantic import BaseModel, Field, validator
-import re
+from pydantic import BaseModel, Field, PrivateAttr, model_validator
+
+from app.services.idoarrt_service import IDOARRTDocument, get_idoarrt_service
+
+# Problems rejected at request validation; the rest are reported by the endpoint
+STRUCTURAL_DIAGNOSTICS = {"empty", "missing_section", "invalid_time", "empty_agenda"}
 
 
 class StrictMeetingCreate(BaseModel):
@@ -14,29 +17,25 @@ class StrictMeetingCreate(BaseModel):
         max_length=10000,
         description="IDOARRT markdown content"
     )
-    
-    @validator('idoarrt_markdown')
-    def validate_idoarrt_format(cls, v):
-        """Validate IDOARRT markdown has required sections."""
-        required_sections = ['Intent', 'Desired Outcomes', 'Agenda', 'Roles', 'Rules', 'Time']
-        
-        # Check for required sections using # Header format
-        for section in required_sections:
-            pattern = rf'^#\s+{re.escape(section)}\s*$'
-            if not re.search(pattern, v, re.MULTILINE | re.IGNORECASE):
-                raise ValueError(f'Missing required section: {section}')
-        
-        # Validate Time section format
-        time_pattern = r'#\s+Time\s*.*Total:\s*(\d+)\s*(?:minutes?|min)'
-        if not re.search(time_pattern, v, re.MULTILINE | re.IGNORECASE):
-            raise ValueError('Time section must contain "Total: XX minutes"')
-        
-        # Validate Agenda has numbered items with time
-        agenda_pattern = r'#\s+Agenda\s*.*(\d+\.\s+.+\(\s*\d+\s*min\))'
-        if not re.search(agenda_pattern, v, re.MULTILINE | re.IGNORECASE):
-            raise ValueError('Agenda must have numbered items with time allocation')
-        
-        return v
+
+    _document: IDOARRTDocument | None = PrivateAttr(default=None)
+
+    @model_validator(mode="after")
+    def validate_idoarrt_format(self) -> "StrictMeetingCreate":
+        """Parse the markdown once and reject documents missing required structure."""
+        document = get_idoarrt_service().parse_document(self.idoarrt_markdown)
+        structural = [d for d in document.diagnostics if d.code in STRUCTURAL_DIAGNOSTICS]
+        if structural:
+            raise ValueError("; ".join(str(diagnostic) for diagnostic in structural))
+        self._document = document
+        return self
+
+    @property
+    def document(self) -> IDOARRTDocument:
+        """Parsed IDOARRT document, reused by the endpoint instead of parsing again."""
+        if self._document is None:
+            self._document = get_idoarrt_service().parse_document(self.idoarrt_markdown)
+        return self._document
 
 
 class StrictAudioChunkUpload(BaseModel):
@@ -0,0 +1,33 @@
+"""Structured trigger analysis output from Claude."""
+
+from typing import Literal
+
+from pydantic import BaseModel, Field
+
+TriggerType = Literal["goal_deviation", "perspective_gap", "complexity_mistake"]
+
+
+class DetectedTrigger(BaseModel):
+    """Single trigger detected in a transcription chunk."""
+
+    type: TriggerType
+    confidence: float = Field(..., ge=0.0, le=1.0)
+    reason: str = Field(..., description="Kort förklaring varför denna trigger detekterades")
+
+
+class TriggerAnalysis(BaseModel):
+    """Trigger analysis result, used as the tool input schema for Claude."""
+
+    triggers: list[DetectedTrigger] = Field(default_factory=list)
+
+
+class FacilitationTrigger(DetectedTrigger):
+    """Detected trigger together with its GROW facilitation question."""
+
+    question: str = Field(..., description="En kraftfull, öppen GROW-fråga på svenska (max 20 ord)")
+
+
+class FacilitationAnalysis(BaseModel):
+    """Combined trigger detection and question generation result."""
+
+    triggers: list[FacilitationTrigger] = Field(default_factory=list)
@@ -14,6 +14,8 @@ class WebSocketEventType(str, Enum):
     TRANSCRIPTION_STARTED = "transcription_started"
     TRANSCRIPTION_COMPLETED = "transcription_completed"
     TRANSCRIPTION_FAILED = "transcription_failed"
+    TRANSCRIPTION_PARTIAL = "transcription_partial"
+    TRANSCRIPTION_PROGRESS = "transcription_progress"
 
     # Intervention events
     INTERVENTION_TRIGGERED = "intervention_triggered"
@@ -26,6 +28,13 @@ class WebSocketEventType(str, Enum):
 
     # Time warnings
     TIME_WARNING = "time_warning"
+    AGENDA_ITEM_STARTED = "agenda_item_started"
+
+    # Resume fallback when missed events are no longer buffered
+    SNAPSHOT = "snapshot"
+
+    # Several events flushed together in one frame
+    BATCH = "batch"
 
     # Error events
     ERROR = "error"
@@ -56,6 +65,20 @@ class TranscriptionFailedEvent(BaseModel):
     timestamp: datetime = Field(default_factory=datetime.utcnow)
 
 
+class TranscriptionPartialEvent(BaseModel):
+    """Event sent with the transcription so far while a chunk is being transcribed."""
+
+    chunk_number: int
+    text: str  # Full text so far, replacing earlier partials for the chunk
+
+
+class TranscriptionProgressEvent(BaseModel):
+    """Event sent as transcription of a chunk progresses."""
+
+    chunk_number: int
+    percent: int
+
+
 class InterventionType(str, Enum):
     """Types of interventions."""
 
@@ -71,6 +94,7 @@ class InterventionTriggeredEvent(BaseModel):
     intervention_type: InterventionType
     reason: str
     context: str | None = None
+    intervention_id: str | None = None
     timestamp: datetime = Field(default_factory=datetime.utcnow)
 
 
@@ -80,9 +104,20 @@ class InterventionQuestionEvent(BaseModel):
     intervention_type: InterventionType
     question: str
     context: str | None = None
+    intervention_id: str | None = None
+    stream_id: str | None = None  # Set when the question was streamed as deltas first
     timestamp: datetime = Field(default_factory=datetime.utcnow)
 
 
+class InterventionQuestionDeltaEvent(BaseModel):
+    """Event sent with a fragment of a facilitation question as it is generated."""
+
+    stream_id: str
+    intervention_type: InterventionType
+    index: int
+    delta: str
+
+
 class MeetingStartedEvent(BaseModel):
     """Event sent when meeting starts."""
 
@@ -115,6 +150,34 @@ class TimeWarningEvent(BaseModel):
     message: str
 
 
+class AgendaItemStartedEvent(BaseModel):
+    """Event sent when the planned time for an agenda item begins."""
+
+    index: int
+    topic: str
+    duration_minutes: int
+    previous_topic: str | None = None
+
+
+class MeetingSnapshotEvent(BaseModel):
+    """Compact meeting state sent instead of replaying events a client missed."""
+
+    meeting_id: str
+    status: str
+    started_at: datetime | None = None
+    total_duration_minutes: int
+    time_extensions_seconds: int
+    transcribed_chunks: int
+    last_chunk_number: int | None = None
+    interventions: list[dict[str, Any]] = Field(default_factory=list)  # Most recent last
+
+
+class BatchEvent(BaseModel):
+    """Several events, each with its own type, data, timestamp and seq, in one frame."""
+
+    events: list[dict[str, Any]]
+
+
 class ErrorEvent(BaseModel):
     """Event sent when an error occurs."""
 
@@ -129,3 +192,4 @@ class WebSocketEvent(BaseModel):
     type: WebSocketEventType
     data: dict[str, Any]
     timestamp: datetime = Field(default_factory=datetime.utcnow)
+    seq: int | None = None  # Increases per meeting; reconnect with last_seq to resume
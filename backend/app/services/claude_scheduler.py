@@ -0,0 +1,356 @@
+"""Rate-limited, prioritized and fair scheduling of Claude API requests."""
+
+import asyncio
+import contextlib
+import heapq
+import itertools
+import os
+import random
+import time
+from collections.abc import Awaitable, Callable
+from enum import IntEnum
+from typing import Any, TypeVar
+
+import anthropic
+
+T = TypeVar("T")
+
+# Anthropic's published defaults for a low usage tier; override per deployment
+DEFAULT_REQUESTS_PER_MINUTE = 50
+DEFAULT_TOKENS_PER_MINUTE = 40_000
+
+
+class RequestPriority(IntEnum):
+    """Dispatch order of queued requests (lower goes first)."""
+
+    LIVE = 0  # Interventions for a running meeting
+    BACKGROUND = 1  # Meeting memory and other work a live meeting waits on indirectly
+    BATCH = 2  # Protocol generation and other after-the-fact work
+
+
+# Seconds a request may wait (queueing and retries included) before it is useless
+DEFAULT_DEADLINES: dict[RequestPriority, float | None] = {
+    RequestPriority.LIVE: 30.0,
+    RequestPriority.BACKGROUND: 120.0,
+    RequestPriority.BATCH: None,
+}
+
+
+class DeadlineExceeded(Exception):
+    """Raised when a request cannot be sent before its deadline."""
+
+
+class TokenBucket:
+    """Continuous-refill token bucket sized for a per-minute budget."""
+
+    def __init__(self, per_minute: float, capacity: float | None = None) -> None:
+        """
+        Initialize a full bucket.
+
+        Args:
+            per_minute: Refill rate
+            capacity: Burst size (defaults to one minute of budget)
+        """
+        self.rate = per_minute / 60.0
+        self.capacity = capacity if capacity is not None else float(per_minute)
+        self.tokens = self.capacity
+        self.updated = time.monotonic()
+
+    def _refill(self, now: float) -> None:
+        if now > self.updated:
+            self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+            self.updated = now
+
+    def time_until(self, amount: float, now: float | None = None) -> float:
+        """Seconds until ``amount`` tokens are available (0 if available now)."""
+        now = time.monotonic() if now is None else now
+        self._refill(now)
+        missing = min(amount, self.capacity) - self.tokens
+        return max(0.0, missing / self.rate)
+
+    def take(self, amount: float, now: float | None = None) -> None:
+        """Remove ``amount`` tokens; the balance may go negative after ``refund``."""
+        self._refill(time.monotonic() if now is None else now)
+        self.tokens -= min(amount, self.capacity)
+
+    def refund(self, amount: float) -> None:
+        """Return tokens (negative ``amount`` charges extra)."""
+        self.tokens = min(self.capacity, self.tokens + amount)
+
+
+def is_retryable(error: BaseException) -> bool:
+    """Whether a failed Claude call is worth retrying (same rules as the SDK)."""
+    if isinstance(error, anthropic.APIConnectionError):  # Includes timeouts
+        return True
+    if isinstance(error, anthropic.APIStatusError):
+        return error.status_code in (408, 409, 429) or error.status_code >= 500
+    return False
+
+
+def retry_after_seconds(error: BaseException) -> float | None:
+    """Read the server's ``retry-after`` hint from an API error, if any."""
+    response = getattr(error, "response", None)
+    if response is None:
+        return None
+    try:
+        return float(response.headers.get("retry-after", ""))
+    except ValueError:
+        return None
+
+
+class _Job:
+    """One queued dispatch request."""
+
+    __slots__ = ("key", "meeting_id", "cost", "deadline", "future")
+
+    def __init__(
+        self,
+        key: tuple[int, float, float, int],
+        meeting_id: str | None,
+        cost: float,
+        deadline: float | None,
+        future: asyncio.Future[None],
+    ) -> None:
+        self.key = key
+        self.meeting_id = meeting_id
+        self.cost = cost
+        self.deadline = deadline
+        self.future = future
+
+    def __lt__(self, other: "_Job") -> bool:
+        return self.key < other.key
+
+
+class ClaudeRequestScheduler:
+    """
+    Single gate in front of every Claude request.
+
+    A request is queued and dispatched in order of:
+
+    1. priority class (``RequestPriority``)
+    2. start-time fair queuing across meetings within a class: each
+       meeting's requests get virtual start times spaced by their token
+       cost, so a meeting that floods the queue is interleaved with the
+       others instead of going first
+    3. deadline, then arrival
+
+    A request is dispatched only when the requests-per-minute and
+    tokens-per-minute buckets allow it. Token cost is estimated up front
+    and corrected from the response's usage afterwards. Requests whose
+    deadline passes while queued fail with ``DeadlineExceeded``.
+    Retryable errors are retried with full-jitter exponential backoff
+    (honouring ``retry-after``) unless the retry would land past the
+    deadline. A 429 also pauses all dispatching until the hinted time.
+    """
+
+    def __init__(
+        self,
+        requests_per_minute: float = DEFAULT_REQUESTS_PER_MINUTE,
+        tokens_per_minute: float = DEFAULT_TOKENS_PER_MINUTE,
+        max_attempts: int = 3,
+        backoff_base_seconds: float = 0.5,
+        backoff_max_seconds: float = 20.0,
+        request_burst: float | None = None,
+        token_burst: float | None = None,
+    ) -> None:
+        """
+        Initialize scheduler.
+
+        Args:
+            requests_per_minute: Request budget
+            tokens_per_minute: Input plus output token budget
+            max_attempts: Attempts per request, including the first
+            backoff_base_seconds: Backoff ceiling for the first retry
+            backoff_max_seconds: Upper bound of any backoff
+            request_burst: Max requests sent back to back (defaults to a minute's budget)
+            token_burst: Max tokens sent back to back (defaults to a minute's budget)
+        """
+        self.requests = TokenBucket(requests_per_minute, request_burst)
+        self.tokens = TokenBucket(tokens_per_minute, token_burst)
+        self.max_attempts = max_attempts
+        self.backoff_base_seconds = backoff_base_seconds
+        self.backoff_max_seconds = backoff_max_seconds
+
+        self._queue: list[_Job] = []
+        self._sequence = itertools.count()
+        self._virtual_time: dict[int, float] = {}
+        self._meeting_finish: dict[tuple[int, str | None], float] = {}
+        self._paused_until = 0.0
+        self._wakeup: asyncio.Event | None = None
+        self._dispatcher: asyncio.Task[None] | None = None
+
+        self.dispatched = 0
+        self.retries = 0
+        self.rate_limited = 0
+        self.expired = 0
+
+    @classmethod
+    def from_env(cls, max_attempts: int = 3) -> "ClaudeRequestScheduler":
+        """Create a scheduler sized by CLAUDE_REQUESTS_PER_MINUTE / CLAUDE_TOKENS_PER_MINUTE."""
+        return cls(
+            requests_per_minute=float(
+                os.getenv("CLAUDE_REQUESTS_PER_MINUTE", DEFAULT_REQUESTS_PER_MINUTE)
+            ),
+            tokens_per_minute=float(
+                os.getenv("CLAUDE_TOKENS_PER_MINUTE", DEFAULT_TOKENS_PER_MINUTE)
+            ),
+            max_attempts=max_attempts,
+        )
+
+    async def run(
+        self,
+        call: Callable[[], Awaitable[T]],
+        *,
+        meeting_id: str | None = None,
+        priority: RequestPriority = RequestPriority.LIVE,
+        estimated_tokens: int = 1000,
+        deadline_seconds: float | None = None,
+        should_retry: Callable[[BaseException], bool] = is_retryable,
+    ) -> T:
+        """
+        Run ``call`` once the scheduler dispatches it, retrying on transient errors.
+
+        Args:
+            call: Zero-argument factory for the API call (invoked once per attempt)
+            meeting_id: Meeting the request belongs to (None for shared work)
+            priority: Priority class
+            estimated_tokens: Expected input plus output tokens
+            deadline_seconds: Time budget from now (defaults per priority)
+            should_retry: Decides whether a failed attempt is retried
+
+        Returns:
+            Result of ``call``
+
+        Raises:
+            DeadlineExceeded: If the request could not be sent in time
+        """
+        if deadline_seconds is None:
+            deadline_seconds = DEFAULT_DEADLINES[priority]
+        deadline = None if deadline_seconds is None else time.monotonic() + deadline_seconds
+
+        attempt = 0
+        while True:
+            await self._acquire(meeting_id, priority, estimated_tokens, deadline)
+            try:
+                result = await call()
+            except Exception as e:
+                # The attempt was not billed as estimated; a 429 means the budget is spent
+                if not isinstance(e, anthropic.RateLimitError):
+                    self.tokens.refund(estimated_tokens)
+                attempt += 1
+                if attempt >= self.max_attempts or not should_retry(e):
+                    raise
+                delay = self._backoff(attempt, e)
+                if deadline is not None and time.monotonic() + delay >= deadline:
+                    raise
+                self.retries += 1
+                await asyncio.sleep(delay)
+                continue
+
+            usage = getattr(result, "usage", None)
+            if usage is not None:
+                actual = (getattr(usage, "input_tokens", 0) or 0) + (
+                    getattr(usage, "output_tokens", 0) or 0
+                )
+                self.tokens.refund(estimated_tokens - actual)
+            return result
+
+    def forget_meeting(self, meeting_id: str) -> None:
+        """Drop per-meeting fair-queuing state once a meeting has ended."""
+        for flow in [flow for flow in self._meeting_finish if flow[1] == meeting_id]:
+            del self._meeting_finish[flow]
+
+    def stats(self) -> dict[str, Any]:
+        """Return counters for logging or metrics endpoints."""
+        return {
+            "queued": len(self._queue),
+            "dispatched": self.dispatched,
+            "retries": self.retries,
+            "rate_limited": self.rate_limited,
+            "expired": self.expired,
+        }
+
+    def _backoff(self, attempt: int, error: BaseException) -> float:
+        """Full-jitter exponential backoff, at least the server's retry-after."""
+        ceiling = min(self.backoff_max_seconds, self.backoff_base_seconds * 2 ** (attempt - 1))
+        delay = random.uniform(0, ceiling)
+        hint = retry_after_seconds(error)
+        if isinstance(error, anthropic.RateLimitError):
+            self.rate_limited += 1
+            pause = hint if hint is not None else ceiling
+            self._paused_until = max(self._paused_until, time.monotonic() + pause)
+        if hint is not None:
+            delay = max(delay, min(hint, self.backoff_max_seconds))
+        return delay
+
+    async def _acquire(
+        self,
+        meeting_id: str | None,
+        priority: RequestPriority,
+        cost: float,
+        deadline: float | None,
+    ) -> None:
+        """Queue a dispatch request and wait until it is granted."""
+        loop = asyncio.get_running_loop()
+        if (
+            self._dispatcher is None
+            or self._dispatcher.done()
+            or self._dispatcher.get_loop() is not loop
+        ):
+            self._wakeup = asyncio.Event()
+            self._dispatcher = loop.create_task(self._dispatch_loop())
+
+        flow = (int(priority), meeting_id)
+        start = max(self._virtual_time.get(priority, 0.0), self._meeting_finish.get(flow, 0.0))
+        self._meeting_finish[flow] = start + cost
+        job = _Job(
+            key=(int(priority), start, deadline if deadline is not None else float("inf"),
+                 next(self._sequence)),
+            meeting_id=meeting_id,
+            cost=cost,
+            deadline=deadline,
+            future=loop.create_future(),
+        )
+        heapq.heappush(self._queue, job)
+        self._wakeup.set()  # type: ignore[union-attr]
+        await job.future
+
+    async def _dispatch_loop(self) -> None:
+        """Grant queued jobs in order as the rate limits allow."""
+        wakeup = self._wakeup
+        assert wakeup is not None
+        while True:
+            wakeup.clear()
+            while self._queue and self._queue[0].future.cancelled():
+                heapq.heappop(self._queue)
+            if not self._queue:
+                await wakeup.wait()
+                continue
+
+            job = self._queue[0]
+            now = time.monotonic()
+            if job.deadline is not None and now >= job.deadline:
+                heapq.heappop(self._queue)
+                self.expired += 1
+                job.future.set_exception(DeadlineExceeded("Request deadline passed while queued"))
+                continue
+
+            wait = max(
+                self._paused_until - now,
+                self.requests.time_until(1, now),
+                self.tokens.time_until(job.cost, now),
+            )
+            if wait > 0:
+                if job.deadline is not None:
+                    wait = min(wait, job.deadline - now)
+                # Wake early if a more urgent job arrives
+                with contextlib.suppress(TimeoutError):
+                    await asyncio.wait_for(wakeup.wait(), timeout=wait)
+                continue
+
+            heapq.heappop(self._queue)
+            self.requests.take(1, now)
+            self.tokens.take(job.cost, now)
+            self._virtual_time[job.key[0]] = job.key[1]
+            self.dispatched += 1
+            job.future.set_result(None)
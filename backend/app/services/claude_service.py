@@ -1,28 +1,715 @@
 """Claude AI service for meeting facilitation."""
 
+import asyncio
+import json
 import os
-from typing import Any
+import time
+from collections.abc import AsyncIterator, Awaitable, Callable
+from contextlib import asynccontextmanager
+from typing import Any, Literal, TypeVar
 
-from anthropic import Anthropic
+import httpx
+from anthropic import Anthropic, AsyncAnthropic, DefaultAsyncHttpxClient, Timeout
+from pydantic import BaseModel, ValidationError
 
+from app.schemas.meeting_notes import (
+    GoalAssessment,
+    MemoryUpdate,
+    OutcomeAssessment,
+    TranscriptNotes,
+)
+from app.schemas.trigger_analysis import FacilitationAnalysis, TriggerAnalysis
+from app.services.claude_scheduler import ClaudeRequestScheduler, RequestPriority, is_retryable
+from app.services.meeting_memory import SUMMARY_MAX_WORDS, MeetingMemory, estimate_tokens
+from app.services.response_cache import ResponseCache
 
-class ClaudeService:
+MODEL = "claude-sonnet-4-20250514"  # Latest Sonnet model
+
+ModelT = TypeVar("ModelT", bound=BaseModel)
+
+# Words per agenda item in each map-step summary of a transcript group
+PARTIAL_SUMMARY_MAX_WORDS = 80
+
+
+def _get_api_key() -> str:
+    """Read the Anthropic API key from the environment."""
+    api_key = os.getenv("ANTHROPIC_API_KEY")
+    if not api_key:
+        raise ValueError("ANTHROPIC_API_KEY environment variable is not set")
+    return api_key
+
+
+TRIGGER_ANALYSIS_INSTRUCTIONS = """Du är en AI-mötesassistent som analyserar mötestranskriptioner
+för att identifiera när facilitering behövs.
+
+Du får mötets kontext (intent och önskade utfall) och därefter, i varje meddelande,
+tidigare transkriptioner samt den nuvarande transkriptionen.
+
+ANALYS-UPPGIFT:
+Analysera den nuvarande transkriptionen och identifiera om någon av följande triggers förekommer:
+
+1. **goal_deviation**: Diskussionen avviker från mötets intent eller önskade utfall
+2. **perspective_gap**: Bara 1-2 personer pratar, andra perspektiv saknas
+3. **complexity_mistake**: Gruppen behandlar enkla frågor som komplexa eller vice versa
+
+SVARSFORMAT:
+Rapportera resultatet med verktyget report_triggers. Ange för varje trigger
+typ, confidence (0.0-1.0) och en kort förklaring.
+
+Om inga triggers detekteras, rapportera en tom lista."""
+
+COMBINED_RESPONSE_INSTRUCTIONS = """FRÅGOR (GROW-MODELLEN):
+För varje trigger, formulera också EN kraftfull, öppen fråga (på svenska) som
+facilitatorn kan ställa till gruppen:
+- **G**oal: Var vill vi komma?
+- **R**eality: Var är vi nu?
+- **O**ptions: Vilka alternativ har vi?
+- **W**ill: Vad gör vi härnäst?
+
+Frågan ska hjälpa gruppen att återkoppla till mötets intent, öppna upp för nya
+perspektiv och vara kort och tydlig (max 20 ord).
+
+SVARSFORMAT:
+Rapportera resultatet med verktyget report_interventions: typ, confidence
+(0.0-1.0), en kort förklaring och frågan för varje trigger.
+
+Om inga triggers detekteras, rapportera en tom lista."""
+
+TRIGGER_TOOL_NAME = "report_triggers"
+
+TRIGGER_TOOL = {
+    "name": TRIGGER_TOOL_NAME,
+    "description": "Rapportera vilka faciliteringstriggers som detekterades i transkriptionen.",
+    "input_schema": TriggerAnalysis.model_json_schema(),
+}
+
+COMBINED_TOOL_NAME = "report_interventions"
+
+COMBINED_TOOL = {
+    "name": COMBINED_TOOL_NAME,
+    "description": "Rapportera detekterade triggers tillsammans med en GROW-fråga för varje.",
+    "input_schema": FacilitationAnalysis.model_json_schema(),
+}
+
+MEMORY_TOOL = {
+    "name": "update_memory",
+    "description": "Rapportera den uppdaterade sammanfattningen med talare, beslut och åtgärder.",
+    "input_schema": MemoryUpdate.model_json_schema(),
+}
+
+GOAL_ASSESSMENT_TOOL = {
+    "name": "report_goal_assessment",
+    "description": "Rapportera bedömningen av varje önskat utfall, efter dess nummer.",
+    "input_schema": GoalAssessment.model_json_schema(),
+}
+
+TRANSCRIPT_NOTES_TOOL = {
+    "name": "report_transcript_notes",
+    "description": "Rapportera anteckningar per agendapunkt och utfall, beslut och åtgärder.",
+    "input_schema": TranscriptNotes.model_json_schema(),
+}
+
+OUTCOME_ASSESSMENT_TOOL = {
+    "name": "report_outcome_assessment",
+    "description": "Rapportera bedömningen av det önskade utfallet.",
+    "input_schema": OutcomeAssessment.model_json_schema(),
+}
+
+FacilitationMode = Literal["combined", "two_call"]
+
+
+def _get_facilitation_mode() -> FacilitationMode:
+    """Read the facilitation mode from the environment (default: combined)."""
+    mode = os.getenv("FACILITATION_MODE", "combined")
+    if mode not in ("combined", "two_call"):
+        raise ValueError(f"FACILITATION_MODE must be 'combined' or 'two_call', got {mode!r}")
+    return mode  # type: ignore[return-value]
+
+
+class TokenUsage:
+    """Running totals of input/output tokens, split by prompt-cache status."""
+
+    def __init__(self) -> None:
+        self.requests = 0
+        self.input_tokens = 0  # Uncached input tokens
+        self.cache_creation_input_tokens = 0
+        self.cache_read_input_tokens = 0
+        self.output_tokens = 0
+
+    def record(self, message: Any) -> None:
+        """Add the usage reported on a Messages API response."""
+        usage = getattr(message, "usage", None)
+        self.requests += 1
+        for field in (
+            "input_tokens",
+            "cache_creation_input_tokens",
+            "cache_read_input_tokens",
+            "output_tokens",
+        ):
+            value = getattr(usage, field, None)
+            if isinstance(value, int):
+                setattr(self, field, getattr(self, field) + value)
+
+    @property
+    def cache_hit_ratio(self) -> float:
+        """Share of input tokens served from the prompt cache."""
+        total = self.input_tokens + self.cache_creation_input_tokens + self.cache_read_input_tokens
+        return self.cache_read_input_tokens / total if total else 0.0
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return usage totals for logging or metrics endpoints."""
+        return {
+            "requests": self.requests,
+            "input_tokens": self.input_tokens,
+            "cache_creation_input_tokens": self.cache_creation_input_tokens,
+            "cache_read_input_tokens": self.cache_read_input_tokens,
+            "output_tokens": self.output_tokens,
+            "cache_hit_ratio": round(self.cache_hit_ratio, 3),
+        }
+
+
+class ClaudeServiceBase:
+    """
+    Prompts and response parsing shared by the sync and async Claude services.
+
+    Subclasses own the API client and send the requests built here.
+    """
+
+    def __init__(self, response_cache: ResponseCache | None) -> None:
+        """
+        Initialize state shared by both services.
+
+        Args:
+            response_cache: Cache for repeatable responses (None = no caching)
+        """
+        self.model = MODEL
+        self.usage = TokenUsage()
+        self.trigger_responses = 0
+        self.trigger_parse_failures = 0
+        self.facilitation_mode = _get_facilitation_mode()
+        self.response_cache = response_cache
+
+    def _build_memory_update_request(
+        self, memory: MeetingMemory, item_index: int, transcription: str
+    ) -> dict[str, Any]:
+        """Build Messages API arguments for a meeting memory update."""
+        topic = memory.agenda[item_index].get("topic", "") if memory.agenda else ""
+        previous = memory.summaries[item_index] if memory.summaries else ""
+
+        prompt = f"""Du uppdaterar en löpande sammanfattning av en agendapunkt i ett möte.
+
+AGENDAPUNKT: {topic}
+
+SAMMANFATTNING HITTILLS:
+{previous or "Tom"}
+
+SENAST NOTERADE BESLUT OCH ÅTGÄRDER:
+{memory.render_recent_outcomes()}
+
+NY TRANSKRIPTION:
+{transcription}
+
+UPPGIFT:
+1. Skriv om sammanfattningen så att den även täcker den nya transkriptionen.
+   Max {SUMMARY_MAX_WORDS} ord. Behåll beslut, öppna frågor och olika ståndpunkter.
+2. Lista de personer som hörs tala i den nya transkriptionen (namn eller roll),
+   om det går att avgöra.
+3. Lista beslut som fattas i den nya transkriptionen och som inte redan är noterade.
+4. Lista åtgärder som någon åtar sig eller tilldelas i den nya transkriptionen och
+   som inte redan är noterade, med ansvarig om den nämns (annars tom sträng).
+
+Rapportera resultatet med verktyget update_memory."""
+
+        return {
+            "model": self.model,
+            "max_tokens": 600,
+            "temperature": 0.2,
+            "messages": [{"role": "user", "content": prompt}],
+            **self._forced_tool(MEMORY_TOOL),
+        }
+
+    def _apply_memory_update(self, memory: MeetingMemory, item_index: int, message: Any) -> bool:
+        """Validate a memory update tool call and apply it."""
+        update = self._parse_tool_call(message, MemoryUpdate)
+        if update is None:
+            return False
+
+        memory.apply_update(
+            item_index,
+            update.summary,
+            update.speakers,
+            update.decisions,
+            [item.model_dump() for item in update.action_items],
+        )
+        return True
+
+    def _build_goal_assessment_request(
+        self,
+        desired_outcomes: list[str],
+        agenda_summary: dict[str, str],
+        decisions: list[str],
+    ) -> dict[str, Any]:
+        """Build Messages API arguments for the final goal assessment."""
+        outcomes = "\n".join(
+            f"{index}. {outcome}" for index, outcome in enumerate(desired_outcomes, 1)
+        )
+        summaries = "\n".join(f"- {topic}: {summary}" for topic, summary in agenda_summary.items())
+        decided = "\n".join(f"- {decision}" for decision in decisions)
+
+        prompt = f"""Du bedömer i vilken grad ett mötes önskade utfall uppnåddes.
+
+ÖNSKADE UTFALL:
+{outcomes}
+
+SAMMANFATTNING PER AGENDAPUNKT:
+{summaries or "Inget diskuterades"}
+
+BESLUT:
+{decided or "Inga"}
+
+UPPGIFT:
+Bedöm varje önskat utfall som "achieved", "partial" eller "not_achieved"
+och motivera med en mening.
+
+Rapportera bedömningarna med verktyget report_goal_assessment."""
+
+        return {
+            "model": self.model,
+            "max_tokens": 150 + 80 * len(desired_outcomes),
+            "temperature": 0.2,
+            "messages": [{"role": "user", "content": prompt}],
+            **self._forced_tool(GOAL_ASSESSMENT_TOOL),
+        }
+
+    @classmethod
+    def _parse_goal_assessment(
+        cls, desired_outcomes: list[str], message: Any
+    ) -> dict[str, dict[str, str]]:
+        """Map a goal assessment tool call onto the outcomes, defaulting to unknown."""
+        assessment = {outcome: {"status": "unknown", "comment": ""} for outcome in desired_outcomes}
+        result = cls._parse_tool_call(message, GoalAssessment)
+        for item in result.assessments if result else []:
+            if item.outcome <= len(desired_outcomes):
+                assessment[desired_outcomes[item.outcome - 1]] = {
+                    "status": item.status,
+                    "comment": item.comment,
+                }
+        return assessment
+
+    def _build_transcript_group_request(
+        self,
+        transcript: str,
+        meeting_context: dict[str, Any],
+        start_minutes: float,
+        end_minutes: float,
+        scheduled_items: list[int],
+    ) -> dict[str, Any]:
+        """Build Messages API arguments summarizing one group of chunks (map step)."""
+        outcomes = "\n".join(
+            f"{index}. {outcome}"
+            for index, outcome in enumerate(meeting_context["desired_outcomes"], 1)
+        )
+        agenda = "\n".join(
+            f"{index + 1}. {item.get('topic', '')}"
+            + (" (schemalagd under den här delen)" if index in scheduled_items else "")
+            for index, item in enumerate(meeting_context["agenda"])
+        )
+
+        prompt = f"""Du sammanfattar en del av transkriptionen från ett möte,
+som underlag för mötesprotokollet.
+
+MÖTETS INTENT: {meeting_context["intent"]}
+
+ÖNSKADE UTFALL:
+{outcomes}
+
+AGENDA:
+{agenda}
+
+TRANSKRIPTION ({start_minutes:.0f}–{end_minutes:.0f} min in i mötet):
+{transcript}
+
+UPPGIFT:
+1. Sammanfatta vad som sägs om varje agendapunkt som diskuteras i den här delen.
+   Max {PARTIAL_SUMMARY_MAX_WORDS} ord per punkt. Utelämna punkter som inte diskuteras.
+2. Notera för varje önskat utfall som berörs vad som talar för eller emot att det uppnås.
+3. Lista beslut som fattas.
+4. Lista åtgärder som någon åtar sig eller tilldelas, med ansvarig om den nämns
+   (annars tom sträng).
+
+Rapportera anteckningarna med verktyget report_transcript_notes. Ange
+agendapunkter och utfall med sina nummer."""
+
+        return {
+            "model": self.model,
+            "max_tokens": 1000,
+            "temperature": 0.2,
+            "messages": [{"role": "user", "content": prompt}],
+            **self._forced_tool(TRANSCRIPT_NOTES_TOOL),
+        }
+
+    @classmethod
+    def _parse_transcript_group(
+        cls, message: Any, agenda_size: int, outcome_count: int
+    ) -> dict[str, Any] | None:
+        """
+        Validate a map-step tool call.
+
+        Returns:
+            {agenda_items: {index: summary}, outcomes: {index: evidence},
+            decisions, action_items} with 0-based indices, or None if invalid
+        """
+        notes = cls._parse_tool_call(message, TranscriptNotes)
+        if notes is None:
+            return None
+
+        def numbered(entries: list[tuple[int, str]], size: int) -> dict[int, str]:
+            return {
+                number - 1: " ".join(text.split())
+                for number, text in entries
+                if number <= size and text.strip()
+            }
+
+        return {
+            "agenda_items": numbered(
+                [(note.item, note.summary) for note in notes.agenda_items], agenda_size
+            ),
+            "outcomes": numbered(
+                [(note.outcome, note.evidence) for note in notes.outcomes], outcome_count
+            ),
+            "decisions": notes.decisions,
+            "action_items": [item.model_dump() for item in notes.action_items],
+        }
+
+    def _build_merge_request(
+        self, subject: str, notes: list[str], max_words: int
+    ) -> dict[str, Any]:
+        """Build Messages API arguments merging partial notes (reduce step)."""
+        numbered = "\n".join(f"{index}. {note}" for index, note in enumerate(notes, 1))
+
+        prompt = f"""Du slår ihop anteckningar från på varandra följande delar av ett möte.
+
+ÄMNE: {subject}
+
+ANTECKNINGAR (i tidsordning):
+{numbered}
+
+UPPGIFT:
+Skriv en sammanhängande sammanfattning av anteckningarna, max {max_words} ord.
+Behåll beslut, öppna frågor och olika ståndpunkter; ta bort upprepningar.
+
+Svara ENDAST med sammanfattningen, ingen annan text."""
+
+        return {
+            "model": self.model,
+            "max_tokens": max_words * 3,
+            "temperature": 0.2,
+            "messages": [{"role": "user", "content": prompt}],
+        }
+
+    def _build_outcome_assessment_request(
+        self, outcome: str, evidence: str, decisions: list[str]
+    ) -> dict[str, Any]:
+        """Build Messages API arguments assessing one desired outcome."""
+        decided = "\n".join(f"- {decision}" for decision in decisions)
+
+        prompt = f"""Du bedömer om ett önskat utfall för ett möte uppnåddes.
+
+ÖNSKAT UTFALL: {outcome}
+
+UNDERLAG FRÅN MÖTET:
+{evidence or "Utfallet berördes inte uttryckligen"}
+
+BESLUT:
+{decided or "Inga"}
+
+UPPGIFT:
+Bedöm utfallet som "achieved", "partial" eller "not_achieved" och motivera med en mening.
+
+Rapportera bedömningen med verktyget report_outcome_assessment."""
+
+        return {
+            "model": self.model,
+            "max_tokens": 200,
+            "temperature": 0.2,
+            "messages": [{"role": "user", "content": prompt}],
+            **self._forced_tool(OUTCOME_ASSESSMENT_TOOL),
+        }
+
+    @classmethod
+    def _parse_outcome_assessment(cls, message: Any) -> dict[str, str]:
+        """Validate a single outcome assessment tool call, defaulting to unknown."""
+        assessment = cls._parse_tool_call(message, OutcomeAssessment)
+        if assessment is None:
+            return {"status": "unknown", "comment": ""}
+        return assessment.model_dump()
+
+    @staticmethod
+    def _forced_tool(tool: dict[str, Any]) -> dict[str, Any]:
+        """Messages API arguments forcing a call of ``tool``."""
+        return {"tools": [tool], "tool_choice": {"type": "tool", "name": tool["name"]}}
+
+    @staticmethod
+    def _parse_tool_call(message: Any, schema: type[ModelT]) -> ModelT | None:
+        """
+        Validate the tool call in ``message`` against ``schema``.
+
+        Returns:
+            The validated tool input, or None if there was no tool call or
+            it did not match the schema
+        """
+        for block in getattr(message, "content", None) or []:
+            if getattr(block, "type", None) != "tool_use":
+                continue
+            try:
+                return schema.model_validate(block.input)
+            except ValidationError as e:
+                print(f"Invalid {schema.__name__} tool call: {e}")
+                return None
+        if getattr(message, "stop_reason", None) == "max_tokens":
+            print(f"{schema.__name__} tool call was truncated at max_tokens")
+        return None
+
+    def _build_trigger_analysis_request(
+        self,
+        transcription: str,
+        meeting_context: dict[str, Any],
+        history: list[str],
+        memory: MeetingMemory | None = None,
+        combined: bool = False,
+    ) -> dict[str, Any]:
+        """
+        Build Messages API arguments for trigger analysis.
+
+        The static parts are sent as a system prompt with two cache
+        breakpoints: the instructions (identical for every meeting) and the
+        meeting's IDOARRT context (identical for every chunk of a meeting).
+        Only the small per-chunk user message changes between calls.
+
+        With ``combined``, the model also writes a GROW question per trigger
+        and reports through the ``report_interventions`` tool.
+        """
+        instructions = TRIGGER_ANALYSIS_INSTRUCTIONS
+        tool = TRIGGER_TOOL
+        if combined:
+            instructions = (
+                instructions.split("SVARSFORMAT:")[0] + COMBINED_RESPONSE_INSTRUCTIONS
+            )
+            tool = COMBINED_TOOL
+
+        return {
+            "model": self.model,
+            "max_tokens": 1024,
+            # Lower temperature for focused analysis; a bit higher when it also writes questions
+            "temperature": 0.5 if combined else 0.3,
+            "system": [
+                {
+                    "type": "text",
+                    "text": instructions,
+                    "cache_control": {"type": "ephemeral"},
+                },
+                {
+                    "type": "text",
+                    "text": self._build_meeting_context_block(meeting_context),
+                    "cache_control": {"type": "ephemeral"},
+                },
+            ],
+            "messages": [
+                {
+                    "role": "user",
+                    "content": self._build_trigger_analysis_message(
+                        transcription, history, memory
+                    ),
+                }
+            ],
+            # Force a schema-bound tool call instead of free-form JSON text
+            "tools": [tool],
+            "tool_choice": {"type": "tool", "name": tool["name"]},
+        }
+
+    def _build_meeting_context_block(self, meeting_context: dict[str, Any]) -> str:
+        """Build the per-meeting static context block."""
+        intent = meeting_context.get("intent", "")
+        desired_outcomes = meeting_context.get("desired_outcomes", [])
+        outcomes_str = "\n".join(f"- {outcome}" for outcome in desired_outcomes)
+
+        return f"""MÖTETS KONTEXT:
+Intent: {intent}
+
+Önskade utfall:
+{outcomes_str}"""
+
+    def _build_trigger_analysis_message(
+        self, transcription: str, history: list[str], memory: MeetingMemory | None = None
+    ) -> str:
+        """
+        Build the per-chunk user message for trigger analysis.
+
+        With a meeting memory, the message holds the budgeted summary plus
+        only the previous chunk, so its size stays constant for the whole
+        meeting. Without one, it falls back to the last three chunks.
+        """
+        if memory is not None:
+            previous = history[-1] if history else "Ingen tidigare kontext"
+            return f"""MÖTESMINNE (sammanfattning hittills):
+{memory.render()}
+
+FÖREGÅENDE TRANSKRIPTION:
+{previous}
+
+NUVARANDE TRANSKRIPTION:
+{transcription}"""
+
+        history_str = "\n\n".join(
+            f"Tidigare chunk {i+1}:\n{chunk}"
+            for i, chunk in enumerate(history[-3:])  # Last 3 chunks for context
+        )
+
+        return f"""TIDIGARE TRANSKRIPTIONER:
+{history_str if history_str else "Ingen tidigare kontext"}
+
+NUVARANDE TRANSKRIPTION:
+{transcription}"""
+
+    def _build_facilitation_prompt(
+        self,
+        trigger_type: str,
+        context: dict[str, Any],
+        transcription: str,
+    ) -> str:
+        """Build prompt for facilitation question generation."""
+        intent = context.get("intent", "")
+        reason = context.get("reason", "")
+
+        trigger_descriptions = {
+            "goal_deviation": "Diskussionen har avvikit från mötets mål",
+            "perspective_gap": "Bara ett fåtal personer pratar",
+            "complexity_mistake": "Gruppen behandlar frågan med fel komplexitetsnivå",
+        }
+
+        trigger_desc = trigger_descriptions.get(
+            trigger_type, "En intervention behövs"
+        )
+
+        return f"""Du är en AI-mötesassistent som använder GROW-coachingmodellen för att facilitera möten.
+
+MÖTETS INTENT: {intent}
+
+SITUATION: {trigger_desc}
+ANLEDNING: {reason}
+
+SENASTE TRANSKRIPTION:
+{transcription[-500:]}  # Last 500 chars for context
+
+GROW-MODELLEN:
+- **G**oal: Var vill vi komma?
+- **R**eality: Var är vi nu?
+- **O**ptions: Vilka alternativ har vi?
+- **W**ill: Vad gör vi härnäst?
+
+UPPGIFT:
+Generera EN kraftfull, öppen fråga (på svenska) som:
+1. Är baserad på GROW-modellen
+2. Hjälper gruppen att återkoppla till mötets intent
+3. Öppnar upp för nya perspektiv
+4. Är kort och tydlig (max 20 ord)
+
+Exempel på bra frågor:
+- "Hur relaterar detta till vårt mål om X?"
+- "Vilka andra perspektiv skulle vi behöva höra?"
+- "Om vi tänker enkelt - vad är själva kärnan i detta?"
+- "Var är vi nu i förhållande till vårt önskade utfall?"
+
+Svara ENDAST med frågan, ingen förklaring."""
+
+    def _parse_trigger_message(
+        self,
+        message: Any,
+        schema: type[TriggerAnalysis] | type[FacilitationAnalysis] = TriggerAnalysis,
+    ) -> dict[str, Any]:
+        """
+        Parse Claude's trigger analysis response.
+
+        The response is expected as a tool call and is validated once
+        against ``schema``. A plain-text reply is accepted only if it is
+        exactly valid JSON. Failures are counted and reported, never
+        re-requested.
+        """
+        self.trigger_responses += 1
+
+        tool_input = None
+        text = ""
+        for block in message.content or []:
+            if getattr(block, "type", None) == "tool_use":
+                tool_input = block.input
+                break
+            if isinstance(getattr(block, "text", None), str):
+                text += block.text
+
+        if tool_input is not None:
+            try:
+                result = schema.model_validate(tool_input).model_dump(mode="json")
+            except ValidationError as e:
+                result = {"triggers": [], "error": f"Invalid trigger analysis: {e}"}
+        else:
+            if getattr(message, "stop_reason", None) == "max_tokens":
+                print("Trigger analysis was truncated at max_tokens")
+            result = self._parse_trigger_response(text, schema)
+
+        if "error" in result:
+            self.trigger_parse_failures += 1
+        return result
+
+    def _parse_trigger_response(
+        self,
+        response: str,
+        schema: type[TriggerAnalysis] | type[FacilitationAnalysis] = TriggerAnalysis,
+    ) -> dict[str, Any]:
+        """Parse a plain-text trigger analysis response as strict JSON."""
+        try:
+            return schema.model_validate_json(response.strip()).model_dump(mode="json")
+        except ValidationError as e:
+            print(f"Trigger response parse error: {e}")
+            print(f"Response was: {response}")
+            return {"triggers": [], "error": f"Could not parse trigger response: {e}"}
+
+    @property
+    def trigger_parse_failure_rate(self) -> float:
+        """Share of trigger analysis responses that failed validation."""
+        if not self.trigger_responses:
+            return 0.0
+        return self.trigger_parse_failures / self.trigger_responses
+
+
+class ClaudeService(ClaudeServiceBase):
     """Service for interacting with Claude API for meeting facilitation."""
 
     def __init__(self) -> None:
         """Initialize Claude service with API key from environment."""
-        api_key = os.getenv("ANTHROPIC_API_KEY")
-        if not api_key:
-            raise ValueError("ANTHROPIC_API_KEY environment variable is not set")
+        api_key = _get_api_key()
 
+        super().__init__(ResponseCache.from_env())
         self.client = Anthropic(api_key=api_key)
-        self.model = "claude-sonnet-4-20250514"  # Latest Sonnet model
+
+    def _create(self, **kwargs: Any) -> Any:
+        """Send a Messages API request, answering repeatable ones from the response cache."""
+        if self.response_cache is not None:
+            cached = self.response_cache.get(kwargs)
+            if cached is not None:
+                return cached
+
+        message = self.client.messages.create(**kwargs)
+        self.usage.record(message)
+        if self.response_cache is not None:
+            self.response_cache.put(kwargs, message)
+        return message
 
     def analyze_transcription_for_triggers(
         self,
         transcription: str,
         meeting_context: dict[str, Any],
         transcription_history: list[str],
+        meeting_memory: MeetingMemory | None = None,
     ) -> dict[str, Any]:
         """
         Analyze transcription to detect intervention triggers.
@@ -31,26 +718,19 @@ class ClaudeService:
             transcription: Current chunk transcription
             meeting_context: IDOARRT meeting data (intent, desired_outcomes, etc.)
             transcription_history: Previous chunk transcriptions for context
+            meeting_memory: Rolling meeting summary; replaces the history window
 
         Returns:
             dict with detected triggers and suggested interventions
         """
-        prompt = self._build_trigger_analysis_prompt(
-            transcription, meeting_context, transcription_history
+        request = self._build_trigger_analysis_request(
+            transcription, meeting_context, transcription_history, meeting_memory
         )
 
         try:
-            message = self.client.messages.create(
-                model=self.model,
-                max_tokens=1024,
-                temperature=0.3,  # Lower temperature for more focused analysis
-                messages=[{"role": "user", "content": prompt}],
-            )
+            message = self._create(**request)
 
-            response_text = message.content[0].text if message.content else ""
-
-            # Parse the response
-            return self._parse_trigger_response(response_text)
+            return self._parse_trigger_message(message)
 
         except Exception as e:
             print(f"Claude API error during trigger analysis: {e}")
@@ -76,7 +756,7 @@ class ClaudeService:
         prompt = self._build_facilitation_prompt(trigger_type, context, transcription)
 
         try:
-            message = self.client.messages.create(
+            message = self._create(
                 model=self.model,
                 max_tokens=256,
                 temperature=0.7,  # Higher temperature for creative questions
@@ -90,137 +770,584 @@ class ClaudeService:
             print(f"Claude API error during question generation: {e}")
             return f"[Fel vid generering av fråga: {str(e)}]"
 
-    def _build_trigger_analysis_prompt(
+    def facilitate(
         self,
         transcription: str,
         meeting_context: dict[str, Any],
-        history: list[str],
-    ) -> str:
-        """Build prompt for trigger analysis."""
-        # Format meeting context
-        intent = meeting_context.get("intent", "")
-        desired_outcomes = meeting_context.get("desired_outcomes", [])
-        outcomes_str = "\n".join(f"- {outcome}" for outcome in desired_outcomes)
+        transcription_history: list[str],
+        meeting_memory: MeetingMemory | None = None,
+        mode: FacilitationMode | None = None,
+    ) -> dict[str, Any]:
+        """
+        Detect triggers and produce a facilitation question for each.
 
-        # Format history
-        history_str = "\n\n".join(
-            f"Tidigare chunk {i+1}:\n{chunk}"
-            for i, chunk in enumerate(history[-3:])  # Last 3 chunks for context
+        In ``combined`` mode one call returns triggers and questions
+        together. In ``two_call`` mode triggers are analyzed first and a
+        question is generated per trigger, as before. Both return the same
+        shape, plus ``mode``, ``api_calls`` and ``latency_ms`` so the modes
+        can be compared on the same transcripts.
+
+        Args:
+            transcription: Current chunk transcription
+            meeting_context: IDOARRT meeting data (intent, desired_outcomes, etc.)
+            transcription_history: Previous chunk transcriptions for context
+            meeting_memory: Rolling meeting summary; replaces the history window
+            mode: Override ``self.facilitation_mode`` for this call
+
+        Returns:
+            dict with triggers, each including a ``question``
+        """
+        mode = mode or self.facilitation_mode
+        start = time.perf_counter()
+
+        if mode == "combined":
+            request = self._build_trigger_analysis_request(
+                transcription, meeting_context, transcription_history, meeting_memory,
+                combined=True,
+            )
+            try:
+                message = self._create(**request)
+                result = self._parse_trigger_message(message, FacilitationAnalysis)
+            except Exception as e:
+                print(f"Claude API error during combined facilitation: {e}")
+                result = {"triggers": [], "error": str(e)}
+            api_calls = 1
+        else:
+            result = self.analyze_transcription_for_triggers(
+                transcription, meeting_context, transcription_history, meeting_memory
+            )
+            for trigger in result["triggers"]:
+                trigger["question"] = self.generate_facilitation_question(
+                    trigger["type"],
+                    {**meeting_context, "reason": trigger.get("reason", "")},
+                    transcription,
+                )
+            api_calls = 1 + len(result["triggers"])
+
+        return {
+            **result,
+            "mode": mode,
+            "api_calls": api_calls,
+            "latency_ms": round((time.perf_counter() - start) * 1000, 1),
+        }
+
+    def update_meeting_memory(
+        self,
+        memory: MeetingMemory,
+        transcription: str,
+        elapsed_minutes: float,
+    ) -> bool:
+        """
+        Fold a new chunk into the rolling meeting memory.
+
+        Only the summary of the agenda item scheduled at ``elapsed_minutes``
+        is rewritten, so each update costs a constant number of tokens. The
+        same call picks up decisions and action items from the chunk.
+
+        Args:
+            memory: Meeting memory to update in place
+            transcription: Newly transcribed chunk
+            elapsed_minutes: Minutes since meeting start at the end of the chunk
+
+        Returns:
+            True if the memory was updated, False on API or parse errors
+        """
+        item_index = memory.current_item_index(elapsed_minutes)
+        request = self._build_memory_update_request(memory, item_index, transcription)
+
+        try:
+            message = self._create(**request)
+            return self._apply_memory_update(memory, item_index, message)
+
+        except Exception as e:
+            print(f"Claude API error during memory update: {e}")
+            return False
+
+    def assess_goals(
+        self,
+        desired_outcomes: list[str],
+        agenda_summary: dict[str, str],
+        decisions: list[str],
+    ) -> dict[str, dict[str, str]]:
+        """
+        Assess how far each desired outcome was reached.
+
+        Works from the meeting's per-item summaries and decisions rather
+        than the transcript, so the request is small however long the
+        meeting ran.
+
+        Args:
+            desired_outcomes: The meeting's desired outcomes
+            agenda_summary: Summary per discussed agenda item, by topic
+            decisions: Decisions made in the meeting
+
+        Returns:
+            {outcome: {status, comment}} for every desired outcome; status is
+            "unknown" for outcomes that could not be assessed
+        """
+        request = self._build_goal_assessment_request(desired_outcomes, agenda_summary, decisions)
+
+        try:
+            message = self._create(**request)
+        except Exception as e:
+            print(f"Claude API error during goal assessment: {e}")
+            message = None
+        return self._parse_goal_assessment(desired_outcomes, message)
+
+
+class AsyncClaudeService(ClaudeServiceBase):
+    """
+    Non-blocking Claude service for use inside the event loop.
+
+    All requests share one pooled HTTP client, so TLS connections are reused
+    across meetings. Concurrency is bounded globally and per meeting: one
+    long meeting cannot starve the others, and a burst of chunks cannot
+    exceed the connection pool. Every request first passes the
+    ``ClaudeRequestScheduler``, which enforces the account's rate limits,
+    orders live work before background work and retries transient errors.
+    """
+
+    def __init__(
+        self,
+        max_connections: int = 20,
+        max_concurrency: int = 16,
+        per_meeting_concurrency: int = 2,
+        timeout_seconds: float = 30.0,
+        connect_timeout_seconds: float = 5.0,
+        max_retries: int = 2,
+        base_url: str | None = None,
+        scheduler: ClaudeRequestScheduler | None = None,
+        response_cache: ResponseCache | None = None,
+    ) -> None:
+        """
+        Initialize async Claude service with API key from environment.
+
+        Args:
+            max_connections: Size of the shared HTTP connection pool
+            max_concurrency: Max in-flight requests across all meetings
+            per_meeting_concurrency: Max in-flight requests per meeting
+            timeout_seconds: Total timeout per request
+            connect_timeout_seconds: Timeout for establishing a connection
+            max_retries: Retries on connection errors, 429 and 5xx (done by the scheduler)
+            base_url: Override API URL (defaults to ANTHROPIC_BASE_URL or the SDK default)
+            scheduler: Request scheduler (defaults to one sized from the environment)
+            response_cache: Response cache (defaults to CLAUDE_RESPONSE_CACHE_PATH, if set)
+        """
+        api_key = _get_api_key()
+
+        self.http_client = DefaultAsyncHttpxClient(
+            limits=httpx.Limits(
+                max_connections=max_connections,
+                max_keepalive_connections=max_connections,
+            ),
+        )
+        super().__init__(
+            response_cache if response_cache is not None else ResponseCache.from_env()
         )
+        self.client = AsyncAnthropic(
+            api_key=api_key,
+            base_url=base_url or os.getenv("ANTHROPIC_BASE_URL"),
+            http_client=self.http_client,
+            timeout=Timeout(timeout_seconds, connect=connect_timeout_seconds),
+            max_retries=0,  # Retries go through the scheduler so they respect rate limits
+        )
+        self.scheduler = scheduler or ClaudeRequestScheduler.from_env(max_attempts=max_retries + 1)
 
-        return f"""Du är en AI-mötesassistent som analyserar mötestranskriptioner för att identifiera när facilitering behövs.
+        self.per_meeting_concurrency = per_meeting_concurrency
+        self._global_limit = asyncio.Semaphore(max_concurrency)
+        self._meeting_limits: dict[str, asyncio.Semaphore] = {}
 
-MÖTETS KONTEXT:
-Intent: {intent}
+    def _meeting_limit(self, meeting_id: str | None) -> asyncio.Semaphore | None:
+        """Get (or create) the concurrency limit for a meeting."""
+        if meeting_id is None:
+            return None
+        if meeting_id not in self._meeting_limits:
+            self._meeting_limits[meeting_id] = asyncio.Semaphore(self.per_meeting_concurrency)
+        return self._meeting_limits[meeting_id]
 
-Önskade utfall:
-{outcomes_str}
+    @asynccontextmanager
+    async def _request_slot(self, meeting_id: str | None) -> AsyncIterator[None]:
+        """Hold one slot of the global and per-meeting concurrency limits."""
+        meeting_limit = self._meeting_limit(meeting_id)
+        if meeting_limit is None:
+            async with self._global_limit:
+                yield
+            return
+        # Acquire the meeting slot first so a queued meeting does not hold a global slot
+        async with meeting_limit, self._global_limit:
+            yield
 
-TIDIGARE TRANSKRIPTIONER:
-{history_str if history_str else "Ingen tidigare kontext"}
+    @staticmethod
+    def _estimate_request_tokens(kwargs: dict[str, Any]) -> int:
+        """Estimate input plus output tokens of a request for rate limiting."""
+        prompt = json.dumps([kwargs.get("system"), kwargs.get("messages"), kwargs.get("tools")])
+        return estimate_tokens(prompt) + int(kwargs.get("max_tokens", 0))
 
-NUVARANDE TRANSKRIPTION:
-{transcription}
+    async def _create_message(
+        self,
+        meeting_id: str | None,
+        priority: RequestPriority = RequestPriority.LIVE,
+        **kwargs: Any,
+    ) -> Any:
+        """Send a Messages API request through the cache, scheduler and concurrency limits."""
+        if self.response_cache is not None:
+            cached = await self.response_cache.aget(kwargs)
+            if cached is not None:
+                return cached
 
-ANALYS-UPPGIFT:
-Analysera den nuvarande transkriptionen och identifiera om någon av följande triggers förekommer:
+        async def call() -> Any:
+            async with self._request_slot(meeting_id):
+                return await self.client.messages.create(**kwargs)
 
-1. **goal_deviation**: Diskussionen avviker från mötets intent eller önskade utfall
-2. **perspective_gap**: Bara 1-2 personer pratar, andra perspektiv saknas
-3. **complexity_mistake**: Gruppen behandlar enkla frågor som komplexa eller vice versa
+        message = await self.scheduler.run(
+            call,
+            meeting_id=meeting_id,
+            priority=priority,
+            estimated_tokens=self._estimate_request_tokens(kwargs),
+        )
+        self.usage.record(message)
+        if self.response_cache is not None:
+            await self.response_cache.aput(kwargs, message)
+        return message
 
-SVARSFORMAT (JSON):
-{{
-  "triggers": [
-    {{
-      "type": "goal_deviation" | "perspective_gap" | "complexity_mistake",
-      "confidence": 0.0-1.0,
-      "reason": "Kortförklaring varför denna trigger detekterades"
-    }}
-  ]
-}}
+    async def analyze_transcription_for_triggers(
+        self,
+        transcription: str,
+        meeting_context: dict[str, Any],
+        transcription_history: list[str],
+        meeting_memory: MeetingMemory | None = None,
+        meeting_id: str | None = None,
+    ) -> dict[str, Any]:
+        """
+        Analyze transcription to detect intervention triggers.
 
-Om inga triggers detekteras, returnera: {{"triggers": []}}
+        Args:
+            transcription: Current chunk transcription
+            meeting_context: IDOARRT meeting data (intent, desired_outcomes, etc.)
+            transcription_history: Previous chunk transcriptions for context
+            meeting_memory: Rolling meeting summary; replaces the history window
+            meeting_id: Meeting ID for per-meeting concurrency limiting
 
-Svara ENDAST med JSON, ingen annan text."""
+        Returns:
+            dict with detected triggers and suggested interventions
+        """
+        request = self._build_trigger_analysis_request(
+            transcription, meeting_context, transcription_history, meeting_memory
+        )
 
-    def _build_facilitation_prompt(
+        try:
+            message = await self._create_message(meeting_id, **request)
+
+            return self._parse_trigger_message(message)
+
+        except Exception as e:
+            print(f"Claude API error during trigger analysis: {e}")
+            return {"triggers": [], "error": str(e)}
+
+    async def facilitate(
         self,
-        trigger_type: str,
-        context: dict[str, Any],
         transcription: str,
-    ) -> str:
-        """Build prompt for facilitation question generation."""
-        intent = context.get("intent", "")
-        reason = context.get("reason", "")
+        meeting_context: dict[str, Any],
+        transcription_history: list[str],
+        meeting_memory: MeetingMemory | None = None,
+        mode: FacilitationMode | None = None,
+        meeting_id: str | None = None,
+    ) -> dict[str, Any]:
+        """
+        Detect triggers and produce a facilitation question for each.
 
-        trigger_descriptions = {
-            "goal_deviation": "Diskussionen har avvikit från mötets mål",
-            "perspective_gap": "Bara ett fåtal personer pratar",
-            "complexity_mistake": "Gruppen behandlar frågan med fel komplexitetsnivå",
+        See ``ClaudeService.facilitate``. In ``two_call`` mode the questions
+        for several triggers are generated concurrently.
+
+        Args:
+            transcription: Current chunk transcription
+            meeting_context: IDOARRT meeting data (intent, desired_outcomes, etc.)
+            transcription_history: Previous chunk transcriptions for context
+            meeting_memory: Rolling meeting summary; replaces the history window
+            mode: Override ``self.facilitation_mode`` for this call
+            meeting_id: Meeting ID for per-meeting concurrency limiting
+
+        Returns:
+            dict with triggers, each including a ``question``
+        """
+        mode = mode or self.facilitation_mode
+        start = time.perf_counter()
+
+        if mode == "combined":
+            request = self._build_trigger_analysis_request(
+                transcription, meeting_context, transcription_history, meeting_memory,
+                combined=True,
+            )
+            try:
+                message = await self._create_message(meeting_id, **request)
+                result = self._parse_trigger_message(message, FacilitationAnalysis)
+            except Exception as e:
+                print(f"Claude API error during combined facilitation: {e}")
+                result = {"triggers": [], "error": str(e)}
+            api_calls = 1
+        else:
+            result = await self.analyze_transcription_for_triggers(
+                transcription, meeting_context, transcription_history, meeting_memory,
+                meeting_id=meeting_id,
+            )
+            questions = await asyncio.gather(*[
+                self.generate_facilitation_question(
+                    trigger["type"],
+                    {**meeting_context, "reason": trigger.get("reason", "")},
+                    transcription,
+                    meeting_id=meeting_id,
+                )
+                for trigger in result["triggers"]
+            ])
+            for trigger, question in zip(result["triggers"], questions, strict=True):
+                trigger["question"] = question
+            api_calls = 1 + len(result["triggers"])
+
+        return {
+            **result,
+            "mode": mode,
+            "api_calls": api_calls,
+            "latency_ms": round((time.perf_counter() - start) * 1000, 1),
         }
 
-        trigger_desc = trigger_descriptions.get(
-            trigger_type, "En intervention behövs"
+    async def update_meeting_memory(
+        self,
+        memory: MeetingMemory,
+        transcription: str,
+        elapsed_minutes: float,
+        meeting_id: str | None = None,
+    ) -> bool:
+        """
+        Fold a new chunk into the rolling meeting memory.
+
+        Args:
+            memory: Meeting memory to update in place
+            transcription: Newly transcribed chunk
+            elapsed_minutes: Minutes since meeting start at the end of the chunk
+            meeting_id: Meeting ID for per-meeting concurrency limiting
+
+        Returns:
+            True if the memory was updated, False on API or parse errors
+        """
+        item_index = memory.current_item_index(elapsed_minutes)
+        request = self._build_memory_update_request(memory, item_index, transcription)
+
+        try:
+            message = await self._create_message(
+                meeting_id, RequestPriority.BACKGROUND, **request
+            )
+            return self._apply_memory_update(memory, item_index, message)
+
+        except Exception as e:
+            print(f"Claude API error during memory update: {e}")
+            return False
+
+    async def assess_goals(
+        self,
+        desired_outcomes: list[str],
+        agenda_summary: dict[str, str],
+        decisions: list[str],
+        meeting_id: str | None = None,
+    ) -> dict[str, dict[str, str]]:
+        """
+        Assess how far each desired outcome was reached.
+
+        Args:
+            desired_outcomes: The meeting's desired outcomes
+            agenda_summary: Summary per discussed agenda item, by topic
+            decisions: Decisions made in the meeting
+            meeting_id: Meeting ID for per-meeting concurrency limiting
+
+        Returns:
+            {outcome: {status, comment}} for every desired outcome
+        """
+        request = self._build_goal_assessment_request(desired_outcomes, agenda_summary, decisions)
+
+        try:
+            message = await self._create_message(meeting_id, RequestPriority.BATCH, **request)
+        except Exception as e:
+            print(f"Claude API error during goal assessment: {e}")
+            message = None
+        return self._parse_goal_assessment(desired_outcomes, message)
+
+    async def summarize_transcript_group(
+        self,
+        transcript: str,
+        meeting_context: dict[str, Any],
+        start_minutes: float,
+        end_minutes: float,
+        scheduled_items: list[int],
+    ) -> dict[str, Any] | None:
+        """
+        Summarize one group of consecutive chunks for the protocol (map step).
+
+        Args:
+            transcript: Joined transcriptions of the group
+            meeting_context: Meeting intent, desired outcomes and agenda
+            start_minutes: Minutes into the meeting the group starts
+            end_minutes: Minutes into the meeting the group ends
+            scheduled_items: Agenda items (0-based) scheduled during the group
+
+        Returns:
+            Notes per agenda item and desired outcome plus decisions and
+            action items (see ``_parse_transcript_group``), or None on errors
+        """
+        request = self._build_transcript_group_request(
+            transcript, meeting_context, start_minutes, end_minutes, scheduled_items
         )
 
-        return f"""Du är en AI-mötesassistent som använder GROW-coachingmodellen för att facilitera möten.
+        try:
+            message = await self._create_message(None, RequestPriority.BATCH, **request)
+        except Exception as e:
+            print(f"Claude API error during transcript summarization: {e}")
+            return None
+        return self._parse_transcript_group(
+            message, len(meeting_context["agenda"]), len(meeting_context["desired_outcomes"])
+        )
 
-MÖTETS INTENT: {intent}
+    async def merge_notes(self, subject: str, notes: list[str], max_words: int) -> str:
+        """
+        Merge partial notes on one subject into a single summary (reduce step).
 
-SITUATION: {trigger_desc}
-ANLEDNING: {reason}
+        Returns:
+            Merged summary, or an empty string on errors
+        """
+        request = self._build_merge_request(subject, notes, max_words)
 
-SENASTE TRANSKRIPTION:
-{transcription[-500:]}  # Last 500 chars for context
+        try:
+            message = await self._create_message(None, RequestPriority.BATCH, **request)
+            return message.content[0].text.strip() if message.content else ""
+        except Exception as e:
+            print(f"Claude API error during note merging: {e}")
+            return ""
 
-GROW-MODELLEN:
-- **G**oal: Var vill vi komma?
-- **R**eality: Var är vi nu?
-- **O**ptions: Vilka alternativ har vi?
-- **W**ill: Vad gör vi härnäst?
+    async def assess_outcome(
+        self, outcome: str, evidence: str, decisions: list[str]
+    ) -> dict[str, str]:
+        """
+        Assess whether one desired outcome was reached.
 
-UPPGIFT:
-Generera EN kraftfull, öppen fråga (på svenska) som:
-1. Är baserad på GROW-modellen
-2. Hjälper gruppen att återkoppla till mötets intent
-3. Öppnar upp för nya perspektiv
-4. Är kort och tydlig (max 20 ord)
+        Returns:
+            {status, comment}; status is "unknown" on errors
+        """
+        request = self._build_outcome_assessment_request(outcome, evidence, decisions)
 
-Exempel på bra frågor:
-- "Hur relaterar detta till vårt mål om X?"
-- "Vilka andra perspektiv skulle vi behöva höra?"
-- "Om vi tänker enkelt - vad är själva kärnan i detta?"
-- "Var är vi nu i förhållande till vårt önskade utfall?"
+        try:
+            message = await self._create_message(None, RequestPriority.BATCH, **request)
+        except Exception as e:
+            print(f"Claude API error during outcome assessment: {e}")
+            message = None
+        return self._parse_outcome_assessment(message)
 
-Svara ENDAST med frågan, ingen förklaring."""
+    async def generate_facilitation_question(
+        self,
+        trigger_type: str,
+        context: dict[str, Any],
+        transcription: str,
+        meeting_id: str | None = None,
+    ) -> str:
+        """
+        Generate a GROW-based coaching question for a detected trigger.
 
-    def _parse_trigger_response(self, response: str) -> dict[str, Any]:
-        """Parse Claude's trigger analysis response."""
-        import json
+        Args:
+            trigger_type: Type of trigger (goal_deviation, perspective_gap, etc.)
+            context: Meeting context and trigger details
+            transcription: Recent transcription for context
+            meeting_id: Meeting ID for per-meeting concurrency limiting
+
+        Returns:
+            Facilitation question as a string
+        """
+        prompt = self._build_facilitation_prompt(trigger_type, context, transcription)
 
         try:
-            # Try to extract JSON from response
-            # Sometimes Claude adds extra text, so find the JSON part
-            json_start = response.find("{")
-            json_end = response.rfind("}") + 1
+            message = await self._create_message(
+                meeting_id,
+                model=self.model,
+                max_tokens=256,
+                temperature=0.7,
+                messages=[{"role": "user", "content": prompt}],
+            )
 
-            if json_start >= 0 and json_end > json_start:
-                json_str = response[json_start:json_end]
-                data = json.loads(json_str)
-                return data
+            return message.content[0].text.strip() if message.content else ""
 
-            # Fallback if no JSON found
-            return {"triggers": [], "error": "Could not parse JSON response"}
+        except Exception as e:
+            print(f"Claude API error during question generation: {e}")
+            return f"[Fel vid generering av fråga: {str(e)}]"
 
-        except json.JSONDecodeError as e:
-            print(f"JSON parse error: {e}")
-            print(f"Response was: {response}")
-            return {"triggers": [], "error": f"JSON parse error: {str(e)}"}
+    async def stream_facilitation_question(
+        self,
+        trigger_type: str,
+        context: dict[str, Any],
+        transcription: str,
+        on_delta: Callable[[str], Awaitable[None]],
+        meeting_id: str | None = None,
+    ) -> str:
+        """
+        Generate a facilitation question, forwarding text as it is produced.
+
+        Same prompt as ``generate_facilitation_question``, but sent with the
+        streaming API so the first words reach the facilitator after the
+        time-to-first-token instead of the full round trip.
+
+        Args:
+            trigger_type: Type of trigger (goal_deviation, perspective_gap, etc.)
+            context: Meeting context and trigger details
+            transcription: Recent transcription for context
+            on_delta: Awaited with each text fragment, in order
+            meeting_id: Meeting ID for per-meeting concurrency limiting
+
+        Returns:
+            Complete facilitation question as a string
+        """
+        prompt = self._build_facilitation_prompt(trigger_type, context, transcription)
+        request: dict[str, Any] = {
+            "model": self.model,
+            "max_tokens": 256,
+            "temperature": 0.7,
+            "messages": [{"role": "user", "content": prompt}],
+        }
+        parts: list[str] = []
+
+        async def call() -> Any:
+            async with (
+                self._request_slot(meeting_id),
+                self.client.messages.stream(**request) as stream,
+            ):
+                async for text in stream.text_stream:
+                    parts.append(text)
+                    await on_delta(text)
+                return await stream.get_final_message()
+
+        try:
+            message = await self.scheduler.run(
+                call,
+                meeting_id=meeting_id,
+                estimated_tokens=self._estimate_request_tokens(request),
+                # Deltas already sent cannot be taken back, so only retry before the first one
+                should_retry=lambda e: not parts and is_retryable(e),
+            )
+            self.usage.record(message)
+
+            return "".join(parts).strip()
+
+        except Exception as e:
+            print(f"Claude API error during question streaming: {e}")
+            return f"[Fel vid generering av fråga: {str(e)}]"
+
+    def forget_meeting(self, meeting_id: str) -> None:
+        """Drop the per-meeting concurrency limit once a meeting has ended."""
+        self._meeting_limits.pop(meeting_id, None)
+        self.scheduler.forget_meeting(meeting_id)
+
+    async def aclose(self) -> None:
+        """Close the shared HTTP connection pool."""
+        await self.client.close()
 
 
 # Global instance
 _claude_service: ClaudeService | None = None
+_async_claude_service: AsyncClaudeService | None = None
 
 
 def get_claude_service() -> ClaudeService:
@@ -229,3 +1356,19 @@ def get_claude_service() -> ClaudeService:
     if _claude_service is None:
         _claude_service = ClaudeService()
     return _claude_service
+
+
+def get_async_claude_service() -> AsyncClaudeService:
+    """Get or create global async Claude service instance."""
+    global _async_claude_service
+    if _async_claude_service is None:
+        _async_claude_service = AsyncClaudeService()
+    return _async_claude_service
+
+
+async def close_async_claude_service() -> None:
+    """Close the global async Claude service, if created."""
+    global _async_claude_service
+    if _async_claude_service is not None:
+        await _async_claude_service.aclose()
+        _async_claude_service = None
@@ -1,18 +1,289 @@
 """IDOARRT markdown parsing and validation service."""
 
+import hashlib
 import re
+import threading
+from collections import OrderedDict
 from typing import Any
 
 
 class IDOARRTParseError(Exception):
     """Raised when IDOARRT parsing fails."""
-    pass
+
+    def __init__(self, message: str, diagnostics: list["IDOARRTDiagnostic"] | None = None) -> None:
+        super().__init__(message)
+        self.diagnostics = diagnostics or []
+
+
+class IDOARRTDiagnostic:
+    """One problem found while parsing, with the line it was found on."""
+
+    __slots__ = ("code", "message", "line", "section")
+
+    def __init__(
+        self, code: str, message: str, line: int | None = None, section: str | None = None
+    ) -> None:
+        self.code = code  # Stable identifier, e.g. "missing_section" or "invalid_time"
+        self.message = message
+        self.line = line  # 1-based; None when the problem is the absence of something
+        self.section = section
+
+    def __str__(self) -> str:
+        return f"Line {self.line}: {self.message}" if self.line is not None else self.message
+
+    def __repr__(self) -> str:
+        return f"IDOARRTDiagnostic({self.code!r}, {str(self)!r})"
+
+
+class IDOARRTDocument:
+    """Result of parsing: the structured data and every diagnostic found."""
+
+    __slots__ = ("data", "diagnostics", "validation_errors")
+
+    def __init__(self, data: dict[str, Any], diagnostics: list[IDOARRTDiagnostic]) -> None:
+        self.data = data
+        self.diagnostics = diagnostics
+        # Filled in by IDOARRTService.validate_document
+        self.validation_errors: list[str] | None = None
+
+    @property
+    def ok(self) -> bool:
+        """Whether the document parsed without problems."""
+        return not self.diagnostics
+
+
+REQUIRED_SECTIONS = ["Intent", "Desired Outcomes", "Agenda", "Roles", "Rules", "Time"]
+_SECTION_NAMES = {name.lower(): name for name in REQUIRED_SECTIONS}
+
+_HEADER = re.compile(r"(#{1,6})\s+(.+?)\s*$")
+_AGENDA_ITEM = re.compile(r"\d+\.\s+(.+?)\s*\((\d+)\s*(?:min)?\)$", re.IGNORECASE)
+_NUMBERED = re.compile(r"\d+\.")
+_TOTAL = re.compile(r"Total:\s*(\d+)", re.IGNORECASE)
+
+
+def parse_idoarrt_document(markdown: str) -> IDOARRTDocument:
+    """
+    Parse IDOARRT markdown in a single pass over its lines.
+
+    Level-1 headers start a section; deeper headers (``## Agenda``)
+    start one only when they name a known section, so subheadings inside
+    a section stay part of it. Section names match case-insensitively.
+    A repeated section replaces the earlier one.
+
+    Args:
+        markdown: IDOARRT markdown content
+
+    Returns:
+        Parsed data (possibly incomplete) and line-numbered diagnostics
+    """
+    diagnostics: list[IDOARRTDiagnostic] = []
+    if not markdown.strip():
+        diagnostics.append(IDOARRTDiagnostic("empty", "No content found"))
+        return IDOARRTDocument({}, diagnostics)
+
+    headers: dict[str, int] = {}  # Section -> line of its header
+    intent_lines: list[str] = []
+    outcomes: list[str] = []
+    agenda: list[dict[str, Any]] = []
+    agenda_errors: list[IDOARRTDiagnostic] = []
+    roles: dict[str, str] = {}
+    rules: list[str] = []
+    total: tuple[int, int] | None = None  # (minutes, line)
+    section: str | None = None
+
+    for number, raw in enumerate(markdown.splitlines(), 1):
+        line = raw.strip()
+        if line.startswith("#"):
+            header = _HEADER.match(line)
+            if header:
+                name = _SECTION_NAMES.get(header.group(2).lower())
+                if name is not None or len(header.group(1)) == 1:
+                    section = name
+                    if name is not None:
+                        headers[name] = number
+                        # Later section of the same name wins
+                        if name == "Intent":
+                            intent_lines = []
+                        elif name == "Desired Outcomes":
+                            outcomes = []
+                        elif name == "Agenda":
+                            agenda, agenda_errors = [], []
+                        elif name == "Roles":
+                            roles = {}
+                        elif name == "Rules":
+                            rules = []
+                        else:
+                            total = None
+                    continue
+
+        if section is None:
+            continue
+        if section == "Intent":
+            intent_lines.append(raw)
+        elif section == "Agenda":
+            item = _AGENDA_ITEM.match(line)
+            if item:
+                agenda.append(
+                    {"topic": item.group(1).strip(), "duration_minutes": int(item.group(2))}
+                )
+            elif _NUMBERED.match(line):
+                agenda_errors.append(IDOARRTDiagnostic(
+                    "agenda_missing_time",
+                    f"Agenda item missing time allocation: {line}",
+                    number,
+                    section,
+                ))
+        elif section == "Time":
+            if total is None:
+                match = _TOTAL.search(line)
+                if match:
+                    total = (int(match.group(1)), number)
+        elif line.startswith(("-", "*")):
+            text = line[1:].strip()
+            if section == "Roles":
+                if ":" in text:
+                    role, person = text.split(":", 1)
+                    roles[role.strip()] = person.strip()
+            elif text:
+                (outcomes if section == "Desired Outcomes" else rules).append(text)
+
+    for name in REQUIRED_SECTIONS:
+        if name not in headers:
+            diagnostics.append(IDOARRTDiagnostic(
+                "missing_section", f"{name} section is required", None, name
+            ))
+
+    intent = "\n".join(intent_lines).strip()
+    if "Intent" in headers and not intent:
+        diagnostics.append(IDOARRTDiagnostic(
+            "empty_section", "Intent cannot be empty", headers["Intent"], "Intent"
+        ))
+    if "Desired Outcomes" in headers and not outcomes:
+        diagnostics.append(IDOARRTDiagnostic(
+            "empty_section", "Desired Outcomes must have at least one item",
+            headers["Desired Outcomes"], "Desired Outcomes",
+        ))
+    diagnostics.extend(agenda_errors)
+    if "Agenda" in headers and not agenda and not agenda_errors:
+        diagnostics.append(IDOARRTDiagnostic(
+            "empty_agenda", "Agenda must have at least one item", headers["Agenda"], "Agenda"
+        ))
+    if "Roles" in headers and not roles:
+        diagnostics.append(IDOARRTDiagnostic(
+            "empty_section", "Roles must have at least one role defined", headers["Roles"], "Roles"
+        ))
+    if "Rules" in headers and not rules:
+        diagnostics.append(IDOARRTDiagnostic(
+            "empty_section", "Rules must have at least one rule", headers["Rules"], "Rules"
+        ))
+
+    valid_total: tuple[int, int] | None = None  # (minutes, line)
+    if "Time" in headers:
+        if total is None:
+            diagnostics.append(IDOARRTDiagnostic(
+                "invalid_time",
+                "Invalid time format: Time section must contain 'Total: XX minutes'",
+                headers["Time"],
+                "Time",
+            ))
+        elif total[0] <= 0:
+            diagnostics.append(IDOARRTDiagnostic(
+                "invalid_time", "Total time must be positive", total[1], "Time"
+            ))
+        else:
+            valid_total = total
+
+    if valid_total is not None and agenda and not agenda_errors:
+        total_minutes, total_line = valid_total
+        agenda_total = sum(item["duration_minutes"] for item in agenda)
+        if agenda_total != total_minutes:
+            diagnostics.append(IDOARRTDiagnostic(
+                "agenda_total_mismatch",
+                f"Agenda times ({agenda_total} min) don't match total time ({total_minutes} min)",
+                total_line, "Time",
+            ))
+
+    # Missing sections first, then in document order
+    diagnostics.sort(key=lambda diagnostic: diagnostic.line or 0)
+    data = {
+        "intent": intent,
+        "desired_outcomes": outcomes,
+        "agenda": agenda,
+        "roles": roles,
+        "rules": rules,
+        "total_duration_minutes": valid_total[0] if valid_total else None,
+    }
+    return IDOARRTDocument(data, diagnostics)
+
+
+def copy_idoarrt_data(data: dict[str, Any]) -> dict[str, Any]:
+    """Copy parsed data deep enough that callers cannot change a cached original."""
+    return {
+        "intent": data.get("intent"),
+        "desired_outcomes": list(data.get("desired_outcomes", ())),
+        "agenda": [dict(item) for item in data.get("agenda", ())],
+        "roles": dict(data.get("roles", {})),
+        "rules": list(data.get("rules", ())),
+        "total_duration_minutes": data.get("total_duration_minutes"),
+    }
 
 
 class IDOARRTService:
-    """Parse and validate IDOARRT markdown files."""
+    """
+    Parse and validate IDOARRT markdown files.
+
+    Parsed documents are memoized by the SHA-256 of the markdown in a
+    bounded LRU, so the same template submitted again (or validated by
+    the request schema and then used by the endpoint) is parsed once.
+    Validation errors are memoized on the cached document. Callers get
+    copies of the data, never the cached original.
+    """
 
-    REQUIRED_SECTIONS = ["Intent", "Desired Outcomes", "Agenda", "Roles", "Rules", "Time"]
+    REQUIRED_SECTIONS = REQUIRED_SECTIONS
+
+    def __init__(self, cache_size: int = 256) -> None:
+        """
+        Initialize service.
+
+        Args:
+            cache_size: Max parsed documents kept (0 disables memoization)
+        """
+        self.cache_size = cache_size
+        self._documents: OrderedDict[bytes, IDOARRTDocument] = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def parse_document(self, markdown: str) -> IDOARRTDocument:
+        """Parse markdown and return the data together with all diagnostics."""
+        if self.cache_size <= 0:
+            return parse_idoarrt_document(markdown)
+
+        key = hashlib.sha256(markdown.encode("utf-8")).digest()
+        with self._lock:
+            document = self._documents.get(key)
+            if document is not None:
+                self._documents.move_to_end(key)
+                self.hits += 1
+                return document
+            self.misses += 1
+
+        document = parse_idoarrt_document(markdown)
+        with self._lock:
+            self._documents[key] = document
+            while len(self._documents) > self.cache_size:
+                self._documents.popitem(last=False)
+        return document
+
+    def validate_document(self, document: IDOARRTDocument) -> list[str]:
+        """Validate a parsed document's data, once per document."""
+        if document.validation_errors is None:
+            document.validation_errors = self.validate_idoarrt(document.data)
+        return list(document.validation_errors)
+
+    def cache_stats(self) -> dict[str, int]:
+        """Return memoization counters for logging or metrics endpoints."""
+        return {"entries": len(self._documents), "hits": self.hits, "misses": self.misses}
 
     def parse_idoarrt(self, markdown: str) -> dict[str, Any]:
         """
@@ -27,189 +298,22 @@ class IDOARRTService:
         Raises:
             IDOARRTParseError: If parsing fails or validation errors
         """
-        # Split into sections
-        sections = self._split_sections(markdown)
-
-        # Validate all required sections exist
-        missing_sections = [s for s in self.REQUIRED_SECTIONS if s not in sections]
-        if missing_sections:
-            raise IDOARRTParseError(f"Missing required sections: {', '.join(missing_sections)}")
-
-        # Parse each section
-        try:
-            intent = self._parse_intent(sections["Intent"])
-            desired_outcomes = self._parse_desired_outcomes(sections["Desired Outcomes"])
-            agenda = self._parse_agenda(sections["Agenda"])
-            roles = self._parse_roles(sections["Roles"])
-            rules = self._parse_rules(sections["Rules"])
-            total_duration_minutes = self._parse_time(sections["Time"])
-        except Exception as e:
-            raise IDOARRTParseError(f"Parsing error: {str(e)}") from e
-
-        # Validate agenda time allocations
-        agenda_total = sum(item["duration_minutes"] for item in agenda)
-        if agenda_total != total_duration_minutes:
-            raise IDOARRTParseError(
-                f"Agenda times ({agenda_total} min) don't match total time "
-                f"({total_duration_minutes} min)"
-            )
-
-        return {
-            "intent": intent,
-            "desired_outcomes": desired_outcomes,
-            "agenda": agenda,
-            "roles": roles,
-            "rules": rules,
-            "total_duration_minutes": total_duration_minutes,
-        }
-
-    def _split_sections(self, markdown: str) -> dict[str, str]:
-        """Split markdown into sections based on # headers."""
-        sections: dict[str, str] = {}
-        current_section: str | None = None
-        current_content: list[str] = []
-
-        for line in markdown.split("\n"):
-            # Check if line is a header
-            header_match = re.match(r"^#\s+(.+)$", line.strip())
-            if header_match:
-                # Save previous section
-                if current_section:
-                    sections[current_section] = "\n".join(current_content).strip()
-
-                # Start new section
-                current_section = header_match.group(1)
-                current_content = []
-            elif current_section:
-                current_content.append(line)
-
-        # Save last section
-        if current_section:
-            sections[current_section] = "\n".join(current_content).strip()
-
-        return sections
-
-    def _parse_intent(self, content: str) -> str:
-        """Parse Intent section."""
-        intent = content.strip()
-        if not intent:
-            raise IDOARRTParseError("Intent cannot be empty")
-        return intent
-
-    def _parse_desired_outcomes(self, content: str) -> list[str]:
-        """Parse Desired Outcomes section (bullet list)."""
-        outcomes = []
-        for line in content.split("\n"):
-            line = line.strip()
-            if line.startswith("-") or line.startswith("*"):
-                outcome = line[1:].strip()
-                if outcome:
-                    outcomes.append(outcome)
-
-        if not outcomes:
-            raise IDOARRTParseError("Desired Outcomes must have at least one item")
-
-        return outcomes
-
-    def _parse_agenda(self, content: str) -> list[dict[str, Any]]:
-        """
-        Parse Agenda section (numbered list with time allocations).
-
-        Expected format:
-        1. Topic name (15 min)
-        2. Another topic (20 min)
-        """
-        agenda = []
-        for line in content.split("\n"):
-            line = line.strip()
-            if not line:
-                continue
-
-            # Match numbered list with time: "1. Topic (15 min)"
-            match = re.match(r"^\d+\.\s+(.+?)\s*\((\d+)\s*min\)$", line, re.IGNORECASE)
-            if match:
-                topic = match.group(1).strip()
-                duration = int(match.group(2))
-                agenda.append({
-                    "topic": topic,
-                    "duration_minutes": duration,
-                })
-            else:
-                # Try without "min" suffix: "1. Topic (15)"
-                match = re.match(r"^\d+\.\s+(.+?)\s*\((\d+)\)$", line)
-                if match:
-                    topic = match.group(1).strip()
-                    duration = int(match.group(2))
-                    agenda.append({
-                        "topic": topic,
-                        "duration_minutes": duration,
-                    })
-                elif re.match(r"^\d+\.", line):
-                    # Numbered item without time allocation
-                    raise IDOARRTParseError(
-                        f"Agenda item missing time allocation: {line}"
-                    )
-
-        if not agenda:
-            raise IDOARRTParseError("Agenda must have at least one item")
-
-        return agenda
-
-    def _parse_roles(self, content: str) -> dict[str, str]:
-        """
-        Parse Roles section (bullet list with role: person).
+        return self.document_data(self.parse_document(markdown))
 
-        Expected format:
-        - Facilitator: Anna
-        - Timekeeper: Björn
+    @staticmethod
+    def document_data(document: IDOARRTDocument) -> dict[str, Any]:
         """
-        roles = {}
-        for line in content.split("\n"):
-            line = line.strip()
-            if line.startswith("-") or line.startswith("*"):
-                # Remove bullet
-                line = line[1:].strip()
-                # Split by colon
-                if ":" in line:
-                    role, person = line.split(":", 1)
-                    roles[role.strip()] = person.strip()
-
-        if not roles:
-            raise IDOARRTParseError("Roles must have at least one role defined")
-
-        return roles
-
-    def _parse_rules(self, content: str) -> list[str]:
-        """Parse Rules section (bullet list)."""
-        rules = []
-        for line in content.split("\n"):
-            line = line.strip()
-            if line.startswith("-") or line.startswith("*"):
-                rule = line[1:].strip()
-                if rule:
-                    rules.append(rule)
-
-        if not rules:
-            raise IDOARRTParseError("Rules must have at least one rule")
-
-        return rules
+        Return a parsed document's data, raising if it has diagnostics.
 
-    def _parse_time(self, content: str) -> int:
-        """
-        Parse Time section.
-
-        Expected format:
-        Total: 60 minutes
+        Raises:
+            IDOARRTParseError: With every diagnostic, in document order
         """
-        # Match "Total: XX minutes" or "Total: XX min"
-        match = re.search(r"Total:\s*(\d+)\s*(?:minutes?|min)?", content, re.IGNORECASE)
-        if match:
-            total = int(match.group(1))
-            if total <= 0:
-                raise IDOARRTParseError("Total time must be positive")
-            return total
-
-        raise IDOARRTParseError("Time section must contain 'Total: XX minutes'")
+        if document.diagnostics:
+            raise IDOARRTParseError(
+                "; ".join(str(diagnostic) for diagnostic in document.diagnostics),
+                document.diagnostics,
+            )
+        return copy_idoarrt_data(document.data)
 
     def validate_idoarrt(self, parsed_data: dict[str, Any]) -> list[str]:
         """
@@ -255,3 +359,15 @@ class IDOARRTService:
             errors.append("Total time must be positive")
 
         return errors
+
+
+# Global IDOARRT service instance (shared so its parse cache is too)
+_idoarrt_service: IDOARRTService | None = None
+
+
+def get_idoarrt_service() -> IDOARRTService:
+    """Get or create IDOARRT service instance."""
+    global _idoarrt_service
+    if _idoarrt_service is None:
+        _idoarrt_service = IDOARRTService()
+    return _idoarrt_service
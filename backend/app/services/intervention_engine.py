@@ -0,0 +1,487 @@
+"""Live intervention engine: turns transcribed chunks into facilitation interventions."""
+
+import asyncio
+import logging
+import time
+import uuid
+from collections import Counter, deque
+from collections.abc import Callable
+from datetime import datetime
+from functools import partial
+from typing import Any
+
+from sqlalchemy.orm import Session
+
+from app.core.event_bus import EventBus
+from app.core.websocket import WebSocketManager, websocket_manager
+from app.db.session import SessionLocal
+from app.models.meeting import Intervention, Meeting
+from app.schemas.websocket_events import (
+    InterventionQuestionEvent,
+    InterventionTriggeredEvent,
+    InterventionType,
+    WebSocketEventType,
+)
+from app.services.claude_service import AsyncClaudeService, get_async_claude_service
+from app.services.intervention_stream import stream_question_to_meeting
+from app.services.meeting_memory import MeetingMemory
+from app.services.protocol_service import ProtocolService, get_protocol_service
+from app.services.trigger_prescreen import TriggerPrescreener, cosine_similarity, tokenize
+
+logger = logging.getLogger(__name__)
+
+HISTORY_CHUNKS = 3
+
+
+class MeetingState:
+    """Per-meeting state kept by the engine between chunks."""
+
+    def __init__(self, meeting: Meeting, max_concurrent_analyses: int) -> None:
+        self.meeting_id = str(meeting.id)
+        self.context: dict[str, Any] = {
+            "intent": meeting.intent,
+            "desired_outcomes": list(meeting.desired_outcomes or []),
+            "agenda": list(meeting.agenda or []),
+        }
+        self.started_at: datetime = meeting.started_at or datetime.utcnow()  # type: ignore[assignment]
+        self.memory = MeetingMemory(self.context["agenda"])
+        self.history: deque[str] = deque(maxlen=HISTORY_CHUNKS)
+        # Fired interventions as (monotonic time, type, reason terms) for cooldown and dedup
+        self.fired: deque[tuple[float, str, Counter[str]]] = deque(maxlen=20)
+        self.analyses = asyncio.Semaphore(max_concurrent_analyses)
+        self.memory_lock = asyncio.Lock()
+        # Prescreened-out chunks, folded into the memory with the next analyzed one
+        self.pending_memory: list[str] = []
+
+    def elapsed_minutes(self) -> float:
+        """Minutes since the meeting started."""
+        return (datetime.utcnow() - self.started_at).total_seconds() / 60
+
+
+class InterventionEngine:
+    """
+    Analyze transcribed chunks in the background and deliver interventions.
+
+    ``submit`` is called from the upload endpoint and returns at once; the
+    analysis runs as a task. Per meeting the engine keeps the recent
+    transcription history, a rolling ``MeetingMemory`` and the interventions
+    already fired. A chunk is prescreened locally, then analyzed by Claude
+    (at most ``max_concurrent_analyses`` at a time per meeting). Triggers
+    below ``min_confidence``, of a type fired within ``cooldown_seconds`` or
+    with a reason similar to a recent intervention of the same type are
+    dropped. The rest are persisted as ``Intervention`` rows and sent to the
+    meeting's clients as ``InterventionTriggeredEvent`` followed by the
+    question (streamed in two-call mode). The memory is only updated with
+    chunks that pass the prescreen; the text of skipped chunks is carried
+    into that update, so a run of skipped chunks costs one memory call
+    (the prescreen forwards a chunk at least every few skips). After each
+    memory update the meeting's protocol is brought up to date through
+    ``protocol_service``.
+    ``drain`` waits for a meeting's chunks still in flight, so ending the
+    meeting and finishing its protocol see every chunk.
+
+    That state (and the per-meeting Claude limits) only holds if one
+    worker sees all of a meeting's chunks, so uploads must be routed by
+    meeting. ``claim_meeting`` enforces it: the first worker to analyze a
+    meeting holds a lease on ``bus`` and any other worker leaves the
+    meeting's chunks unanalyzed (counted as ``misrouted``).
+    """
+
+    def __init__(
+        self,
+        claude_service_factory: Callable[[], AsyncClaudeService] = get_async_claude_service,
+        session_factory: Callable[[], Session] = SessionLocal,
+        manager: WebSocketManager = websocket_manager,
+        prescreener: TriggerPrescreener | None = None,
+        max_concurrent_analyses: int = 2,
+        cooldown_seconds: float = 300.0,
+        dedup_window_seconds: float = 900.0,
+        dedup_similarity: float = 0.6,
+        min_confidence: float = 0.6,
+        protocol_service: ProtocolService | None = None,
+        drain_timeout_seconds: float = 30.0,
+        bus: EventBus | None = None,
+        ownership_ttl_seconds: float = 300.0,
+    ) -> None:
+        """
+        Initialize engine.
+
+        Args:
+            claude_service_factory: Returns the async Claude service (resolved lazily)
+            session_factory: Creates database sessions for persisting interventions
+            manager: WebSocket manager to send events through
+            prescreener: Local prescreen deciding which chunks reach Claude (None = all)
+            max_concurrent_analyses: Max chunks of one meeting analyzed at a time
+            cooldown_seconds: Min time between interventions of the same type
+            dedup_window_seconds: How long fired reasons are remembered for dedup
+            dedup_similarity: Reason similarity at which a trigger counts as repeated
+            min_confidence: Triggers below this confidence are ignored
+            protocol_service: Stores the incremental protocol (default: the shared instance)
+            drain_timeout_seconds: Default max wait in ``drain``
+            bus: Holds the per-meeting ownership leases (default: the manager's)
+            ownership_ttl_seconds: How long a meeting stays owned after its last chunk
+        """
+        self.claude_service_factory = claude_service_factory
+        self.session_factory = session_factory
+        self.manager = manager
+        self.prescreener = prescreener
+        self.max_concurrent_analyses = max_concurrent_analyses
+        self.cooldown_seconds = cooldown_seconds
+        self.dedup_window_seconds = dedup_window_seconds
+        self.dedup_similarity = dedup_similarity
+        self.min_confidence = min_confidence
+        self.protocol_service = protocol_service or get_protocol_service()
+        self.drain_timeout_seconds = drain_timeout_seconds
+        self.bus = bus if bus is not None else manager.bus
+        self.ownership_ttl_seconds = ownership_ttl_seconds
+        self._owner = uuid.uuid4().hex
+
+        self._states: dict[str, MeetingState] = {}
+        self._tasks: set[asyncio.Task[None]] = set()
+        # Kept apart from the state so chunks still run after forget_meeting can be drained
+        self._meeting_tasks: dict[str, set[asyncio.Task[None]]] = {}
+
+        self.chunks = 0
+        self.analyzed = 0
+        self.fired = 0
+        self.suppressed = 0
+        self.misrouted = 0
+        self.memory_updates = 0
+        self.memory_updates_avoided = 0
+
+    async def claim_meeting(self, meeting_id: str) -> bool:
+        """
+        Take or renew this worker's ownership of a meeting's analysis.
+
+        Args:
+            meeting_id: Meeting ID
+
+        Returns:
+            True if this worker may ``submit`` the meeting's chunks
+        """
+        try:
+            owned = await self.bus.claim(
+                f"intervention:{meeting_id}", self._owner, self.ownership_ttl_seconds
+            )
+        except ConnectionError as e:
+            # Without the broker no other worker can be told apart, so carry on here
+            logger.warning(f"Could not claim meeting {meeting_id}: {e}")
+            return True
+        if not owned:
+            self.misrouted += 1
+            logger.warning(
+                f"Meeting {meeting_id} is analyzed by another worker; "
+                "route its uploads to one worker"
+            )
+        return owned
+
+    def submit(self, meeting: Meeting, chunk_number: int, transcription: str) -> asyncio.Task[None]:
+        """
+        Schedule analysis of a transcribed chunk without waiting for it.
+
+        Must be called in chunk order: history and prescreen state are
+        updated here, before the background task starts.
+
+        Args:
+            meeting: Active meeting (only read here, never kept)
+            chunk_number: Sequential chunk number
+            transcription: Chunk transcription
+
+        Returns:
+            Background task doing the analysis
+        """
+        state = self._states.get(str(meeting.id))
+        if state is None:
+            state = MeetingState(meeting, self.max_concurrent_analyses)
+            self._states[state.meeting_id] = state
+
+        history = list(state.history)
+        state.history.append(transcription)
+        self.chunks += 1
+
+        analyze = bool(transcription.strip())
+        if analyze and self.prescreener is not None:
+            analyze = self.prescreener.evaluate(
+                state.meeting_id, transcription, state.context
+            ).should_analyze
+
+        memory_texts: list[str] = []
+        if analyze:
+            memory_texts, state.pending_memory = [*state.pending_memory, transcription], []
+        elif transcription.strip():
+            state.pending_memory.append(transcription)
+
+        return self._track(state.meeting_id, asyncio.create_task(
+            self._process_chunk(state, chunk_number, transcription, history, analyze, memory_texts)
+        ))
+
+    async def drain(self, meeting_id: str, timeout: float | None = None) -> bool:
+        """
+        Wait for a meeting's chunks in flight, memory and protocol updates included.
+
+        Args:
+            meeting_id: Meeting ID
+            timeout: Max seconds to wait (default: ``drain_timeout_seconds``)
+
+        Returns:
+            True if nothing is left running for the meeting
+        """
+        state = self._states.get(meeting_id)
+        if state is not None and state.pending_memory:
+            # Skipped chunks at the end have no analyzed chunk to ride along with
+            texts, state.pending_memory = state.pending_memory, []
+            claude = self.claude_service_factory()
+            self._track(meeting_id, asyncio.create_task(self._update_memory(claude, state, texts)))
+
+        tasks = self._meeting_tasks.get(meeting_id)
+        if not tasks:
+            return True
+        _, pending = await asyncio.wait(
+            set(tasks), timeout=self.drain_timeout_seconds if timeout is None else timeout
+        )
+        if pending:
+            logger.warning(
+                f"{len(pending)} chunk(s) of meeting {meeting_id} still running after drain"
+            )
+        return not pending
+
+    def forget_meeting(self, meeting_id: str) -> None:
+        """Drop per-meeting state once a meeting has ended."""
+        if self._states.pop(meeting_id, None) is None:
+            return
+        if self.prescreener is not None:
+            self.prescreener.forget_meeting(meeting_id)
+        self.claude_service_factory().forget_meeting(meeting_id)
+
+    async def aclose(self) -> None:
+        """Wait for analyses in flight (used on shutdown)."""
+        if self._tasks:
+            await asyncio.gather(*self._tasks, return_exceptions=True)
+
+    def stats(self) -> dict[str, Any]:
+        """Return counters for logging or metrics endpoints."""
+        return {
+            "meetings": len(self._states),
+            "in_flight": len(self._tasks),
+            "chunks": self.chunks,
+            "analyzed": self.analyzed,
+            "fired": self.fired,
+            "suppressed": self.suppressed,
+            "misrouted": self.misrouted,
+            "memory_updates": self.memory_updates,
+            "memory_updates_avoided": self.memory_updates_avoided,
+        }
+
+    def _track(self, meeting_id: str, task: asyncio.Task[None]) -> asyncio.Task[None]:
+        self._tasks.add(task)
+        self._meeting_tasks.setdefault(meeting_id, set()).add(task)
+        task.add_done_callback(partial(self._task_done, meeting_id))
+        return task
+
+    def _task_done(self, meeting_id: str, task: asyncio.Task[None]) -> None:
+        self._tasks.discard(task)
+        tasks = self._meeting_tasks.get(meeting_id)
+        if tasks is not None:
+            tasks.discard(task)
+            if not tasks:
+                del self._meeting_tasks[meeting_id]
+        if not task.cancelled() and task.exception() is not None:
+            logger.error(f"Intervention analysis failed: {task.exception()!r}")
+
+    async def _process_chunk(
+        self,
+        state: MeetingState,
+        chunk_number: int,
+        transcription: str,
+        history: list[str],
+        analyze: bool,
+        memory_texts: list[str],
+    ) -> None:
+        """Analyze one chunk, deliver its interventions and fold ``memory_texts`` into memory."""
+        claude = self.claude_service_factory()
+        memory_update = (
+            asyncio.create_task(self._update_memory(claude, state, memory_texts))
+            if memory_texts
+            else None
+        )
+
+        if analyze:
+            async with state.analyses:
+                self.analyzed += 1
+                if claude.facilitation_mode == "combined":
+                    result = await claude.facilitate(
+                        transcription,
+                        state.context,
+                        history,
+                        state.memory,
+                        meeting_id=state.meeting_id,
+                    )
+                else:
+                    # Questions are streamed per delivered trigger instead
+                    result = await claude.analyze_transcription_for_triggers(
+                        transcription,
+                        state.context,
+                        history,
+                        state.memory,
+                        meeting_id=state.meeting_id,
+                    )
+            for trigger in self._select(state, result.get("triggers", [])):
+                await self._deliver(claude, state, chunk_number, transcription, trigger)
+
+        if memory_update is not None:
+            await memory_update
+
+    async def _update_memory(
+        self, claude: AsyncClaudeService, state: MeetingState, texts: list[str]
+    ) -> None:
+        # One call for the analyzed chunk and the skipped chunks before it
+        self.memory_updates += 1
+        self.memory_updates_avoided += len(texts) - 1
+        # Serialized per meeting so each update builds on the previous summary
+        async with state.memory_lock:
+            updated = await claude.update_meeting_memory(
+                state.memory,
+                "\n\n".join(texts),
+                state.elapsed_minutes(),
+                meeting_id=state.meeting_id,
+            )
+            if updated:
+                self._persist_protocol(state)
+
+    def _select(self, state: MeetingState, triggers: list[dict[str, Any]]) -> list[dict[str, Any]]:
+        """Keep the strongest new trigger per type, dropping repeats and cooldowns."""
+        now = time.monotonic()
+        best: dict[str, dict[str, Any]] = {}
+        for trigger in triggers:
+            if trigger.get("confidence", 0.0) < self.min_confidence:
+                continue
+            current = best.get(trigger["type"])
+            if current is None or trigger["confidence"] > current["confidence"]:
+                best[trigger["type"]] = trigger
+
+        selected = []
+        for trigger_type, trigger in best.items():
+            terms = Counter(tokenize(trigger.get("reason", "")))
+            repeated = any(
+                fired_type == trigger_type
+                and (
+                    now - fired_at < self.cooldown_seconds
+                    or (
+                        now - fired_at < self.dedup_window_seconds
+                        and cosine_similarity(terms, fired_terms) >= self.dedup_similarity
+                    )
+                )
+                for fired_at, fired_type, fired_terms in state.fired
+            )
+            if repeated:
+                self.suppressed += 1
+                continue
+            state.fired.append((now, trigger_type, terms))
+            selected.append(trigger)
+        return selected
+
+    async def _deliver(
+        self,
+        claude: AsyncClaudeService,
+        state: MeetingState,
+        chunk_number: int,
+        transcription: str,
+        trigger: dict[str, Any],
+    ) -> None:
+        """Persist an intervention and send it to the meeting's clients."""
+        intervention_type = InterventionType(trigger["type"])
+        intervention_id = self._persist(state.meeting_id, chunk_number, trigger)
+        self.fired += 1
+
+        await self.manager.send_event(
+            state.meeting_id,
+            WebSocketEventType.INTERVENTION_TRIGGERED,
+            InterventionTriggeredEvent(
+                intervention_type=intervention_type,
+                reason=trigger.get("reason", ""),
+                intervention_id=intervention_id,
+            ),
+        )
+
+        question = trigger.get("question")
+        if question:
+            await self.manager.send_event(
+                state.meeting_id,
+                WebSocketEventType.INTERVENTION_QUESTION,
+                InterventionQuestionEvent(
+                    intervention_type=intervention_type,
+                    question=question,
+                    context=trigger.get("reason"),
+                    intervention_id=intervention_id,
+                ),
+            )
+            return
+
+        # Two-call mode: stream the question so it starts appearing at once
+        question = await stream_question_to_meeting(
+            claude,
+            state.meeting_id,
+            intervention_type,
+            {**state.context, "reason": trigger.get("reason", "")},
+            transcription,
+            manager=self.manager,
+            intervention_id=intervention_id,
+        )
+        self._persist_question(intervention_id, question)
+
+    def _persist(self, meeting_id: str, chunk_number: int, trigger: dict[str, Any]) -> str:
+        db = self.session_factory()
+        try:
+            intervention = Intervention(
+                meeting_id=meeting_id,
+                intervention_type=trigger["type"],
+                trigger_context={
+                    "reason": trigger.get("reason", ""),
+                    "confidence": trigger.get("confidence"),
+                    "chunk_number": chunk_number,
+                },
+                question=trigger.get("question"),
+            )
+            db.add(intervention)
+            db.commit()
+            return str(intervention.id)
+        finally:
+            db.close()
+
+    def _persist_protocol(self, state: MeetingState) -> None:
+        db = self.session_factory()
+        try:
+            # A no-op once the meeting is completed, so late updates cannot outrun the final pass
+            self.protocol_service.record_memory(db, state.meeting_id, state.memory)
+        finally:
+            db.close()
+
+    def _persist_question(self, intervention_id: str, question: str) -> None:
+        db = self.session_factory()
+        try:
+            db.query(Intervention).filter(Intervention.id == intervention_id).update(
+                {"question": question}
+            )
+            db.commit()
+        finally:
+            db.close()
+
+
+# Global instance
+_intervention_engine: InterventionEngine | None = None
+
+
+def get_intervention_engine() -> InterventionEngine:
+    """Get or create global intervention engine."""
+    global _intervention_engine
+    if _intervention_engine is None:
+        _intervention_engine = InterventionEngine(prescreener=TriggerPrescreener())
+    return _intervention_engine
+
+
+async def close_intervention_engine() -> None:
+    """Let in-flight analyses finish (called on application shutdown)."""
+    global _intervention_engine
+    if _intervention_engine is not None:
+        await _intervention_engine.aclose()
+        _intervention_engine = None
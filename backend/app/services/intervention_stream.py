@@ -0,0 +1,79 @@
+"""Stream facilitation questions to the live meeting view."""
+
+import uuid
+from typing import Any
+
+from app.core.websocket import WebSocketManager, websocket_manager
+from app.schemas.websocket_events import (
+    InterventionQuestionDeltaEvent,
+    InterventionQuestionEvent,
+    InterventionType,
+    WebSocketEventType,
+)
+from app.services.claude_service import AsyncClaudeService
+
+
+async def stream_question_to_meeting(
+    claude_service: AsyncClaudeService,
+    meeting_id: str,
+    intervention_type: InterventionType,
+    context: dict[str, Any],
+    transcription: str,
+    manager: WebSocketManager = websocket_manager,
+    intervention_id: str | None = None,
+) -> str:
+    """
+    Generate a facilitation question and stream it to the meeting's clients.
+
+    Every text fragment is sent as an ``INTERVENTION_QUESTION`` event
+    carrying ``stream_id``, ``index`` and ``delta``; clients append deltas
+    with the same ``stream_id`` in index order. A final
+    ``InterventionQuestionEvent`` with the same ``stream_id`` carries the
+    complete question, so clients that ignore deltas keep working and
+    streaming clients can replace their partial text.
+
+    Args:
+        claude_service: Async Claude service
+        meeting_id: Meeting ID
+        intervention_type: Trigger the question addresses
+        context: Meeting context and trigger details
+        transcription: Recent transcription for context
+        manager: WebSocket manager to send events through
+        intervention_id: Persisted intervention, also used as the stream ID
+
+    Returns:
+        Complete facilitation question
+    """
+    stream_id = intervention_id or uuid.uuid4().hex
+    index = 0
+
+    async def send_delta(text: str) -> None:
+        nonlocal index
+        await manager.send_event(
+            meeting_id,
+            WebSocketEventType.INTERVENTION_QUESTION,
+            InterventionQuestionDeltaEvent(
+                stream_id=stream_id,
+                intervention_type=intervention_type,
+                index=index,
+                delta=text,
+            ),
+        )
+        index += 1
+
+    question = await claude_service.stream_facilitation_question(
+        intervention_type.value, context, transcription, send_delta, meeting_id=meeting_id
+    )
+
+    await manager.send_event(
+        meeting_id,
+        WebSocketEventType.INTERVENTION_QUESTION,
+        InterventionQuestionEvent(
+            intervention_type=intervention_type,
+            question=question,
+            context=context.get("reason"),
+            intervention_id=intervention_id,
+            stream_id=stream_id,
+        ),
+    )
+    return question
@@ -0,0 +1,261 @@
+"""Bulk import of IDOARRT documents as meetings."""
+
+import io
+import os
+import tarfile
+import uuid
+import zipfile
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import Any
+
+from sqlalchemy import insert
+from sqlalchemy.orm import Session
+
+from app.models.meeting import Meeting
+from app.services.idoarrt_service import copy_idoarrt_data, get_idoarrt_service
+
+# Same limit as StrictMeetingCreate
+MAX_DOCUMENT_CHARS = 10000
+MAX_DOCUMENTS = 10000
+MAX_ARCHIVE_BYTES = 50 * 1024 * 1024
+# Upper bound on UTF-8 bytes for MAX_DOCUMENT_CHARS; larger members are not decompressed
+_MAX_DOCUMENT_BYTES = MAX_DOCUMENT_CHARS * 4
+MARKDOWN_SUFFIXES = (".md", ".markdown")
+
+
+class MeetingImportError(Exception):
+    """Raised when an import source cannot be read at all."""
+    pass
+
+
+class ImportedFile:
+    """Outcome of importing one file."""
+
+    __slots__ = ("name", "markdown", "data", "errors", "meeting_id")
+
+    def __init__(
+        self, name: str, markdown: str | None = None, errors: list[str] | None = None
+    ) -> None:
+        self.name = name
+        self.markdown = markdown
+        self.data: dict[str, Any] | None = None
+        self.errors = errors or []
+        self.meeting_id: str | None = None
+
+    def as_dict(self) -> dict[str, Any]:
+        """Per-file result as returned by the API and printed by the CLI."""
+        return {
+            "file": self.name,
+            "success": self.data is not None,
+            "meeting_id": self.meeting_id,
+            "validation_errors": self.errors,
+        }
+
+
+def _too_large(name: str) -> ImportedFile:
+    return ImportedFile(name, errors=[f"Document exceeds {MAX_DOCUMENT_CHARS} characters"])
+
+
+def _decode(name: str, raw: bytes) -> ImportedFile:
+    try:
+        markdown = raw.decode("utf-8-sig")
+    except UnicodeDecodeError:
+        return ImportedFile(name, errors=["File is not valid UTF-8"])
+    if len(markdown) > MAX_DOCUMENT_CHARS:
+        return _too_large(name)
+    return ImportedFile(name, markdown)
+
+
+def _check_count(count: int) -> None:
+    if count > MAX_DOCUMENTS:
+        raise MeetingImportError(f"Import is limited to {MAX_DOCUMENTS} documents")
+
+
+def read_directory(path: str | Path) -> list[ImportedFile]:
+    """Read every markdown file below ``path``, in name order."""
+    root = Path(path)
+    paths = sorted(
+        p for p in root.rglob("*") if p.is_file() and p.suffix.lower() in MARKDOWN_SUFFIXES
+    )
+    _check_count(len(paths))
+    return [_decode(str(p.relative_to(root)), p.read_bytes()) for p in paths]
+
+
+def _read_tar_member(archive: tarfile.TarFile, member: tarfile.TarInfo) -> ImportedFile:
+    if member.size > _MAX_DOCUMENT_BYTES:
+        return _too_large(member.name)
+    stream = archive.extractfile(member)
+    if stream is None:
+        return ImportedFile(member.name, errors=["Archive member could not be read"])
+    with stream:
+        return _decode(member.name, stream.read())
+
+
+def read_archive(data: bytes) -> list[ImportedFile]:
+    """
+    Read every markdown file in a zip or (compressed) tar archive.
+
+    Raises:
+        MeetingImportError: If the data is not a supported archive or too large
+    """
+    if len(data) > MAX_ARCHIVE_BYTES:
+        raise MeetingImportError(f"Archive exceeds {MAX_ARCHIVE_BYTES // (1024 * 1024)} MB")
+    if zipfile.is_zipfile(io.BytesIO(data)):
+        with zipfile.ZipFile(io.BytesIO(data)) as archive:
+            infos = sorted(
+                (
+                    info for info in archive.infolist()
+                    if not info.is_dir() and info.filename.lower().endswith(MARKDOWN_SUFFIXES)
+                ),
+                key=lambda info: info.filename,
+            )
+            _check_count(len(infos))
+            return [
+                _decode(info.filename, archive.read(info))
+                if info.file_size <= _MAX_DOCUMENT_BYTES
+                else _too_large(info.filename)
+                for info in infos
+            ]
+
+    try:
+        with tarfile.open(fileobj=io.BytesIO(data), mode="r:*") as archive:
+            members = sorted(
+                (
+                    m for m in archive.getmembers()
+                    if m.isfile() and m.name.lower().endswith(MARKDOWN_SUFFIXES)
+                ),
+                key=lambda m: m.name,
+            )
+            _check_count(len(members))
+            return [_read_tar_member(archive, m) for m in members]
+    except tarfile.TarError as e:
+        raise MeetingImportError("Expected a .zip, .tar or .tar.gz archive") from e
+
+
+def read_source(path: str | Path) -> list[ImportedFile]:
+    """Read a directory or an archive file."""
+    if os.path.isdir(path):
+        return read_directory(path)
+    return read_archive(Path(path).read_bytes())
+
+
+def _parse(markdown: str) -> tuple[dict[str, Any] | None, list[str]]:
+    # Module level so process pool workers can unpickle it
+    service = get_idoarrt_service()
+    document = service.parse_document(markdown)
+    if document.diagnostics:
+        return None, [str(diagnostic) for diagnostic in document.diagnostics]
+    errors = service.validate_document(document)
+    # Parsed documents are cached and shared; the importer must not hold the original
+    return (None, errors) if errors else (copy_idoarrt_data(document.data), [])
+
+
+class MeetingImportService:
+    """
+    Parse many IDOARRT documents and insert the valid ones together.
+
+    Parsing costs tens of microseconds per document, so it runs inline
+    unless a batch is large enough for a process pool to pay off; the
+    database work is one multi-row insert in a single transaction.
+    """
+
+    def __init__(self, max_workers: int | None = None, parallel_threshold: int = 5000) -> None:
+        """
+        Initialize service.
+
+        Args:
+            max_workers: Parser processes for large batches (None = CPU count, 1 = inline)
+            parallel_threshold: Smallest batch parsed in a process pool
+        """
+        self.max_workers = max_workers
+        self.parallel_threshold = parallel_threshold
+
+    def parse(self, files: list[ImportedFile]) -> list[ImportedFile]:
+        """Parse and validate files in place; returns ``files``."""
+        pending = [(f, f.markdown) for f in files if f.markdown is not None]
+        markdowns = [markdown for _, markdown in pending]
+        workers = self.max_workers or os.cpu_count() or 1
+        if workers > 1 and len(markdowns) >= self.parallel_threshold:
+            with ProcessPoolExecutor(max_workers=workers) as executor:
+                chunksize = max(1, len(markdowns) // (workers * 4))
+                parsed = list(executor.map(_parse, markdowns, chunksize=chunksize))
+        else:
+            parsed = [_parse(markdown) for markdown in markdowns]
+
+        for (imported, _), (data, errors) in zip(pending, parsed, strict=True):
+            imported.data = data
+            imported.errors = errors
+        return files
+
+    def insert(self, db: Session, files: list[ImportedFile]) -> int:
+        """
+        Insert a meeting for every valid file in one transaction.
+
+        Returns:
+            Number of meetings created
+        """
+        rows = []
+        for imported in files:
+            if imported.data is None:
+                continue
+            meeting_id = str(uuid.uuid4())
+            rows.append({
+                "id": meeting_id,
+                "intent": imported.data["intent"],
+                "desired_outcomes": imported.data["desired_outcomes"],
+                "agenda": imported.data["agenda"],
+                "roles": imported.data["roles"],
+                "rules": imported.data["rules"],
+                "total_duration_minutes": imported.data["total_duration_minutes"],
+                "status": "preparation",
+            })
+            imported.meeting_id = meeting_id
+        if not rows:
+            return 0
+
+        try:
+            db.execute(insert(Meeting), rows)
+            db.commit()
+        except Exception:
+            db.rollback()
+            for imported in files:
+                imported.meeting_id = None
+            raise
+        return len(rows)
+
+    def import_files(
+        self, db: Session, files: list[ImportedFile], dry_run: bool = False
+    ) -> dict[str, Any]:
+        """
+        Parse, validate and (unless ``dry_run``) insert files.
+
+        Returns:
+            Summary with per-file results in input order
+        """
+        return self.store(db, self.parse(files), dry_run)
+
+    def store(
+        self, db: Session, files: list[ImportedFile], dry_run: bool = False
+    ) -> dict[str, Any]:
+        """Insert already parsed files (unless ``dry_run``) and summarize them."""
+        imported = 0 if dry_run else self.insert(db, files)
+        return {
+            "imported": imported,
+            "valid": sum(1 for f in files if f.data is not None),
+            "failed": sum(1 for f in files if f.data is None),
+            "dry_run": dry_run,
+            "results": [f.as_dict() for f in files],
+        }
+
+
+# Global import service instance
+_import_service: MeetingImportService | None = None
+
+
+def get_meeting_import_service() -> MeetingImportService:
+    """Get or create meeting import service instance."""
+    global _import_service
+    if _import_service is None:
+        _import_service = MeetingImportService()
+    return _import_service
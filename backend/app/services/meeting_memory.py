@@ -0,0 +1,191 @@
+"""Rolling, constant-size meeting memory for trigger analysis."""
+
+from typing import Any
+
+# Rough conversion used for budgeting; Swedish text averages ~4 characters per token
+CHARS_PER_TOKEN = 4
+DEFAULT_TOKEN_BUDGET = 600
+SUMMARY_MAX_WORDS = 60
+# Recent decisions and action items shown to each update so they are not reported again
+RECENT_OUTCOMES = 5
+
+
+def estimate_tokens(text: str) -> int:
+    """Estimate token count of ``text`` without calling the tokenizer."""
+    return (len(text) + CHARS_PER_TOKEN - 1) // CHARS_PER_TOKEN
+
+
+class MeetingMemory:
+    """
+    Incremental summary of a meeting, one entry per agenda item.
+
+    The summary of the current agenda item is rewritten once per chunk
+    (see ``ClaudeService.update_meeting_memory``), so the input to each
+    update is constant-size. ``render`` produces text that always fits in
+    ``token_budget``, which keeps the trigger-analysis prompt the same size
+    whether the meeting has run for 6 minutes or 3 hours.
+
+    The same update also reports decisions and action items first heard in
+    the chunk; they accumulate in ``decisions`` and ``action_items`` and
+    become the protocol's (see ``ProtocolService``).
+    """
+
+    def __init__(
+        self,
+        agenda: list[dict[str, Any]],
+        token_budget: int = DEFAULT_TOKEN_BUDGET,
+    ) -> None:
+        """
+        Initialize empty memory.
+
+        Args:
+            agenda: Meeting agenda as a list of {topic, duration_minutes}
+            token_budget: Max tokens of rendered memory
+        """
+        self.agenda = agenda
+        self.token_budget = token_budget
+        self.summaries: list[str] = ["" for _ in agenda]
+        self.speaker_counts: dict[str, int] = {}
+        self.decisions: list[str] = []
+        self.action_items: list[dict[str, str]] = []
+        self.chunks_seen = 0
+        self.last_item_index = 0
+
+    def current_item_index(self, elapsed_minutes: float) -> int:
+        """Return the agenda item scheduled at ``elapsed_minutes`` into the meeting."""
+        end = 0.0
+        for index, item in enumerate(self.agenda):
+            end += item.get("duration_minutes", 0)
+            if elapsed_minutes < end:
+                return index
+        return max(0, len(self.agenda) - 1)
+
+    def apply_update(
+        self,
+        item_index: int,
+        summary: str,
+        speakers: list[str],
+        decisions: list[str] | None = None,
+        action_items: list[dict[str, str]] | None = None,
+    ) -> None:
+        """
+        Store the rewritten summary for one agenda item.
+
+        Args:
+            item_index: Agenda item the chunk belongs to
+            summary: New cumulative summary for that item
+            speakers: People heard speaking in the chunk
+            decisions: Decisions made in the chunk
+            action_items: Action items agreed in the chunk, as {task, owner}
+        """
+        if 0 <= item_index < len(self.summaries):
+            self.summaries[item_index] = " ".join(summary.split())
+        for speaker in speakers:
+            name = speaker.strip()
+            if name:
+                self.speaker_counts[name] = self.speaker_counts.get(name, 0) + 1
+        self.add_outcomes(decisions, action_items)
+        self.chunks_seen += 1
+        self.last_item_index = item_index
+
+    def add_outcomes(
+        self,
+        decisions: list[str] | None = None,
+        action_items: list[dict[str, str]] | None = None,
+    ) -> None:
+        """Append decisions and action items not already recorded."""
+        # Chunks overlap in content, so the same decision may be reported twice
+        known = {self._normalize(decision) for decision in self.decisions}
+        for decision in decisions or []:
+            text = " ".join(decision.split())
+            if text and self._normalize(text) not in known:
+                known.add(self._normalize(text))
+                self.decisions.append(text)
+        known_tasks = {self._normalize(item["task"]) for item in self.action_items}
+        for item in action_items or []:
+            task = " ".join(item.get("task", "").split())
+            if task and self._normalize(task) not in known_tasks:
+                known_tasks.add(self._normalize(task))
+                owner = " ".join(item.get("owner", "").split())
+                self.action_items.append({"task": task, "owner": owner})
+
+    def agenda_summary(self) -> dict[str, str]:
+        """Summaries of the agenda items discussed so far, by topic."""
+        return {
+            item.get("topic", ""): summary
+            for item, summary in zip(self.agenda, self.summaries, strict=True)
+            if summary
+        }
+
+    def render_recent_outcomes(self) -> str:
+        """The latest decisions and action items, for the next update prompt."""
+        lines = [f"- Beslut: {decision}" for decision in self.decisions[-RECENT_OUTCOMES:]]
+        lines += [
+            f"- Åtgärd: {item['task']}" + (f" ({item['owner']})" if item["owner"] else "")
+            for item in self.action_items[-RECENT_OUTCOMES:]
+        ]
+        return "\n".join(lines) or "Inga"
+
+    def render(self) -> str:
+        """
+        Render memory as prompt text within ``token_budget``.
+
+        The current agenda item keeps up to half the budget; the remaining
+        items share the rest, so older items are compressed first.
+        """
+        speakers = self._render_speakers()
+        items = [
+            (index, item, summary)
+            for index, (item, summary) in enumerate(zip(self.agenda, self.summaries, strict=True))
+            if summary
+        ]
+        if not items and not speakers:
+            return "Inget har diskuterats ännu"
+
+        prefixes = {
+            index: f"{index + 1}. {item.get('topic', '')} "
+            f"({'pågår' if index == self.last_item_index else 'diskuterad'}): "
+            for index, item, _ in items
+        }
+        budget_chars = (
+            self.token_budget * CHARS_PER_TOKEN
+            - len(speakers)
+            - sum(len(prefix) + 1 for prefix in prefixes.values())
+        )
+        current = [entry for entry in items if entry[0] == self.last_item_index]
+        others = [entry for entry in items if entry[0] != self.last_item_index]
+
+        allowances: dict[int, int] = {}
+        remaining = budget_chars
+        if current:
+            allowances[self.last_item_index] = min(len(current[0][2]), budget_chars // 2)
+            remaining -= allowances[self.last_item_index]
+        for index, _, summary in others:
+            allowances[index] = min(len(summary), remaining // max(1, len(others)))
+
+        lines = [
+            prefixes[index] + self._truncate(summary, allowances[index])
+            for index, _, summary in items
+        ]
+        if speakers:
+            lines.append(speakers)
+        return "\n".join(lines)
+
+    def _render_speakers(self) -> str:
+        if not self.speaker_counts:
+            return ""
+        ranked = sorted(self.speaker_counts.items(), key=lambda kv: -kv[1])[:10]
+        heard = ", ".join(f"{name} ({count})" for name, count in ranked)
+        return f"Har hörts (antal chunks): {heard} av {self.chunks_seen} chunks"
+
+    @staticmethod
+    def _normalize(text: str) -> str:
+        return " ".join(text.lower().split()).rstrip(".")
+
+    @staticmethod
+    def _truncate(text: str, max_chars: int) -> str:
+        if len(text) <= max_chars:
+            return text
+        if max_chars <= 1:
+            return "…"
+        return text[: max_chars - 1].rsplit(" ", 1)[0] + "…"
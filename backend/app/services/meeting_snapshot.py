@@ -0,0 +1,67 @@
+"""Compact meeting state for WebSocket clients that cannot resume by replay."""
+
+from sqlalchemy import func
+from sqlalchemy.orm import Session
+
+from app.models.meeting import AudioChunk, Intervention, Meeting
+from app.schemas.websocket_events import MeetingSnapshotEvent
+
+
+class MeetingSnapshotService:
+    """Build meeting snapshots without loading or decrypting transcripts."""
+
+    @staticmethod
+    def build(
+        db: Session, meeting_id: str, max_interventions: int = 20
+    ) -> MeetingSnapshotEvent | None:
+        """
+        Build the snapshot sent to a reconnecting client.
+
+        Transcriptions are not included, only how far transcription has
+        come; clients fetch text over REST if they need it.
+
+        Args:
+            db: Database session
+            meeting_id: Meeting ID
+            max_interventions: How many of the latest interventions to include
+
+        Returns:
+            Snapshot, or None if the meeting does not exist
+        """
+        meeting = db.query(Meeting).filter(Meeting.id == meeting_id).first()
+        if meeting is None:
+            return None
+
+        transcribed: int
+        last_chunk: int | None
+        transcribed, last_chunk = (
+            db.query(func.count(AudioChunk.id), func.max(AudioChunk.chunk_number))
+            .filter(AudioChunk.meeting_id == meeting_id, AudioChunk._transcription.isnot(None))
+            .one()
+        )
+        interventions = (
+            db.query(Intervention)
+            .filter(Intervention.meeting_id == meeting_id)
+            .order_by(Intervention.created_at.desc())
+            .limit(max_interventions)
+            .all()
+        )
+
+        return MeetingSnapshotEvent(
+            meeting_id=meeting.id,
+            status=meeting.status,
+            started_at=meeting.started_at,
+            total_duration_minutes=meeting.total_duration_minutes,
+            time_extensions_seconds=meeting.time_extensions_seconds,
+            transcribed_chunks=transcribed,
+            last_chunk_number=last_chunk,
+            interventions=[
+                {
+                    "intervention_id": intervention.id,
+                    "intervention_type": intervention.intervention_type,
+                    "question": intervention.question,
+                    "created_at": intervention.created_at,
+                }
+                for intervention in reversed(interventions)
+            ],
+        )
@@ -0,0 +1,100 @@
+"""Reusable IDOARRT templates that meetings are created from without parsing."""
+
+from typing import Any
+
+from sqlalchemy.orm import Session
+
+from app.models.meeting import Meeting, MeetingTemplate
+from app.schemas.meeting import MeetingTemplateOverrides
+from app.services.idoarrt_service import IDOARRTService, copy_idoarrt_data, get_idoarrt_service
+
+IDOARRT_FIELDS = (
+    "intent", "desired_outcomes", "agenda", "roles", "rules", "total_duration_minutes"
+)
+
+
+class MeetingTemplateService:
+    """
+    Store parsed IDOARRT documents and create meetings from them.
+
+    A template is parsed and validated once when it is stored. Creating a
+    meeting from it copies the stored data, applies the overrides (a
+    series typically only changes the intent's date or who holds which
+    role) and validates the result, which needs no markdown at all.
+    """
+
+    def __init__(self, idoarrt_service: IDOARRTService | None = None) -> None:
+        """
+        Initialize service.
+
+        Args:
+            idoarrt_service: Parser and validator (default: the shared instance)
+        """
+        self.idoarrt_service = idoarrt_service or get_idoarrt_service()
+
+    def create_template(
+        self, db: Session, name: str, markdown: str
+    ) -> tuple[MeetingTemplate | None, list[str]]:
+        """
+        Parse, validate and store a template.
+
+        Returns:
+            (template, []) on success, (None, errors) otherwise
+        """
+        document = self.idoarrt_service.parse_document(markdown)
+        if document.diagnostics:
+            return None, [str(diagnostic) for diagnostic in document.diagnostics]
+        errors = self.idoarrt_service.validate_document(document)
+        if errors:
+            return None, errors
+
+        template = MeetingTemplate(name=name, **copy_idoarrt_data(document.data))
+        db.add(template)
+        db.commit()
+        db.refresh(template)
+        return template, []
+
+    @staticmethod
+    def apply_overrides(
+        template: MeetingTemplate, overrides: MeetingTemplateOverrides
+    ) -> dict[str, Any]:
+        """Template data with overrides applied; roles are merged, other fields replaced."""
+        data = copy_idoarrt_data({field: getattr(template, field) for field in IDOARRT_FIELDS})
+        changes = overrides.model_dump(exclude_none=True)
+        roles = changes.pop("roles", None)
+        if roles:
+            data["roles"].update(roles)
+        data.update(changes)
+        return data
+
+    def create_meeting(
+        self, db: Session, template: MeetingTemplate, overrides: MeetingTemplateOverrides
+    ) -> tuple[Meeting | None, dict[str, Any], list[str]]:
+        """
+        Create a meeting in preparation from a template.
+
+        Returns:
+            (meeting or None, the meeting's IDOARRT data, validation errors)
+        """
+        data = self.apply_overrides(template, overrides)
+        errors = self.idoarrt_service.validate_idoarrt(data)
+        if errors:
+            return None, data, errors
+
+        meeting = Meeting(**data, status="preparation")
+        db.add(meeting)
+        db.commit()
+        db.refresh(meeting)
+        return meeting, data, []
+
+
+# Global template service instance
+_template_service: MeetingTemplateService | None = None
+
+
+def get_meeting_template_service() -> MeetingTemplateService:
+    """Get or create meeting template service instance."""
+    global _template_service
+    if _template_service is None:
+        _template_service = MeetingTemplateService()
+    return _template_service
@@ -0,0 +1,426 @@
+"""Server-side time warnings and agenda transitions for active meetings."""
+
+import asyncio
+import contextlib
+import heapq
+import itertools
+import logging
+import time
+import uuid
+from collections.abc import Callable
+from datetime import UTC, datetime
+from typing import Any
+
+from pydantic import BaseModel
+from sqlalchemy.orm import Session
+
+from app.core.event_bus import EventBus
+from app.core.websocket import WebSocketManager, websocket_manager
+from app.db.session import SessionLocal
+from app.models.meeting import Meeting
+from app.schemas.websocket_events import (
+    AgendaItemStartedEvent,
+    TimeWarningEvent,
+    WebSocketEventType,
+)
+
+logger = logging.getLogger(__name__)
+
+WARNING_PERCENTAGES = (50, 75)
+WARNING_REMAINING_MINUTES = 5
+
+# Deadlines that move with an extension and may fire again after one
+REARMABLE = {f"remaining:{WARNING_REMAINING_MINUTES}", "end"}
+
+# Event bus topic telling the other workers that a meeting's timing changed
+TIMER_TOPIC = "meeting-timer"
+# How long the worker that sent a deadline keeps it claimed
+CLAIM_TTL_SECONDS = 3600.0
+
+
+def to_timestamp(value: datetime) -> float:
+    """Convert a naive UTC datetime (as stored in the database) to epoch seconds."""
+    if value.tzinfo is None:
+        value = value.replace(tzinfo=UTC)
+    return value.timestamp()
+
+
+class MeetingTimer:
+    """Timing of one active meeting."""
+
+    __slots__ = (
+        "meeting_id",
+        "started_at",
+        "planned_seconds",
+        "extension_seconds",
+        "agenda",
+        "generation",
+        "pending",
+        "fired",
+    )
+
+    def __init__(self, meeting: Meeting) -> None:
+        self.meeting_id = str(meeting.id)
+        self.started_at = to_timestamp(meeting.started_at)  # type: ignore[arg-type]
+        self.planned_seconds = int(meeting.total_duration_minutes) * 60
+        self.extension_seconds = int(meeting.time_extensions_seconds or 0)
+        self.agenda: list[dict[str, Any]] = list(meeting.agenda or [])
+        # Set anew on every (re)schedule; heap entries from other generations are stale
+        self.generation = 0
+        # Heap entries of the current generation not yet popped
+        self.pending = 0
+        self.fired: set[str] = set()
+
+    @property
+    def duration_seconds(self) -> int:
+        """Planned duration including extensions."""
+        return self.planned_seconds + self.extension_seconds
+
+    @property
+    def ends_at(self) -> float:
+        """Epoch time the meeting is due to end."""
+        return self.started_at + self.duration_seconds
+
+    def deadlines(self) -> list[tuple[str, float]]:
+        """Return (key, epoch time) for every warning and agenda transition."""
+        deadlines = [
+            (f"percent:{pct}", self.started_at + self.duration_seconds * pct / 100)
+            for pct in WARNING_PERCENTAGES
+        ]
+        warning_seconds = WARNING_REMAINING_MINUTES * 60
+        if self.duration_seconds > warning_seconds:
+            deadlines.append(
+                (f"remaining:{WARNING_REMAINING_MINUTES}", self.ends_at - warning_seconds)
+            )
+        deadlines.append(("end", self.ends_at))
+
+        # Agenda items follow each other from the start; extensions only move the end
+        offset = 0.0
+        for index, item in enumerate(self.agenda):
+            if index > 0:
+                deadlines.append((f"agenda:{index}", self.started_at + offset))
+            offset += float(item.get("duration_minutes", 0)) * 60
+        return deadlines
+
+
+class MeetingTimerScheduler:
+    """
+    One timer for the time warnings and agenda transitions of all meetings.
+
+    Deadlines of every active meeting live in a single min-heap, so adding,
+    firing or dropping one costs O(log n) and a single task sleeps until
+    the earliest is due. Rescheduling (on ``extend_meeting``) bumps the
+    meeting's generation and pushes fresh deadlines; entries of older
+    generations or cancelled meetings are skipped when they surface, and
+    the heap is rebuilt without them once they outnumber the live ones,
+    so repeated extensions cannot grow it without bound.
+
+    Warnings fire at 50% and 75% of the meeting time, 5 minutes before
+    the end and when the time is up, as ``TimeWarningEvent``. Percentages
+    are of the planned time including extensions and fire once; the
+    5-minute and time-up warnings fire again if an extension moves them
+    into the future. Each agenda item after the first starts with an
+    ``AgendaItemStartedEvent`` at its planned time.
+
+    With several workers, every worker tracks every active meeting.
+    ``announce`` (on start, extend and end) applies a change here and
+    publishes the meeting ID on ``bus``, and the other workers reload the
+    meeting from the database. A due deadline is only sent by the worker
+    that claims it on the bus first, so clients get each event once.
+    """
+
+    def __init__(
+        self,
+        manager: WebSocketManager = websocket_manager,
+        clock: Callable[[], float] = time.time,
+        bus: EventBus | None = None,
+        session_factory: Callable[[], Session] = SessionLocal,
+    ) -> None:
+        """
+        Initialize scheduler.
+
+        Args:
+            manager: WebSocket manager to send events through
+            clock: Returns the current epoch time (injectable for tests)
+            bus: Shares timing changes and deadline claims between workers (default: the manager's)
+            session_factory: Creates database sessions for reloading announced meetings
+        """
+        self.manager = manager
+        self.clock = clock
+        self.bus = bus if bus is not None else manager.bus
+        self.session_factory = session_factory
+        self._origin = uuid.uuid4().hex
+
+        self._heap: list[tuple[float, int, str, int, str]] = []
+        self._seq = itertools.count()
+        self._generations = itertools.count(1)
+        self._stale = 0
+        self._timers: dict[str, MeetingTimer] = {}
+        self._wakeup: asyncio.Event | None = None
+        self._runner: asyncio.Task[None] | None = None
+
+        self.events_sent = 0
+        self.events_claimed_elsewhere = 0
+
+    def schedule(self, meeting: Meeting) -> None:
+        """
+        Track an active meeting, or reschedule it after its timing changed.
+
+        Deadlines already past when a meeting is first tracked (e.g. after
+        a server restart) are skipped rather than replayed.
+
+        Args:
+            meeting: Active meeting with ``started_at`` set
+        """
+        meeting_id = str(meeting.id)
+        timer = self._timers.get(meeting_id)
+        first = timer is None
+        if timer is None:
+            timer = MeetingTimer(meeting)
+            self._timers[meeting_id] = timer
+        else:
+            timer.extension_seconds = int(meeting.time_extensions_seconds or 0)
+            self._stale += timer.pending
+            timer.pending = 0
+        # Unique across meetings, so a cancelled and re-added meeting's old entries stay stale
+        timer.generation = next(self._generations)
+
+        now = self.clock()
+        for key, due in timer.deadlines():
+            if first and due <= now:
+                timer.fired.add(key)
+                continue
+            if key in timer.fired:
+                if key not in REARMABLE or due <= now:
+                    continue
+                timer.fired.discard(key)
+            heapq.heappush(self._heap, (due, next(self._seq), meeting_id, timer.generation, key))
+            timer.pending += 1
+        self._compact()
+
+        if self._wakeup is not None:
+            self._wakeup.set()
+
+    def cancel(self, meeting_id: str) -> None:
+        """Stop tracking a meeting (its heap entries become stale)."""
+        timer = self._timers.pop(meeting_id, None)
+        if timer is not None:
+            self._stale += timer.pending
+            self._compact()
+
+    async def announce(self, meeting: Meeting) -> None:
+        """
+        Apply a change to a meeting's timing on this and every other worker.
+
+        An active meeting is scheduled (or rescheduled after an extension);
+        any other meeting is no longer tracked.
+
+        Args:
+            meeting: Meeting as just committed to the database
+        """
+        self._apply(meeting)
+        await self.bus.publish(TIMER_TOPIC, f"{self._origin} {meeting.id}".encode())
+
+    def load_active_meetings(self, session_factory: Callable[[], Session]) -> int:
+        """
+        Schedule every active meeting in the database (called on startup).
+
+        Returns:
+            Number of meetings scheduled
+        """
+        db = session_factory()
+        try:
+            meetings = (
+                db.query(Meeting)
+                .filter(Meeting.status == "active", Meeting.started_at.isnot(None))
+                .all()
+            )
+            for meeting in meetings:
+                self.schedule(meeting)
+            return len(meetings)
+        finally:
+            db.close()
+
+    def next_due(self) -> float | None:
+        """Epoch time of the earliest heap entry, if any."""
+        return self._heap[0][0] if self._heap else None
+
+    async def run_due(self, now: float | None = None) -> int:
+        """
+        Send every event that is due.
+
+        Args:
+            now: Current epoch time (defaults to the clock)
+
+        Returns:
+            Number of events sent
+        """
+        if now is None:
+            now = self.clock()
+
+        candidates: list[tuple[str, WebSocketEventType, BaseModel]] = []
+        claims = []
+        while self._heap and self._heap[0][0] <= now:
+            at, _, meeting_id, generation, key = heapq.heappop(self._heap)
+            timer = self._timers.get(meeting_id)
+            if timer is None or generation != timer.generation:
+                self._stale -= 1
+                continue
+            timer.pending -= 1
+            if key in timer.fired:
+                continue
+            timer.fired.add(key)
+            candidates.append((meeting_id, *self._build_event(timer, key, now)))
+            claims.append(self._claim(f"timer:{meeting_id}:{key}:{round(at)}"))
+
+        # Every worker reaches the same deadlines; the first to claim one sends it
+        claimed = await asyncio.gather(*claims)
+        due = [event for event, mine in zip(candidates, claimed, strict=True) if mine]
+        self.events_claimed_elsewhere += len(candidates) - len(due)
+
+        if due:
+            # One slow meeting must not hold back warnings for the others
+            results = await asyncio.gather(
+                *(self.manager.send_event(*event) for event in due), return_exceptions=True
+            )
+            for result in results:
+                if isinstance(result, Exception):
+                    logger.error(f"Error sending timer event: {result!r}")
+            self.events_sent += len(due)
+        return len(due)
+
+    def start(self) -> None:
+        """Start the timer task (and follow other workers' changes) on the running event loop."""
+        if self._runner is None or self._runner.done():
+            self._wakeup = asyncio.Event()
+            self._runner = asyncio.create_task(self._run())
+
+    async def aclose(self) -> None:
+        """Stop the timer task."""
+        if self._runner is not None:
+            self._runner.cancel()
+            with contextlib.suppress(asyncio.CancelledError):
+                await self._runner
+            self._runner = None
+            await self.bus.unsubscribe(TIMER_TOPIC, self._on_bus_message)
+
+    def stats(self) -> dict[str, Any]:
+        """Return counters for logging or metrics endpoints."""
+        return {
+            "meetings": len(self._timers),
+            "pending": len(self._heap),
+            "events_sent": self.events_sent,
+            "events_claimed_elsewhere": self.events_claimed_elsewhere,
+        }
+
+    def _compact(self) -> None:
+        """Rebuild the heap without stale entries once they outnumber the live ones."""
+        if self._stale * 2 <= len(self._heap):
+            return
+        self._heap = [
+            entry for entry in self._heap
+            if (timer := self._timers.get(entry[2])) is not None and entry[3] == timer.generation
+        ]
+        heapq.heapify(self._heap)
+        self._stale = 0
+
+    def _apply(self, meeting: Meeting) -> None:
+        if meeting.status == "active" and meeting.started_at is not None:
+            self.schedule(meeting)
+        else:
+            self.cancel(str(meeting.id))
+
+    async def _on_bus_message(self, topic: str, message: bytes) -> None:
+        origin, _, meeting_id = message.decode().partition(" ")
+        if origin == self._origin:
+            return
+        db = self.session_factory()
+        try:
+            meeting = db.query(Meeting).filter(Meeting.id == meeting_id).first()
+            if meeting is None:
+                self.cancel(meeting_id)
+            else:
+                self._apply(meeting)
+        finally:
+            db.close()
+
+    async def _claim(self, key: str) -> bool:
+        try:
+            return await self.bus.claim(key, self._origin, CLAIM_TTL_SECONDS)
+        except ConnectionError as e:
+            # Better twice than never: without the broker no other worker is reachable either
+            logger.warning(f"Could not claim {key}, sending anyway: {e}")
+            return True
+
+    async def _run(self) -> None:
+        assert self._wakeup is not None
+        await self.bus.subscribe(TIMER_TOPIC, self._on_bus_message)
+        while True:
+            self._wakeup.clear()
+            try:
+                await self.run_due()
+            except Exception as e:
+                logger.error(f"Meeting timer failed: {e!r}")
+
+            next_due = self.next_due()
+            timeout = None if next_due is None else max(0.0, next_due - self.clock())
+            with contextlib.suppress(TimeoutError):
+                await asyncio.wait_for(self._wakeup.wait(), timeout)
+
+    def _build_event(
+        self, timer: MeetingTimer, key: str, now: float
+    ) -> tuple[WebSocketEventType, BaseModel]:
+        kind, _, value = key.partition(":")
+
+        if kind == "agenda":
+            index = int(value)
+            item = timer.agenda[index]
+            return WebSocketEventType.AGENDA_ITEM_STARTED, AgendaItemStartedEvent(
+                index=index,
+                topic=item.get("topic", ""),
+                duration_minutes=int(item.get("duration_minutes", 0)),
+                previous_topic=timer.agenda[index - 1].get("topic"),
+            )
+
+        remaining_minutes = max(0, round((timer.ends_at - now) / 60))
+        if kind == "percent":
+            percentage = int(value)
+            message = (
+                "Halva mötestiden har gått"
+                if percentage == 50
+                else f"{percentage} % av mötestiden har gått"
+            )
+        elif kind == "remaining":
+            percentage = min(100, int((now - timer.started_at) / timer.duration_seconds * 100))
+            remaining_minutes = int(value)
+            message = f"{remaining_minutes} minuter kvar av mötet"
+        else:
+            percentage = 100
+            remaining_minutes = 0
+            message = "Mötestiden är slut"
+
+        return WebSocketEventType.TIME_WARNING, TimeWarningEvent(
+            percentage_complete=percentage,
+            remaining_minutes=remaining_minutes,
+            message=message,
+        )
+
+
+# Global instance
+_meeting_timer: MeetingTimerScheduler | None = None
+
+
+def get_meeting_timer() -> MeetingTimerScheduler:
+    """Get or create global meeting timer."""
+    global _meeting_timer
+    if _meeting_timer is None:
+        _meeting_timer = MeetingTimerScheduler()
+    return _meeting_timer
+
+
+async def close_meeting_timer() -> None:
+    """Stop the global meeting timer (called on application shutdown)."""
+    global _meeting_timer
+    if _meeting_timer is not None:
+        await _meeting_timer.aclose()
+        _meeting_timer = None
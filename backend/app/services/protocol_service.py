@@ -0,0 +1,229 @@
+"""Meeting protocols, kept up to date while the meeting runs."""
+
+from collections.abc import Awaitable, Callable
+from typing import Any
+
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+
+from app.models.meeting import Meeting, Protocol
+from app.services.claude_service import AsyncClaudeService, get_async_claude_service
+from app.services.meeting_memory import MeetingMemory
+from app.services.protocol_summarizer import ProtocolSummarizer
+from app.services.transcript_service import TranscriptService
+
+GOAL_STATUS_LABELS = {
+    "achieved": "Uppnått",
+    "partial": "Delvis uppnått",
+    "not_achieved": "Ej uppnått",
+    "unknown": "Ej bedömt",
+}
+
+
+def render_protocol_markdown(meeting: Meeting, protocol: Protocol) -> str:
+    """Render a protocol as the markdown export shown in the wrap-up view."""
+    lines = [f"# Protokoll: {meeting.intent}", ""]
+    if meeting.started_at:
+        period = meeting.started_at.strftime("%Y-%m-%d %H:%M")
+        if meeting.ended_at:
+            period += f"–{meeting.ended_at.strftime('%H:%M')}"
+        lines += [f"Tid: {period}", ""]
+
+    goal_assessment: dict[str, dict[str, str]] = protocol.goal_assessment or {}  # type: ignore[assignment]
+    outcomes: list[str] = meeting.desired_outcomes or []  # type: ignore[assignment]
+    lines.append("## Måluppfyllelse")
+    for outcome in outcomes:
+        assessment = goal_assessment.get(outcome) or {"status": "unknown", "comment": ""}
+        label = GOAL_STATUS_LABELS.get(assessment["status"], assessment["status"])
+        line = f"- **{outcome}**: {label}"
+        if assessment.get("comment"):
+            line += f" – {assessment['comment']}"
+        lines.append(line)
+
+    agenda_summary: dict[str, str] = protocol.agenda_summary or {}  # type: ignore[assignment]
+    agenda: list[dict[str, Any]] = meeting.agenda or []  # type: ignore[assignment]
+    lines += ["", "## Agenda"]
+    for index, item in enumerate(agenda, 1):
+        topic = item.get("topic", "")
+        lines += [
+            "",
+            f"### {index}. {topic} ({item.get('duration_minutes', 0)} min)",
+            agenda_summary.get(topic) or "Inte diskuterad.",
+        ]
+
+    key_decisions: list[str] = protocol.key_decisions or []  # type: ignore[assignment]
+    action_items: list[dict[str, str]] = protocol.action_items or []  # type: ignore[assignment]
+    lines += ["", "## Beslut"]
+    lines += [f"- {decision}" for decision in key_decisions] or ["Inga beslut noterades."]
+
+    lines += ["", "## Åtgärder"]
+    lines += [
+        f"- [ ] {item['task']}" + (f" ({item['owner']})" if item.get("owner") else "")
+        for item in action_items
+    ] or ["Inga åtgärder noterades."]
+    return "\n".join(lines) + "\n"
+
+
+async def _drain_intervention_engine(meeting_id: str) -> bool:
+    """Wait for the meeting's chunks still in the intervention engine."""
+    # Imported here; the intervention engine itself depends on this module
+    from app.services.intervention_engine import get_intervention_engine
+
+    return await get_intervention_engine().drain(meeting_id)
+
+
+class ProtocolService:
+    """
+    Build a meeting's protocol incrementally instead of at the end.
+
+    After every chunk the intervention engine folds the transcription into
+    the meeting's ``MeetingMemory``, which also collects decisions and
+    action items; ``record_memory`` copies that state into the meeting's
+    ``Protocol`` row (agenda summary, key decisions, action items). When
+    the meeting is over, ``finalize`` only has to join the transcript,
+    assess the desired outcomes from the summaries (one small Claude call
+    whose size does not depend on meeting length) and render the markdown.
+
+    A meeting without incremental data (a recording uploaded afterwards,
+    or a restart while it ran) is summarized from its transcript with the
+    map-reduce ``ProtocolSummarizer`` instead, as is any meeting when a
+    rebuild is asked for.
+
+    ``finalize`` first drains the meeting's chunks still being processed,
+    and ``record_memory`` leaves a completed meeting's protocol alone, so a
+    late memory update can neither miss nor overwrite the final pass. A
+    meeting whose chunks did not drain in time (see ``mark_incomplete``)
+    is rebuilt from its transcript, since its memory may lack those updates.
+    """
+
+    def __init__(
+        self,
+        claude_service_factory: Callable[[], AsyncClaudeService] = get_async_claude_service,
+        summarizer: ProtocolSummarizer | None = None,
+        drain: Callable[[str], Awaitable[bool]] = _drain_intervention_engine,
+    ) -> None:
+        """
+        Initialize service.
+
+        Args:
+            claude_service_factory: Returns the async Claude service (resolved lazily)
+            summarizer: Summarizes whole transcripts (default: one using the same Claude service)
+            drain: Waits for a meeting's chunks in flight (default: the intervention engine's)
+        """
+        self.claude_service_factory = claude_service_factory
+        self.summarizer = summarizer or ProtocolSummarizer(claude_service_factory)
+        self.drain = drain
+        self._incomplete: set[str] = set()
+
+    @staticmethod
+    def get(db: Session, meeting_id: str) -> Protocol | None:
+        """Return a meeting's protocol, if one has been started."""
+        return db.query(Protocol).filter(Protocol.meeting_id == meeting_id).first()
+
+    def mark_incomplete(self, meeting_id: str) -> None:
+        """Have ``finalize`` rebuild a meeting whose memory updates did not all land."""
+        self._incomplete.add(meeting_id)
+
+    def record_memory(self, db: Session, meeting_id: str, memory: MeetingMemory) -> Protocol | None:
+        """
+        Store the incremental parts of the protocol from the meeting memory.
+
+        Args:
+            db: Database session
+            meeting_id: Meeting ID
+            memory: The meeting's memory after the latest update
+
+        Returns:
+            The meeting's protocol, or None if the meeting is already completed
+        """
+        status = db.query(Meeting.status).filter(Meeting.id == meeting_id).scalar()
+        if status == "completed":
+            # The final pass owns the protocol from here on
+            return None
+        return self._save(db, meeting_id, {
+            "agenda_summary": memory.agenda_summary(),
+            "key_decisions": list(memory.decisions),
+            "action_items": [dict(item) for item in memory.action_items],
+        })
+
+    async def finalize(self, db: Session, meeting: Meeting, rebuild: bool = False) -> Protocol:
+        """
+        Complete the protocol of an ended meeting.
+
+        Args:
+            db: Database session
+            meeting: Completed meeting
+            rebuild: Summarize the whole transcript even if incremental data exists
+
+        Returns:
+            The finished protocol
+        """
+        meeting_id = str(meeting.id)
+        if not await self.drain(meeting_id):
+            self._incomplete.add(meeting_id)
+        rebuild = rebuild or meeting_id in self._incomplete
+        db.expire_all()
+        protocol = self.get(db, meeting_id)
+        agenda_summary: dict[str, str] = {}
+        decisions: list[str] = []
+        if protocol is not None:
+            agenda_summary = protocol.agenda_summary or {}  # type: ignore[assignment]
+            decisions = protocol.key_decisions or []  # type: ignore[assignment]
+        outcomes: list[str] = list(meeting.desired_outcomes or [])
+        chunks = TranscriptService.load_chunks(db, meeting_id)
+        transcriptions = [chunk.transcription for chunk in chunks if chunk.transcription]
+
+        if transcriptions and (rebuild or not (agenda_summary or decisions)):
+            changes = (await self.summarizer.summarize(meeting, chunks)).as_dict()
+        elif agenda_summary or decisions:
+            changes = {"goal_assessment": await self.claude_service_factory().assess_goals(
+                outcomes, agenda_summary, decisions
+            )}
+        else:
+            # Nothing was transcribed, so there is nothing to assess against
+            changes = {"goal_assessment": {
+                outcome: {"status": "unknown", "comment": ""} for outcome in outcomes
+            }}
+
+        transcript = "\n\n".join(transcriptions)
+        protocol = self._save(db, meeting_id, {**changes, "full_transcription": transcript})
+        protocol.markdown_content = render_protocol_markdown(meeting, protocol)  # type: ignore[assignment]
+        db.commit()
+        db.refresh(protocol)
+        self._incomplete.discard(meeting_id)
+        return protocol
+
+    def _save(self, db: Session, meeting_id: str, changes: dict[str, Any]) -> Protocol:
+        """Apply ``changes`` to the meeting's protocol, creating it if needed."""
+        protocol = self.get(db, meeting_id)
+        if protocol is None:
+            protocol = Protocol(meeting_id=meeting_id, full_transcription="", markdown_content="")
+            db.add(protocol)
+        for field, value in changes.items():
+            setattr(protocol, field, value)
+        try:
+            db.commit()
+        except IntegrityError:
+            # Another session created the row first; update that one instead
+            db.rollback()
+            existing = self.get(db, meeting_id)
+            if existing is None:
+                # The conflict was not the meeting's protocol row
+                raise
+            protocol = existing
+            for field, value in changes.items():
+                setattr(protocol, field, value)
+            db.commit()
+        return protocol
+
+
+# Global protocol service instance
+_protocol_service: ProtocolService | None = None
+
+
+def get_protocol_service() -> ProtocolService:
+    """Get or create protocol service instance."""
+    global _protocol_service
+    if _protocol_service is None:
+        _protocol_service = ProtocolService()
+    return _protocol_service
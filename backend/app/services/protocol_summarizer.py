@@ -0,0 +1,281 @@
+"""Hierarchical (map-reduce) summarization of whole meeting transcripts."""
+
+import asyncio
+from collections.abc import Awaitable, Callable
+from typing import Any, TypeVar
+
+from app.models.meeting import AudioChunk, Meeting
+from app.services.claude_service import AsyncClaudeService, get_async_claude_service
+from app.services.meeting_memory import MeetingMemory, estimate_tokens
+
+T = TypeVar("T")
+
+# Transcript tokens per map request; leaves room for the prompt and a long chunk
+DEFAULT_GROUP_TOKENS = 3000
+# Note tokens merged per reduce request
+DEFAULT_MERGE_TOKENS = 2000
+ITEM_SUMMARY_MAX_WORDS = 150
+OUTCOME_EVIDENCE_MAX_WORDS = 100
+
+
+class TranscriptGroup:
+    """Consecutive chunks summarized together in one map request."""
+
+    __slots__ = ("start_minutes", "end_minutes", "transcriptions")
+
+    def __init__(self, start_minutes: float) -> None:
+        self.start_minutes = start_minutes
+        self.end_minutes = start_minutes
+        self.transcriptions: list[str] = []
+
+    @property
+    def text(self) -> str:
+        """Transcriptions of the group, joined."""
+        return "\n\n".join(self.transcriptions)
+
+
+def group_chunks(chunks: list[AudioChunk], max_tokens: int) -> list[TranscriptGroup]:
+    """
+    Split a meeting's chunks into consecutive groups of at most ``max_tokens``.
+
+    A chunk larger than ``max_tokens`` becomes a group of its own. Chunks
+    without transcription add to the elapsed time only.
+
+    Args:
+        chunks: Chunks in chunk order, transcriptions decrypted
+        max_tokens: Estimated transcript tokens per group
+
+    Returns:
+        Non-empty groups with their span in minutes since the meeting start
+    """
+    groups: list[TranscriptGroup] = []
+    current = TranscriptGroup(0.0)
+    tokens = 0
+    elapsed = 0.0
+    for chunk in chunks:
+        text = chunk.transcription
+        if text:
+            size = estimate_tokens(text)
+            if current.transcriptions and tokens + size > max_tokens:
+                groups.append(current)
+                current, tokens = TranscriptGroup(elapsed), 0
+            current.transcriptions.append(text)
+            tokens += size
+        elapsed += float(chunk.duration_seconds or 0) / 60
+        if current.transcriptions:
+            current.end_minutes = elapsed
+        else:
+            current.start_minutes = current.end_minutes = elapsed
+    if current.transcriptions:
+        groups.append(current)
+    return groups
+
+
+def scheduled_items(
+    agenda: list[dict[str, Any]], start_minutes: float, end_minutes: float
+) -> list[int]:
+    """Agenda items whose scheduled time overlaps ``[start_minutes, end_minutes)``."""
+    items = []
+    item_start = 0.0
+    for index, item in enumerate(agenda):
+        item_end = item_start + item.get("duration_minutes", 0)
+        if item_start < end_minutes and start_minutes < item_end:
+            items.append(index)
+        item_start = item_end
+    if not items and agenda:
+        # Overtime is discussed under the last item
+        items.append(len(agenda) - 1)
+    return items
+
+
+def _merge_batches(notes: list[str], max_tokens: int) -> list[list[str]]:
+    """Pack consecutive notes into batches of at most ``max_tokens``, at least two per batch."""
+    batches: list[list[str]] = []
+    batch: list[str] = []
+    tokens = 0
+    for note in notes:
+        size = estimate_tokens(note)
+        if len(batch) >= 2 and tokens + size > max_tokens:
+            batches.append(batch)
+            batch, tokens = [], 0
+        batch.append(note)
+        tokens += size
+    batches.append(batch)
+    return batches
+
+
+class ProtocolSummary:
+    """Protocol fields produced from a whole transcript."""
+
+    __slots__ = ("agenda_summary", "goal_assessment", "key_decisions", "action_items")
+
+    def __init__(
+        self,
+        agenda_summary: dict[str, str],
+        goal_assessment: dict[str, dict[str, str]],
+        key_decisions: list[str],
+        action_items: list[dict[str, str]],
+    ) -> None:
+        self.agenda_summary = agenda_summary
+        self.goal_assessment = goal_assessment
+        self.key_decisions = key_decisions
+        self.action_items = action_items
+
+    def as_dict(self) -> dict[str, Any]:
+        """Fields to store on the ``Protocol`` row."""
+        return {
+            "agenda_summary": self.agenda_summary,
+            "goal_assessment": self.goal_assessment,
+            "key_decisions": self.key_decisions,
+            "action_items": self.action_items,
+        }
+
+
+class ProtocolSummarizer:
+    """
+    Summarize a meeting of any length without one whole-transcript request.
+
+    Map: the chunks are split into consecutive groups of about
+    ``group_tokens`` and each group is summarized on its own, giving notes
+    per agenda item and per desired outcome plus the decisions and action
+    items heard in it. Reduce: the notes of each agenda item (and of each
+    outcome) are merged in batches of about ``merge_tokens``, repeating
+    until one summary is left, and every outcome is assessed from its
+    merged notes. Decisions and action items are deduplicated locally.
+
+    Every note is merged once per level and each level at least halves the
+    number of notes, so the number of requests grows linearly with meeting
+    length and no request grows with it at all. At most
+    ``max_concurrency`` requests of one summarization run at a time, at
+    batch priority so live meetings go first.
+    """
+
+    def __init__(
+        self,
+        claude_service_factory: Callable[[], AsyncClaudeService] = get_async_claude_service,
+        max_concurrency: int = 4,
+        group_tokens: int = DEFAULT_GROUP_TOKENS,
+        merge_tokens: int = DEFAULT_MERGE_TOKENS,
+    ) -> None:
+        """
+        Initialize summarizer.
+
+        Args:
+            claude_service_factory: Returns the async Claude service (resolved lazily)
+            max_concurrency: Max in-flight requests per summarization
+            group_tokens: Transcript tokens per map request
+            merge_tokens: Note tokens per reduce request
+        """
+        self.claude_service_factory = claude_service_factory
+        self.max_concurrency = max_concurrency
+        self.group_tokens = group_tokens
+        self.merge_tokens = merge_tokens
+
+    async def summarize(self, meeting: Meeting, chunks: list[AudioChunk]) -> ProtocolSummary:
+        """
+        Summarize a meeting's transcript for its protocol.
+
+        Args:
+            meeting: The meeting (intent, desired outcomes and agenda are used)
+            chunks: Its chunks in chunk order, transcriptions decrypted
+
+        Returns:
+            Agenda summary, goal assessment, key decisions and action items
+        """
+        claude = self.claude_service_factory()
+        limit = asyncio.Semaphore(self.max_concurrency)
+        agenda: list[dict[str, Any]] = list(meeting.agenda or [])
+        outcomes: list[str] = list(meeting.desired_outcomes or [])
+        context = {"intent": meeting.intent, "desired_outcomes": outcomes, "agenda": agenda}
+
+        # Map
+        groups = group_chunks(chunks, self.group_tokens)
+        partials = await asyncio.gather(*(
+            self._limited(limit, claude.summarize_transcript_group(
+                group.text,
+                context,
+                group.start_minutes,
+                group.end_minutes,
+                scheduled_items(agenda, group.start_minutes, group.end_minutes),
+            ))
+            for group in groups
+        ))
+
+        memory = MeetingMemory(agenda)
+        item_notes: list[list[str]] = [[] for _ in agenda]
+        outcome_notes: list[list[str]] = [[] for _ in outcomes]
+        for notes in partials:
+            if notes is None:
+                continue
+            for index, summary in notes["agenda_items"].items():
+                item_notes[index].append(summary)
+            for index, text in notes["outcomes"].items():
+                outcome_notes[index].append(text)
+            memory.add_outcomes(notes["decisions"], notes["action_items"])
+
+        # Reduce
+        item_summaries, evidence = await asyncio.gather(
+            asyncio.gather(*(
+                self._reduce(
+                    claude,
+                    limit,
+                    f"Agendapunkt: {item.get('topic', '')}",
+                    notes,
+                    ITEM_SUMMARY_MAX_WORDS,
+                )
+                for item, notes in zip(agenda, item_notes, strict=True)
+            )),
+            asyncio.gather(*(
+                self._reduce(
+                    claude,
+                    limit,
+                    f"Underlag för utfallet: {outcome}",
+                    notes,
+                    OUTCOME_EVIDENCE_MAX_WORDS,
+                )
+                for outcome, notes in zip(outcomes, outcome_notes, strict=True)
+            )),
+        )
+        for index, summary in enumerate(item_summaries):
+            memory.summaries[index] = summary
+        assessments = await asyncio.gather(*(
+            self._limited(limit, claude.assess_outcome(outcome, notes, memory.decisions))
+            for outcome, notes in zip(outcomes, evidence, strict=True)
+        ))
+
+        return ProtocolSummary(
+            agenda_summary=memory.agenda_summary(),
+            goal_assessment=dict(zip(outcomes, assessments, strict=True)),
+            key_decisions=list(memory.decisions),
+            action_items=list(memory.action_items),
+        )
+
+    async def _reduce(
+        self,
+        claude: AsyncClaudeService,
+        limit: asyncio.Semaphore,
+        subject: str,
+        notes: list[str],
+        max_words: int,
+    ) -> str:
+        """Merge ``notes`` level by level until one summary is left."""
+        while len(notes) > 1:
+            batches = _merge_batches(notes, self.merge_tokens)
+            merged = iter(await asyncio.gather(*(
+                self._limited(limit, claude.merge_notes(subject, batch, max_words))
+                for batch in batches
+                if len(batch) > 1
+            )))
+            # A lone trailing note moves up a level as is; a failed merge keeps
+            # its notes joined, so every level still shrinks
+            notes = [
+                (next(merged) or " ".join(batch)) if len(batch) > 1 else batch[0]
+                for batch in batches
+            ]
+        return notes[0] if notes else ""
+
+    @staticmethod
+    async def _limited(limit: asyncio.Semaphore, call: Awaitable[T]) -> T:
+        # ``call`` is a coroutine not yet started; it only runs once awaited here
+        async with limit:
+            return await call
@@ -0,0 +1,196 @@
+"""Persistent cache of Claude responses for repeatable (low-temperature) requests."""
+
+import asyncio
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+from typing import Any
+
+from anthropic.types import Message
+
+from app.core.encryption import db_encryption
+
+DEFAULT_TTL_SECONDS = 7 * 24 * 3600
+DEFAULT_MAX_ENTRIES = 10_000
+# Trigger analysis (0.3, or 0.5 when combined with questions) and memory
+# updates (0.2) are cached; free-standing questions (0.7) are not
+DEFAULT_MAX_TEMPERATURE = 0.5
+
+# Request fields that determine the response; anything else (e.g. stream) is ignored
+KEY_FIELDS = ("model", "temperature", "max_tokens", "system", "messages", "tools", "tool_choice")
+
+
+class ResponseCache:
+    """
+    SQLite-backed cache of Messages API responses keyed on the request.
+
+    The key is a SHA-256 of the canonical JSON of the request's model,
+    temperature, max_tokens, prompt and tool fields, so a replayed meeting
+    or a regenerated protocol hits the cache when it sends the same
+    prompt. Responses contain meeting content and are stored encrypted
+    like transcriptions. Entries expire after ``ttl_seconds``, and the
+    least recently used entries are evicted beyond ``max_entries``.
+
+    Every lookup and store commits to SQLite, so code running on the event
+    loop uses ``aget`` and ``aput``, which do that work in a worker thread.
+    """
+
+    def __init__(
+        self,
+        path: str,
+        ttl_seconds: float = DEFAULT_TTL_SECONDS,
+        max_entries: int = DEFAULT_MAX_ENTRIES,
+        max_temperature: float = DEFAULT_MAX_TEMPERATURE,
+    ) -> None:
+        """
+        Open (or create) the cache.
+
+        Args:
+            path: SQLite file path (":memory:" for a process-local cache)
+            ttl_seconds: Age after which an entry is ignored and purged
+            max_entries: Max number of entries kept
+            max_temperature: Requests above this temperature bypass the cache
+        """
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self.max_temperature = max_temperature
+        self.hits = 0
+        self.misses = 0
+        self.bypassed = 0
+
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS claude_responses (
+                key TEXT PRIMARY KEY,
+                created_at REAL NOT NULL,
+                last_used_at REAL NOT NULL,
+                response BLOB NOT NULL
+            )
+            """
+        )
+        self._conn.execute(
+            "CREATE INDEX IF NOT EXISTS ix_claude_responses_last_used "
+            "ON claude_responses (last_used_at)"
+        )
+        self._conn.commit()
+
+    @classmethod
+    def from_env(cls) -> "ResponseCache | None":
+        """Create the cache configured by CLAUDE_RESPONSE_CACHE_PATH (None if unset)."""
+        path = os.getenv("CLAUDE_RESPONSE_CACHE_PATH")
+        if not path:
+            return None
+        return cls(
+            path,
+            ttl_seconds=float(os.getenv("CLAUDE_RESPONSE_CACHE_TTL_SECONDS", DEFAULT_TTL_SECONDS)),
+            max_entries=int(os.getenv("CLAUDE_RESPONSE_CACHE_MAX_ENTRIES", DEFAULT_MAX_ENTRIES)),
+        )
+
+    def cacheable(self, request: dict[str, Any]) -> bool:
+        """Whether a request is repeatable enough to cache."""
+        return request.get("temperature", 1.0) <= self.max_temperature and not request.get("stream")
+
+    @staticmethod
+    def key(request: dict[str, Any]) -> str:
+        """Fingerprint of the request fields that determine the response."""
+        canonical = json.dumps(
+            {field: request.get(field) for field in KEY_FIELDS},
+            sort_keys=True,
+            ensure_ascii=False,
+            separators=(",", ":"),
+        )
+        return hashlib.sha256(canonical.encode("utf-8")).hexdigest()
+
+    def get(self, request: dict[str, Any]) -> Message | None:
+        """Return the cached response for ``request``, if present and fresh."""
+        if not self.cacheable(request):
+            self.bypassed += 1
+            return None
+
+        key = self.key(request)
+        now = time.time()
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT response FROM claude_responses WHERE key = ? AND created_at > ?",
+                (key, now - self.ttl_seconds),
+            ).fetchone()
+            if row is None:
+                self.misses += 1
+                return None
+            self._conn.execute(
+                "UPDATE claude_responses SET last_used_at = ? WHERE key = ?", (now, key)
+            )
+            self._conn.commit()
+            self.hits += 1
+
+        return Message.model_validate_json(db_encryption.decrypt_field(row[0]))
+
+    def put(self, request: dict[str, Any], message: Any) -> None:
+        """Store a response, evicting expired and least recently used entries."""
+        if not self.cacheable(request) or not isinstance(message, Message):
+            return
+
+        now = time.time()
+        encrypted = db_encryption.encrypt_field(message.model_dump_json())
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO claude_responses (key, created_at, last_used_at, response) "
+                "VALUES (?, ?, ?, ?)",
+                (self.key(request), now, now, encrypted),
+            )
+            self._conn.execute(
+                "DELETE FROM claude_responses WHERE created_at <= ?", (now - self.ttl_seconds,)
+            )
+            self._conn.execute(
+                """
+                DELETE FROM claude_responses WHERE key IN (
+                    SELECT key FROM claude_responses ORDER BY last_used_at DESC LIMIT -1 OFFSET ?
+                )
+                """,
+                (self.max_entries,),
+            )
+            self._conn.commit()
+
+    async def aget(self, request: dict[str, Any]) -> Message | None:
+        """Like ``get``, but runs the SQLite lookup in a worker thread."""
+        if not self.cacheable(request):
+            self.bypassed += 1
+            return None
+        return await asyncio.to_thread(self.get, request)
+
+    async def aput(self, request: dict[str, Any], message: Any) -> None:
+        """Like ``put``, but runs the encryption and SQLite writes in a worker thread."""
+        if not self.cacheable(request) or not isinstance(message, Message):
+            return
+        await asyncio.to_thread(self.put, request, message)
+
+    def __len__(self) -> int:
+        with self._lock:
+            count: int = self._conn.execute("SELECT COUNT(*) FROM claude_responses").fetchone()[0]
+        return count
+
+    @property
+    def hit_ratio(self) -> float:
+        """Share of cacheable lookups answered from the cache."""
+        lookups = self.hits + self.misses
+        return self.hits / lookups if lookups else 0.0
+
+    def stats(self) -> dict[str, Any]:
+        """Return counters for logging or metrics endpoints."""
+        return {
+            "entries": len(self),
+            "hits": self.hits,
+            "misses": self.misses,
+            "bypassed": self.bypassed,
+            "hit_ratio": round(self.hit_ratio, 3),
+        }
+
+    def close(self) -> None:
+        """Close the database connection."""
+        with self._lock:
+            self._conn.close()
@@ -0,0 +1,49 @@
+"""Bulk access to decrypted meeting transcripts."""
+
+from sqlalchemy.orm import Session
+
+from app.models.meeting import AudioChunk
+
+
+class TranscriptService:
+    """Load meeting transcripts with a single bulk decryption pass."""
+
+    @staticmethod
+    def load_chunks(
+        db: Session, meeting_id: str, max_workers: int | None = None
+    ) -> list[AudioChunk]:
+        """
+        Load all chunks of a meeting with transcriptions already decrypted.
+
+        Subsequent ``chunk.transcription`` access within the same session is
+        served from the per-instance cache.
+
+        Args:
+            db: Database session
+            meeting_id: Meeting ID
+            max_workers: Decrypt on a thread pool of this size (None = inline)
+
+        Returns:
+            Chunks ordered by chunk number
+        """
+        chunks = (
+            db.query(AudioChunk)
+            .filter(AudioChunk.meeting_id == meeting_id)
+            .order_by(AudioChunk.chunk_number)
+            .all()
+        )
+        AudioChunk.prefetch_transcriptions(chunks, max_workers=max_workers)
+        return chunks
+
+    @staticmethod
+    def load_transcriptions(
+        db: Session, meeting_id: str, max_workers: int | None = None
+    ) -> list[str]:
+        """
+        Load decrypted transcriptions of all transcribed chunks of a meeting.
+
+        Returns:
+            Non-empty transcriptions ordered by chunk number
+        """
+        chunks = TranscriptService.load_chunks(db, meeting_id, max_workers=max_workers)
+        return [chunk.transcription for chunk in chunks if chunk.transcription]
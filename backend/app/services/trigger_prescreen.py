@@ -0,0 +1,217 @@
+"""Cheap local pre-screening that decides whether a chunk is worth a Claude call."""
+
+import math
+import re
+from collections import Counter
+from typing import Any
+
+WORD_PATTERN = re.compile(r"\w+", re.UNICODE)
+SENTENCE_PATTERN = re.compile(r"[^.!?]+[.!?]?")
+
+# Crude stemming: Swedish inflections mostly change the ending, so comparing
+# word prefixes matches "kaffemaskin"/"kaffemaskinen"/"kaffemaskiner".
+STEM_LENGTH = 6
+MIN_WORD_LENGTH = 3
+
+STOPWORDS = frozenset([
+    "och", "att", "det", "som", "en", "på", "är", "för", "med", "har", "inte", "jag", "vi",
+    "ni", "de", "den", "till", "av", "om", "var", "kan", "men", "så", "ska", "från", "eller",
+    "när", "här", "där", "hur", "vad", "vilken", "vilka", "alla", "också", "bara", "mycket",
+    "nu", "då", "sen", "ett", "detta", "dessa", "denna", "man", "sig", "sin", "sina", "sitt",
+    "hade", "blir", "blev", "vara", "varit", "skulle", "kunde", "måste", "ju", "väl", "nog",
+    "liksom", "typ", "alltså", "asså", "okej", "mm", "ja", "nej",
+])
+
+# Interjections that typically open a new speaker turn in Whisper output
+TURN_OPENERS = frozenset([
+    "ja", "nej", "men", "okej", "precis", "exakt", "absolut", "jo", "mm", "fast", "alltså", "visst",
+])
+
+
+def tokenize(text: str) -> list[str]:
+    """Lowercase, drop stopwords and short words, and stem by prefix."""
+    return [
+        word[:STEM_LENGTH]
+        for word in WORD_PATTERN.findall(text.lower())
+        if len(word) >= MIN_WORD_LENGTH and word not in STOPWORDS and not word.isdigit()
+    ]
+
+
+def cosine_similarity(a: Counter[str], b: Counter[str]) -> float:
+    """Cosine similarity of two term-frequency vectors."""
+    if not a or not b:
+        return 0.0
+    dot = sum(count * b[term] for term, count in a.items() if term in b)
+    norm = math.sqrt(sum(c * c for c in a.values())) * math.sqrt(sum(c * c for c in b.values()))
+    return dot / norm if norm else 0.0
+
+
+class PrescreenResult:
+    """Outcome of pre-screening one chunk."""
+
+    def __init__(
+        self,
+        should_analyze: bool,
+        score: float,
+        goal_distance: float,
+        turn_sparsity: float,
+        topic_drift: float,
+        reason: str,
+    ) -> None:
+        self.should_analyze = should_analyze
+        self.score = score
+        self.goal_distance = goal_distance
+        self.turn_sparsity = turn_sparsity
+        self.topic_drift = topic_drift
+        self.reason = reason
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return result as a JSON-serializable dict."""
+        return {
+            "should_analyze": self.should_analyze,
+            "score": round(self.score, 3),
+            "goal_distance": round(self.goal_distance, 3),
+            "turn_sparsity": round(self.turn_sparsity, 3),
+            "topic_drift": round(self.topic_drift, 3),
+            "reason": self.reason,
+        }
+
+
+class TriggerPrescreener:
+    """
+    Score chunks locally and only forward likely triggers to Claude.
+
+    Three signals, each in [0, 1], mirror the triggers Claude looks for:
+
+    - goal_distance: how little the chunk overlaps lexically with the
+      meeting's intent and desired outcomes (goal_deviation)
+    - turn_sparsity: how few speaker turns the chunk shows, estimated from
+      sentence count, questions and turn-opening interjections
+      (perspective_gap)
+    - topic_drift: how far the chunk moved from the previous one
+      (goal_deviation, complexity_mistake)
+
+    The weighted score is compared to ``threshold``. A chunk is also always
+    forwarded after ``max_consecutive_skips`` skipped chunks, so slow
+    drifts that never cross the threshold still get a Claude look.
+    """
+
+    WEIGHTS = {"goal_distance": 0.45, "turn_sparsity": 0.25, "topic_drift": 0.30}
+
+    def __init__(self, threshold: float = 0.55, max_consecutive_skips: int = 4) -> None:
+        """
+        Initialize prescreener.
+
+        Args:
+            threshold: Score at or above which Claude is called
+            max_consecutive_skips: Force a Claude call after this many skips
+        """
+        self.threshold = threshold
+        self.max_consecutive_skips = max_consecutive_skips
+        self._previous_terms: dict[str, Counter[str]] = {}
+        self._goal_terms: dict[str, set[str]] = {}
+        self._consecutive_skips: dict[str, int] = {}
+        self.analyzed = 0
+        self.skipped = 0
+
+    def evaluate(
+        self, meeting_id: str, transcription: str, meeting_context: dict[str, Any]
+    ) -> PrescreenResult:
+        """
+        Score a chunk and update per-meeting state.
+
+        Args:
+            meeting_id: Meeting ID (state is kept per meeting)
+            transcription: Current chunk transcription
+            meeting_context: IDOARRT meeting data (intent, desired_outcomes)
+
+        Returns:
+            PrescreenResult telling whether Claude should analyze the chunk
+        """
+        terms = Counter(tokenize(transcription))
+        goal_terms = self._goal_terms_for(meeting_id, meeting_context)
+        previous = self._previous_terms.get(meeting_id)
+
+        goal_distance = self._goal_distance(terms, goal_terms)
+        turn_sparsity = self._turn_sparsity(transcription)
+        topic_drift = 1.0 - cosine_similarity(terms, previous) if previous else 0.0
+
+        score = (
+            self.WEIGHTS["goal_distance"] * goal_distance
+            + self.WEIGHTS["turn_sparsity"] * turn_sparsity
+            + self.WEIGHTS["topic_drift"] * topic_drift
+        )
+
+        skips = self._consecutive_skips.get(meeting_id, 0)
+        if not terms:
+            should_analyze, reason = False, "empty"
+        elif score >= self.threshold:
+            should_analyze, reason = True, "score"
+        elif skips >= self.max_consecutive_skips:
+            should_analyze, reason = True, "max_skips"
+        else:
+            should_analyze, reason = False, "below_threshold"
+
+        self._previous_terms[meeting_id] = terms
+        if should_analyze:
+            self._consecutive_skips[meeting_id] = 0
+            self.analyzed += 1
+        else:
+            self._consecutive_skips[meeting_id] = skips + 1
+            self.skipped += 1
+
+        return PrescreenResult(
+            should_analyze, score, goal_distance, turn_sparsity, topic_drift, reason
+        )
+
+    def forget_meeting(self, meeting_id: str) -> None:
+        """Drop per-meeting state once a meeting has ended."""
+        self._previous_terms.pop(meeting_id, None)
+        self._goal_terms.pop(meeting_id, None)
+        self._consecutive_skips.pop(meeting_id, None)
+
+    @property
+    def skip_ratio(self) -> float:
+        """Share of chunks for which the Claude call was skipped."""
+        total = self.analyzed + self.skipped
+        return self.skipped / total if total else 0.0
+
+    def stats(self) -> dict[str, Any]:
+        """Return counters for logging or metrics endpoints."""
+        return {
+            "analyzed": self.analyzed,
+            "skipped": self.skipped,
+            "skip_ratio": round(self.skip_ratio, 3),
+        }
+
+    def _goal_terms_for(self, meeting_id: str, meeting_context: dict[str, Any]) -> set[str]:
+        if meeting_id not in self._goal_terms:
+            text = " ".join([
+                meeting_context.get("intent", ""),
+                *meeting_context.get("desired_outcomes", []),
+            ])
+            self._goal_terms[meeting_id] = set(tokenize(text))
+        return self._goal_terms[meeting_id]
+
+    @staticmethod
+    def _goal_distance(terms: Counter[str], goal_terms: set[str]) -> float:
+        """1 minus the share of goal terms mentioned, saturating at half of them."""
+        if not goal_terms or not terms:
+            return 0.0
+        covered = len(goal_terms.intersection(terms)) / len(goal_terms)
+        return 1.0 - min(1.0, covered * 2)
+
+    @staticmethod
+    def _turn_sparsity(transcription: str) -> float:
+        """Estimate how monologue-like a chunk is (1.0 = one long turn)."""
+        sentences = [s.strip() for s in SENTENCE_PATTERN.findall(transcription) if s.strip()]
+        if len(sentences) < 3:
+            return 0.0
+        turns = 0
+        for sentence in sentences:
+            words = WORD_PATTERN.findall(sentence.lower())
+            if sentence.endswith("?") or (words and words[0] in TURN_OPENERS) or len(words) <= 3:
+                turns += 1
+        # Roughly one turn change per three sentences is a lively discussion
+        density = min(1.0, turns * 3 / len(sentences))
+        return 1.0 - density
@@ -0,0 +1,79 @@
+#!/usr/bin/env python3
+"""Benchmark streaming AES-GCM blob encryption against the Fernet path."""
+
+import sys
+import time
+from collections.abc import Callable
+from pathlib import Path
+
+# Add app to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from app.core.encryption import db_encryption
+
+SIZES_MB = [0.5, 2, 8]
+ROUNDS = 5
+
+
+def throughput(func: Callable[[], object], size_bytes: int) -> float:
+    """Return best-of-ROUNDS throughput in MB/s."""
+    best = float("inf")
+    for _ in range(ROUNDS):
+        start = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter() - start)
+    return size_bytes / best / (1024 * 1024)
+
+
+def _time(func: Callable[[], object]) -> float:
+    start = time.perf_counter()
+    func()
+    return time.perf_counter() - start
+
+
+def main() -> None:
+    """Run blob encryption benchmark."""
+    print(f"{'size':>8} {'path':<22} {'encrypt MB/s':>14} {'decrypt MB/s':>14} {'overhead':>9}")
+    print("-" * 72)
+
+    for size_mb in SIZES_MB:
+        size = int(size_mb * 1024 * 1024)
+        data = bytes(range(256)) * (size // 256)
+
+        fernet_token = db_encryption.encrypt(data)
+        aead_blob = db_encryption.encrypt_blob(data)
+
+        rows = [
+            (
+                "fernet",
+                throughput(lambda data=data: db_encryption.encrypt(data), size),
+                throughput(lambda token=fernet_token: db_encryption.decrypt(token), size),
+                len(fernet_token) / size,
+            ),
+            (
+                "aes-gcm stream",
+                throughput(lambda data=data: db_encryption.encrypt_blob(data), size),
+                throughput(lambda blob=aead_blob: db_encryption.decrypt_blob(blob), size),
+                len(aead_blob) / size,
+            ),
+        ]
+        for name, enc, dec, overhead in rows:
+            print(f"{size_mb:>6}MB {name:<22} {enc:>14.1f} {dec:>14.1f} {overhead:>8.3f}x")
+
+        # Range playback: first 64 KiB, as a browser does when seeking
+        range_time = min(
+            _time(lambda blob=aead_blob: db_encryption.decrypt_blob_range(blob, 0, 64 * 1024))
+            for _ in range(ROUNDS)
+        )
+        full_time = min(
+            _time(lambda token=fernet_token: db_encryption.decrypt(token)) for _ in range(ROUNDS)
+        )
+        print(
+            f"{'':>8} {'64KiB range request':<22} "
+            f"aes-gcm {range_time * 1000:.2f} ms vs fernet full decrypt {full_time * 1000:.2f} ms"
+        )
+        print()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,178 @@
+#!/usr/bin/env python3
+"""
+Benchmark IDOARRT parsing on large generated documents.
+
+Compares the previous path (the strict request validator scanning the
+document with its own regexes, then the service splitting it into
+sections and re-splitting each one with uncompiled patterns) with the
+single-pass parser whose result the validator hands to the endpoint,
+then the memoized service on a repeated document and a meeting built
+from a stored template without any markdown.
+"""
+
+import argparse
+import re
+import sys
+import time
+from pathlib import Path
+
+# Add app to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from app.models.meeting import MeetingTemplate
+from app.schemas.meeting import MeetingTemplateOverrides
+from app.services.idoarrt_service import IDOARRTService, parse_idoarrt_document
+from app.services.meeting_templates import IDOARRT_FIELDS, MeetingTemplateService
+
+REQUIRED_SECTIONS = ["Intent", "Desired Outcomes", "Agenda", "Roles", "Rules", "Time"]
+
+
+def generate(items: int) -> str:
+    """IDOARRT document with ``items`` agenda items, outcomes, roles and rules."""
+    lines = ["# Planeringsmöte", "", "# Intent", "Planera kvartalet tillsammans"]
+    lines += ["", "# Desired Outcomes"]
+    lines += [f"- Utfall {i} är beslutat" for i in range(items)]
+    lines += ["", "# Agenda"]
+    lines += [f"{i + 1}. Punkt {i} om budget och bemanning (5 min)" for i in range(items)]
+    lines += ["", "# Roles"]
+    lines += [f"- Roll {i}: Person {i}" for i in range(items)]
+    lines += ["", "# Rules"]
+    lines += [f"- Regel {i}" for i in range(items)]
+    lines += ["", "# Time", f"Total: {items * 5} minutes"]
+    return "\n".join(lines)
+
+
+def legacy_strict(markdown: str) -> None:
+    """Request validator before the single-pass parser."""
+    for section in REQUIRED_SECTIONS:
+        if not re.search(rf"^#\s+{re.escape(section)}\s*$", markdown, re.MULTILINE | re.IGNORECASE):
+            raise ValueError(f"Missing required section: {section}")
+    flags = re.MULTILINE | re.IGNORECASE
+    if not re.search(r"#\s+Time\s*.*Total:\s*(\d+)\s*(?:minutes?|min)", markdown, flags):
+        raise ValueError("Time section")
+    if not re.search(r"#\s+Agenda\s*.*(\d+\.\s+.+\(\s*\d+\s*min\))", markdown, flags):
+        raise ValueError("Agenda")
+
+
+def legacy_parse(markdown: str) -> dict:
+    """Service parser before the single-pass parser (same patterns, same splitting)."""
+    sections: dict[str, str] = {}
+    current: str | None = None
+    content: list[str] = []
+    for line in markdown.split("\n"):
+        header = re.match(r"^#\s+(.+)$", line.strip())
+        if header:
+            if current:
+                sections[current] = "\n".join(content).strip()
+            current, content = header.group(1), []
+        elif current:
+            content.append(line)
+    if current:
+        sections[current] = "\n".join(content).strip()
+
+    def bullets(text: str) -> list[str]:
+        items = []
+        for line in text.split("\n"):
+            line = line.strip()
+            if (line.startswith("-") or line.startswith("*")) and line[1:].strip():
+                items.append(line[1:].strip())
+        return items
+
+    agenda = []
+    for line in sections["Agenda"].split("\n"):
+        line = line.strip()
+        if not line:
+            continue
+        match = re.match(r"^\d+\.\s+(.+?)\s*\((\d+)\s*min\)$", line, re.IGNORECASE)
+        if not match:
+            match = re.match(r"^\d+\.\s+(.+?)\s*\((\d+)\)$", line)
+        if match:
+            agenda.append(
+                {"topic": match.group(1).strip(), "duration_minutes": int(match.group(2))}
+            )
+        elif re.match(r"^\d+\.", line):
+            raise ValueError(line)
+    roles = {}
+    for item in bullets(sections["Roles"]):
+        if ":" in item:
+            role, person = item.split(":", 1)
+            roles[role.strip()] = person.strip()
+    total = re.search(r"Total:\s*(\d+)\s*(?:minutes?|min)?", sections["Time"], re.IGNORECASE)
+    return {
+        "intent": sections["Intent"].strip(),
+        "desired_outcomes": bullets(sections["Desired Outcomes"]),
+        "agenda": agenda,
+        "roles": roles,
+        "rules": bullets(sections["Rules"]),
+        "total_duration_minutes": int(total.group(1)),
+    }
+
+
+def legacy(markdown: str) -> dict:
+    """Validate, then parse again."""
+    legacy_strict(markdown)
+    return legacy_parse(markdown)
+
+
+def single_pass(markdown: str) -> dict:
+    """Parse once; the validator and endpoint share the result."""
+    return parse_idoarrt_document(markdown).data
+
+
+def parse_and_validate(service: IDOARRTService):
+    """What creating a meeting from markdown costs with ``service``."""
+    def run(markdown: str) -> dict:
+        document = service.parse_document(markdown)
+        service.validate_document(document)
+        return service.document_data(document)
+    return run
+
+
+def per_second(func, markdown: str, seconds: float) -> float:
+    """Calls per second of ``func(markdown)``."""
+    calls = 0
+    start = time.perf_counter()
+    while time.perf_counter() - start < seconds:
+        func(markdown)
+        calls += 1
+    return calls / (time.perf_counter() - start)
+
+
+def main():
+    """Run benchmark and print report."""
+    parser = argparse.ArgumentParser(description="IDOARRT parser benchmark")
+    parser.add_argument("--seconds", type=float, default=0.5, help="Time per measurement")
+    args = parser.parse_args()
+
+    print(f"{'items':>6} {'KB':>7} {'legacy/s':>10} {'single-pass/s':>14} {'speedup':>8}")
+    for items in (5, 50, 500, 5000):
+        markdown = generate(items)
+        assert legacy(markdown) == single_pass(markdown)
+        old = per_second(legacy, markdown, args.seconds)
+        new = per_second(single_pass, markdown, args.seconds)
+        print(f"{items:>6} {len(markdown) / 1024:7.1f} {old:10.0f} {new:14.0f} {new / old:7.1f}x")
+
+    print(f"\n{'items':>6} {'uncached/s':>11} {'cached/s':>10} {'template/s':>11}")
+    for items in (5, 50, 500):
+        markdown = generate(items)
+        uncached, cached = IDOARRTService(cache_size=0), IDOARRTService()
+        data = cached.parse_idoarrt(markdown)
+        template = MeetingTemplate(name="Mall", **{field: data[field] for field in IDOARRT_FIELDS})
+        overrides = MeetingTemplateOverrides(intent="Vecka 42", roles={"Tidhållare": "Björn"})
+        templates = MeetingTemplateService(cached)
+
+        def from_template(
+            _: str, cached=cached, templates=templates, template=template, overrides=overrides
+        ) -> None:
+            cached.validate_idoarrt(templates.apply_overrides(template, overrides))
+
+        rates = [
+            per_second(parse_and_validate(uncached), markdown, args.seconds),
+            per_second(parse_and_validate(cached), markdown, args.seconds),
+            per_second(from_template, markdown, args.seconds),
+        ]
+        print(f"{items:>6} {rates[0]:11.0f} {rates[1]:10.0f} {rates[2]:11.0f}")
+
+
+if __name__ == "__main__":
+    main()
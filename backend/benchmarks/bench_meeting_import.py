@@ -0,0 +1,129 @@
+#!/usr/bin/env python3
+"""
+Benchmark bulk meeting import against one POST /meetings per document.
+
+The per-request path validates with StrictMeetingCreate, builds a
+Meeting and commits it on its own, as the create endpoint does. The bulk
+path parses every document (inline, then in a process pool) and inserts
+all valid meetings in one transaction. Both run against a file-backed
+SQLite database so commits cost what they cost in development.
+"""
+
+import argparse
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+# Add app to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from app.db.session import Base
+from app.models.meeting import Meeting
+from app.schemas.strict_validation import StrictMeetingCreate
+from app.services.idoarrt_service import IDOARRTService
+from app.services.meeting_import import ImportedFile, MeetingImportService
+
+
+def generate(count: int) -> list[str]:
+    """IDOARRT documents for a recurring meeting series."""
+    documents = []
+    for number in range(count):
+        agenda = "\n".join(f"{i + 1}. Punkt {i} för vecka {number} (5 min)" for i in range(6))
+        documents.append(f"""# Veckomöte {number}
+
+# Intent
+Stämma av läget vecka {number} och fördela veckans arbete
+
+# Desired Outcomes
+- Alla vet vad som är viktigast den här veckan
+- Blockerare har en ägare
+
+# Agenda
+{agenda}
+
+# Roles
+- Facilitator: Anna
+- Tidhållare: Björn
+
+# Rules
+- En person i taget
+- Telefoner i fickan
+
+# Time
+Total: 30 minutes""")
+    return documents
+
+
+def session_for(directory: str, name: str):
+    """Fresh file-backed database session."""
+    engine = create_engine(f"sqlite:///{directory}/{name}.db")
+    Base.metadata.create_all(bind=engine)
+    return sessionmaker(bind=engine)()
+
+
+def per_request(documents: list[str], directory: str) -> float:
+    """Seconds to create every meeting through the create endpoint's steps."""
+    db = session_for(directory, "per_request")
+    service = IDOARRTService()
+    start = time.perf_counter()
+    for markdown in documents:
+        request = StrictMeetingCreate(idoarrt_markdown=markdown)
+        data = service.document_data(request.document)
+        if service.validate_idoarrt(data):
+            continue
+        db.add(Meeting(
+            intent=data["intent"],
+            desired_outcomes=data["desired_outcomes"],
+            agenda=data["agenda"],
+            roles=data["roles"],
+            rules=data["rules"],
+            total_duration_minutes=data["total_duration_minutes"],
+            status="preparation",
+        ))
+        db.commit()
+    elapsed = time.perf_counter() - start
+    db.close()
+    return elapsed
+
+
+def bulk(documents: list[str], directory: str, name: str, workers: int, threshold: int) -> float:
+    """Seconds to import every document in one batch."""
+    db = session_for(directory, name)
+    files = [ImportedFile(f"{number}.md", markdown) for number, markdown in enumerate(documents)]
+    start = time.perf_counter()
+    service = MeetingImportService(max_workers=workers, parallel_threshold=threshold)
+    summary = service.import_files(db, files)
+    elapsed = time.perf_counter() - start
+    assert summary["imported"] == len(documents)
+    db.close()
+    return elapsed
+
+
+def main():
+    """Run benchmark and print report."""
+    parser = argparse.ArgumentParser(description="Bulk meeting import benchmark")
+    parser.add_argument("--workers", type=int, default=4)
+    parser.add_argument("--skip-per-request-above", type=int, default=2000)
+    args = parser.parse_args()
+
+    bulk = f"bulk {args.workers} procs/s"
+    print(f"{'documents':>9} {'per-request/s':>14} {'bulk inline/s':>14} {bulk:>16}")
+    for count in (100, 1000, 5000, 10000):
+        documents = generate(count)
+        with tempfile.TemporaryDirectory() as directory:
+            old = (
+                f"{count / per_request(documents, directory):14.0f}"
+                if count <= args.skip_per_request_above
+                else f"{'-':>14}"
+            )
+            inline = count / bulk(documents, directory, "inline", 1, count + 1)
+            pooled = count / bulk(documents, directory, "pooled", args.workers, 0)
+        print(f"{count:>9} {old} {inline:14.0f} {pooled:16.0f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,255 @@
+#!/usr/bin/env python3
+"""
+Drive N concurrent simulated meetings through the intervention engine.
+
+Each meeting submits a transcribed chunk every ``--interval`` seconds to
+the same InterventionEngine the upload endpoint uses (prescreen, Claude
+analysis, memory update, dedup, persistence and WebSocket events). Claude
+calls go to the offline fake API in fake_anthropic.py and interventions
+are written to an in-memory database, so no API key is needed and runs
+with the same seed are reproducible.
+
+Intervention latency is measured from chunk submission to the complete
+question event; in two-call mode also to the first streamed delta.
+"""
+
+import argparse
+import asyncio
+import os
+import random
+import sys
+import time
+from datetime import datetime
+from pathlib import Path
+from typing import Any
+
+# Add app to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from fake_anthropic import FakeAnthropicConfig, FakeAnthropicServer, LatencyDistribution
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+
+from app.core.event_bus import InProcessEventBus
+from app.db.session import Base
+from app.models.meeting import Intervention, Meeting
+from app.services.claude_scheduler import ClaudeRequestScheduler
+from app.services.claude_service import AsyncClaudeService
+from app.services.intervention_engine import InterventionEngine
+from app.services.response_cache import ResponseCache
+from app.services.trigger_prescreen import TriggerPrescreener
+
+INTENT = "Välja kaffemaskin till kontoret"
+DESIRED_OUTCOMES = ["Beslut om modell", "Budget för inköp"]
+AGENDA = [
+    {"topic": "Behov", "duration_minutes": 20},
+    {"topic": "Alternativ", "duration_minutes": 20},
+    {"topic": "Beslut", "duration_minutes": 20},
+]
+
+ON_TOPIC = [
+    "Kaffemaskinen måste klara trettio koppar på morgonen.",
+    "Budgeten för inköpet ligger runt tjugo tusen kronor.",
+    "Vilken modell är lättast att rengöra?",
+    "Jag tycker vi ska välja bönmaskinen, den håller längre.",
+    "Okej, ska vi fatta beslut om modell nu?",
+]
+OFF_TOPIC = [
+    "Förresten, har någon sett matchen i helgen?",
+    "Parkeringen utanför kontoret är full varje morgon nu.",
+    "Semesterplaneringen behöver vara klar innan maj.",
+    "Jag pratade med IT om nya datorer till hela avdelningen.",
+]
+
+
+class RecordingManager:
+    """WebSocket manager stand-in that timestamps question events."""
+
+    def __init__(self) -> None:
+        self.questions: dict[str, float] = {}
+        self.first_deltas: dict[str, float] = {}
+
+    async def send_event(self, meeting_id: str, event_type: Any, data: Any) -> None:
+        now = time.perf_counter()
+        if getattr(data, "question", None) is not None and data.intervention_id:
+            self.questions[data.intervention_id] = now
+        elif getattr(data, "index", None) == 0:
+            self.first_deltas.setdefault(data.stream_id, now)
+
+
+def make_chunk(rng: random.Random) -> str:
+    """Synthesize one transcribed chunk, sometimes drifting off topic."""
+    pool = OFF_TOPIC if rng.random() < 0.3 else ON_TOPIC
+    return " ".join(rng.choice(pool) for _ in range(rng.randint(6, 14)))
+
+
+def percentile(values: list[float], pct: float) -> float:
+    """Nearest-rank percentile."""
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(round(pct / 100 * (len(ordered) - 1))))]
+
+
+async def run_meeting(
+    engine: InterventionEngine,
+    meeting: Meeting,
+    chunks: int,
+    interval: float,
+    rng: random.Random,
+    arrivals: dict[tuple[str, int], float],
+) -> None:
+    """Submit one meeting's chunks at the chunk interval."""
+    for number in range(chunks):
+        arrivals[(meeting.id, number)] = time.perf_counter()
+        engine.submit(meeting, number, make_chunk(rng))
+        await asyncio.sleep(interval)
+
+
+async def run(
+    args: argparse.Namespace, base_url: str
+) -> tuple[dict[str, list[float]], dict, float]:
+    """Run all meetings concurrently against the fake API."""
+    db_engine = create_engine(
+        "sqlite://", connect_args={"check_same_thread": False}, poolclass=StaticPool
+    )
+    Base.metadata.create_all(bind=db_engine)
+    session_factory = sessionmaker(bind=db_engine)
+
+    db = session_factory()
+    meetings = [
+        Meeting(
+            intent=INTENT,
+            desired_outcomes=DESIRED_OUTCOMES,
+            agenda=AGENDA,
+            roles={"Facilitator": "Anna"},
+            rules=["En i taget"],
+            total_duration_minutes=60,
+            status="active",
+            started_at=datetime.utcnow(),
+        )
+        for _ in range(args.meetings)
+    ]
+    db.add_all(meetings)
+    db.commit()
+    for meeting in meetings:
+        db.refresh(meeting)
+    db.expunge_all()
+    db.close()
+
+    service = AsyncClaudeService(
+        base_url=base_url,
+        max_connections=args.connections,
+        max_concurrency=args.connections,
+        scheduler=ClaudeRequestScheduler(
+            requests_per_minute=args.rpm, tokens_per_minute=args.tpm, max_attempts=3
+        ),
+        response_cache=ResponseCache(str(args.response_cache)) if args.response_cache else None,
+    )
+    service.facilitation_mode = args.mode
+    manager = RecordingManager()
+    engine = InterventionEngine(
+        claude_service_factory=lambda: service,
+        session_factory=session_factory,
+        manager=manager,  # type: ignore[arg-type]
+        bus=InProcessEventBus(),
+        prescreener=None if args.no_prescreen else TriggerPrescreener(),
+        cooldown_seconds=args.cooldown,
+        dedup_window_seconds=args.cooldown,
+    )
+    arrivals: dict[tuple[str, int], float] = {}
+
+    start = time.perf_counter()
+    try:
+        await asyncio.gather(*[
+            run_meeting(
+                engine, meeting, args.chunks, args.interval, random.Random(args.seed + i), arrivals
+            )
+            for i, meeting in enumerate(meetings)
+        ])
+        await engine.aclose()
+    finally:
+        await service.aclose()
+    wall = time.perf_counter() - start
+
+    latencies: dict[str, list[float]] = {"question": [], "first_delta": []}
+    db = session_factory()
+    for intervention in db.query(Intervention).all():
+        arrived = arrivals[(intervention.meeting_id, intervention.trigger_context["chunk_number"])]
+        if intervention.id in manager.questions:
+            latencies["question"].append(manager.questions[intervention.id] - arrived)
+        if intervention.id in manager.first_deltas:
+            latencies["first_delta"].append(manager.first_deltas[intervention.id] - arrived)
+    db.close()
+
+    stats = {
+        "engine": engine.stats(),
+        "scheduler": service.scheduler.stats(),
+        "usage": service.usage.as_dict(),
+    }
+    if service.response_cache is not None:
+        stats["response_cache"] = service.response_cache.stats()
+    return latencies, stats, wall
+
+
+def main():
+    """Run benchmark and print report."""
+    parser = argparse.ArgumentParser(description="Concurrent meeting pipeline benchmark")
+    parser.add_argument("--meetings", type=int, default=20)
+    parser.add_argument("--chunks", type=int, default=10, help="Chunks per meeting")
+    parser.add_argument("--interval", type=float, default=1.0, help="Seconds between chunks")
+    parser.add_argument("--mode", choices=["combined", "two_call"], default="combined")
+    parser.add_argument("--no-prescreen", action="store_true")
+    parser.add_argument(
+        "--cooldown", type=float, default=0.0, help="Engine cooldown and dedup window (seconds)"
+    )
+    parser.add_argument("--connections", type=int, default=20)
+    parser.add_argument("--rpm", type=float, default=4000)
+    parser.add_argument("--tpm", type=float, default=4_000_000)
+    parser.add_argument("--latency-ms", type=float, default=800, help="Median API latency")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="Share of 529 responses")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--config", type=Path, help="FakeAnthropicConfig JSON (overrides above)")
+    parser.add_argument(
+        "--response-cache", type=Path, help="Response cache file (run twice to measure a replay)"
+    )
+    args = parser.parse_args()
+
+    if args.config:
+        config = FakeAnthropicConfig.model_validate_json(args.config.read_text(encoding="utf-8"))
+    else:
+        config = FakeAnthropicConfig(
+            seed=args.seed,
+            latency=LatencyDistribution(median_ms=args.latency_ms),
+            overloaded_rate=args.error_rate,
+        )
+
+    os.environ.setdefault("ANTHROPIC_API_KEY", "fake-key")
+    with FakeAnthropicServer(config) as server:
+        latencies, stats, wall = asyncio.run(run(args, server.base_url))
+        api_requests = server.fake.requests
+        api_errors = dict(server.fake.errors)
+
+    print(
+        f"{args.meetings} meetings x {args.chunks} chunks, mode={args.mode}, "
+        f"prescreen={'off' if args.no_prescreen else 'on'}, "
+        f"median API latency {config.latency.median_ms:.0f} ms\n"
+    )
+    print(f"Interventions:        {len(latencies['question'])}")
+    for label, values in (
+        ("Question", latencies["question"]),
+        ("First delta", latencies["first_delta"]),
+    ):
+        if not values:
+            continue
+        for pct in (50, 90, 95, 99):
+            print(f"{label + ' p' + str(pct) + ':':<22}{percentile(values, pct) * 1000:8.0f} ms")
+        print(f"{label + ' max:':<22}{max(values) * 1000:8.0f} ms")
+    print(f"API requests:         {api_requests} ({api_errors or 'no'} errors)")
+    print(f"Stats:                {stats}")
+    print(f"Wall time:            {wall:.1f} s")
+
+
+if __name__ == "__main__":
+    main()
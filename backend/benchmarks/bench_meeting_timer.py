@@ -0,0 +1,82 @@
+#!/usr/bin/env python3
+"""
+Benchmark the meeting timer with thousands of concurrent meetings.
+
+Schedules N meetings with a few agenda items each, extends every meeting
+once and then fires all deadlines, reporting the cost per operation.
+Events go to a no-op manager so only the scheduler itself is measured.
+"""
+
+import argparse
+import asyncio
+import sys
+import time
+from datetime import datetime, timedelta
+from pathlib import Path
+from types import SimpleNamespace
+
+# Add app to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from app.core.event_bus import InProcessEventBus
+from app.services.meeting_timer import MeetingTimerScheduler, to_timestamp
+
+
+class NullManager:
+    """WebSocket manager stand-in that drops events."""
+
+    async def send_event(self, meeting_id, event_type, data) -> None:
+        pass
+
+
+def main():
+    """Run benchmark and print report."""
+    parser = argparse.ArgumentParser(description="Meeting timer benchmark")
+    parser.add_argument("--meetings", type=int, default=10_000)
+    parser.add_argument("--agenda-items", type=int, default=4)
+    args = parser.parse_args()
+
+    base = datetime(2025, 1, 1, 9, 0)
+    now = to_timestamp(base)
+    scheduler = MeetingTimerScheduler(
+        manager=NullManager(), bus=InProcessEventBus(), clock=lambda: now  # type: ignore[arg-type]
+    )
+    meetings = [
+        SimpleNamespace(
+            id=f"m{number}",
+            started_at=base + timedelta(seconds=number % 3600),
+            total_duration_minutes=60,
+            time_extensions_seconds=0,
+            agenda=[{"topic": f"Punkt {i}", "duration_minutes": 60 // args.agenda_items}
+                    for i in range(args.agenda_items)],
+        )
+        for number in range(args.meetings)
+    ]
+
+    start = time.perf_counter()
+    for meeting in meetings:
+        scheduler.schedule(meeting)
+    scheduled = time.perf_counter() - start
+
+    start = time.perf_counter()
+    for meeting in meetings:
+        meeting.time_extensions_seconds = 600
+        scheduler.schedule(meeting)
+    extended = time.perf_counter() - start
+
+    pending = scheduler.stats()["pending"]
+    start = time.perf_counter()
+    sent = asyncio.run(scheduler.run_due(now + 3 * 3600))
+    fired = time.perf_counter() - start
+
+    print(f"{args.meetings} meetings, {args.agenda_items} agenda items each\n")
+    print(f"Schedule:   {scheduled / args.meetings * 1e6:6.1f} µs/meeting")
+    print(f"Extend:     {extended / args.meetings * 1e6:6.1f} µs/meeting")
+    print(
+        f"Fire:       {fired / max(sent, 1) * 1e6:6.1f} µs/event "
+        f"({sent} events, {pending} heap entries incl. stale)"
+    )
+
+
+if __name__ == "__main__":
+    main()
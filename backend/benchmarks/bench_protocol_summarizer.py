@@ -0,0 +1,115 @@
+#!/usr/bin/env python3
+"""
+Benchmark map-reduce protocol summarization against meeting length.
+
+Summarizes generated transcripts of 1 to 12 hour meetings through the
+offline fake API in fake_anthropic.py, once one request at a time and
+once with bounded concurrency, and reports requests, the largest request
+(estimated tokens) next to the size of a single whole-transcript request,
+and wall time.
+"""
+
+import argparse
+import asyncio
+import sys
+import time
+from pathlib import Path
+from typing import Any
+
+# Add app to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from fake_anthropic import FakeAnthropicConfig, FakeAnthropicServer, LatencyDistribution
+
+from app.models.meeting import AudioChunk, Meeting
+from app.services.claude_scheduler import ClaudeRequestScheduler
+from app.services.claude_service import AsyncClaudeService
+from app.services.meeting_memory import estimate_tokens
+from app.services.protocol_summarizer import ProtocolSummarizer
+
+CHUNK_MINUTES = 2
+# About 130 spoken words per minute
+CHUNK_TEXT = " ".join(
+    ["vi behöver bestämma vilken kaffemaskin vi köper och vem som beställer den"] * 20
+)
+
+
+def make_meeting(hours: int) -> Meeting:
+    """Meeting with one agenda item per half hour."""
+    return Meeting(
+        intent="Planera kvartalet",
+        desired_outcomes=["Budget beslutad", "Ägare för varje mål", "Risker kända"],
+        agenda=[{"topic": f"Punkt {i + 1}", "duration_minutes": 30} for i in range(hours * 2)],
+        total_duration_minutes=hours * 60,
+    )
+
+
+def make_chunks(hours: int) -> list[AudioChunk]:
+    """Transcribed chunks covering ``hours``."""
+    return [
+        AudioChunk(
+            chunk_number=number,
+            audio_blob=b"",
+            duration_seconds=CHUNK_MINUTES * 60,
+            transcription=f"[{number}] {CHUNK_TEXT}",
+        )
+        for number in range(hours * 60 // CHUNK_MINUTES)
+    ]
+
+
+async def run(base_url: str, hours: int, concurrency: int) -> dict[str, Any]:
+    """Summarize one meeting; returns requests, largest request and seconds."""
+    service = AsyncClaudeService(
+        base_url=base_url,
+        max_concurrency=16,
+        scheduler=ClaudeRequestScheduler(
+            requests_per_minute=100_000, tokens_per_minute=100_000_000
+        ),
+    )
+    largest = 0
+    create_message = service._create_message
+
+    async def measured(meeting_id, priority, **kwargs):
+        nonlocal largest
+        largest = max(largest, service._estimate_request_tokens(kwargs))
+        return await create_message(meeting_id, priority, **kwargs)
+
+    service._create_message = measured  # type: ignore[method-assign]
+    summarizer = ProtocolSummarizer(lambda: service, max_concurrency=concurrency)
+    start = time.perf_counter()
+    summary = await summarizer.summarize(make_meeting(hours), make_chunks(hours))
+    elapsed = time.perf_counter() - start
+    await service.aclose()
+    assert len(summary.agenda_summary) == hours * 2
+    return {"requests": service.usage.requests, "largest": largest, "seconds": elapsed}
+
+
+def main():
+    """Run benchmark and print report."""
+    parser = argparse.ArgumentParser(description="Map-reduce protocol summarization benchmark")
+    parser.add_argument("--latency-ms", type=float, default=300.0, help="Median fake API latency")
+    parser.add_argument("--concurrency", type=int, default=8)
+    args = parser.parse_args()
+
+    config = FakeAnthropicConfig(
+        latency=LatencyDistribution(median_ms=args.latency_ms),
+        output_tokens_per_second=400.0,
+    )
+    print(
+        f"{'hours':>5} {'transcript tok':>14} {'requests':>8} {'largest tok':>11} "
+        f"{'1 at a time s':>13} {args.concurrency:>2} at a time s"
+    )
+    with FakeAnthropicServer(config) as server:
+        for hours in (1, 3, 6, 12):
+            transcript = sum(estimate_tokens(chunk.transcription) for chunk in make_chunks(hours))
+            sequential = asyncio.run(run(server.base_url, hours, 1))
+            bounded = asyncio.run(run(server.base_url, hours, args.concurrency))
+            assert sequential["requests"] == bounded["requests"]
+            print(
+                f"{hours:>5} {transcript:>14} {bounded['requests']:>8} {bounded['largest']:>11} "
+                f"{sequential['seconds']:>13.1f} {bounded['seconds']:>15.1f}"
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,57 @@
+#!/usr/bin/env python3
+"""Benchmark binary field ciphertext against base64-of-Fernet text columns."""
+
+import sys
+import time
+from pathlib import Path
+
+# Add app to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from app.core.encryption import db_encryption
+
+# A 2-minute chunk of Swedish speech is roughly 1,500-2,000 characters
+SAMPLE = (
+    "Vi behöver bestämma oss för vilken kaffemaskin vi ska köpa till kontoret. "
+    "Jag tycker att vi ska titta på både pris och hur lätt den är att rengöra. "
+)
+SIZES = {"short (150 chars)": 1, "chunk (~1.8k chars)": 12, "protocol (~60k chars)": 400}
+ROUNDS = 2000
+
+
+def avg_time(func, rounds: int) -> float:
+    """Return average seconds per call over ``rounds`` calls."""
+    start = time.perf_counter()
+    for _ in range(rounds):
+        func()
+    return (time.perf_counter() - start) / rounds
+
+
+def main() -> None:
+    """Run text ciphertext benchmark."""
+    header = (
+        f"{'payload':<22} {'plain':>8} {'legacy':>8} {'binary':>8} {'saved':>7} "
+        f"{'legacy µs':>10} {'binary µs':>10}"
+    )
+    print(header)
+    print("-" * len(header))
+
+    for name, repeat in SIZES.items():
+        plaintext = SAMPLE * repeat
+        plain_len = len(plaintext.encode("utf-8"))
+        legacy = db_encryption.encrypt_text(plaintext)
+        binary = db_encryption.encrypt_field(plaintext)
+
+        rounds = max(20, ROUNDS // repeat)
+        legacy_time = avg_time(lambda token=legacy: db_encryption.decrypt_text(token), rounds)
+        binary_time = avg_time(lambda value=binary: db_encryption.decrypt_field(value), rounds)
+
+        saved = 100 * (1 - len(binary) / len(legacy))
+        print(
+            f"{name:<22} {plain_len:>8} {len(legacy):>8} {len(binary):>8} {saved:>6.1f}% "
+            f"{legacy_time * 1e6:>10.1f} {binary_time * 1e6:>10.1f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
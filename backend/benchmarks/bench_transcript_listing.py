@@ -0,0 +1,112 @@
+#!/usr/bin/env python3
+"""Benchmark listing a 90-chunk meeting with and without decrypted-value caching."""
+
+import sys
+import time
+from pathlib import Path
+
+# Add app to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from app.core.encryption import db_encryption
+from app.db.session import Base
+from app.models.meeting import AudioChunk, Meeting
+from app.services.transcript_service import TranscriptService
+
+CHUNKS = 90
+ACCESSES_PER_CHUNK = 3  # listing response, Claude history, protocol text
+ROUNDS = 20
+SAMPLE = (
+    "Vi behöver bestämma oss för vilken kaffemaskin vi ska köpa till kontoret. "
+    "Jag tycker att vi ska titta på både pris och hur lätt den är att rengöra. "
+) * 12
+
+
+def setup(legacy: bool) -> tuple[sessionmaker, str]:
+    """Create an in-memory database with one 90-chunk meeting."""
+    engine = create_engine("sqlite:///:memory:")
+    Base.metadata.create_all(bind=engine)
+    Session = sessionmaker(bind=engine)
+    db = Session()
+    meeting = Meeting(
+        intent="Välja kaffemaskin",
+        desired_outcomes=["Beslut"],
+        agenda=[{"topic": "Diskussion", "duration_minutes": 180}],
+        roles={"Facilitator": "Anna"},
+        rules=["En i taget"],
+        total_duration_minutes=180,
+    )
+    db.add(meeting)
+    db.flush()
+    for number in range(1, CHUNKS + 1):
+        chunk = AudioChunk(
+            meeting_id=meeting.id,
+            chunk_number=number,
+            audio_blob=b"webm",
+            duration_seconds=120.0,
+            transcription=f"{number}: {SAMPLE}",
+        )
+        if legacy:
+            # Pre-binary base64-of-Fernet storage format
+            chunk._transcription = db_encryption.encrypt_text(f"{number}: {SAMPLE}").encode()
+        db.add(chunk)
+    db.commit()
+    meeting_id = meeting.id
+    db.close()
+    return Session, meeting_id
+
+
+def run_uncached(Session: sessionmaker, meeting_id: str) -> None:
+    """Old behavior: every attribute access is a separate decrypt."""
+    db = Session()
+    chunks = (
+        db.query(AudioChunk)
+        .filter(AudioChunk.meeting_id == meeting_id)
+        .order_by(AudioChunk.chunk_number)
+        .all()
+    )
+    for _ in range(ACCESSES_PER_CHUNK):
+        for chunk in chunks:
+            db_encryption.decrypt_field(chunk._transcription)
+    db.close()
+
+
+def run_cached(Session: sessionmaker, meeting_id: str, max_workers: int | None) -> None:
+    """New behavior: bulk decrypt once, then serve from the instance cache."""
+    db = Session()
+    chunks = TranscriptService.load_chunks(db, meeting_id, max_workers=max_workers)
+    for _ in range(ACCESSES_PER_CHUNK):
+        for chunk in chunks:
+            _ = chunk.transcription
+    db.close()
+
+
+def measure(func) -> float:
+    """Return best-of-ROUNDS time in milliseconds."""
+    best = float("inf")
+    for _ in range(ROUNDS):
+        start = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter() - start)
+    return best * 1000
+
+
+def main() -> None:
+    """Run listing benchmark."""
+    print(f"{CHUNKS} chunks, {ACCESSES_PER_CHUNK} transcript reads per chunk per request")
+    for legacy in (True, False):
+        Session, meeting_id = setup(legacy)
+        uncached = measure(lambda s=Session, m=meeting_id: run_uncached(s, m))
+        inline = measure(lambda s=Session, m=meeting_id: run_cached(s, m, None))
+        threaded = measure(lambda s=Session, m=meeting_id: run_cached(s, m, 4))
+        print(f"\n{'legacy Fernet' if legacy else 'binary AES-GCM'} storage:")
+        print(f"  uncached (decrypt per access):  {uncached:7.2f} ms")
+        print(f"  bulk + cache, inline:           {inline:7.2f} ms")
+        print(f"  bulk + cache, 4 worker threads: {threaded:7.2f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,118 @@
+#!/usr/bin/env python3
+"""
+Benchmark coalescing of high-frequency WebSocket events.
+
+Streams partial transcripts, progress updates and question deltas at a
+steady rate to a meeting with several subscribers, once with every event
+sent as it comes and once with the default coalesce rules, and reports
+frames written per client and manager CPU time per event.
+"""
+
+import argparse
+import asyncio
+import sys
+import time
+from pathlib import Path
+
+# Add app to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from app.core.websocket import WebSocketManager
+from app.schemas.websocket_events import (
+    InterventionQuestionDeltaEvent,
+    InterventionType,
+    TranscriptionPartialEvent,
+    TranscriptionProgressEvent,
+    WebSocketEventType,
+)
+
+WORDS = [
+    "vi", "borde", "nog", "bestämma", "oss", "för", "en", "kaffemaskin",
+    "innan", "fredag", "så", "att", "inköp", "hinner", "beställa",
+]
+
+
+class NullWebSocket:
+    """WebSocket stand-in that counts frames."""
+
+    def __init__(self) -> None:
+        self.scope = {"subprotocols": []}
+        self.frames = 0
+
+    async def accept(self, subprotocol: str | None = None) -> None:
+        pass
+
+    async def send_text(self, text: str) -> None:
+        self.frames += 1
+
+
+async def stream(coalesce: bool, subscribers: int, seconds: float, rate: int) -> dict[str, float]:
+    """Send ``rate`` events per second for ``seconds`` and count frames per client."""
+    manager = WebSocketManager(max_queue_size=100_000, coalesce_rules=None if coalesce else {})
+    sockets = [NullWebSocket() for _ in range(subscribers)]
+    for socket in sockets:
+        await manager.connect(socket, "m1")
+
+    events = int(seconds * rate)
+    cpu = 0.0
+    for n in range(events):
+        chunk = n // 200
+        kind = n % 4
+        start = time.perf_counter()
+        if kind in (0, 1):
+            await manager.send_event(
+                "m1",
+                WebSocketEventType.TRANSCRIPTION_PARTIAL,
+                TranscriptionPartialEvent(
+                    chunk_number=chunk, text=" ".join(WORDS[: n % len(WORDS) + 1])
+                ),
+            )
+        elif kind == 2:
+            await manager.send_event(
+                "m1",
+                WebSocketEventType.TRANSCRIPTION_PROGRESS,
+                TranscriptionProgressEvent(chunk_number=chunk, percent=(n % 200) // 2),
+            )
+        else:
+            await manager.send_event(
+                "m1",
+                WebSocketEventType.INTERVENTION_QUESTION,
+                InterventionQuestionDeltaEvent(
+                    stream_id=f"q{chunk}",
+                    intervention_type=InterventionType.GOAL_DEVIATION,
+                    index=n,
+                    delta=WORDS[n % len(WORDS)] + " ",
+                ),
+            )
+        cpu += time.perf_counter() - start
+        await asyncio.sleep(1 / rate)
+
+    await manager.flush("m1")
+    await asyncio.sleep(0.05)
+    frames = sum(socket.frames for socket in sockets) / subscribers
+    for socket in sockets:
+        manager.disconnect(socket, "m1")
+    return {"events": events, "frames": frames, "us_per_event": cpu / events * 1e6}
+
+
+def main():
+    """Run benchmark and print report."""
+    parser = argparse.ArgumentParser(description="WebSocket coalescing benchmark")
+    parser.add_argument("--seconds", type=float, default=3.0)
+    parser.add_argument("--rate", type=int, default=400, help="Events per second")
+    parser.add_argument("--subscribers", type=int, default=10)
+    args = parser.parse_args()
+
+    print(f"{args.rate} events/s for {args.seconds:.0f} s to {args.subscribers} subscribers\n")
+    print(f"{'mode':>10} {'events':>8} {'frames/client':>14} {'us/event':>9}")
+    for coalesce in (False, True):
+        result = asyncio.run(stream(coalesce, args.subscribers, args.seconds, args.rate))
+        mode = "coalesced" if coalesce else "direct"
+        print(
+            f"{mode:>10} {result['events']:8d} {result['frames']:14.0f} "
+            f"{result['us_per_event']:9.1f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
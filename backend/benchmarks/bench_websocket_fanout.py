@@ -0,0 +1,131 @@
+#!/usr/bin/env python3
+"""
+Benchmark WebSocket event fan-out at 1, 10 and 100 subscribers.
+
+Compares the previous encoding (model_dump of the event, a WebSocketEvent
+wrapper dumped again and json.dumps per broadcast) with the
+serialize-once path in WebSocketManager, and measures end-to-end events
+per second through the per-client queues to no-op sockets.
+"""
+
+import argparse
+import asyncio
+import json
+import sys
+import time
+from pathlib import Path
+
+# Add app to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from app.core.event_encoding import EncodedEvent, msgpack_available
+from app.core.websocket import WebSocketManager
+from app.schemas.websocket_events import (
+    InterventionQuestionEvent,
+    InterventionType,
+    WebSocketEvent,
+    WebSocketEventType,
+)
+
+EVENT = InterventionQuestionEvent(
+    intervention_type=InterventionType.GOAL_DEVIATION,
+    question="Hur hänger det här ihop med beslutet om kaffemaskin som vi ska fatta idag?",
+    context="Diskussionen har glidit över till parkeringen utanför kontoret.",
+    intervention_id="4f1c2a9e-0d8b-4b8e-9a53-1f3f1b2c7d10",
+)
+
+
+class NullWebSocket:
+    """WebSocket stand-in that accepts every frame immediately."""
+
+    def __init__(self, binary: bool = False) -> None:
+        self.scope = {"subprotocols": ["meeting-events.msgpack"] if binary else []}
+        self.frames = 0
+
+    async def accept(self, subprotocol: str | None = None) -> None:
+        pass
+
+    async def send_text(self, text: str) -> None:
+        self.frames += 1
+
+    async def send_bytes(self, data: bytes) -> None:
+        self.frames += 1
+
+
+def legacy_encode() -> str:
+    """Encoding done per broadcast before serialize-once."""
+    event = WebSocketEvent(type=WebSocketEventType.INTERVENTION_QUESTION, data=EVENT.model_dump())
+    return json.dumps(event.model_dump(), default=str)
+
+
+def new_encode() -> str:
+    """Serialize-once encoding."""
+    payload = {
+        "type": WebSocketEventType.INTERVENTION_QUESTION,
+        "data": EVENT.model_dump(),
+        "timestamp": EVENT.timestamp,
+    }
+    return EncodedEvent(payload).text
+
+
+def per_second(func, seconds: float = 0.5) -> float:
+    """Calls per second of a synchronous function."""
+    calls = 0
+    start = time.perf_counter()
+    while time.perf_counter() - start < seconds:
+        for _ in range(100):
+            func()
+        calls += 100
+    return calls / (time.perf_counter() - start)
+
+
+async def fanout(subscribers: int, events: int, binary: bool, legacy: bool) -> float:
+    """End-to-end events per second to ``subscribers`` clients."""
+    manager = WebSocketManager(max_queue_size=events + 1)
+    sockets = [NullWebSocket(binary) for _ in range(subscribers)]
+    for socket in sockets:
+        await manager.connect(socket, "m1")
+
+    start = time.perf_counter()
+    for _ in range(events):
+        if legacy:
+            # Old broadcast: dump twice, then one json.dumps and one awaited send per client
+            text = legacy_encode()
+            for socket in sockets:
+                await socket.send_text(text)
+        else:
+            await manager.send_event("m1", WebSocketEventType.INTERVENTION_QUESTION, EVENT)
+    while any(socket.frames < events for socket in sockets):
+        await asyncio.sleep(0)
+    elapsed = time.perf_counter() - start
+
+    for socket in sockets:
+        manager.disconnect(socket, "m1")
+    return events / elapsed
+
+
+def main():
+    """Run benchmark and print report."""
+    parser = argparse.ArgumentParser(description="WebSocket fan-out benchmark")
+    parser.add_argument("--events", type=int, default=2000)
+    args = parser.parse_args()
+
+    print(
+        f"Encode only:  legacy {per_second(legacy_encode):9.0f}/s   "
+        f"serialize-once {per_second(new_encode):9.0f}/s\n"
+    )
+    print(f"{'subscribers':>11} {'legacy/s':>10} {'json/s':>10} {'msgpack/s':>10}")
+    for subscribers in (1, 10, 100):
+        events = max(200, args.events // subscribers)
+        legacy = asyncio.run(fanout(subscribers, events, binary=False, legacy=True))
+        text = asyncio.run(fanout(subscribers, events, binary=False, legacy=False))
+        binary = (
+            f"{asyncio.run(fanout(subscribers, events, binary=True, legacy=False)):10.0f}"
+            if msgpack_available()
+            else f"{'n/a':>10}"
+        )
+        print(f"{subscribers:>11} {legacy:10.0f} {text:10.0f} {binary}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,124 @@
+#!/usr/bin/env python3
+"""
+Compare combined and two-call facilitation against the real Claude API.
+
+Replays a JSONL corpus (same format as eval_trigger_prescreen.py; the
+``claude_triggers`` label is optional) through both modes and reports
+latency, API calls, tokens and how often the two modes agree on which
+triggers fired. Requires ANTHROPIC_API_KEY.
+"""
+
+import argparse
+import asyncio
+import json
+import statistics
+import sys
+from pathlib import Path
+
+# Add app to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from app.services.claude_service import AsyncClaudeService
+
+
+def load_corpus(path: Path) -> list[dict]:
+    """Load corpus lines."""
+    with path.open(encoding="utf-8") as f:
+        return [json.loads(line) for line in f if line.strip()]
+
+
+def percentile(values: list[float], pct: float) -> float:
+    """Nearest-rank percentile."""
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(round(pct / 100 * (len(ordered) - 1))))]
+
+
+async def run_mode(corpus: list[dict], mode: str) -> tuple[list[dict], dict]:
+    """Run every chunk through one mode, keeping per-meeting history."""
+    service = AsyncClaudeService()
+    histories: dict[str, list[str]] = {}
+    results = []
+    try:
+        for entry in corpus:
+            history = histories.setdefault(entry["meeting_id"], [])
+            result = await service.facilitate(
+                entry["transcription"], entry["meeting_context"], history[-3:],
+                mode=mode, meeting_id=entry["meeting_id"],
+            )
+            history.append(entry["transcription"])
+            results.append(result)
+    finally:
+        await service.aclose()
+
+    latencies = [r["latency_ms"] for r in results]
+    summary = {
+        "mode": mode,
+        "chunks": len(results),
+        "api_calls": sum(r["api_calls"] for r in results),
+        "errors": sum(1 for r in results if "error" in r),
+        "p50_ms": percentile(latencies, 50),
+        "p95_ms": percentile(latencies, 95),
+        "mean_ms": round(statistics.fmean(latencies), 1) if latencies else 0.0,
+        **service.usage.as_dict(),
+    }
+    return results, summary
+
+
+def trigger_types(result: dict) -> set[str]:
+    """Trigger types reported for one chunk."""
+    return {t["type"] for t in result.get("triggers", [])}
+
+
+def main():
+    """Run comparison and print report."""
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[1])
+    parser.add_argument("corpus", type=Path, help="JSONL corpus of transcribed chunks")
+    parser.add_argument(
+        "--show-questions", action="store_true", help="Print questions side by side"
+    )
+    args = parser.parse_args()
+
+    corpus = load_corpus(args.corpus)
+    print(f"Comparing facilitation modes on {len(corpus)} chunks\n")
+
+    combined, combined_summary = asyncio.run(run_mode(corpus, "combined"))
+    two_call, two_call_summary = asyncio.run(run_mode(corpus, "two_call"))
+
+    keys = [
+        "api_calls", "errors", "p50_ms", "p95_ms", "mean_ms",
+        "input_tokens", "output_tokens", "cache_read_input_tokens",
+    ]
+    print(f"{'':26} {'combined':>12} {'two_call':>12}")
+    for key in keys:
+        print(f"{key:26} {combined_summary.get(key, 0):>12} {two_call_summary.get(key, 0):>12}")
+
+    agree = sum(
+        1 for a, b in zip(combined, two_call, strict=True) if trigger_types(a) == trigger_types(b)
+    )
+    print(f"\nTrigger agreement: {agree}/{len(corpus)} chunks")
+
+    labelled = [e for e in corpus if "claude_triggers" in e]
+    if labelled:
+        for name, results in (("combined", combined), ("two_call", two_call)):
+            matches = sum(
+                1 for entry, result in zip(corpus, results, strict=True)
+                if "claude_triggers" in entry
+                and trigger_types(result) == {t["type"] for t in entry["claude_triggers"]}
+            )
+            print(f"Agreement with labels ({name}): {matches}/{len(labelled)}")
+
+    if args.show_questions:
+        for entry, a, b in zip(corpus, combined, two_call, strict=True):
+            if not a.get("triggers") and not b.get("triggers"):
+                continue
+            print(f"\n--- {entry['transcription'][:80]}")
+            for t in a.get("triggers", []):
+                print(f"  combined  [{t['type']}] {t['question']}")
+            for t in b.get("triggers", []):
+                print(f"  two_call  [{t['type']}] {t['question']}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,86 @@
+#!/usr/bin/env python3
+"""
+Measure agreement between the local trigger prescreen and Claude.
+
+The corpus is a JSONL file with one transcribed chunk per line, in meeting
+order, labelled with the triggers Claude returned for it:
+
+    {"meeting_id": "...", "meeting_context": {"intent": "...", "desired_outcomes": [...]},
+     "transcription": "...", "claude_triggers": [{"type": "goal_deviation", ...}]}
+"""
+
+import argparse
+import json
+import sys
+from pathlib import Path
+
+# Add app to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from app.services.trigger_prescreen import TriggerPrescreener
+
+
+def load_corpus(path: Path) -> list[dict]:
+    """Load corpus lines."""
+    with path.open(encoding="utf-8") as f:
+        return [json.loads(line) for line in f if line.strip()]
+
+
+def evaluate(corpus: list[dict], threshold: float, max_skips: int) -> dict:
+    """Replay the corpus through a fresh prescreener and compare with Claude labels."""
+    prescreener = TriggerPrescreener(threshold=threshold, max_consecutive_skips=max_skips)
+    true_pos = false_pos = true_neg = false_neg = 0
+
+    for entry in corpus:
+        result = prescreener.evaluate(
+            entry["meeting_id"], entry["transcription"], entry["meeting_context"]
+        )
+        claude_positive = bool(entry.get("claude_triggers"))
+        if result.should_analyze and claude_positive:
+            true_pos += 1
+        elif result.should_analyze:
+            false_pos += 1
+        elif claude_positive:
+            false_neg += 1
+        else:
+            true_neg += 1
+
+    total = len(corpus)
+    return {
+        "threshold": threshold,
+        "chunks": total,
+        "skipped": prescreener.skipped,
+        "skip_ratio": prescreener.skip_ratio,
+        "agreement": (true_pos + true_neg) / total if total else 0.0,
+        # Share of Claude-detected triggers the prescreen still forwards
+        "recall": true_pos / (true_pos + false_neg) if true_pos + false_neg else 1.0,
+        "missed_triggers": false_neg,
+    }
+
+
+def main() -> None:
+    """Evaluate one or more thresholds."""
+    parser = argparse.ArgumentParser(
+        description=__doc__, formatter_class=argparse.RawTextHelpFormatter
+    )
+    parser.add_argument("corpus", type=Path)
+    parser.add_argument("--thresholds", type=float, nargs="+", default=[0.35, 0.45, 0.55, 0.65])
+    parser.add_argument("--max-skips", type=int, default=4)
+    args = parser.parse_args()
+
+    corpus = load_corpus(args.corpus)
+    print(
+        f"{'threshold':>9} {'chunks':>7} {'skipped':>8} {'skip %':>7} {'agree %':>8} "
+        f"{'recall %':>9} {'missed':>7}"
+    )
+    for threshold in args.thresholds:
+        r = evaluate(corpus, threshold, args.max_skips)
+        print(
+            f"{r['threshold']:>9.2f} {r['chunks']:>7} {r['skipped']:>8} "
+            f"{r['skip_ratio'] * 100:>6.1f}% {r['agreement'] * 100:>7.1f}% "
+            f"{r['recall'] * 100:>8.1f}% {r['missed_triggers']:>7}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,341 @@
+#!/usr/bin/env python3
+"""
+Deterministic offline stand-in for the Anthropic Messages API.
+
+Serves POST /v1/messages with the response shapes the facilitation
+pipeline expects: tool calls for trigger analysis (report_triggers and
+report_interventions), meeting-memory updates, protocol map steps and
+goal assessments, and plain text (or an SSE stream) for facilitation
+questions and merged protocol notes. Latency, error rates
+and trigger output are configurable. Every random draw is seeded from
+the request body, so a given run produces the same responses and delays
+regardless of request arrival order.
+
+Run standalone and point the backend at it:
+
+    python benchmarks/fake_anthropic.py --port 8090 --config fake.json
+    ANTHROPIC_BASE_URL=http://localhost:8090 ANTHROPIC_API_KEY=fake uvicorn app.main:app
+
+or start it in-process with ``FakeAnthropicServer``.
+"""
+
+import argparse
+import asyncio
+import hashlib
+import json
+import random
+import re
+import sys
+import threading
+import time
+from collections import Counter
+from collections.abc import AsyncIterator
+from pathlib import Path
+from typing import Any, Literal
+
+# Add app to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+import uvicorn
+from fastapi import FastAPI, Request
+from fastapi.responses import JSONResponse, Response, StreamingResponse
+from pydantic import BaseModel, Field
+
+from app.schemas.trigger_analysis import DetectedTrigger
+
+
+class LatencyDistribution(BaseModel):
+    """Distribution of time to the first byte of a response."""
+
+    kind: Literal["fixed", "uniform", "lognormal"] = "lognormal"
+    median_ms: float = 800.0
+    sigma: float = 0.35  # lognormal shape; 0.35 gives p99 around 2.3x median
+    min_ms: float = 50.0
+    max_ms: float = 10_000.0
+
+    def sample(self, rng: random.Random) -> float:
+        """Draw one latency in seconds."""
+        if self.kind == "fixed":
+            value = self.median_ms
+        elif self.kind == "uniform":
+            value = rng.uniform(self.min_ms, self.max_ms)
+        else:
+            value = rng.lognormvariate(0.0, self.sigma) * self.median_ms
+        return min(self.max_ms, max(self.min_ms, value)) / 1000
+
+
+class TriggerRule(BaseModel):
+    """Canned triggers returned when the transcription contains a phrase."""
+
+    contains: str
+    triggers: list[DetectedTrigger]
+
+
+class FakeAnthropicConfig(BaseModel):
+    """Behaviour of the fake server."""
+
+    seed: int = 0
+    latency: LatencyDistribution = Field(default_factory=LatencyDistribution)
+    output_tokens_per_second: float = 80.0  # Added to latency for the generated text
+    overloaded_rate: float = 0.0  # Share of requests answered with 529
+    rate_limited_rate: float = 0.0  # Share of requests answered with 429
+    retry_after_seconds: float = 1.0
+    trigger_rate: float = 0.3  # Share of analyses reporting a trigger when no rule matches
+    rules: list[TriggerRule] = Field(default_factory=list)
+    triggers: list[DetectedTrigger] = Field(
+        default_factory=lambda: [
+            DetectedTrigger(type="goal_deviation", confidence=0.8,
+                            reason="Diskussionen har glidit från mötets intent"),
+            DetectedTrigger(type="perspective_gap", confidence=0.75,
+                            reason="Bara en person har pratat under chunken"),
+            DetectedTrigger(type="complexity_mistake", confidence=0.7,
+                            reason="En enkel fråga behandlas som komplex"),
+        ]
+    )
+    question: str = "Hur tar det här oss närmare det vi vill uppnå idag?"
+    summary: str = "Gruppen diskuterar alternativen och har ännu inte landat i ett beslut."
+    speakers: list[str] = Field(default_factory=lambda: ["Anna", "Erik"])
+
+
+class FakeAnthropic:
+    """Response generator shared by the HTTP app and in-process callers."""
+
+    def __init__(self, config: FakeAnthropicConfig) -> None:
+        self.config = config
+        self._occurrences: Counter[str] = Counter()
+        self.requests = 0
+        self.errors: Counter[int] = Counter()
+        # Request bodies in arrival order, and what tests assert on besides them
+        self.received: list[dict[str, Any]] = []
+        self.connections: set[tuple[str, int]] = set()
+        self.in_flight = 0
+        self.max_in_flight = 0
+
+    def rng_for(self, body: bytes) -> random.Random:
+        """Seeded RNG for one request, independent of arrival order."""
+        digest = hashlib.sha256(body).hexdigest()
+        self._occurrences[digest] += 1
+        return random.Random(f"{self.config.seed}:{digest}:{self._occurrences[digest]}")
+
+    def error_status(self, rng: random.Random) -> int | None:
+        """Decide whether this request fails, and how."""
+        draw = rng.random()
+        if draw < self.config.rate_limited_rate:
+            return 429
+        if draw < self.config.rate_limited_rate + self.config.overloaded_rate:
+            return 529
+        return None
+
+    def content_block(self, request: dict[str, Any], rng: random.Random) -> dict[str, Any]:
+        """Build the single content block answering ``request``."""
+        tool_choice = request.get("tool_choice")
+        if tool_choice:
+            return {
+                "type": "tool_use",
+                "id": f"toolu_{rng.getrandbits(48):012x}",
+                "name": tool_choice["name"],
+                "input": self.tool_input(tool_choice["name"], request, rng),
+            }
+        if "ANTECKNINGAR" in _user_text(request):
+            return {"type": "text", "text": self.config.summary}
+        return {"type": "text", "text": self.config.question}
+
+    def tool_input(self, name: str, request: dict[str, Any], rng: random.Random) -> dict[str, Any]:
+        """Input of the forced ``name`` tool call answering ``request``."""
+        if name in ("report_triggers", "report_interventions"):
+            triggers = [t.model_dump() for t in self._triggers(request, rng)]
+            if name == "report_interventions":
+                triggers = [{**t, "question": self.config.question} for t in triggers]
+            return {"triggers": triggers}
+        status = {"status": "partial", "comment": self.config.summary}
+        if name == "report_goal_assessment":
+            return {"assessments": [{"outcome": 1, **status}]}
+        if name == "report_outcome_assessment":
+            return status
+        if name == "report_transcript_notes":
+            # Protocol map step: notes on the first scheduled item and every outcome
+            user_text = _user_text(request)
+            scheduled = re.search(r"^(\d+)\. .*\(schemalagd", user_text, re.MULTILINE)
+            outcomes = user_text.split("ÖNSKADE UTFALL:", 1)[1].split("AGENDA:", 1)[0]
+            item = int(scheduled.group(1)) if scheduled else 1
+            return {
+                "agenda_items": [{"item": item, "summary": self.config.summary}],
+                "outcomes": [
+                    {"outcome": index, "evidence": self.config.summary}
+                    for index in range(1, len(outcomes.strip().splitlines()) + 1)
+                ],
+            }
+        return {"summary": self.config.summary, "speakers": self.config.speakers}
+
+    def _triggers(self, request: dict[str, Any], rng: random.Random) -> list[DetectedTrigger]:
+        text = _user_text(request).lower()
+        for rule in self.config.rules:
+            if rule.contains.lower() in text:
+                return rule.triggers
+        if self.config.triggers and rng.random() < self.config.trigger_rate:
+            return [rng.choice(self.config.triggers)]
+        return []
+
+    def generation_seconds(self, block: dict[str, Any]) -> float:
+        """Time to generate the output, from its rough token count."""
+        output = json.dumps(block.get("input")) if block["type"] == "tool_use" else block["text"]
+        return (len(output) / 4) / self.config.output_tokens_per_second
+
+    def message(self, request: dict[str, Any], block: dict[str, Any]) -> dict[str, Any]:
+        """Wrap a content block in a Messages API response."""
+        return {
+            "id": "msg_fake",
+            "type": "message",
+            "role": "assistant",
+            "model": request.get("model", "claude-fake"),
+            "content": [block],
+            "stop_reason": "tool_use" if block["type"] == "tool_use" else "end_turn",
+            "stop_sequence": None,
+            "usage": {
+                "input_tokens": len(json.dumps(request)) // 4,
+                "output_tokens": max(1, len(json.dumps(block)) // 4),
+            },
+        }
+
+
+def _user_text(request: dict[str, Any]) -> str:
+    parts = []
+    for message in request.get("messages", []):
+        content = message.get("content")
+        if isinstance(content, str):
+            parts.append(content)
+        else:
+            parts.extend(block.get("text", "") for block in content or [])
+    return "\n".join(parts)
+
+
+def create_app(config: FakeAnthropicConfig) -> FastAPI:
+    """Create the fake Messages API app."""
+    app = FastAPI(title="Fake Anthropic Messages API")
+    fake = FakeAnthropic(config)
+    app.state.fake = fake
+
+    @app.post("/v1/messages")
+    async def create_message(request: Request) -> Response:
+        body = await request.body()
+        payload = json.loads(body)
+        rng = fake.rng_for(body)
+        fake.requests += 1
+        fake.received.append(payload)
+        if request.client is not None:
+            fake.connections.add((request.client.host, request.client.port))
+
+        fake.in_flight += 1
+        fake.max_in_flight = max(fake.max_in_flight, fake.in_flight)
+        try:
+            await asyncio.sleep(config.latency.sample(rng))
+
+            status = fake.error_status(rng)
+            if status is not None:
+                fake.errors[status] += 1
+                error_type = "rate_limit_error" if status == 429 else "overloaded_error"
+                headers = {"retry-after": str(config.retry_after_seconds)} if status == 429 else {}
+                return JSONResponse(
+                    {"type": "error", "error": {"type": error_type, "message": "Simulated error"}},
+                    status_code=status,
+                    headers=headers,
+                )
+
+            block = fake.content_block(payload, rng)
+            message = fake.message(payload, block)
+            if payload.get("stream"):
+                return StreamingResponse(
+                    _stream_events(fake, message, block), media_type="text/event-stream"
+                )
+            await asyncio.sleep(fake.generation_seconds(block))
+            return JSONResponse(message)
+        finally:
+            fake.in_flight -= 1
+
+    return app
+
+
+async def _stream_events(
+    fake: FakeAnthropic, message: dict[str, Any], block: dict[str, Any]
+) -> AsyncIterator[bytes]:
+    """Server-sent events for a streamed text response, one delta per word."""
+
+    def event(name: str, data: dict[str, Any]) -> bytes:
+        return f"event: {name}\ndata: {json.dumps(data)}\n\n".encode()
+
+    words = block["text"].split(" ")
+    deltas = [word + " " for word in words[:-1]] + words[-1:]
+    per_delta = fake.generation_seconds(block) / max(1, len(deltas))
+
+    yield event("message_start", {
+        "type": "message_start",
+        "message": {**message, "content": [], "stop_reason": None,
+                    "usage": {**message["usage"], "output_tokens": 0}},
+    })
+    yield event("content_block_start", {
+        "type": "content_block_start", "index": 0, "content_block": {"type": "text", "text": ""},
+    })
+    for delta in deltas:
+        yield event("content_block_delta", {
+            "type": "content_block_delta", "index": 0,
+            "delta": {"type": "text_delta", "text": delta},
+        })
+        await asyncio.sleep(per_delta)
+    yield event("content_block_stop", {"type": "content_block_stop", "index": 0})
+    yield event("message_delta", {
+        "type": "message_delta",
+        "delta": {"stop_reason": "end_turn", "stop_sequence": None},
+        "usage": {"output_tokens": message["usage"]["output_tokens"]},
+    })
+    yield event("message_stop", {"type": "message_stop"})
+
+
+class FakeAnthropicServer:
+    """Run the fake API on a background thread for the duration of a ``with`` block."""
+
+    def __init__(self, config: FakeAnthropicConfig | None = None, port: int = 0) -> None:
+        self.app = create_app(config or FakeAnthropicConfig())
+        self.server = uvicorn.Server(
+            uvicorn.Config(self.app, host="127.0.0.1", port=port, log_level="warning")
+        )
+        self._thread = threading.Thread(target=self.server.run, daemon=True)
+
+    @property
+    def fake(self) -> FakeAnthropic:
+        """Response generator with request and error counters."""
+        return self.app.state.fake
+
+    @property
+    def base_url(self) -> str:
+        """URL to use as ANTHROPIC_BASE_URL."""
+        port = self.server.servers[0].sockets[0].getsockname()[1]
+        return f"http://127.0.0.1:{port}"
+
+    def __enter__(self) -> "FakeAnthropicServer":
+        self._thread.start()
+        while not self.server.started:
+            time.sleep(0.01)
+        return self
+
+    def __exit__(self, *exc: object) -> None:
+        self.server.should_exit = True
+        self._thread.join()
+
+
+def main():
+    """Run the fake server."""
+    parser = argparse.ArgumentParser(description="Deterministic fake Anthropic Messages API")
+    parser.add_argument("--port", type=int, default=8090)
+    parser.add_argument("--config", type=Path, help="JSON file with FakeAnthropicConfig fields")
+    args = parser.parse_args()
+
+    config = FakeAnthropicConfig()
+    if args.config:
+        config = FakeAnthropicConfig.model_validate_json(args.config.read_text(encoding="utf-8"))
+
+    print(f"Fake Anthropic API on http://localhost:{args.port} (seed {config.seed})")
+    uvicorn.run(create_app(config), host="127.0.0.1", port=args.port, log_level="warning")
+
+
+if __name__ == "__main__":
+    main()
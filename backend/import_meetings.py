@@ -0,0 +1,61 @@
+"""Create meetings from a directory or archive of IDOARRT markdown files."""
+
+import argparse
+import sys
+import time
+from pathlib import Path
+
+# Add app to path
+sys.path.insert(0, str(Path(__file__).parent))
+
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from app.db.session import DATABASE_URL, Base
+from app.services.meeting_import import MeetingImportError, MeetingImportService, read_source
+
+
+def main() -> int:
+    """Run the import and print per-file failures and a summary."""
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("source", help="Directory, .zip, .tar or .tar.gz of .md files")
+    parser.add_argument("--database-url", default=DATABASE_URL)
+    parser.add_argument(
+        "--workers", type=int, default=None, help="Parser processes (default: CPU count)"
+    )
+    parser.add_argument("--dry-run", action="store_true", help="Only validate, create nothing")
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    try:
+        files = read_source(args.source)
+    except (MeetingImportError, OSError) as e:
+        print(f"✗ {e}")
+        return 1
+
+    engine = create_engine(args.database_url)
+    Base.metadata.create_all(bind=engine)
+    db = sessionmaker(bind=engine)()
+    try:
+        service = MeetingImportService(max_workers=args.workers)
+        summary = service.import_files(db, files, args.dry_run)
+    finally:
+        db.close()
+
+    for result in summary["results"]:
+        if not result["success"]:
+            print(f"✗ {result['file']}")
+            for error in result["validation_errors"]:
+                print(f"    {error}")
+
+    elapsed = time.perf_counter() - start
+    action = "valid (dry run)" if args.dry_run else "imported"
+    print(
+        f"\nDone! {summary['valid']}/{len(files)} {action}, {summary['failed']} failed "
+        f"in {elapsed:.2f}s"
+    )
+    return 1 if summary["failed"] else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
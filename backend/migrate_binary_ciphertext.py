@@ -0,0 +1,131 @@
+"""Convert encrypted text columns from base64-of-Fernet text to binary ciphertext."""
+
+import argparse
+import sys
+from pathlib import Path
+
+# Add app to path
+sys.path.insert(0, str(Path(__file__).parent))
+
+from sqlalchemy import create_engine, text
+from sqlalchemy.engine import Connection
+
+from app.core.encryption import db_encryption
+from app.db.session import DATABASE_URL
+
+# (table, column) pairs holding encrypted text
+ENCRYPTED_COLUMNS = [
+    ("audio_chunks", "transcription"),
+    ("protocols", "full_transcription"),
+    ("protocols", "markdown_content"),
+]
+
+DEFAULT_BATCH_SIZE = 500
+
+
+def alter_column_types(conn: Connection) -> None:
+    """
+    Change column types to binary where the database enforces column types.
+
+    Columns that are already binary are left alone, so the migration can be
+    run again (e.g. to resume an interrupted conversion).
+    """
+    if conn.dialect.name == "postgresql":
+        for table, column in ENCRYPTED_COLUMNS:
+            data_type = conn.execute(
+                text(
+                    "SELECT data_type FROM information_schema.columns "
+                    "WHERE table_schema = current_schema() "
+                    "AND table_name = :table AND column_name = :column"
+                ),
+                {"table": table, "column": column},
+            ).scalar()
+            if data_type not in ("text", "character varying"):
+                continue
+            conn.execute(
+                text(
+                    f"ALTER TABLE {table} ALTER COLUMN {column} TYPE BYTEA "
+                    f"USING convert_to({column}, 'UTF8')"
+                )
+            )
+    # SQLite stores any value in any column, so no DDL is needed there
+
+
+def convert_column(
+    conn: Connection, table: str, column: str, batch_size: int
+) -> tuple[int, int, int]:
+    """
+    Re-encrypt legacy values in one column, batch by batch.
+
+    Rows are walked in primary key order (keyset pagination) and each batch
+    is committed on its own, so the migration can be interrupted and resumed.
+
+    Returns:
+        (rows converted, bytes before, bytes after)
+    """
+    converted = 0
+    bytes_before = 0
+    bytes_after = 0
+    last_id = ""
+
+    while True:
+        rows = conn.execute(
+            text(
+                f"SELECT id, {column} FROM {table} "
+                f"WHERE id > :last_id AND {column} IS NOT NULL ORDER BY id LIMIT :limit"
+            ),
+            {"last_id": last_id, "limit": batch_size},
+        ).all()
+        if not rows:
+            break
+        last_id = rows[-1][0]
+
+        updates = []
+        for row_id, value in rows:
+            if isinstance(value, memoryview):
+                value = value.tobytes()
+            if not db_encryption.is_legacy_field(value):
+                continue
+            new_value = db_encryption.encrypt_field(db_encryption.decrypt_field(value))
+            bytes_before += len(value)
+            bytes_after += len(new_value)
+            updates.append({"id": row_id, "value": new_value})
+
+        if updates:
+            conn.execute(text(f"UPDATE {table} SET {column} = :value WHERE id = :id"), updates)
+            conn.commit()
+            converted += len(updates)
+            print(f"  {table}.{column}: {converted} rows converted")
+
+    return converted, bytes_before, bytes_after
+
+
+def migrate(database_url: str, batch_size: int) -> None:
+    """Run migration for all encrypted text columns."""
+    engine = create_engine(database_url)
+    with engine.connect() as conn:
+        alter_column_types(conn)
+        conn.commit()
+
+        total_before = 0
+        total_after = 0
+        for table, column in ENCRYPTED_COLUMNS:
+            print(f"Converting {table}.{column}...")
+            converted, before, after = convert_column(conn, table, column, batch_size)
+            total_before += before
+            total_after += after
+            print(f"  ✓ {converted} rows ({before:,} → {after:,} bytes)")
+
+    if total_before:
+        saved = 100 * (1 - total_after / total_before)
+        print(f"\nDone! Storage {total_before:,} → {total_after:,} bytes ({saved:.1f}% smaller)")
+    else:
+        print("\nDone! Nothing to convert")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--database-url", default=DATABASE_URL)
+    parser.add_argument("--batch-size", type=int, default=DEFAULT_BATCH_SIZE)
+    args = parser.parse_args()
+    migrate(args.database_url, args.batch_size)
@@ -0,0 +1,41 @@
+"""Test Range header handling of the audio endpoints."""
+
+import pytest
+from fastapi import HTTPException
+
+from app.api.v1.audio import _parse_range_header
+
+
+class TestParseRangeHeader:
+    """Test suite for _parse_range_header."""
+
+    @pytest.mark.parametrize(
+        ("header", "expected"),
+        [
+            ("bytes=0-99", (0, 100)),
+            ("bytes=900-", (900, 1000)),
+            ("bytes=-100", (900, 1000)),
+            ("bytes=990-2000", (990, 1000)),
+            ("BYTES = 10 - 19", (10, 20)),
+        ],
+    )
+    def test_single_byte_range(self, header, expected):
+        """Test that a single bytes range becomes a half-open interval."""
+        assert _parse_range_header(header, 1000) == expected
+
+    @pytest.mark.parametrize(
+        "header",
+        ["bytes=0-9,20-29", "items=0-9", "bytes=", "bytes=-", "bytes=a-b", "bytes=20-10"],
+    )
+    def test_unsupported_or_malformed_range_is_ignored(self, header):
+        """Test that headers to ignore give None, so the whole blob is sent."""
+        assert _parse_range_header(header, 1000) is None
+
+    @pytest.mark.parametrize("header", ["bytes=1000-", "bytes=5000-6000", "bytes=-0"])
+    def test_unsatisfiable_range_raises_416(self, header):
+        """Test that a well-formed range outside the blob is rejected."""
+        with pytest.raises(HTTPException) as exc_info:
+            _parse_range_header(header, 1000)
+
+        assert exc_info.value.status_code == 416
+        assert exc_info.value.headers == {"Content-Range": "bytes */1000"}
@@ -0,0 +1,126 @@
+"""Test streaming blob encryption."""
+
+import os
+
+import pytest
+
+from app.core.encryption import BlobDecryptionError, DatabaseEncryption, StreamingBlobCipher
+
+
+class TestStreamingBlobCipher:
+    """Test suite for chunked AES-GCM blob encryption."""
+
+    def setup_method(self):
+        """Set up cipher with a small frame size to exercise frame boundaries."""
+        self.cipher = StreamingBlobCipher(os.urandom(32), frame_size=64)
+
+    @pytest.mark.parametrize("size", [0, 1, 63, 64, 65, 128, 1000])
+    def test_roundtrip_preserves_data(self, size):
+        """Test encrypt/decrypt roundtrip for sizes around frame boundaries."""
+        # Given
+        data = os.urandom(size)
+
+        # When
+        blob = self.cipher.encrypt(data)
+
+        # Then
+        assert self.cipher.decrypt(blob) == data
+        assert self.cipher.plaintext_length(blob) == size
+
+    def test_stream_with_uneven_chunks_matches_whole_blob(self):
+        """Test streaming in arbitrary chunk sizes decrypts correctly."""
+        # Given
+        data = os.urandom(500)
+        chunks = [data[:7], data[7:200], data[200:201], data[201:]]
+
+        # When
+        blob = b"".join(self.cipher.encrypt_stream(chunks))
+        pieces = [blob[i : i + 33] for i in range(0, len(blob), 33)]
+
+        # Then
+        assert b"".join(self.cipher.decrypt_stream(pieces)) == data
+
+    @pytest.mark.parametrize("start,end", [(0, 10), (60, 70), (64, 128), (100, 500), (490, 999)])
+    def test_decrypt_range_returns_slice(self, start, end):
+        """Test range decryption returns the same bytes as slicing the plaintext."""
+        # Given
+        data = os.urandom(500)
+        blob = self.cipher.encrypt(data)
+
+        # When
+        result = self.cipher.decrypt_range(blob, start, end)
+
+        # Then
+        assert result == data[start:end]
+
+    def test_tampered_frame_raises_error(self):
+        """Test that modified ciphertext fails authentication."""
+        # Given
+        blob = bytearray(self.cipher.encrypt(os.urandom(200)))
+        blob[StreamingBlobCipher.HEADER_SIZE + 5] ^= 0x01
+
+        # When/Then
+        with pytest.raises(BlobDecryptionError):
+            self.cipher.decrypt(bytes(blob))
+
+    def test_truncated_blob_raises_error(self):
+        """Test that dropping trailing frames is detected."""
+        # Given
+        blob = self.cipher.encrypt(os.urandom(200))
+        sealed_size = 64 + StreamingBlobCipher.TAG_SIZE
+        truncated = blob[: StreamingBlobCipher.HEADER_SIZE + 2 * sealed_size]
+
+        # When/Then
+        with pytest.raises(BlobDecryptionError):
+            self.cipher.decrypt(truncated)
+
+    def test_legacy_unencrypted_blob_passes_through(self):
+        """Test that blobs stored before encryption are still readable."""
+        # Given
+        encryption = DatabaseEncryption()
+        legacy = b"\x1aE\xdf\xa3 webm data"
+
+        # When/Then
+        assert encryption.decrypt_blob(legacy) == legacy
+        assert encryption.blob_length(legacy) == len(legacy)
+        assert encryption.decrypt_blob_range(legacy, 2, 6) == legacy[2:6]
+
+
+class TestFieldEncryption:
+    """Test suite for compact binary text field encryption."""
+
+    def setup_method(self):
+        """Set up encryption instance."""
+        self.encryption = DatabaseEncryption()
+
+    def test_roundtrip_preserves_text(self):
+        """Test encrypt/decrypt roundtrip with non-ASCII text."""
+        # Given
+        text = "Vi behöver fler perspektiv på frågan 😊"
+
+        # When
+        value = self.encryption.encrypt_field(text)
+
+        # Then
+        assert isinstance(value, bytes)
+        assert self.encryption.decrypt_field(value) == text
+        assert len(value) == len(text.encode("utf-8")) + 29
+
+    def test_decrypt_legacy_base64_text(self):
+        """Test that legacy base64-of-Fernet values are still readable."""
+        # Given
+        legacy = self.encryption.encrypt_text("gammal transkription")
+
+        # When/Then
+        assert self.encryption.is_legacy_field(legacy)
+        assert self.encryption.is_legacy_field(legacy.encode("ascii"))
+        assert self.encryption.decrypt_field(legacy) == "gammal transkription"
+        assert self.encryption.decrypt_field(legacy.encode("ascii")) == "gammal transkription"
+
+    def test_binary_value_is_not_legacy(self):
+        """Test format detection for binary values."""
+        # When
+        value = self.encryption.encrypt_field("ny")
+
+        # Then
+        assert not self.encryption.is_legacy_field(value)
@@ -0,0 +1,328 @@
+"""Test cross-worker WebSocket event delivery."""
+
+import asyncio
+from unittest.mock import patch
+
+import pytest
+
+from app.core.event_broker import EventBroker
+from app.core.event_bus import InProcessEventBus, RedisEventBus, encode_command, read_reply
+from app.core.event_encoding import EncodedEvent
+from app.core.websocket import TOPIC_PREFIX, WebSocketManager
+from app.schemas.websocket_events import WebSocketEventType
+from tests.test_core.websocket_fakes import FakeWebSocket, started
+
+
+async def eventually(condition, timeout: float = 1.0) -> None:
+    """Wait until ``condition()`` holds."""
+    deadline = asyncio.get_running_loop().time() + timeout
+    while not condition():
+        assert asyncio.get_running_loop().time() < deadline, "condition not met in time"
+        await asyncio.sleep(0.01)
+
+
+class TestInProcessEventBus:
+    """Test suite for WebSocketManager over InProcessEventBus."""
+
+    async def test_event_reaches_clients_of_other_worker(self):
+        """Test that an event sent by one manager is delivered by another."""
+        # Given
+        bus = InProcessEventBus()
+        worker_a, worker_b = WebSocketManager(bus=bus), WebSocketManager(bus=bus)
+        client_a, client_b = FakeWebSocket(), FakeWebSocket()
+        await worker_a.connect(client_a, "m1")
+        await worker_b.connect(client_b, "m1")
+
+        # When
+        await worker_a.send_event("m1", WebSocketEventType.TRANSCRIPTION_STARTED, started(1))
+        await asyncio.sleep(0.01)
+
+        # Then
+        assert [e["data"]["chunk_number"] for e in client_a.sent] == [1]
+        assert [e["data"]["chunk_number"] for e in client_b.sent] == [1]
+
+    async def test_worker_subscribes_only_while_it_has_clients(self):
+        """Test that topics follow the meetings a worker has clients for."""
+        # Given
+        bus = InProcessEventBus()
+        manager = WebSocketManager(bus=bus, resume_grace_seconds=0)
+        client = FakeWebSocket()
+
+        # When
+        await manager.connect(client, "m1")
+        subscribed = set(bus._handlers)
+        manager.disconnect(client, "m1")
+        await asyncio.sleep(0.01)
+
+        # Then
+        assert subscribed == {TOPIC_PREFIX + "m1"}
+        assert bus._handlers == {}
+
+    async def test_client_resumes_on_other_worker(self):
+        """Test that events from another worker are buffered for resuming clients."""
+        # Given
+        bus = InProcessEventBus()
+        worker_a, worker_b = WebSocketManager(bus=bus), WebSocketManager(bus=bus)
+        client = FakeWebSocket()
+        await worker_b.connect(client, "m1")
+        await worker_a.send_event("m1", WebSocketEventType.TRANSCRIPTION_STARTED, started(1))
+        await asyncio.sleep(0.01)
+        last_seq = client.sent[-1]["seq"]
+        worker_b.disconnect(client, "m1")
+
+        # When
+        await worker_a.send_event("m1", WebSocketEventType.TRANSCRIPTION_STARTED, started(2))
+        await worker_b.send_event("m1", WebSocketEventType.TRANSCRIPTION_STARTED, started(3))
+        resumed = FakeWebSocket()
+        await worker_b.connect(resumed, "m1", last_seq=last_seq)
+        await asyncio.sleep(0.01)
+
+        # Then
+        events = resumed.sent
+        assert [e["data"]["chunk_number"] for e in events] == [2, 3]
+        assert events[0]["seq"] < events[1]["seq"]
+
+    async def test_workers_in_the_same_millisecond_get_ordered_sequences(self):
+        """Test that events of two workers get unique seqs, delivered and resumed in order."""
+        # Given
+        bus = InProcessEventBus()
+        worker_a, worker_b = WebSocketManager(bus=bus), WebSocketManager(bus=bus)
+        watcher, leaving = FakeWebSocket(), FakeWebSocket()
+        await worker_a.connect(watcher, "m1")
+        await worker_b.connect(leaving, "m1")
+
+        # When
+        with patch("app.core.event_bus.time.time", return_value=1_700_000_000.0):
+            await asyncio.gather(*(
+                worker.send_event("m1", WebSocketEventType.TRANSCRIPTION_STARTED, started(number))
+                for number in range(6)
+                for worker in (worker_a, worker_b)
+            ))
+        await asyncio.sleep(0.01)
+        last_seq = leaving.sent[5]["seq"]
+        worker_b.disconnect(leaving, "m1")
+        resumed = FakeWebSocket()
+        await worker_a.connect(resumed, "m1", last_seq=last_seq)
+        await asyncio.sleep(0.01)
+
+        # Then
+        seqs = [event["seq"] for event in watcher.sent]
+        assert len(seqs) == 12
+        assert seqs == list(range(seqs[0], seqs[0] + 12))
+        assert [event["seq"] for event in leaving.sent] == seqs
+        assert [event["seq"] for event in resumed.sent] == seqs[6:]
+
+    async def test_event_overtaking_an_earlier_one_is_held(self):
+        """Test that a worker releases events in seq order and gives up on a gap after a while."""
+        # Given
+        manager = WebSocketManager(bus=InProcessEventBus(), reorder_window_seconds=0.05)
+        client = FakeWebSocket()
+        await manager.connect(client, "m1")
+
+        async def arrive(seq):
+            event = EncodedEvent(
+                {"type": "transcription_started", "data": {"chunk_number": seq}, "seq": seq}
+            )
+            await manager._on_bus_message(TOPIC_PREFIX + "m1", b"other " + event.json)
+
+        # When
+        await arrive(10)
+        await arrive(12)
+        await arrive(11)
+        await arrive(14)
+        await asyncio.sleep(0.01)
+        before_window = [event["seq"] for event in client.sent]
+        await asyncio.sleep(0.1)
+
+        # Then
+        assert before_window == [10, 11, 12]
+        assert [event["seq"] for event in client.sent] == [10, 11, 12, 14]
+
+
+class TestRedisEventBus:
+    """Test suite for RedisEventBus against the stand-in broker."""
+
+    async def test_resp_round_trip(self):
+        """Test command encoding against the reply parser."""
+        # Given
+        reader = asyncio.StreamReader()
+        reader.feed_data(encode_command("PUBLISH", "meeting:m1", b"\x00data"))
+
+        # When
+        command = await read_reply(reader)
+
+        # Then
+        assert command == [b"PUBLISH", b"meeting:m1", b"\x00data"]
+
+    async def test_events_cross_workers_through_broker(self, tmp_path):
+        """Test delivery between two workers over a Unix socket broker."""
+        # Given
+        path = str(tmp_path / "events.sock")
+        broker = EventBroker()
+        await broker.start_unix(path)
+        worker_a = WebSocketManager(bus=RedisEventBus(f"unix://{path}"))
+        worker_b = WebSocketManager(bus=RedisEventBus(f"unix://{path}"))
+        client_b = FakeWebSocket()
+        await worker_b.connect(client_b, "m1")
+        await eventually(lambda: broker._subscribers)
+
+        try:
+            # When
+            for number in range(3):
+                for meeting_id, event in (("m1", started(number)), ("m2", started(99))):
+                    await worker_a.send_event(
+                        meeting_id, WebSocketEventType.TRANSCRIPTION_STARTED, event
+                    )
+
+            # Then
+            await eventually(lambda: len(client_b.sent) == 3)
+            assert [e["data"]["chunk_number"] for e in client_b.sent] == [0, 1, 2]
+            assert worker_b.bus.stats()["received"] == 3
+        finally:
+            await worker_a.aclose()
+            await worker_b.aclose()
+            await broker.close()
+
+    async def test_sequences_are_shared_through_broker(self, tmp_path):
+        """Test that workers reserve disjoint sequence blocks from the broker."""
+        # Given
+        path = str(tmp_path / "events.sock")
+        broker = EventBroker()
+        await broker.start_unix(path)
+        bus_a, bus_b = RedisEventBus(f"unix://{path}"), RedisEventBus(f"unix://{path}")
+
+        try:
+            # When
+            first = await bus_a.next_sequence("seq", 3)
+            second = await bus_b.next_sequence("seq")
+            third = await bus_a.next_sequence("seq")
+
+            # Then
+            assert first > 1_600_000_000_000  # Seeded with the epoch milliseconds
+            assert (second, third) == (first + 1, first + 2)
+        finally:
+            await bus_a.close()
+            await bus_b.close()
+            await broker.close()
+
+    async def test_leases_are_shared_through_broker(self, tmp_path):
+        """Test that a lease held by one worker is refused to another until it expires."""
+        # Given
+        path = str(tmp_path / "events.sock")
+        broker = EventBroker()
+        await broker.start_unix(path)
+        bus_a, bus_b = RedisEventBus(f"unix://{path}"), RedisEventBus(f"unix://{path}")
+
+        try:
+            # When
+            taken = await bus_a.claim("lease", "a", 0.05)
+            refused = not await bus_b.claim("lease", "b", 0.05)
+            renewed = await bus_a.claim("lease", "a", 0.05)
+            await asyncio.sleep(0.1)
+            taken_over = await bus_b.claim("lease", "b", 0.05)
+
+            # Then
+            assert (taken, refused, renewed, taken_over) == (True, True, True, True)
+        finally:
+            await bus_a.close()
+            await bus_b.close()
+            await broker.close()
+
+    async def test_broker_requires_configured_password(self):
+        """Test that AUTH only succeeds with the broker's password."""
+        # Given
+        broker = EventBroker(password="hemligt")
+        port = await broker.start_tcp("127.0.0.1", 0)
+        reader, writer = await asyncio.open_connection("127.0.0.1", port)
+
+        async def command(*args: str) -> object:
+            writer.write(encode_command(*args))
+            await writer.drain()
+            try:
+                return await read_reply(reader)
+            except RuntimeError as e:
+                return str(e)
+
+        try:
+            # When
+            before = await command("PUBLISH", "meeting:m1", "x")
+            wrong = await command("AUTH", "gissning")
+            right = await command("AUTH", "hemligt")
+            after = await command("PUBLISH", "meeting:m1", "x")
+
+            # Then
+            assert before.startswith("NOAUTH")
+            assert wrong.startswith("WRONGPASS")
+            assert right == b"OK"
+            assert after == 0
+        finally:
+            writer.close()
+            await broker.close()
+
+    async def test_broker_without_password_refuses_auth_and_public_binds(self):
+        """Test that a broker without a password rejects AUTH and stays on loopback."""
+        # Given
+        broker = EventBroker()
+        port = await broker.start_tcp("127.0.0.1", 0)
+        bus = RedisEventBus(f"redis://:gissning@127.0.0.1:{port}")
+
+        try:
+            # When / Then
+            with pytest.raises(ConnectionError, match="authentication failed"):
+                await bus.next_sequence("seq")
+            with pytest.raises(ValueError):
+                await EventBroker().start_tcp("0.0.0.0", 0)
+        finally:
+            await bus.close()
+            await broker.close()
+
+    async def test_workers_authenticate_with_password_in_url(self):
+        """Test that events cross workers when the bus URL carries the password."""
+        # Given
+        broker = EventBroker(password="hemligt")
+        port = await broker.start_tcp("127.0.0.1", 0)
+        url = f"redis://:hemligt@127.0.0.1:{port}"
+        worker_a = WebSocketManager(bus=RedisEventBus(url))
+        worker_b = WebSocketManager(bus=RedisEventBus(url))
+        client_b = FakeWebSocket()
+        await worker_b.connect(client_b, "m1")
+        await eventually(lambda: broker._subscribers)
+
+        try:
+            # When
+            await worker_a.send_event("m1", WebSocketEventType.TRANSCRIPTION_STARTED, started(1))
+
+            # Then
+            await eventually(lambda: len(client_b.sent) == 1)
+        finally:
+            await worker_a.aclose()
+            await worker_b.aclose()
+            await broker.close()
+
+    async def test_subscriber_resubscribes_after_broker_restart(self, tmp_path):
+        """Test that a worker keeps receiving events once the broker is back."""
+        # Given
+        path = str(tmp_path / "events.sock")
+        broker = EventBroker()
+        await broker.start_unix(path)
+        worker_a = WebSocketManager(bus=RedisEventBus(f"unix://{path}", reconnect_max_seconds=0.1))
+        worker_b = WebSocketManager(bus=RedisEventBus(f"unix://{path}", reconnect_max_seconds=0.1))
+        client_b = FakeWebSocket()
+        await worker_b.connect(client_b, "m1")
+        await eventually(lambda: broker._subscribers)
+
+        # When
+        await broker.close()
+        broker = EventBroker()
+        await broker.start_unix(path)
+        await eventually(lambda: broker._subscribers)
+
+        try:
+            await worker_a.send_event("m1", WebSocketEventType.TRANSCRIPTION_STARTED, started(5))
+
+            # Then
+            await eventually(lambda: len(client_b.sent) == 1)
+        finally:
+            await worker_a.aclose()
+            await worker_b.aclose()
+            await broker.close()
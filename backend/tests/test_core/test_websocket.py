@@ -0,0 +1,482 @@
+"""Test WebSocket fan-out with per-client send queues."""
+
+import asyncio
+from unittest.mock import patch
+
+import pytest
+
+from app.core.event_coalescing import CoalesceRule, field_key, merge_progress
+from app.core.event_encoding import MSGPACK_SUBPROTOCOL
+from app.core.websocket import SLOW_CONSUMER_CLOSE_CODE, WebSocketManager
+from app.schemas.websocket_events import (
+    InterventionQuestionDeltaEvent,
+    InterventionQuestionEvent,
+    InterventionType,
+    TimeWarningEvent,
+    TranscriptionPartialEvent,
+    TranscriptionProgressEvent,
+    WebSocketEventType,
+)
+from tests.test_core.websocket_fakes import FakeWebSocket, started
+
+
+class TestWebSocketManager:
+    """Test suite for WebSocketManager."""
+
+    async def test_slow_client_does_not_delay_others(self):
+        """Test that a blocked client neither blocks the sender nor other clients."""
+        # Given
+        manager = WebSocketManager()
+        fast, slow = FakeWebSocket(), FakeWebSocket(blocked=True)
+        await manager.connect(fast, "m1")
+        await manager.connect(slow, "m1")
+
+        # When
+        for number in (1, 2):
+            await asyncio.wait_for(
+                manager.send_event(
+                    "m1", WebSocketEventType.TRANSCRIPTION_STARTED, started(number)
+                ),
+                0.1,
+            )
+        await asyncio.sleep(0.01)
+
+        # Then
+        assert [event["data"]["chunk_number"] for event in fast.sent] == [1, 2]
+        assert slow.sent == []
+        assert manager.metrics()["m1"]["queue_depth"] == 1
+
+    async def test_messages_arrive_in_order(self):
+        """Test that each client receives events in the order they were sent."""
+        # Given
+        manager = WebSocketManager()
+        client = FakeWebSocket()
+        await manager.connect(client, "m1")
+
+        # When
+        for number in range(20):
+            await manager.send_event(
+                "m1", WebSocketEventType.TRANSCRIPTION_STARTED, started(number)
+            )
+        await asyncio.sleep(0.01)
+
+        # Then
+        assert [event["data"]["chunk_number"] for event in client.sent] == list(range(20))
+        assert manager.metrics()["m1"]["sent"] == 20
+
+    async def test_queued_time_warning_is_coalesced(self):
+        """Test that a newer time warning replaces one still waiting in the queue."""
+        # Given
+        manager = WebSocketManager()
+        client = FakeWebSocket(blocked=True)
+        await manager.connect(client, "m1")
+
+        # When
+        for percentage in (50, 75):
+            await manager.send_event(
+                "m1",
+                WebSocketEventType.TIME_WARNING,
+                TimeWarningEvent(percentage_complete=percentage, remaining_minutes=10, message=""),
+            )
+        client.unblocked.set()
+        await asyncio.sleep(0.01)
+
+        # Then
+        assert [event["data"]["percentage_complete"] for event in client.sent] == [75]
+        assert manager.metrics()["m1"]["coalesced"] == 1
+
+    async def test_full_queue_drops_deltas_first(self):
+        """Test that question deltas are dropped before other events when a queue is full."""
+        # Given
+        manager = WebSocketManager(max_queue_size=3)
+        client = FakeWebSocket(blocked=True)
+        await manager.connect(client, "m1")
+        await manager.send_event("m1", WebSocketEventType.TRANSCRIPTION_STARTED, started(1))
+        await asyncio.sleep(0)  # Writer takes the first event and blocks on it
+        await manager.send_event(
+            "m1",
+            WebSocketEventType.INTERVENTION_QUESTION,
+            InterventionQuestionDeltaEvent(
+                stream_id="s",
+                intervention_type=InterventionType.GOAL_DEVIATION,
+                index=0,
+                delta="Vad",
+            ),
+        )
+        for number in (2, 3):
+            await manager.send_event(
+                "m1", WebSocketEventType.TRANSCRIPTION_STARTED, started(number)
+            )
+
+        # When
+        await manager.send_event("m1", WebSocketEventType.TRANSCRIPTION_STARTED, started(4))
+        client.unblocked.set()
+        await asyncio.sleep(0.01)
+
+        # Then
+        assert [event["data"]["chunk_number"] for event in client.sent] == [1, 2, 3, 4]
+        assert manager.metrics()["m1"]["dropped"] == 1
+
+    async def test_drop_oldest_when_nothing_is_droppable(self):
+        """Test the overflow policy once no deltas are queued."""
+        # Given
+        manager = WebSocketManager(max_queue_size=2)
+        client = FakeWebSocket(blocked=True)
+        await manager.connect(client, "m1")
+        await manager.send_event("m1", WebSocketEventType.TRANSCRIPTION_STARTED, started(0))
+        await asyncio.sleep(0)
+
+        # When
+        for number in (1, 2, 3):
+            await manager.send_event(
+                "m1", WebSocketEventType.TRANSCRIPTION_STARTED, started(number)
+            )
+        client.unblocked.set()
+        await asyncio.sleep(0.01)
+
+        # Then
+        assert [event["data"]["chunk_number"] for event in client.sent] == [0, 2, 3]
+
+    async def test_blocked_send_evicts_client(self):
+        """Test that a client whose send blocks past the timeout is disconnected."""
+        # Given
+        manager = WebSocketManager(send_timeout_seconds=0.02)
+        client = FakeWebSocket(blocked=True)
+        await manager.connect(client, "m1")
+
+        # When
+        await manager.send_event("m1", WebSocketEventType.TRANSCRIPTION_STARTED, started(1))
+        await asyncio.sleep(0.05)
+
+        # Then
+        assert "m1" not in manager.active_connections
+        assert client.close_code == SLOW_CONSUMER_CLOSE_CODE
+
+    async def test_persistently_full_queue_evicts_client(self):
+        """Test that a client whose queue stays full is disconnected."""
+        # Given
+        manager = WebSocketManager(max_queue_size=1, slow_consumer_seconds=0.01)
+        slow, fast = FakeWebSocket(blocked=True), FakeWebSocket()
+        await manager.connect(slow, "m1")
+        await manager.connect(fast, "m1")
+
+        # When
+        for number in range(4):
+            await manager.send_event(
+                "m1", WebSocketEventType.TRANSCRIPTION_STARTED, started(number)
+            )
+            await asyncio.sleep(0.02)
+
+        # Then
+        assert list(manager.active_connections["m1"]) == [fast]
+        assert manager.metrics()["m1"]["evicted"] == 1
+        assert len(fast.sent) == 4
+
+    async def test_disconnect_stops_writer(self):
+        """Test that disconnecting cancels the writer and forgets the meeting."""
+        # Given
+        manager = WebSocketManager()
+        client = FakeWebSocket()
+        await manager.connect(client, "m1")
+        writer = manager.active_connections["m1"][client].writer
+
+        # When
+        manager.disconnect(client, "m1")
+        await asyncio.sleep(0)
+
+        # Then
+        assert writer.cancelled()
+        assert manager.metrics() == {}
+
+    async def test_event_is_encoded_once_for_all_subscribers(self):
+        """Test that every subscriber's queue holds the same encoded buffer."""
+        # Given
+        manager = WebSocketManager()
+        clients = [FakeWebSocket(blocked=True) for _ in range(3)]
+        for client in clients:
+            await manager.connect(client, "m1")
+        await manager.send_event("m1", WebSocketEventType.TRANSCRIPTION_STARTED, started(0))
+        await asyncio.sleep(0)
+
+        # When
+        await manager.send_event("m1", WebSocketEventType.TRANSCRIPTION_STARTED, started(1))
+
+        # Then
+        queued = [c.queue[0].event for c in manager.active_connections["m1"].values()]
+        assert all(event is queued[0] for event in queued)
+
+    async def test_json_payload_shape(self):
+        """Test the event envelope sent to JSON clients."""
+        # Given
+        manager = WebSocketManager()
+        client = FakeWebSocket()
+        await manager.connect(client, "m1")
+
+        # When
+        await manager.send_event("m1", WebSocketEventType.TRANSCRIPTION_STARTED, started(7))
+        await asyncio.sleep(0.01)
+
+        # Then
+        (event,) = client.sent
+        assert event["type"] == "transcription_started"
+        assert event["data"]["chunk_number"] == 7
+        assert "T" in event["timestamp"] and "T" in event["data"]["timestamp"]
+        assert client.subprotocol is None
+
+    async def test_msgpack_subprotocol(self):
+        """Test that clients requesting msgpack get binary frames."""
+        # Given
+        msgpack = pytest.importorskip("msgpack")
+        manager = WebSocketManager()
+        client = FakeWebSocket(subprotocols=[MSGPACK_SUBPROTOCOL])
+        await manager.connect(client, "m1")
+
+        # When
+        await manager.send_event("m1", WebSocketEventType.TRANSCRIPTION_STARTED, started(3))
+        await asyncio.sleep(0.01)
+
+        # Then
+        assert client.subprotocol == MSGPACK_SUBPROTOCOL
+        event = msgpack.unpackb(client.frames[0])
+        assert (event["type"], event["data"]["chunk_number"]) == ("transcription_started", 3)
+
+    async def test_msgpack_request_falls_back_to_json(self):
+        """Test that JSON is used when msgpack is not installed."""
+        # Given
+        manager = WebSocketManager()
+        client = FakeWebSocket(subprotocols=[MSGPACK_SUBPROTOCOL])
+
+        # When
+        with patch("app.core.websocket.msgpack_available", return_value=False):
+            await manager.connect(client, "m1")
+        await manager.send_event("m1", WebSocketEventType.TRANSCRIPTION_STARTED, started(3))
+        await asyncio.sleep(0.01)
+
+        # Then
+        assert client.subprotocol is None
+        assert client.sent[0]["data"]["chunk_number"] == 3
+
+
+class TestWebSocketResume:
+    """Test suite for resuming WebSocket clients from last_seq."""
+
+    async def test_events_carry_increasing_sequence_numbers(self):
+        """Test that every event gets a per-meeting sequence number."""
+        # Given
+        manager = WebSocketManager()
+        client = FakeWebSocket()
+        await manager.connect(client, "m1")
+
+        # When
+        for number in range(3):
+            await manager.send_event(
+                "m1", WebSocketEventType.TRANSCRIPTION_STARTED, started(number)
+            )
+        await asyncio.sleep(0.01)
+
+        # Then
+        seqs = [event["seq"] for event in client.sent]
+        assert seqs == sorted(seqs) and len(set(seqs)) == 3
+
+    async def test_reconnect_replays_missed_events(self):
+        """Test that a client reconnecting with last_seq only gets what it missed."""
+        # Given
+        manager = WebSocketManager()
+        first = FakeWebSocket()
+        await manager.connect(first, "m1")
+        await manager.send_event("m1", WebSocketEventType.TRANSCRIPTION_STARTED, started(1))
+        await asyncio.sleep(0.01)
+        last_seq = first.sent[-1]["seq"]
+        manager.disconnect(first, "m1")
+        for number in (2, 3):
+            await manager.send_event(
+                "m1", WebSocketEventType.TRANSCRIPTION_STARTED, started(number)
+            )
+
+        # When
+        second = FakeWebSocket()
+        await manager.connect(second, "m1", last_seq=last_seq)
+        await manager.send_event("m1", WebSocketEventType.TRANSCRIPTION_STARTED, started(4))
+        await asyncio.sleep(0.01)
+
+        # Then
+        assert [event["data"]["chunk_number"] for event in second.sent] == [2, 3, 4]
+        assert manager.metrics()["m1"]["replayed"] == 2
+
+    async def test_large_gap_falls_back_to_snapshot(self):
+        """Test that a snapshot is sent when missed events are no longer buffered."""
+        # Given
+        manager = WebSocketManager(replay_buffer_size=2)
+        first = FakeWebSocket()
+        await manager.connect(first, "m1")
+        await manager.send_event("m1", WebSocketEventType.TRANSCRIPTION_STARTED, started(1))
+        await asyncio.sleep(0.01)
+        last_seq = first.sent[-1]["seq"]
+        manager.disconnect(first, "m1")
+        for number in (2, 3, 4):
+            await manager.send_event(
+                "m1", WebSocketEventType.TRANSCRIPTION_STARTED, started(number)
+            )
+
+        # When
+        second = FakeWebSocket()
+        await manager.connect(
+            second, "m1", last_seq=last_seq, snapshot=lambda: {"status": "active"}
+        )
+        await asyncio.sleep(0.01)
+
+        # Then
+        (event,) = second.sent
+        assert event["type"] == WebSocketEventType.SNAPSHOT.value
+        assert event["data"] == {"status": "active"}
+        assert event["seq"] > last_seq
+
+    async def test_reconnect_after_grace_period_gets_snapshot(self):
+        """Test that the buffer is released once a meeting has had no clients for a while."""
+        # Given
+        manager = WebSocketManager(resume_grace_seconds=0)
+        first = FakeWebSocket()
+        await manager.connect(first, "m1")
+        await manager.send_event("m1", WebSocketEventType.TRANSCRIPTION_STARTED, started(1))
+        await asyncio.sleep(0.01)
+        manager.disconnect(first, "m1")
+        await asyncio.sleep(0.01)
+
+        # When
+        second = FakeWebSocket()
+        await manager.connect(
+            second, "m1", last_seq=first.sent[-1]["seq"], snapshot=lambda: {"status": "active"}
+        )
+        await asyncio.sleep(0.01)
+
+        # Then
+        assert [event["type"] for event in second.sent] == [WebSocketEventType.SNAPSHOT.value]
+
+
+def partial(chunk_number: int, text: str) -> TranscriptionPartialEvent:
+    """Build a partial-transcription event."""
+    return TranscriptionPartialEvent(chunk_number=chunk_number, text=text)
+
+
+def delta(index: int, text: str) -> InterventionQuestionDeltaEvent:
+    """Build a question delta event."""
+    return InterventionQuestionDeltaEvent(
+        stream_id="s", intervention_type=InterventionType.GOAL_DEVIATION, index=index, delta=text
+    )
+
+
+class TestWebSocketCoalescing:
+    """Test suite for coalescing and batching of high-frequency events."""
+
+    async def test_only_latest_partial_per_chunk_is_sent(self):
+        """Test that partials for a chunk within the flush interval merge into the newest."""
+        # Given
+        manager = WebSocketManager()
+        client = FakeWebSocket()
+        await manager.connect(client, "m1")
+
+        # When
+        for text in ("Vi", "Vi borde", "Vi borde välja"):
+            await manager.send_event(
+                "m1", WebSocketEventType.TRANSCRIPTION_PARTIAL, partial(1, text)
+            )
+        await asyncio.sleep(0.15)
+
+        # Then
+        assert [event["data"]["text"] for event in client.sent] == ["Vi borde välja"]
+        assert manager.metrics()["m1"]["merged"] == 2
+
+    async def test_due_events_are_sent_as_one_batch(self):
+        """Test that events for different keys flushed together share one frame."""
+        # Given
+        manager = WebSocketManager()
+        client = FakeWebSocket()
+        await manager.connect(client, "m1")
+
+        # When
+        await manager.send_event("m1", WebSocketEventType.TRANSCRIPTION_PARTIAL, partial(1, "Ett"))
+        await manager.send_event("m1", WebSocketEventType.TRANSCRIPTION_PARTIAL, partial(2, "Två"))
+        await asyncio.sleep(0.15)
+
+        # Then
+        (frame,) = client.sent
+        assert frame["type"] == WebSocketEventType.BATCH.value
+        events = frame["data"]["events"]
+        assert [event["data"]["chunk_number"] for event in events] == [1, 2]
+        assert events[0]["seq"] < events[1]["seq"] == frame["seq"]
+
+    async def test_progress_never_goes_backwards(self):
+        """Test that merged progress keeps the highest percentage."""
+        # Given
+        rules = {
+            WebSocketEventType.TRANSCRIPTION_PROGRESS.value: CoalesceRule(
+                0.01, field_key("chunk_number"), merge_progress
+            )
+        }
+        manager = WebSocketManager(coalesce_rules=rules)
+        client = FakeWebSocket()
+        await manager.connect(client, "m1")
+
+        # When
+        for percent in (10, 60, 40):
+            await manager.send_event(
+                "m1",
+                WebSocketEventType.TRANSCRIPTION_PROGRESS,
+                TranscriptionProgressEvent(chunk_number=1, percent=percent),
+            )
+        await asyncio.sleep(0.05)
+
+        # Then
+        assert [event["data"]["percent"] for event in client.sent] == [60]
+
+    async def test_other_events_flush_pending_first(self):
+        """Test that deltas are merged and still arrive before the final question."""
+        # Given
+        manager = WebSocketManager()
+        client = FakeWebSocket()
+        await manager.connect(client, "m1")
+        for index, text in enumerate(("Vad ", "är ", "målet?")):
+            await manager.send_event(
+                "m1", WebSocketEventType.INTERVENTION_QUESTION, delta(index, text)
+            )
+
+        # When
+        await manager.send_event(
+            "m1",
+            WebSocketEventType.INTERVENTION_QUESTION,
+            InterventionQuestionEvent(
+                intervention_type=InterventionType.GOAL_DEVIATION,
+                question="Vad är målet?",
+                stream_id="s",
+            ),
+        )
+        await asyncio.sleep(0.01)
+
+        # Then
+        merged, final = client.sent
+        assert (merged["data"]["delta"], merged["data"]["index"]) == ("Vad är målet?", 2)
+        assert final["data"]["question"] == "Vad är målet?"
+        assert merged["seq"] < final["seq"]
+
+    async def test_resume_replays_batched_events_individually(self):
+        """Test that a client can resume from the middle of a batch."""
+        # Given
+        manager = WebSocketManager()
+        first = FakeWebSocket()
+        await manager.connect(first, "m1")
+        for number in (1, 2, 3):
+            await manager.send_event(
+                "m1", WebSocketEventType.TRANSCRIPTION_PARTIAL, partial(number, "Hej")
+            )
+        await manager.flush("m1")
+        await asyncio.sleep(0.01)
+        events = first.sent[0]["data"]["events"]
+        manager.disconnect(first, "m1")
+
+        # When
+        second = FakeWebSocket()
+        await manager.connect(second, "m1", last_seq=events[0]["seq"])
+        await asyncio.sleep(0.01)
+
+        # Then
+        assert [event["data"]["chunk_number"] for event in second.sent] == [2, 3]
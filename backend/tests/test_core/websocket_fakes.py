@@ -0,0 +1,40 @@
+"""WebSocket stand-ins shared by the WebSocket and event bus tests."""
+
+import asyncio
+import json
+
+from app.schemas.websocket_events import TranscriptionStartedEvent
+
+
+class FakeWebSocket:
+    """WebSocket stand-in recording sent text, optionally blocking on send."""
+
+    def __init__(self, blocked: bool = False, subprotocols: list[str] | None = None) -> None:
+        self.scope = {"subprotocols": subprotocols or []}
+        self.sent: list[dict] = []
+        self.frames: list[str | bytes] = []
+        self.unblocked = asyncio.Event()
+        if not blocked:
+            self.unblocked.set()
+        self.subprotocol: str | None = None
+        self.close_code: int | None = None
+
+    async def accept(self, subprotocol: str | None = None) -> None:
+        self.subprotocol = subprotocol
+
+    async def send_text(self, text: str) -> None:
+        await self.unblocked.wait()
+        self.frames.append(text)
+        self.sent.append(json.loads(text))
+
+    async def send_bytes(self, data: bytes) -> None:
+        await self.unblocked.wait()
+        self.frames.append(data)
+
+    async def close(self, code: int = 1000, reason: str | None = None) -> None:
+        self.close_code = code
+
+
+def started(chunk_number: int) -> TranscriptionStartedEvent:
+    """Build a transcription-started event."""
+    return TranscriptionStartedEvent(chunk_number=chunk_number, duration_seconds=10.0)
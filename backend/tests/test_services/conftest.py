@@ -0,0 +1,33 @@
+"""Shared fixtures for service tests."""
+
+from collections.abc import Generator
+
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.orm import Session, sessionmaker
+from sqlalchemy.pool import StaticPool
+
+from app.db.session import Base
+
+
+@pytest.fixture
+def session_factory() -> Generator[sessionmaker[Session], None, None]:
+    """Create an isolated in-memory database shared across sessions."""
+    engine = create_engine(
+        "sqlite://", connect_args={"check_same_thread": False}, poolclass=StaticPool
+    )
+    Base.metadata.create_all(bind=engine)
+    try:
+        yield sessionmaker(bind=engine)
+    finally:
+        engine.dispose()
+
+
+@pytest.fixture
+def db(session_factory: sessionmaker[Session]) -> Generator[Session, None, None]:
+    """Create a session on the isolated in-memory database."""
+    session = session_factory()
+    try:
+        yield session
+    finally:
+        session.close()
@@ -0,0 +1,234 @@
+"""Test async Claude service against the offline fake Messages API."""
+
+import asyncio
+import time
+from unittest.mock import AsyncMock, patch
+
+from app.schemas.trigger_analysis import DetectedTrigger
+from app.services.claude_service import AsyncClaudeService
+from benchmarks.fake_anthropic import FakeAnthropicConfig, FakeAnthropicServer, LatencyDistribution
+
+QUESTION = "Vad är kärnan i frågan?"
+
+
+def fake_api(delay_seconds: float = 0.0, generation_seconds: float = 0.0) -> FakeAnthropicServer:
+    """
+    Fake API answering after a fixed delay, always reporting one goal deviation.
+
+    ``generation_seconds`` is the time to generate ``QUESTION``, spread over its
+    streamed deltas.
+    """
+    tokens = len(QUESTION) / 4
+    return FakeAnthropicServer(FakeAnthropicConfig(
+        latency=LatencyDistribution(kind="fixed", median_ms=delay_seconds * 1000, min_ms=0),
+        output_tokens_per_second=tokens / generation_seconds if generation_seconds else 1e9,
+        trigger_rate=1.0,
+        triggers=[DetectedTrigger(type="goal_deviation", confidence=0.8, reason="Test")],
+        question=QUESTION,
+    ))
+
+
+def make_service(base_url: str, **kwargs) -> AsyncClaudeService:
+    """Create service pointed at the fake API."""
+    with patch.dict("os.environ", {"ANTHROPIC_API_KEY": "test-key"}):
+        return AsyncClaudeService(base_url=base_url, max_retries=0, **kwargs)
+
+
+class TestAsyncClaudeService:
+    """Test suite for the async Claude service."""
+
+    async def test_analyze_transcription_success(self):
+        """Test trigger analysis through the real HTTP stack."""
+        with fake_api() as server:
+            # Given
+            service = make_service(server.base_url)
+
+            # When
+            result = await service.analyze_transcription_for_triggers(
+                "Test", {"intent": "Test", "desired_outcomes": ["Mål"]}, [], meeting_id="m1"
+            )
+            await service.aclose()
+
+        # Then
+        assert result["triggers"][0]["type"] == "goal_deviation"
+        assert server.fake.received[0]["temperature"] == 0.3
+        assert server.fake.received[0]["tool_choice"]["name"] == "report_triggers"
+        assert service.trigger_parse_failure_rate == 0.0
+
+    async def test_meetings_are_analyzed_in_parallel(self):
+        """Test that several meetings run concurrently inside one event loop."""
+        with fake_api(delay_seconds=0.3) as server:
+            # Given
+            service = make_service(server.base_url)
+            context = {"intent": "Test", "desired_outcomes": []}
+
+            # When
+            start = time.perf_counter()
+            results = await asyncio.gather(*[
+                service.analyze_transcription_for_triggers("Test", context, [], meeting_id=f"m{i}")
+                for i in range(5)
+            ])
+            elapsed = time.perf_counter() - start
+            await service.aclose()
+
+        # Then
+        assert all(r["triggers"] for r in results)
+        assert server.fake.max_in_flight == 5
+        assert elapsed < 1.0
+
+    async def test_combined_facilitation_uses_one_call(self):
+        """Test that combined mode returns triggers with questions from one request."""
+        with fake_api() as server:
+            # Given
+            service = make_service(server.base_url)
+            context = {"intent": "Test", "desired_outcomes": []}
+
+            # When
+            result = await service.facilitate("Test", context, [], mode="combined", meeting_id="m1")
+            await service.aclose()
+
+        # Then
+        assert result["mode"] == "combined"
+        assert result["api_calls"] == 1
+        assert len(server.fake.received) == 1
+        assert server.fake.received[0]["tool_choice"]["name"] == "report_interventions"
+        assert result["triggers"][0]["question"] == QUESTION
+
+    async def test_two_call_facilitation_matches_combined_shape(self):
+        """Test that two-call mode adds a question per trigger with a second request."""
+        with fake_api() as server:
+            # Given
+            service = make_service(server.base_url)
+            context = {"intent": "Test", "desired_outcomes": []}
+
+            # When
+            result = await service.facilitate("Test", context, [], mode="two_call", meeting_id="m1")
+            await service.aclose()
+
+        # Then
+        assert result["mode"] == "two_call"
+        assert result["api_calls"] == 2
+        assert len(server.fake.received) == 2
+        assert "tool_choice" not in server.fake.received[1]
+        assert result["triggers"][0]["question"] == QUESTION
+
+    async def test_stream_question_forwards_deltas_before_completion(self):
+        """Test that the first text fragment arrives before the stream finishes."""
+        with fake_api(generation_seconds=0.5) as server:
+            # Given
+            service = make_service(server.base_url)
+            arrivals: list[tuple[float, str]] = []
+            start = time.perf_counter()
+
+            async def on_delta(text: str) -> None:
+                arrivals.append((time.perf_counter() - start, text))
+
+            # When
+            question = await service.stream_facilitation_question(
+                "goal_deviation", {"intent": "Test"}, "Test", on_delta, meeting_id="m1"
+            )
+            total = time.perf_counter() - start
+            await service.aclose()
+
+        # Then
+        assert question == QUESTION
+        assert "".join(text for _, text in arrivals) == question
+        assert len(arrivals) == 5
+        assert arrivals[0][0] < total - 0.3
+        assert service.usage.requests == 1
+        assert service.usage.as_dict()["output_tokens"] > 0
+
+    async def test_stream_question_to_meeting_sends_deltas_then_final(self):
+        """Test that deltas and the final question share a stream id."""
+        from app.schemas.websocket_events import InterventionType, WebSocketEventType
+        from app.services.intervention_stream import stream_question_to_meeting
+
+        with fake_api() as server:
+            # Given
+            service = make_service(server.base_url)
+            manager = AsyncMock()
+
+            # When
+            question = await stream_question_to_meeting(
+                service, "m1", InterventionType.GOAL_DEVIATION,
+                {"intent": "Test", "reason": "Off topic"}, "Test", manager=manager,
+            )
+            await service.aclose()
+
+        # Then
+        events = [c.args[2] for c in manager.send_event.await_args_list]
+        assert all(
+            c.args[1] == WebSocketEventType.INTERVENTION_QUESTION
+            for c in manager.send_event.await_args_list
+        )
+        assert [e.index for e in events[:-1]] == list(range(5))
+        assert events[-1].question == question
+        assert events[-1].context == "Off topic"
+        assert {e.stream_id for e in events} == {events[-1].stream_id}
+
+    async def test_replayed_chunk_is_served_from_response_cache(self):
+        """Test that an identical analysis request is answered without the API."""
+        from app.services.response_cache import ResponseCache
+
+        with fake_api() as server:
+            # Given
+            service = make_service(server.base_url, response_cache=ResponseCache(":memory:"))
+            context = {"intent": "Test", "desired_outcomes": []}
+
+            # When
+            analyze = service.analyze_transcription_for_triggers
+            first = await analyze("Test", context, [], meeting_id="m1")
+            second = await analyze("Test", context, [], meeting_id="m1")
+            await service.aclose()
+
+        # Then
+        assert first == second
+        assert len(server.fake.received) == 1
+        assert service.usage.requests == 1
+
+    async def test_per_meeting_concurrency_is_bounded(self):
+        """Test that one meeting cannot exceed its concurrency limit."""
+        with fake_api(delay_seconds=0.05) as server:
+            # Given
+            service = make_service(server.base_url, per_meeting_concurrency=1)
+
+            # When
+            await asyncio.gather(*[
+                service.generate_facilitation_question(
+                    "goal_deviation", {}, "Test", meeting_id="m1"
+                )
+                for _ in range(4)
+            ])
+            await service.aclose()
+
+        # Then
+        assert len(server.fake.received) == 4
+        assert server.fake.max_in_flight == 1
+
+    async def test_connections_are_reused(self):
+        """Test that sequential requests share a pooled keep-alive connection."""
+        with fake_api() as server:
+            # Given
+            service = make_service(server.base_url)
+
+            # When
+            for _ in range(3):
+                await service.generate_facilitation_question("goal_deviation", {}, "Test")
+            await service.aclose()
+
+        # Then
+        assert len(server.fake.connections) == 1
+
+    async def test_timeout_returns_error(self):
+        """Test that a slow API is cut off by the request timeout."""
+        with fake_api(delay_seconds=1.0) as server:
+            # Given
+            service = make_service(server.base_url, timeout_seconds=0.2)
+
+            # When
+            result = await service.analyze_transcription_for_triggers("Test", {}, [])
+            await service.aclose()
+
+        # Then
+        assert result["triggers"] == []
+        assert "error" in result
@@ -0,0 +1,288 @@
+"""Test Claude request scheduler against a simulated rate-limited API."""
+
+import asyncio
+import random
+import time
+from types import SimpleNamespace
+
+import anthropic
+import httpx
+import pytest
+
+from app.services.claude_scheduler import (
+    ClaudeRequestScheduler,
+    DeadlineExceeded,
+    RequestPriority,
+    TokenBucket,
+)
+
+
+def api_error(
+    error_class: type[anthropic.APIStatusError], status: int, retry_after: float | None = None
+) -> anthropic.APIStatusError:
+    """Build an SDK error the way the client raises it for an HTTP status."""
+    request = httpx.Request("POST", "https://api.anthropic.com/v1/messages")
+    headers = {"retry-after": str(retry_after)} if retry_after is not None else {}
+    response = httpx.Response(status, request=request, headers=headers)
+    return error_class("error", response=response, body=None)
+
+
+class SimulatedClaudeAPI:
+    """
+    In-process stand-in for the Messages API with server-side rate limits.
+
+    Requests are admitted by a token bucket like Anthropic's; rejected
+    requests raise ``RateLimitError`` with ``retry-after``. A seeded share of
+    admitted requests fails with a transient overloaded (529) error.
+    """
+
+    def __init__(
+        self,
+        requests_per_minute: float,
+        burst: float,
+        latency_seconds: float = 0.01,
+        overload_rate: float = 0.0,
+        seed: int = 0,
+    ) -> None:
+        self.bucket = TokenBucket(requests_per_minute, burst)
+        self.latency_seconds = latency_seconds
+        self.overload_rate = overload_rate
+        self.random = random.Random(seed)
+        self.accepted = 0
+        self.rejected = 0
+        self.overloaded = 0
+        self.calls: list[str] = []
+
+    async def create(self, label: str, output_tokens: int = 50) -> SimpleNamespace:
+        """Handle one request."""
+        if self.bucket.time_until(1) > 0:
+            self.rejected += 1
+            raise api_error(anthropic.RateLimitError, 429, retry_after=self.bucket.time_until(1))
+        self.bucket.take(1)
+        if self.random.random() < self.overload_rate:
+            self.overloaded += 1
+            raise api_error(anthropic.InternalServerError, 529)
+        self.accepted += 1
+        self.calls.append(label)
+        await asyncio.sleep(self.latency_seconds)
+        return SimpleNamespace(usage=SimpleNamespace(input_tokens=100, output_tokens=output_tokens))
+
+
+def drained(scheduler: ClaudeRequestScheduler) -> ClaudeRequestScheduler:
+    """Empty the request bucket so every request has to queue."""
+    scheduler.requests.tokens = 0
+    return scheduler
+
+
+class TestTokenBucket:
+    """Test suite for the token bucket."""
+
+    def test_refills_at_per_minute_rate(self):
+        """Test that a drained bucket refills continuously."""
+        # Given
+        bucket = TokenBucket(per_minute=60)
+        bucket.updated = 100.0
+        bucket.take(60, now=100.0)
+
+        # When / Then
+        assert bucket.time_until(1, now=100.0) == pytest.approx(1.0)
+        assert bucket.time_until(1, now=101.0) == 0.0
+        assert bucket.time_until(10, now=101.0) == pytest.approx(9.0)
+
+    def test_request_larger_than_capacity_is_clamped(self):
+        """Test that an oversized request waits for a full bucket instead of forever."""
+        # Given
+        bucket = TokenBucket(per_minute=60, capacity=10)
+
+        # When / Then
+        assert bucket.time_until(1000) == 0.0
+
+
+class TestClaudeRequestScheduler:
+    """Test suite for the request scheduler."""
+
+    async def test_rate_limit_is_retried(self):
+        """Test that a 429 is retried after the server's retry-after."""
+        # Given
+        scheduler = ClaudeRequestScheduler(backoff_base_seconds=0.01)
+        attempts = []
+
+        async def call():
+            attempts.append(time.perf_counter())
+            if len(attempts) == 1:
+                raise api_error(anthropic.RateLimitError, 429, retry_after=0.1)
+            return "ok"
+
+        # When
+        result = await scheduler.run(call)
+
+        # Then
+        assert result == "ok"
+        assert attempts[1] - attempts[0] >= 0.1
+        assert scheduler.stats()["retries"] == 1
+        assert scheduler.stats()["rate_limited"] == 1
+
+    async def test_non_retryable_error_is_raised_immediately(self):
+        """Test that client errors are not retried."""
+        # Given
+        scheduler = ClaudeRequestScheduler()
+        attempts = []
+
+        async def call():
+            attempts.append(1)
+            raise api_error(anthropic.BadRequestError, 400)
+
+        # When / Then
+        with pytest.raises(anthropic.BadRequestError):
+            await scheduler.run(call)
+        assert len(attempts) == 1
+
+    async def test_gives_up_after_max_attempts(self):
+        """Test that transient errors are retried a bounded number of times."""
+        # Given
+        scheduler = ClaudeRequestScheduler(max_attempts=3, backoff_base_seconds=0.01)
+        attempts = []
+
+        async def call():
+            attempts.append(1)
+            raise api_error(anthropic.InternalServerError, 529)
+
+        # When / Then
+        with pytest.raises(anthropic.InternalServerError):
+            await scheduler.run(call)
+        assert len(attempts) == 3
+
+    async def test_live_requests_go_before_batch(self):
+        """Test that queued live interventions overtake queued batch work."""
+        # Given
+        scheduler = drained(ClaudeRequestScheduler(requests_per_minute=1200))
+        order = []
+
+        def job(label):
+            async def call():
+                order.append(label)
+            return call
+
+        # When
+        batch = [
+            scheduler.run(job(f"batch{i}"), priority=RequestPriority.BATCH) for i in range(3)
+        ]
+        live = [
+            scheduler.run(job(f"live{i}"), priority=RequestPriority.LIVE) for i in range(3)
+        ]
+        await asyncio.gather(*batch, *live)
+
+        # Then
+        assert order == ["live0", "live1", "live2", "batch0", "batch1", "batch2"]
+
+    async def test_meetings_are_served_fairly(self):
+        """Test that a meeting with a burst of requests cannot starve another."""
+        # Given
+        scheduler = drained(ClaudeRequestScheduler(requests_per_minute=1200))
+        order = []
+
+        def job(label):
+            async def call():
+                order.append(label)
+            return call
+
+        # When
+        busy = [scheduler.run(job("a"), meeting_id="a", estimated_tokens=100) for _ in range(6)]
+        quiet = [scheduler.run(job("b"), meeting_id="b", estimated_tokens=100) for _ in range(2)]
+        await asyncio.gather(*busy, *quiet)
+
+        # Then
+        assert order[:4].count("b") == 2
+
+    async def test_deadline_expires_while_queued(self):
+        """Test that a request stuck behind the rate limit fails at its deadline."""
+        # Given
+        scheduler = drained(ClaudeRequestScheduler(requests_per_minute=6))
+
+        async def call():
+            return "late"
+
+        # When
+        start = time.perf_counter()
+        with pytest.raises(DeadlineExceeded):
+            await scheduler.run(call, deadline_seconds=0.1)
+
+        # Then
+        assert time.perf_counter() - start < 0.5
+        assert scheduler.stats()["expired"] == 1
+
+    async def test_retry_past_deadline_is_not_attempted(self):
+        """Test that a retry-after beyond the deadline ends the request."""
+        # Given
+        scheduler = ClaudeRequestScheduler()
+        attempts = []
+
+        async def call():
+            attempts.append(1)
+            raise api_error(anthropic.RateLimitError, 429, retry_after=5)
+
+        # When / Then
+        with pytest.raises(anthropic.RateLimitError):
+            await scheduler.run(call, deadline_seconds=1.0)
+        assert len(attempts) == 1
+
+    async def test_token_estimate_is_corrected_from_usage(self):
+        """Test that unused estimated tokens are returned to the budget."""
+        # Given
+        scheduler = ClaudeRequestScheduler(tokens_per_minute=10_000)
+
+        async def call():
+            return SimpleNamespace(usage=SimpleNamespace(input_tokens=300, output_tokens=200))
+
+        # When
+        await scheduler.run(call, estimated_tokens=4000)
+
+        # Then
+        assert scheduler.tokens.tokens == pytest.approx(10_000 - 500, abs=5)
+
+
+class TestSimulatedAPI:
+    """Run many meetings against the simulated API, with and without the scheduler."""
+
+    async def test_unscheduled_burst_is_rate_limited(self):
+        """Test that the harness rejects a burst above its limit."""
+        # Given
+        api = SimulatedClaudeAPI(requests_per_minute=1200, burst=5)
+
+        # When
+        results = await asyncio.gather(
+            *[api.create(f"m{i % 5}") for i in range(30)], return_exceptions=True
+        )
+
+        # Then
+        assert sum(isinstance(r, anthropic.RateLimitError) for r in results) >= 20
+
+    async def test_scheduled_meetings_all_complete(self):
+        """Test that the scheduler drives a burst through limits and transient errors."""
+        # Given
+        api = SimulatedClaudeAPI(requests_per_minute=1200, burst=5, overload_rate=0.1, seed=7)
+        scheduler = ClaudeRequestScheduler(
+            requests_per_minute=1200,
+            request_burst=5,
+            max_attempts=5,
+            backoff_base_seconds=0.02,
+        )
+
+        # When
+        results = await asyncio.gather(*[
+            scheduler.run(
+                lambda i=i: api.create(f"m{i % 5}"),
+                meeting_id=f"m{i % 5}",
+                estimated_tokens=150,
+            )
+            for i in range(30)
+        ])
+
+        # Then
+        assert len(results) == 30
+        assert api.accepted == 30
+        assert api.overloaded > 0
+        assert api.rejected <= 3
+        # Round-robin across meetings: every meeting is served within each window of 10
+        for start in range(0, 30, 10):
+            assert len(set(api.calls[start:start + 10])) == 5
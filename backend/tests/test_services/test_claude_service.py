@@ -129,24 +129,56 @@ class TestClaudeService:
     def test_parse_trigger_response_valid_json(self):
         """Test parsing valid JSON response."""
         # Given
-        response = '{"triggers": [{"type": "test", "confidence": 0.5}]}'
+        response = '{"triggers": [{"type": "goal_deviation", "confidence": 0.5, "reason": "Test"}]}'
         
         # When
         result = self.service._parse_trigger_response(response)
         
         # Then
-        assert result["triggers"][0]["type"] == "test"
+        assert result["triggers"][0]["type"] == "goal_deviation"
 
-    def test_parse_trigger_response_with_extra_text(self):
-        """Test parsing JSON with extra text."""
+    def test_parse_trigger_response_with_extra_text_fails(self):
+        """Test that JSON wrapped in extra text is rejected instead of brace-scanned."""
         # Given
-        response = 'Some text {"triggers": [{"type": "test"}]} more text'
+        response = 'Some text {"triggers": []} more text'
         
         # When
         result = self.service._parse_trigger_response(response)
         
         # Then
-        assert result["triggers"][0]["type"] == "test"
+        assert result["triggers"] == []
+        assert "error" in result
+
+    def test_parse_trigger_message_tool_use(self):
+        """Test parsing a report_triggers tool call."""
+        # Given
+        block = Mock(type="tool_use", input={"triggers": [
+            {"type": "perspective_gap", "confidence": 0.7, "reason": "Bara Anna pratar"}
+        ]})
+        message = Mock(content=[block])
+        
+        # When
+        result = self.service._parse_trigger_message(message)
+        
+        # Then
+        assert result == {"triggers": [
+            {"type": "perspective_gap", "confidence": 0.7, "reason": "Bara Anna pratar"}
+        ]}
+        assert self.service.trigger_parse_failure_rate == 0.0
+
+    def test_parse_trigger_message_invalid_tool_input_counts_failure(self):
+        """Test that schema violations are reported and counted, not retried."""
+        # Given
+        block = Mock(type="tool_use", input={"triggers": [{"type": "unknown", "confidence": 2}]})
+        
+        # When
+        result = self.service._parse_trigger_message(Mock(content=[block]))
+        
+        # Then
+        assert result["triggers"] == []
+        assert "error" in result
+        assert self.service.trigger_parse_failures == 1
+        assert self.service.trigger_parse_failure_rate == 1.0
 
     def test_parse_trigger_response_invalid_json(self):
         """Test parsing invalid JSON returns error."""
@@ -159,3 +191,109 @@ class TestClaudeService:
         # Then
         assert result["triggers"] == []
         assert "error" in result
+
+    def test_trigger_request_puts_static_context_in_cached_system_prompt(self):
+        """Test that instructions and meeting context are cacheable system blocks."""
+        # Given
+        context = {"intent": "Välja kaffemaskin", "desired_outcomes": ["Beslut om modell"]}
+
+        # When
+        first = self.service._build_trigger_analysis_request("Chunk ett", context, [])
+        second = self.service._build_trigger_analysis_request("Chunk två", context, ["Chunk ett"])
+
+        # Then
+        assert first["system"] == second["system"]
+        assert all(block["cache_control"] == {"type": "ephemeral"} for block in first["system"])
+        assert "Välja kaffemaskin" in first["system"][1]["text"]
+        assert "Välja kaffemaskin" not in second["messages"][0]["content"]
+        assert "Chunk två" in second["messages"][0]["content"]
+
+    @patch('app.services.claude_service.Anthropic')
+    def test_analyze_transcription_records_cached_tokens(self, mock_anthropic):
+        """Test that cached and uncached input tokens are accumulated."""
+        # Given
+        mock_client = Mock()
+        mock_anthropic.return_value = mock_client
+        mock_message = Mock()
+        mock_message.content = [Mock(text='{"triggers": []}')]
+        mock_message.usage = Mock(
+            input_tokens=120,
+            cache_creation_input_tokens=0,
+            cache_read_input_tokens=1500,
+            output_tokens=12,
+        )
+        mock_client.messages.create.return_value = mock_message
+
+        with patch.dict('os.environ', {'ANTHROPIC_API_KEY': 'test-key'}):
+            service = ClaudeService()
+
+        # When
+        service.analyze_transcription_for_triggers("Test", {"intent": "Test"}, [])
+        service.analyze_transcription_for_triggers("Test", {"intent": "Test"}, [])
+
+        # Then
+        usage = service.usage.as_dict()
+        assert usage["requests"] == 2
+        assert usage["input_tokens"] == 240
+        assert usage["cache_read_input_tokens"] == 3000
+        assert usage["cache_hit_ratio"] == round(3000 / 3240, 3)
+
+    def test_combined_request_asks_for_questions(self):
+        """Test that combined mode uses the intervention tool and GROW instructions."""
+        # Given
+        context = {"intent": "Välja kaffemaskin", "desired_outcomes": []}
+
+        # When
+        request = self.service._build_trigger_analysis_request("Chunk", context, [], combined=True)
+
+        # Then
+        assert request["tool_choice"] == {"type": "tool", "name": "report_interventions"}
+        assert "GROW" in request["system"][0]["text"]
+        assert "report_triggers" not in request["system"][0]["text"]
+
+    def test_facilitate_combined_missing_question_is_parse_failure(self):
+        """Test that combined output without questions fails validation."""
+        # Given
+        block = Mock(
+            type="tool_use",
+            input={"triggers": [{"type": "goal_deviation", "confidence": 0.8, "reason": "Test"}]},
+        )
+        self.service.client = Mock()
+        self.service.client.messages.create.return_value = Mock(content=[block])
+
+        # When
+        result = self.service.facilitate("Test", {"intent": "Test"}, [], mode="combined")
+
+        # Then
+        assert result["triggers"] == []
+        assert "error" in result
+        assert result["api_calls"] == 1
+
+    def test_facilitate_two_call_generates_question_per_trigger(self):
+        """Test that two-call mode makes one extra request per trigger."""
+        # Given
+        triggers = [
+            {"type": "goal_deviation", "confidence": 0.8, "reason": "A"},
+            {"type": "perspective_gap", "confidence": 0.7, "reason": "B"},
+        ]
+        analysis = Mock(content=[Mock(type="tool_use", input={"triggers": triggers})])
+        question = Mock(content=[Mock(text="Vad vill vi uppnå?")])
+        self.service.client = Mock()
+        self.service.client.messages.create.side_effect = [analysis, question, question]
+
+        # When
+        result = self.service.facilitate("Test", {"intent": "Test"}, [], mode="two_call")
+
+        # Then
+        assert result["api_calls"] == 3
+        assert [t["question"] for t in result["triggers"]] == ["Vad vill vi uppnå?"] * 2
+
+    def test_facilitation_mode_from_environment(self):
+        """Test that FACILITATION_MODE selects the default mode."""
+        # Given / When
+        environ = {'ANTHROPIC_API_KEY': 'test-key', 'FACILITATION_MODE': 'two_call'}
+        with patch.dict('os.environ', environ):
+            service = ClaudeService()
+
+        # Then
+        assert service.facilitation_mode == "two_call"
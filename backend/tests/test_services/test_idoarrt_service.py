@@ -1,7 +1,33 @@
 """Test IDOARRT service with TDD approach."""
 
+from unittest.mock import patch
+
 import pytest
-from app.services.idoarrt_service import IDOARRTService, IDOARRTParseError
+from pydantic import ValidationError
+
+from app.schemas.strict_validation import StrictMeetingCreate
+from app.services.idoarrt_service import IDOARRTService, IDOARRTParseError, parse_idoarrt_document
+
+VALID_IDOARRT = """# Kaffemöte
+
+# Intent
+Välja kaffemaskin
+
+# Desired Outcomes
+- Beslut om modell
+
+# Agenda
+1. Alternativ (10 min)
+2. Beslut (5)
+
+# Roles
+- Facilitator: Anna
+
+# Rules
+- En person i taget
+
+# Time
+Total: 15 minutes"""
 
 
 class TestIDOARRTService:
@@ -124,3 +150,135 @@ invalid
         
         # Then
         assert any("agenda time" in error.lower() for error in errors)
+
+
+class TestIDOARRTDocumentParser:
+    """Test suite for the single-pass parser and its diagnostics."""
+
+    def test_valid_document_has_no_diagnostics(self):
+        """Test that both agenda time formats are parsed."""
+        # When
+        document = parse_idoarrt_document(VALID_IDOARRT)
+
+        # Then
+        assert document.ok
+        assert document.data["agenda"] == [
+            {"topic": "Alternativ", "duration_minutes": 10},
+            {"topic": "Beslut", "duration_minutes": 5},
+        ]
+        assert document.data["roles"] == {"Facilitator": "Anna"}
+
+    def test_all_problems_are_reported_with_line_numbers(self):
+        """Test that parsing continues past the first problem."""
+        # Given
+        markdown = VALID_IDOARRT.replace("2. Beslut (5)", "2. Beslut")
+        markdown = markdown.replace("- En person i taget", "")
+
+        # When
+        with pytest.raises(IDOARRTParseError) as error:
+            IDOARRTService().parse_idoarrt(markdown)
+
+        # Then
+        assert [str(d) for d in error.value.diagnostics] == [
+            "Line 11: Agenda item missing time allocation: 2. Beslut",
+            "Line 16: Rules must have at least one rule",
+        ]
+
+    def test_agenda_total_mismatch_points_at_total(self):
+        """Test that the mismatch diagnostic refers to the Total line."""
+        # When
+        document = parse_idoarrt_document(VALID_IDOARRT.replace("Total: 15", "Total: 20"))
+
+        # Then
+        (diagnostic,) = document.diagnostics
+        assert (diagnostic.code, diagnostic.line) == ("agenda_total_mismatch", 20)
+
+    def test_subheadings_stay_inside_their_section(self):
+        """Test that only known section names start a section below level 1."""
+        # Given
+        markdown = VALID_IDOARRT.replace("# Agenda\n", "## agenda\n### Del 1\n")
+
+        # When
+        document = parse_idoarrt_document(markdown)
+
+        # Then
+        assert document.ok
+        assert len(document.data["agenda"]) == 2
+
+
+class TestStrictMeetingCreate:
+    """Test suite for request validation of IDOARRT markdown."""
+
+    def test_missing_section_is_rejected(self):
+        """Test that structural problems fail request validation."""
+        # When/Then
+        with pytest.raises(ValidationError, match="Roles section is required"):
+            StrictMeetingCreate(idoarrt_markdown=VALID_IDOARRT.replace("# Roles", "# Roller"))
+
+    def test_endpoint_reuses_parsed_document(self):
+        """Test that the document parsed during validation is not parsed again."""
+        # Given
+        meeting = StrictMeetingCreate(idoarrt_markdown=VALID_IDOARRT)
+
+        # When
+        with patch("app.services.idoarrt_service.parse_idoarrt_document") as parse:
+            data = IDOARRTService.document_data(meeting.document)
+
+        # Then
+        parse.assert_not_called()
+        assert data["total_duration_minutes"] == 15
+
+
+class TestIDOARRTParseCache:
+    """Test suite for memoized parsing."""
+
+    def test_same_markdown_is_parsed_once(self):
+        """Test that repeated documents are served from the cache."""
+        # Given
+        service = IDOARRTService(cache_size=2)
+
+        # When
+        with patch(
+            "app.services.idoarrt_service.parse_idoarrt_document", wraps=parse_idoarrt_document
+        ) as parse:
+            first = service.parse_idoarrt(VALID_IDOARRT)
+            second = service.parse_idoarrt(VALID_IDOARRT)
+
+        # Then
+        assert parse.call_count == 1
+        assert first == second
+        assert service.cache_stats() == {"entries": 1, "hits": 1, "misses": 1}
+
+    def test_callers_cannot_change_cached_data(self):
+        """Test that returned data is a copy of the cached document."""
+        # Given
+        service = IDOARRTService()
+        data = service.parse_idoarrt(VALID_IDOARRT)
+
+        # When
+        data["agenda"][0]["topic"] = "Ändrad"
+        data["roles"]["Tidhållare"] = "Björn"
+
+        # Then
+        again = service.parse_idoarrt(VALID_IDOARRT)
+        assert again["agenda"][0]["topic"] == "Alternativ"
+        assert "Tidhållare" not in again["roles"]
+
+    def test_least_recently_used_document_is_evicted(self):
+        """Test bounded LRU eviction."""
+        # Given
+        service = IDOARRTService(cache_size=2)
+        first, second, third = (
+            VALID_IDOARRT.replace("kaffemaskin", name) for name in ("a", "b", "c")
+        )
+        service.parse_document(first)
+        service.parse_document(second)
+        service.parse_document(first)
+
+        # When
+        service.parse_document(third)
+
+        # Then
+        service.parse_document(first)
+        service.parse_document(second)
+        assert service.cache_stats()["misses"] == 4
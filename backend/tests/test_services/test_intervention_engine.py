@@ -0,0 +1,373 @@
+"""Test the live intervention engine."""
+
+import asyncio
+from datetime import datetime
+from unittest.mock import AsyncMock
+
+import pytest
+
+from app.core.event_bus import InProcessEventBus
+from app.models.meeting import Intervention, Meeting, Protocol
+from app.schemas.websocket_events import WebSocketEventType
+from app.services.intervention_engine import InterventionEngine
+from app.services.protocol_service import ProtocolService
+from app.services.trigger_prescreen import TriggerPrescreener
+
+
+class FakeClaudeService:
+    """Async Claude service stand-in returning queued facilitation results."""
+
+    def __init__(self, results=None, mode="combined", delay_seconds=0.0):
+        self.results = list(results or [])
+        self.facilitation_mode = mode
+        self.delay_seconds = delay_seconds
+        self.facilitate_calls = 0
+        self.memory_updates = 0
+        self.in_flight = 0
+        self.max_in_flight = 0
+
+    async def analyze_transcription_for_triggers(
+        self, transcription, meeting_context, history, memory, meeting_id=None
+    ):
+        return await self.facilitate(transcription, meeting_context, history, memory, meeting_id)
+
+    async def facilitate(self, transcription, meeting_context, history, memory, meeting_id=None):
+        self.facilitate_calls += 1
+        self.in_flight += 1
+        self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        await asyncio.sleep(self.delay_seconds)
+        self.in_flight -= 1
+        return self.results.pop(0) if self.results else {"triggers": []}
+
+    async def update_meeting_memory(self, memory, transcription, elapsed_minutes, meeting_id=None):
+        self.memory_updates += 1
+        memory.apply_update(0, transcription, [], decisions=[f"Beslut {self.memory_updates}"])
+        return True
+
+    async def stream_facilitation_question(
+        self, trigger_type, context, transcription, on_delta, meeting_id=None
+    ):
+        for part in ("Vad ", "vill ", "vi?"):
+            await on_delta(part)
+        return "Vad vill vi?"
+
+    def forget_meeting(self, meeting_id):
+        pass
+
+
+class GatedClaudeService(FakeClaudeService):
+    """Fake whose memory updates wait until ``release`` is set."""
+
+    def __init__(self):
+        super().__init__()
+        self.release = asyncio.Event()
+
+    async def update_meeting_memory(self, memory, transcription, elapsed_minutes, meeting_id=None):
+        await self.release.wait()
+        return await super().update_meeting_memory(
+            memory, transcription, elapsed_minutes, meeting_id
+        )
+
+
+def trigger(
+    trigger_type="goal_deviation",
+    confidence=0.8,
+    reason="Diskussionen handlar om fotboll",
+    question=None,
+):
+    """Build a facilitation trigger."""
+    result = {"type": trigger_type, "confidence": confidence, "reason": reason}
+    if question is not None:
+        result["question"] = question
+    return result
+
+
+@pytest.fixture
+def meeting(session_factory) -> Meeting:
+    """Create an active meeting."""
+    db = session_factory()
+    meeting = Meeting(
+        intent="Välja kaffemaskin",
+        desired_outcomes=["Beslut om modell"],
+        agenda=[{"topic": "Diskussion", "duration_minutes": 30}],
+        roles={"Facilitator": "Anna"},
+        rules=["En i taget"],
+        total_duration_minutes=30,
+        status="active",
+        started_at=datetime.utcnow(),
+    )
+    db.add(meeting)
+    db.commit()
+    db.refresh(meeting)
+    db.expunge(meeting)
+    db.close()
+    return meeting
+
+
+def make_engine(claude, session_factory, **kwargs):
+    """Create an engine with a mock WebSocket manager."""
+    kwargs.setdefault("bus", InProcessEventBus())
+    return InterventionEngine(
+        claude_service_factory=lambda: claude,
+        session_factory=session_factory,
+        manager=AsyncMock(),
+        **kwargs,
+    )
+
+
+class TestInterventionEngine:
+    """Test suite for InterventionEngine."""
+
+    async def test_trigger_is_persisted_and_sent(self, session_factory, meeting):
+        """Test that a detected trigger becomes an Intervention row and two events."""
+        # Given
+        question = "Hur hänger det ihop med målet?"
+        claude = FakeClaudeService([{"triggers": [trigger(question=question)]}])
+        engine = make_engine(claude, session_factory)
+
+        # When
+        await engine.submit(meeting, 1, "Har ni sett matchen?")
+
+        # Then
+        db = session_factory()
+        rows = db.query(Intervention).all()
+        assert len(rows) == 1
+        assert rows[0].intervention_type == "goal_deviation"
+        assert rows[0].question == question
+        assert rows[0].trigger_context["chunk_number"] == 1
+        calls = engine.manager.send_event.await_args_list
+        assert [c.args[1] for c in calls] == [
+            WebSocketEventType.INTERVENTION_TRIGGERED,
+            WebSocketEventType.INTERVENTION_QUESTION,
+        ]
+        assert calls[1].args[2].intervention_id == rows[0].id
+        assert claude.memory_updates == 1
+
+    async def test_submit_does_not_wait_for_analysis(self, session_factory, meeting):
+        """Test that the upload path returns before Claude answers."""
+        # Given
+        claude = FakeClaudeService(delay_seconds=0.2)
+        engine = make_engine(claude, session_factory)
+
+        # When
+        task = engine.submit(meeting, 1, "Test")
+
+        # Then
+        assert not task.done()
+        await engine.aclose()
+        assert task.done()
+
+    async def test_same_type_within_cooldown_is_suppressed(self, session_factory, meeting):
+        """Test that a trigger type does not fire twice within the cooldown."""
+        # Given
+        claude = FakeClaudeService([
+            {"triggers": [trigger(question="Fråga ett")]},
+            {"triggers": [trigger(reason="Nu pratar de om semester", question="Fråga två")]},
+        ])
+        engine = make_engine(claude, session_factory, cooldown_seconds=60)
+
+        # When
+        await engine.submit(meeting, 1, "Chunk ett")
+        await engine.submit(meeting, 2, "Chunk två")
+
+        # Then
+        assert session_factory().query(Intervention).count() == 1
+        assert engine.stats()["suppressed"] == 1
+
+    async def test_repeated_reason_is_deduplicated_after_cooldown(self, session_factory, meeting):
+        """Test that the same reason is not repeated even once the cooldown has passed."""
+        # Given
+        claude = FakeClaudeService([
+            {"triggers": [trigger(question="Fråga ett")]},
+            {"triggers": [trigger(question="Fråga två")]},
+            {"triggers": [trigger(reason="Gruppen planerar julfesten", question="Fråga tre")]},
+        ])
+        engine = make_engine(claude, session_factory, cooldown_seconds=0)
+
+        # When
+        for number in range(1, 4):
+            await engine.submit(meeting, number, f"Chunk {number}")
+
+        # Then
+        questions = [row.question for row in session_factory().query(Intervention).all()]
+        assert sorted(questions) == ["Fråga ett", "Fråga tre"]
+
+    async def test_low_confidence_and_duplicate_types_are_filtered(self, session_factory, meeting):
+        """Test that weak triggers are dropped and only the strongest per type is kept."""
+        # Given
+        claude = FakeClaudeService([{"triggers": [
+            trigger(confidence=0.3, question="Svag"),
+            trigger(confidence=0.7, question="Medel"),
+            trigger(confidence=0.9, question="Stark"),
+        ]}])
+        engine = make_engine(claude, session_factory)
+
+        # When
+        await engine.submit(meeting, 1, "Chunk")
+
+        # Then
+        rows = session_factory().query(Intervention).all()
+        assert [row.question for row in rows] == ["Stark"]
+
+    async def test_two_call_mode_streams_question(self, session_factory, meeting):
+        """Test that questions are streamed and stored when triggers come without them."""
+        # Given
+        claude = FakeClaudeService([{"triggers": [trigger()]}], mode="two_call")
+        engine = make_engine(claude, session_factory)
+
+        # When
+        await engine.submit(meeting, 1, "Chunk")
+
+        # Then
+        row = session_factory().query(Intervention).one()
+        assert row.question == "Vad vill vi?"
+        events = [c.args[2] for c in engine.manager.send_event.await_args_list]
+        assert [e.delta for e in events[1:4]] == ["Vad ", "vill ", "vi?"]
+        assert events[-1].stream_id == row.id
+
+    async def test_concurrent_analyses_per_meeting_are_bounded(self, session_factory, meeting):
+        """Test that a burst of chunks does not exceed the per-meeting limit."""
+        # Given
+        claude = FakeClaudeService(delay_seconds=0.05)
+        engine = make_engine(claude, session_factory, max_concurrent_analyses=2)
+
+        # When
+        for number in range(6):
+            engine.submit(meeting, number, f"Chunk {number}")
+        await engine.aclose()
+
+        # Then
+        assert claude.facilitate_calls == 6
+        assert claude.max_in_flight == 2
+
+    async def test_prescreened_chunks_join_the_next_memory_update(self, session_factory, meeting):
+        """Test that skipped chunks cost no Claude call until an analyzed chunk carries them."""
+        # Given
+        claude = FakeClaudeService()
+        prescreener = TriggerPrescreener(threshold=1.1, max_consecutive_skips=2)
+        engine = make_engine(claude, session_factory, prescreener=prescreener)
+
+        # When
+        for number, text in enumerate(["Vi tittar på A", "Vi tittar på B", "Vi väljer B"], 1):
+            await engine.submit(meeting, number, text)
+
+        # Then
+        assert claude.facilitate_calls == 1
+        assert claude.memory_updates == 1
+        assert engine._states[meeting.id].memory.summaries[0] == (
+            "Vi tittar på A Vi tittar på B Vi väljer B"
+        )
+        stats = engine.stats()
+        assert (stats["memory_updates"], stats["memory_updates_avoided"]) == (1, 2)
+
+    async def test_drain_folds_trailing_skipped_chunks(self, session_factory, meeting):
+        """Test that chunks skipped at the end of a meeting still reach the memory."""
+        # Given
+        claude = FakeClaudeService()
+        prescreener = TriggerPrescreener(threshold=1.1, max_consecutive_skips=9)
+        engine = make_engine(claude, session_factory, prescreener=prescreener)
+        await engine.submit(meeting, 1, "Vi tittar på A")
+        await engine.submit(meeting, 2, "Vi väljer A")
+        assert claude.memory_updates == 0
+
+        # When
+        await engine.drain(meeting.id)
+
+        # Then
+        assert claude.facilitate_calls == 0
+        assert claude.memory_updates == 1
+        assert engine._states[meeting.id].memory.summaries[0] == "Vi tittar på A Vi väljer A"
+
+    async def test_forget_meeting_drops_state(self, session_factory, meeting):
+        """Test that an ended meeting's state is released."""
+        # Given
+        engine = make_engine(FakeClaudeService(), session_factory)
+        await engine.submit(meeting, 1, "Chunk")
+
+        # When
+        engine.forget_meeting(meeting.id)
+
+        # Then
+        assert engine.stats()["meetings"] == 0
+
+    async def test_memory_update_keeps_protocol_current(self, session_factory, meeting):
+        """Test that every memory update is written to the meeting's protocol."""
+        # Given
+        engine = make_engine(FakeClaudeService(), session_factory)
+
+        # When
+        await engine.submit(meeting, 1, "Vi tittar på två maskiner")
+        await engine.submit(meeting, 2, "Vi väljer Moccamaster")
+
+        # Then
+        db = session_factory()
+        protocols = db.query(Protocol).all()
+        assert len(protocols) == 1
+        assert protocols[0].agenda_summary == {"Diskussion": "Vi väljer Moccamaster"}
+        assert protocols[0].key_decisions == ["Beslut 1", "Beslut 2"]
+
+    async def test_drain_waits_for_memory_update(self, session_factory, meeting):
+        """Test that draining a meeting waits until its last chunk is in the protocol."""
+        # Given
+        claude = GatedClaudeService()
+        engine = make_engine(claude, session_factory)
+        engine.submit(meeting, 1, "Vi väljer Moccamaster")
+        engine.forget_meeting(meeting.id)
+
+        # When
+        drain = asyncio.create_task(engine.drain(meeting.id))
+        await asyncio.sleep(0.01)
+        assert not drain.done()
+        claude.release.set()
+
+        # Then
+        assert await drain is True
+        db = session_factory()
+        assert db.query(Protocol).one().key_decisions == ["Beslut 1"]
+        assert await engine.drain(meeting.id, timeout=0) is True
+
+    async def test_late_memory_update_does_not_overwrite_final_protocol(
+        self, session_factory, meeting
+    ):
+        """Test that a memory update finishing after end and finalize leaves the protocol alone."""
+        # Given
+        claude = GatedClaudeService()
+        engine = make_engine(claude, session_factory)
+        task = engine.submit(meeting, 1, "Vi väljer Moccamaster")
+        db = session_factory()
+        ended = db.query(Meeting).one()
+        ended.status = "completed"
+        db.commit()
+        service = ProtocolService(
+            lambda: claude, drain=lambda meeting_id: engine.drain(meeting_id, timeout=0.01)
+        )
+        protocol = await service.finalize(db, ended)
+
+        # When
+        claude.release.set()
+        await task
+
+        # Then
+        db.expire_all()
+        protocol = db.query(Protocol).one()
+        assert claude.memory_updates == 1
+        assert not protocol.key_decisions
+        assert "Inga beslut noterades." in protocol.markdown_content
+
+    async def test_only_one_worker_analyzes_a_meeting(self, session_factory, meeting):
+        """Test that a meeting's chunks are only accepted by the worker owning it."""
+        # Given
+        bus = InProcessEventBus()
+        owner = make_engine(FakeClaudeService(), session_factory, bus=bus)
+        other = make_engine(FakeClaudeService(), session_factory, bus=bus)
+
+        # When
+        claims = [
+            await owner.claim_meeting(meeting.id),
+            await other.claim_meeting(meeting.id),
+            await owner.claim_meeting(meeting.id),
+        ]
+
+        # Then
+        assert claims == [True, False, True]
+        assert (owner.stats()["misrouted"], other.stats()["misrouted"]) == (0, 1)
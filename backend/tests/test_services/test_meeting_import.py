@@ -0,0 +1,131 @@
+"""Test bulk import of IDOARRT documents."""
+
+import io
+import tarfile
+import zipfile
+
+import pytest
+
+from app.models.meeting import Meeting
+from app.services.meeting_import import (
+    MeetingImportError,
+    MeetingImportService,
+    read_archive,
+    read_directory,
+)
+
+
+def idoarrt(intent: str, total: int = 15) -> str:
+    """Build an IDOARRT document."""
+    return f"""# Intent
+{intent}
+
+# Desired Outcomes
+- Beslut
+
+# Agenda
+1. Diskussion (10 min)
+2. Beslut (5 min)
+
+# Roles
+- Facilitator: Anna
+
+# Rules
+- En person i taget
+
+# Time
+Total: {total} minutes"""
+
+
+def zip_archive(files: dict[str, str]) -> bytes:
+    """Build a zip archive in memory."""
+    buffer = io.BytesIO()
+    with zipfile.ZipFile(buffer, "w") as archive:
+        for name, content in files.items():
+            archive.writestr(name, content)
+    return buffer.getvalue()
+
+
+class TestMeetingImportService:
+    """Test suite for MeetingImportService."""
+
+    def test_valid_files_are_imported_and_invalid_reported(self, db):
+        """Test per-file results for a mixed zip archive."""
+        # Given
+        files = read_archive(zip_archive({
+            "vecka-2/retro.md": idoarrt("Retro"),
+            "vecka-1/planering.md": idoarrt("Planering"),
+            "vecka-1/fel.md": idoarrt("Fel", total=30),
+            "README.txt": "ignored",
+        }))
+
+        # When
+        summary = MeetingImportService(max_workers=1).import_files(db, files)
+
+        # Then
+        results = summary["results"]
+        assert [r["file"] for r in results] == [
+            "vecka-1/fel.md", "vecka-1/planering.md", "vecka-2/retro.md"
+        ]
+        assert [r["success"] for r in results] == [False, True, True]
+        assert "don't match total time" in results[0]["validation_errors"][0]
+        assert (summary["imported"], summary["failed"]) == (2, 1)
+        meeting = db.get(Meeting, results[1]["meeting_id"])
+        assert (meeting.intent, meeting.status) == ("Planering", "preparation")
+
+    def test_dry_run_creates_nothing(self, db, tmp_path):
+        """Test that a dry run only validates a directory."""
+        # Given
+        (tmp_path / "a.md").write_text(idoarrt("A"))
+        (tmp_path / "b.md").write_bytes(b"\xff\xfe")
+
+        # When
+        service = MeetingImportService(max_workers=1)
+        summary = service.import_files(db, read_directory(tmp_path), dry_run=True)
+
+        # Then
+        assert [r["success"] for r in summary["results"]] == [True, False]
+        assert summary["results"][1]["validation_errors"] == ["File is not valid UTF-8"]
+        assert summary["imported"] == 0
+        assert db.query(Meeting).count() == 0
+
+    def test_large_batch_is_parsed_in_processes(self, db):
+        """Test that the process pool path gives the same results in order."""
+        # Given
+        buffer = io.BytesIO()
+        with tarfile.open(fileobj=buffer, mode="w:gz") as archive:
+            for number in range(6):
+                data = idoarrt(f"Möte {number}").encode()
+                info = tarfile.TarInfo(f"{number}.md")
+                info.size = len(data)
+                archive.addfile(info, io.BytesIO(data))
+        files = read_archive(buffer.getvalue())
+
+        # When
+        summary = MeetingImportService(max_workers=2, parallel_threshold=4).import_files(db, files)
+
+        # Then
+        assert summary["imported"] == 6
+        intents = {m.id: m.intent for m in db.query(Meeting)}
+        imported = [intents[r["meeting_id"]] for r in summary["results"]]
+        assert imported == [f"Möte {n}" for n in range(6)]
+
+    def test_imported_data_is_not_the_cached_parse(self):
+        """Test that changing imported data leaves later parses of the same document intact."""
+        # Given
+        service = MeetingImportService(max_workers=1)
+        first = service.parse(read_archive(zip_archive({"a.md": idoarrt("Retro")})))[0]
+
+        # When
+        first.data["agenda"][0]["topic"] = "Ändrad"
+        first.data["rules"].append("Ny regel")
+        again = service.parse(read_archive(zip_archive({"a.md": idoarrt("Retro")})))[0]
+
+        # Then
+        assert again.data["agenda"][0]["topic"] == "Diskussion"
+        assert again.data["rules"] == ["En person i taget"]
+
+    def test_unsupported_archive_raises(self):
+        """Test that data that is no archive is rejected as a whole."""
+        with pytest.raises(MeetingImportError):
+            read_archive(b"# Intent\nnot an archive")
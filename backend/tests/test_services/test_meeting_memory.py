@@ -0,0 +1,170 @@
+"""Test rolling meeting memory."""
+
+from unittest.mock import Mock, patch
+
+from app.services.claude_service import ClaudeService
+from app.services.meeting_memory import MeetingMemory, estimate_tokens
+
+AGENDA = [
+    {"topic": "Introduktion", "duration_minutes": 10},
+    {"topic": "Alternativ", "duration_minutes": 120},
+    {"topic": "Beslut", "duration_minutes": 50},
+]
+
+
+class TestMeetingMemory:
+    """Test suite for meeting memory."""
+
+    def test_current_item_follows_agenda_schedule(self):
+        """Test agenda item lookup from elapsed time."""
+        # Given
+        memory = MeetingMemory(AGENDA)
+
+        # When/Then
+        assert memory.current_item_index(0) == 0
+        assert memory.current_item_index(9.9) == 0
+        assert memory.current_item_index(10) == 1
+        assert memory.current_item_index(175) == 2
+        assert memory.current_item_index(400) == 2
+
+    def test_render_stays_within_budget_for_three_hour_meeting(self):
+        """Test that rendered memory does not grow with meeting length."""
+        # Given
+        memory = MeetingMemory(AGENDA, token_budget=300)
+        sizes = []
+
+        # When
+        for chunk in range(90):
+            elapsed = (chunk + 1) * 2
+            memory.apply_update(
+                memory.current_item_index(elapsed),
+                "lång sammanfattning " * 80,
+                [f"Person {chunk % 7}"],
+            )
+            sizes.append(estimate_tokens(memory.render()))
+
+        # Then
+        assert max(sizes) <= 300
+        assert memory.chunks_seen == 90
+        assert "Person 0" in memory.render()
+
+    def test_repeated_decisions_and_action_items_are_kept_once(self):
+        """Test that outcomes reported again by a later chunk are not duplicated."""
+        # Given
+        memory = MeetingMemory(AGENDA)
+        memory.apply_update(
+            0, "Budget", [], ["Vi köper maskin B."], [{"task": "Beställa", "owner": "Anna"}]
+        )
+
+        # When
+        memory.apply_update(
+            0,
+            "Budget",
+            [],
+            ["vi köper  maskin B", "Leverans i maj"],
+            [{"task": "beställa", "owner": ""}],
+        )
+
+        # Then
+        assert memory.decisions == ["Vi köper maskin B.", "Leverans i maj"]
+        assert memory.action_items == [{"task": "Beställa", "owner": "Anna"}]
+        assert memory.agenda_summary() == {"Introduktion": "Budget"}
+
+    def test_empty_memory_renders_placeholder(self):
+        """Test rendering before any chunk was summarized."""
+        # When/Then
+        assert MeetingMemory(AGENDA).render() == "Inget har diskuterats ännu"
+
+
+class TestClaudeServiceMemory:
+    """Test suite for memory updates and memory-based trigger prompts."""
+
+    @patch('app.services.claude_service.Anthropic')
+    def test_update_meeting_memory_rewrites_current_item(self, mock_anthropic):
+        """Test that the update response is applied to the scheduled agenda item."""
+        # Given
+        mock_client = Mock()
+        mock_anthropic.return_value = mock_client
+        update = {"summary": "Tre maskiner jämförs", "speakers": ["Anna", "Björn"]}
+        mock_client.messages.create.return_value = Mock(
+            content=[Mock(type="tool_use", input=update)]
+        )
+        with patch.dict('os.environ', {'ANTHROPIC_API_KEY': 'test-key'}):
+            service = ClaudeService()
+        memory = MeetingMemory(AGENDA)
+
+        # When
+        updated = service.update_meeting_memory(
+            memory, "Vi jämför tre maskiner", elapsed_minutes=14
+        )
+
+        # Then
+        assert updated is True
+        assert memory.summaries == ["", "Tre maskiner jämförs", ""]
+        assert memory.speaker_counts == {"Anna": 1, "Björn": 1}
+
+    @patch('app.services.claude_service.Anthropic')
+    def test_update_meeting_memory_collects_decisions_and_action_items(self, mock_anthropic):
+        """Test that the same update call extracts outcomes for the protocol."""
+        # Given
+        mock_client = Mock()
+        mock_anthropic.return_value = mock_client
+        mock_client.messages.create.return_value = Mock(content=[Mock(type="tool_use", input={
+            "summary": "Maskin B valdes",
+            "speakers": ["Anna"],
+            "decisions": ["Vi köper maskin B"],
+            "action_items": [{"task": "Beställa maskinen", "owner": "Björn"}],
+        })])
+        with patch.dict('os.environ', {'ANTHROPIC_API_KEY': 'test-key'}):
+            service = ClaudeService()
+        memory = MeetingMemory(AGENDA)
+        memory.apply_update(0, "Start", [], ["Mötet börjar i tid"])
+
+        # When
+        updated = service.update_meeting_memory(
+            memory, "Vi tar B, Björn beställer", elapsed_minutes=1
+        )
+
+        # Then
+        assert updated is True
+        assert memory.decisions == ["Mötet börjar i tid", "Vi köper maskin B"]
+        assert memory.action_items == [{"task": "Beställa maskinen", "owner": "Björn"}]
+        request = mock_client.messages.create.call_args.kwargs
+        assert "Beslut: Mötet börjar i tid" in request["messages"][0]["content"]
+        assert request["tool_choice"] == {"type": "tool", "name": "update_memory"}
+
+    @patch('app.services.claude_service.Anthropic')
+    def test_update_meeting_memory_invalid_response_keeps_memory(self, mock_anthropic):
+        """Test that text replies and tool calls failing validation leave memory untouched."""
+        # Given
+        mock_client = Mock()
+        mock_anthropic.return_value = mock_client
+        with patch.dict('os.environ', {'ANTHROPIC_API_KEY': 'test-key'}):
+            service = ClaudeService()
+        memory = MeetingMemory(AGENDA)
+
+        # When/Then
+        for block in (
+            Mock(type="text", text='{"summary": "Bara text"}'),
+            Mock(type="tool_use", input={"summary": "Text", "action_items": ["ogiltig"]}),
+        ):
+            mock_client.messages.create.return_value = Mock(content=[block])
+            assert service.update_meeting_memory(memory, "Text", elapsed_minutes=1) is False
+        assert memory.chunks_seen == 0
+
+    def test_trigger_message_with_memory_is_constant_size(self):
+        """Test that the user message does not grow with history length."""
+        # Given
+        with patch.dict('os.environ', {'ANTHROPIC_API_KEY': 'test-key'}):
+            service = ClaudeService()
+        memory = MeetingMemory(AGENDA, token_budget=200)
+        memory.apply_update(1, "sammanfattning " * 100, ["Anna"])
+        chunk = "x" * 500
+
+        # When
+        short = service._build_trigger_analysis_message(chunk, [chunk] * 2, memory)
+        long = service._build_trigger_analysis_message(chunk, [chunk] * 90, memory)
+
+        # Then
+        assert len(short) == len(long)
+        assert "MÖTESMINNE" in long
@@ -0,0 +1,54 @@
+"""Test meeting snapshots for reconnecting WebSocket clients."""
+
+from datetime import datetime, timedelta
+
+from app.models.meeting import AudioChunk, Intervention, Meeting
+from app.services.meeting_snapshot import MeetingSnapshotService
+
+
+class TestMeetingSnapshotService:
+    """Test suite for MeetingSnapshotService."""
+
+    def test_snapshot_summarizes_meeting_state(self, db):
+        """Test transcription progress and latest interventions in order."""
+        # Given
+        meeting = Meeting(
+            intent="Välja kaffemaskin",
+            desired_outcomes=["Beslut"],
+            agenda=[{"topic": "Diskussion", "duration_minutes": 30}],
+            roles={},
+            rules=[],
+            total_duration_minutes=30,
+            status="active",
+            started_at=datetime.utcnow(),
+            time_extensions_seconds=300,
+        )
+        db.add(meeting)
+        db.flush()
+        for number in range(3):
+            chunk = AudioChunk(meeting_id=meeting.id, chunk_number=number, duration_seconds=10.0)
+            chunk.audio_blob = b"audio"
+            chunk.transcription = f"Chunk {number}" if number < 2 else None
+            db.add(chunk)
+        now = datetime.utcnow()
+        for minutes in range(3):
+            db.add(Intervention(
+                meeting_id=meeting.id,
+                intervention_type="goal_deviation",
+                question=f"Fråga {minutes}",
+                created_at=now + timedelta(minutes=minutes),
+            ))
+        db.commit()
+
+        # When
+        snapshot = MeetingSnapshotService.build(db, meeting.id, max_interventions=2)
+
+        # Then
+        assert snapshot.status == "active"
+        assert snapshot.time_extensions_seconds == 300
+        assert (snapshot.transcribed_chunks, snapshot.last_chunk_number) == (2, 1)
+        assert [i["question"] for i in snapshot.interventions] == ["Fråga 1", "Fråga 2"]
+
+    def test_unknown_meeting_returns_none(self, db):
+        """Test that a missing meeting gives no snapshot."""
+        assert MeetingSnapshotService.build(db, "missing") is None
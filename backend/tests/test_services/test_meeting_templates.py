@@ -0,0 +1,80 @@
+"""Test meetings created from stored IDOARRT templates."""
+
+from unittest.mock import patch
+
+from app.models.meeting import Meeting
+from app.schemas.meeting import AgendaItem, MeetingTemplateOverrides
+from app.services.idoarrt_service import IDOARRTService
+from app.services.meeting_templates import MeetingTemplateService
+
+TEMPLATE = """# Intent
+Veckomöte
+
+# Desired Outcomes
+- Alla vet veckans prioriteringar
+
+# Agenda
+1. Läget (10 min)
+2. Prioriteringar (20 min)
+
+# Roles
+- Facilitator: Anna
+
+# Rules
+- En person i taget
+
+# Time
+Total: 30 minutes"""
+
+
+class TestMeetingTemplateService:
+    """Test suite for MeetingTemplateService."""
+
+    def setup_method(self):
+        """Set up test instance."""
+        self.service = MeetingTemplateService(IDOARRTService())
+
+    def test_meeting_from_template_skips_parsing(self, db):
+        """Test that overrides are applied without parsing markdown."""
+        # Given
+        template, errors = self.service.create_template(db, "Veckomöte", TEMPLATE)
+        overrides = MeetingTemplateOverrides(
+            intent="Veckomöte v. 42", roles={"Tidhållare": "Björn"}
+        )
+
+        # When
+        with patch("app.services.idoarrt_service.parse_idoarrt_document") as parse:
+            meeting, data, validation_errors = self.service.create_meeting(db, template, overrides)
+
+        # Then
+        parse.assert_not_called()
+        assert errors == validation_errors == []
+        stored = db.get(Meeting, meeting.id)
+        assert stored.intent == "Veckomöte v. 42"
+        assert stored.roles == {"Facilitator": "Anna", "Tidhållare": "Björn"}
+        assert stored.agenda == template.agenda
+        assert stored.status == "preparation"
+
+    def test_overrides_are_validated(self, db):
+        """Test that an agenda override must still add up to the total time."""
+        # Given
+        template, _ = self.service.create_template(db, "Veckomöte", TEMPLATE)
+        overrides = MeetingTemplateOverrides(agenda=[AgendaItem(topic="Allt", duration_minutes=45)])
+
+        # When
+        meeting, data, errors = self.service.create_meeting(db, template, overrides)
+
+        # Then
+        assert meeting is None
+        assert any("don't match total time" in error for error in errors)
+        assert db.query(Meeting).count() == 0
+
+    def test_invalid_template_is_not_stored(self, db):
+        """Test that template documents are validated when stored."""
+        # When
+        markdown = TEMPLATE.replace("Total: 30", "Total: 40")
+        template, errors = self.service.create_template(db, "Trasig", markdown)
+
+        # Then
+        assert template is None
+        assert errors == ["Line 18: Agenda times (30 min) don't match total time (40 min)"]
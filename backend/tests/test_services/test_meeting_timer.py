@@ -0,0 +1,249 @@
+"""Test server-side meeting time warnings and agenda transitions."""
+
+import asyncio
+from datetime import datetime
+from types import SimpleNamespace
+from unittest.mock import AsyncMock
+
+from app.core.event_bus import InProcessEventBus
+from app.models.meeting import Meeting
+from app.schemas.websocket_events import WebSocketEventType
+from app.services.meeting_timer import MeetingTimerScheduler, to_timestamp
+
+STARTED_AT = datetime(2025, 1, 1, 9, 0)
+START = to_timestamp(STARTED_AT)
+
+
+class FakeClock:
+    """Settable epoch clock."""
+
+    def __init__(self, now: float = START) -> None:
+        self.now = now
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def make_meeting(meeting_id="m1", minutes=60, extension_seconds=0, agenda=None):
+    """Build an active meeting stand-in."""
+    return SimpleNamespace(
+        id=meeting_id,
+        started_at=STARTED_AT,
+        total_duration_minutes=minutes,
+        time_extensions_seconds=extension_seconds,
+        agenda=[{"topic": "Diskussion", "duration_minutes": minutes}] if agenda is None else agenda,
+    )
+
+
+def make_scheduler(now: float = START, bus=None, session_factory=None) -> MeetingTimerScheduler:
+    """Create a scheduler with a fake clock and mock WebSocket manager."""
+    return MeetingTimerScheduler(
+        manager=AsyncMock(),
+        clock=FakeClock(now),
+        bus=bus or InProcessEventBus(),
+        session_factory=session_factory,
+    )
+
+
+def sent(scheduler: MeetingTimerScheduler) -> list:
+    """Return (event type, data) for every event sent."""
+    return [(c.args[1], c.args[2]) for c in scheduler.manager.send_event.await_args_list]
+
+
+class TestMeetingTimerScheduler:
+    """Test suite for MeetingTimerScheduler."""
+
+    async def test_warnings_fire_in_order(self):
+        """Test 50%, 75%, 5 minutes left and time up for a 60 minute meeting."""
+        # Given
+        scheduler = make_scheduler()
+        scheduler.schedule(make_meeting())
+
+        # When
+        for minute in (29, 30, 45, 55, 60):
+            await scheduler.run_due(START + minute * 60)
+
+        # Then
+        warnings = [
+            (data.percentage_complete, data.remaining_minutes) for _, data in sent(scheduler)
+        ]
+        assert warnings == [(50, 30), (75, 15), (91, 5), (100, 0)]
+
+    async def test_agenda_transitions(self):
+        """Test that each agenda item after the first starts at its planned time."""
+        # Given
+        scheduler = make_scheduler()
+        scheduler.schedule(make_meeting(agenda=[
+            {"topic": "Behov", "duration_minutes": 10},
+            {"topic": "Alternativ", "duration_minutes": 20},
+            {"topic": "Beslut", "duration_minutes": 30},
+        ]))
+
+        # When
+        await scheduler.run_due(START + 10 * 60)
+
+        # Then
+        ((event_type, data),) = sent(scheduler)
+        assert event_type == WebSocketEventType.AGENDA_ITEM_STARTED
+        assert (data.index, data.topic, data.previous_topic) == (1, "Alternativ", "Behov")
+
+    async def test_extension_reschedules_warnings(self):
+        """Test that extending moves pending warnings and re-arms the end warnings."""
+        # Given
+        scheduler = make_scheduler()
+        meeting = make_meeting()
+        scheduler.schedule(meeting)
+        await scheduler.run_due(START + 56 * 60)
+        scheduler.manager.send_event.reset_mock()
+
+        # When
+        scheduler.clock.now = START + 56 * 60
+        meeting.time_extensions_seconds = 10 * 60
+        scheduler.schedule(meeting)
+        await scheduler.run_due(START + 60 * 60)
+        first = sent(scheduler)
+        await scheduler.run_due(START + 70 * 60)
+
+        # Then
+        assert first == []
+        assert [data.remaining_minutes for _, data in sent(scheduler)] == [5, 0]
+
+    async def test_cancelled_meeting_sends_nothing(self):
+        """Test that an ended meeting's pending deadlines are dropped."""
+        # Given
+        scheduler = make_scheduler()
+        scheduler.schedule(make_meeting())
+
+        # When
+        scheduler.cancel("m1")
+        count = await scheduler.run_due(START + 120 * 60)
+
+        # Then
+        assert count == 0
+        assert scheduler.stats()["pending"] == 0
+
+    async def test_repeated_extensions_keep_the_heap_bounded(self):
+        """Test that stale entries are dropped once they outnumber the live ones."""
+        # Given
+        scheduler = make_scheduler()
+        meeting = make_meeting()
+        scheduler.schedule(meeting)
+        live = scheduler.stats()["pending"]
+
+        # When
+        for minutes in range(1, 101):
+            meeting.time_extensions_seconds = minutes * 60
+            scheduler.schedule(meeting)
+        pending = scheduler.stats()["pending"]
+        count = await scheduler.run_due(START + 300 * 60)
+
+        # Then
+        assert pending <= 2 * live
+        assert count == live
+        assert scheduler.next_due() is None
+
+    async def test_restart_does_not_replay_past_warnings(self):
+        """Test that a meeting tracked mid-way only gets its remaining deadlines."""
+        # Given
+        scheduler = make_scheduler(now=START + 40 * 60)
+
+        # When
+        scheduler.schedule(make_meeting())
+        await scheduler.run_due(START + 46 * 60)
+
+        # Then
+        assert [data.percentage_complete for _, data in sent(scheduler)] == [75]
+
+    async def test_many_meetings_share_one_heap(self):
+        """Test that thousands of meetings each get their warnings exactly once."""
+        # Given
+        scheduler = make_scheduler()
+        for number in range(2000):
+            scheduler.schedule(make_meeting(meeting_id=f"m{number}", minutes=30 + number % 30))
+
+        # When
+        count = await scheduler.run_due(START + 120 * 60)
+
+        # Then
+        assert count == 2000 * 4
+        assert scheduler.next_due() is None
+
+    async def test_runner_fires_due_deadlines(self):
+        """Test that the timer task sends deadlines once they are due."""
+        # Given
+        clock = FakeClock()
+        scheduler = MeetingTimerScheduler(manager=AsyncMock(), clock=clock, bus=InProcessEventBus())
+        scheduler.start()
+        scheduler.schedule(make_meeting())
+        await asyncio.sleep(0.01)
+        assert scheduler.events_sent == 0
+
+        # When
+        clock.now = START + 30 * 60
+        scheduler.schedule(make_meeting(meeting_id="m2"))  # Wakes the sleeping task
+        await asyncio.sleep(0.01)
+        await scheduler.aclose()
+
+        # Then
+        assert [data.percentage_complete for _, data in sent(scheduler)] == [50]
+
+
+class TestMeetingTimerWorkers:
+    """Test suite for several workers sharing the meeting timers over an event bus."""
+
+    async def test_each_deadline_is_sent_by_one_worker(self):
+        """Test that workers tracking the same meeting send each warning once between them."""
+        # Given
+        bus = InProcessEventBus()
+        workers = [make_scheduler(bus=bus) for _ in range(3)]
+        for worker in workers:
+            worker.schedule(make_meeting())
+
+        # When
+        for minute in (30, 45, 55, 60):
+            for worker in workers:
+                await worker.run_due(START + minute * 60)
+
+        # Then
+        warnings = sorted(data.percentage_complete for w in workers for _, data in sent(w))
+        assert warnings == [50, 75, 91, 100]
+        assert sum(worker.stats()["events_claimed_elsewhere"] for worker in workers) == 8
+
+    async def test_extension_and_end_reach_other_workers(self, session_factory):
+        """Test that announcing a change on one worker reschedules or cancels it on the others."""
+        # Given
+        db = session_factory()
+        meeting = Meeting(
+            intent="Välja kaffemaskin",
+            desired_outcomes=["Beslut om modell"],
+            agenda=[{"topic": "Diskussion", "duration_minutes": 60}],
+            roles={"Facilitator": "Anna"},
+            rules=["En i taget"],
+            total_duration_minutes=60,
+            status="active",
+            started_at=STARTED_AT,
+        )
+        db.add(meeting)
+        db.commit()
+        bus = InProcessEventBus()
+        here, other = (make_scheduler(bus=bus, session_factory=session_factory) for _ in range(2))
+        here.start()
+        other.start()
+        await asyncio.sleep(0)
+        await here.announce(meeting)
+
+        # When
+        meeting.time_extensions_seconds = 10 * 60
+        db.commit()
+        await here.announce(meeting)
+        extended = other._timers[meeting.id].duration_seconds
+        meeting.status = "completed"
+        db.commit()
+        await here.announce(meeting)
+
+        # Then
+        assert extended == 70 * 60
+        assert here.stats()["meetings"] == other.stats()["meetings"] == 0
+        await here.aclose()
+        await other.aclose()
+        db.close()
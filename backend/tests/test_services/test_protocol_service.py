@@ -0,0 +1,245 @@
+"""Test incremental protocol generation."""
+
+from datetime import datetime
+from unittest.mock import Mock
+
+import pytest
+
+from app.models.meeting import AudioChunk, Meeting, Protocol
+from app.services.claude_service import ClaudeService
+from app.services.meeting_memory import MeetingMemory
+from app.services.protocol_service import ProtocolService
+from app.services.protocol_summarizer import ProtocolSummary
+
+AGENDA = [
+    {"topic": "Alternativ", "duration_minutes": 20},
+    {"topic": "Beslut", "duration_minutes": 10},
+]
+
+
+class FakeClaudeService:
+    """Async Claude service stand-in recording goal assessment requests."""
+
+    def __init__(self):
+        self.assessments = []
+
+    async def assess_goals(self, desired_outcomes, agenda_summary, decisions, meeting_id=None):
+        self.assessments.append((desired_outcomes, agenda_summary, decisions))
+        return {outcome: {"status": "achieved", "comment": "Klart"} for outcome in desired_outcomes}
+
+
+@pytest.fixture
+def meeting(db) -> Meeting:
+    """Create an active meeting with two transcribed chunks."""
+    meeting = Meeting(
+        intent="Välja kaffemaskin",
+        desired_outcomes=["Beslut om modell"],
+        agenda=AGENDA,
+        roles={"Facilitator": "Anna"},
+        rules=["En i taget"],
+        total_duration_minutes=30,
+        status="active",
+        started_at=datetime(2026, 10, 19, 9, 0),
+    )
+    db.add(meeting)
+    db.flush()
+    for number, text in enumerate(["Vi jämför A och B", "Vi tar B"], 1):
+        db.add(AudioChunk(
+            meeting_id=meeting.id,
+            chunk_number=number,
+            audio_blob=b"audio",
+            duration_seconds=30.0,
+            transcription=text,
+        ))
+    db.commit()
+    return meeting
+
+
+def end(db, meeting: Meeting) -> None:
+    """Mark a meeting as completed."""
+    meeting.status = "completed"
+    meeting.ended_at = datetime(2026, 10, 19, 9, 30)
+    db.commit()
+
+
+class TestProtocolService:
+    """Test suite for ProtocolService."""
+
+    def setup_method(self):
+        """Set up test instance."""
+        self.claude = FakeClaudeService()
+        self.drained = []
+        self.service = ProtocolService(claude_service_factory=lambda: self.claude, drain=self.drain)
+
+    async def drain(self, meeting_id):
+        """Record drained meetings instead of waiting on an intervention engine."""
+        self.drained.append(meeting_id)
+        return True
+
+    def test_record_memory_updates_one_protocol_row(self, db, meeting):
+        """Test that each memory update overwrites the incremental fields."""
+        # Given
+        memory = MeetingMemory(AGENDA)
+        memory.apply_update(0, "A och B jämförs", [])
+        self.service.record_memory(db, meeting.id, memory)
+
+        # When
+        memory.apply_update(
+            1, "B valdes", [], ["Vi köper B"], [{"task": "Beställa", "owner": "Björn"}]
+        )
+        self.service.record_memory(db, meeting.id, memory)
+
+        # Then
+        protocols = db.query(Protocol).all()
+        assert len(protocols) == 1
+        assert protocols[0].agenda_summary == {
+            "Alternativ": "A och B jämförs", "Beslut": "B valdes"
+        }
+        assert protocols[0].key_decisions == ["Vi köper B"]
+        assert protocols[0].action_items == [{"task": "Beställa", "owner": "Björn"}]
+        assert protocols[0].markdown_content == ""
+
+    def test_record_memory_skips_completed_meeting(self, db, meeting):
+        """Test that a late memory update does not touch an ended meeting's protocol."""
+        # Given
+        memory = MeetingMemory(AGENDA)
+        memory.apply_update(1, "B valdes", [], ["Vi köper B"])
+        end(db, meeting)
+
+        # When
+        protocol = self.service.record_memory(db, meeting.id, memory)
+
+        # Then
+        assert protocol is None
+        assert db.query(Protocol).count() == 0
+
+    async def test_finalize_only_runs_the_final_pass(self, db, meeting):
+        """Test that finalizing assesses goals from the summaries and renders markdown."""
+        # Given
+        memory = MeetingMemory(AGENDA)
+        memory.apply_update(
+            1, "B valdes", [], ["Vi köper B"], [{"task": "Beställa", "owner": "Björn"}]
+        )
+        self.service.record_memory(db, meeting.id, memory)
+        end(db, meeting)
+
+        # When
+        protocol = await self.service.finalize(db, meeting)
+
+        # Then
+        assert self.drained == [meeting.id]
+        assert self.claude.assessments == [
+            (["Beslut om modell"], {"Beslut": "B valdes"}, ["Vi köper B"])
+        ]
+        assert protocol.full_transcription == "Vi jämför A och B\n\nVi tar B"
+        assert protocol.goal_assessment == {
+            "Beslut om modell": {"status": "achieved", "comment": "Klart"}
+        }
+        markdown = protocol.markdown_content
+        assert markdown.startswith("# Protokoll: Välja kaffemaskin")
+        assert "- **Beslut om modell**: Uppnått – Klart" in markdown
+        assert "### 1. Alternativ (20 min)\nInte diskuterad." in markdown
+        assert "### 2. Beslut (10 min)\nB valdes" in markdown
+        assert "- [ ] Beställa (Björn)" in markdown
+
+    async def test_finalize_without_incremental_data_summarizes_transcript(self, db, meeting):
+        """Test that a meeting without incremental data is summarized from its transcript."""
+        # Given
+        summaries = []
+
+        class Summarizer:
+            async def summarize(self, meeting, chunks):
+                summaries.append([chunk.transcription for chunk in chunks])
+                return ProtocolSummary({"Beslut": "B valdes"}, {}, ["Vi köper B"], [])
+
+        service = ProtocolService(lambda: self.claude, summarizer=Summarizer(), drain=self.drain)
+        end(db, meeting)
+
+        # When
+        protocol = await service.finalize(db, meeting)
+
+        # Then
+        assert summaries == [["Vi jämför A och B", "Vi tar B"]]
+        assert self.claude.assessments == []
+        assert protocol.key_decisions == ["Vi köper B"]
+        assert "### 2. Beslut (10 min)\nB valdes" in protocol.markdown_content
+
+    async def test_finalize_rebuilds_incomplete_meeting(self, db, meeting):
+        """Test that a meeting whose chunks did not drain is summarized from its transcript."""
+        # Given
+        summaries = []
+
+        class Summarizer:
+            async def summarize(self, meeting, chunks):
+                summaries.append(len(chunks))
+                return ProtocolSummary({"Beslut": "B valdes"}, {}, ["Vi köper B"], [])
+
+        service = ProtocolService(lambda: self.claude, summarizer=Summarizer(), drain=self.drain)
+        memory = MeetingMemory(AGENDA)
+        memory.apply_update(0, "A och B jämförs", [])
+        service.record_memory(db, meeting.id, memory)
+        service.mark_incomplete(meeting.id)
+        end(db, meeting)
+
+        # When
+        protocol = await service.finalize(db, meeting)
+
+        # Then
+        assert summaries == [2]
+        assert self.claude.assessments == []
+        assert protocol.key_decisions == ["Vi köper B"]
+
+    async def test_finalize_without_transcription_skips_claude(self, db, meeting):
+        """Test that a meeting where nothing was transcribed still gets a protocol."""
+        # Given
+        db.query(AudioChunk).delete()
+        end(db, meeting)
+
+        # When
+        protocol = await self.service.finalize(db, meeting)
+
+        # Then
+        assert self.claude.assessments == []
+        assert protocol.full_transcription == ""
+        assert protocol.goal_assessment == {
+            "Beslut om modell": {"status": "unknown", "comment": ""}
+        }
+        assert "Inga beslut noterades." in protocol.markdown_content
+
+
+class TestGoalAssessmentParsing:
+    """Test suite for parsing goal assessment responses."""
+
+    def test_unassessed_and_unknown_outcomes_default_to_unknown(self):
+        """Test that only entries for listed outcomes are used."""
+        # Given
+        outcomes = ["Beslut om modell", "Budget klar"]
+        message = Mock(content=[Mock(type="tool_use", input={"assessments": [
+            {"outcome": 1, "status": "partial", "comment": "Nästan"},
+            {"outcome": 7, "status": "achieved"},
+        ]})])
+
+        # When
+        assessment = ClaudeService._parse_goal_assessment(outcomes, message)
+
+        # Then
+        assert assessment == {
+            "Beslut om modell": {"status": "partial", "comment": "Nästan"},
+            "Budget klar": {"status": "unknown", "comment": ""},
+        }
+
+    def test_invalid_tool_call_assesses_nothing(self):
+        """Test that an invalid tool call or a text reply leaves all outcomes unknown."""
+        # Given
+        outcomes = ["Beslut om modell"]
+        unknown = {"Beslut om modell": {"status": "unknown", "comment": ""}}
+        invalid = {"assessments": [{"outcome": 1, "status": "kanske"}]}
+
+        # When/Then
+        assert ClaudeService._parse_goal_assessment(
+            outcomes, Mock(content=[Mock(type="tool_use", input=invalid)])
+        ) == unknown
+        assert ClaudeService._parse_goal_assessment(
+            outcomes, Mock(content=[Mock(type="text", text='{"assessments": []}')])
+        ) == unknown
+        assert ClaudeService._parse_goal_assessment(outcomes, None) == unknown
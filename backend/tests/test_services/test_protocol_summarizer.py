@@ -0,0 +1,217 @@
+"""Test map-reduce summarization of whole meeting transcripts."""
+
+import asyncio
+from unittest.mock import Mock
+
+from app.models.meeting import AudioChunk, Meeting
+from app.services.claude_service import ClaudeService
+from app.services.protocol_summarizer import ProtocolSummarizer, group_chunks, scheduled_items
+
+AGENDA = [
+    {"topic": "Behov", "duration_minutes": 60},
+    {"topic": "Alternativ", "duration_minutes": 60},
+    {"topic": "Beslut", "duration_minutes": 60},
+]
+
+
+class FakeClaudeService:
+    """Async Claude service stand-in answering map, merge and assessment requests."""
+
+    def __init__(self, delay_seconds=0.0, failing_groups=()):
+        self.delay_seconds = delay_seconds
+        self.failing_groups = set(failing_groups)
+        self.map_calls = 0
+        self.merge_calls = 0
+        self.assess_calls = []
+        self.in_flight = 0
+        self.max_in_flight = 0
+
+    async def _call(self):
+        self.in_flight += 1
+        self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        await asyncio.sleep(self.delay_seconds)
+        self.in_flight -= 1
+
+    async def summarize_transcript_group(self, transcript, context, start, end, scheduled):
+        self.map_calls += 1
+        await self._call()
+        if start in self.failing_groups:
+            return None
+        decided = "beslut" in transcript
+        return {
+            "agenda_items": {scheduled[0]: f"del {start:.0f}"},
+            "outcomes": {0: f"underlag {start:.0f}"},
+            "decisions": ["Vi köper maskin B"] if decided else [],
+            "action_items": [{"task": "Beställa", "owner": "Björn"}] if decided else [],
+        }
+
+    async def merge_notes(self, subject, notes, max_words):
+        self.merge_calls += 1
+        await self._call()
+        return " + ".join(notes)
+
+    async def assess_outcome(self, outcome, evidence, decisions):
+        self.assess_calls.append((outcome, evidence, list(decisions)))
+        await self._call()
+        return {"status": "achieved", "comment": "Ja"}
+
+
+def make_meeting() -> Meeting:
+    """Meeting with three one-hour agenda items."""
+    return Meeting(
+        intent="Välja kaffemaskin",
+        desired_outcomes=["Beslut om modell"],
+        agenda=AGENDA,
+        total_duration_minutes=180,
+    )
+
+
+def make_chunks(count: int, text: str = "ord " * 50, minutes: float = 2.0) -> list[AudioChunk]:
+    """Chunks of ``minutes`` each with the same transcription."""
+    return [
+        AudioChunk(
+            chunk_number=number,
+            audio_blob=b"",
+            duration_seconds=minutes * 60,
+            transcription=text,
+        )
+        for number in range(count)
+    ]
+
+
+class TestGrouping:
+    """Test suite for splitting transcripts into map groups."""
+
+    def test_groups_respect_token_budget_and_track_time(self):
+        """Test that chunks are grouped by size and keep their place in the meeting."""
+        # Given
+        chunks = make_chunks(5, "x" * 400)  # 100 tokens each
+        chunks[2].transcription = ""
+
+        # When
+        groups = group_chunks(chunks, max_tokens=250)
+
+        # Then
+        assert [len(group.transcriptions) for group in groups] == [2, 2]
+        spans = [(group.start_minutes, group.end_minutes) for group in groups]
+        assert spans == [(0.0, 6.0), (6.0, 10.0)]
+
+    def test_scheduled_items_overlap_group_span(self):
+        """Test agenda items scheduled during a group, with overtime on the last item."""
+        # When/Then
+        assert scheduled_items(AGENDA, 50, 70) == [0, 1]
+        assert scheduled_items(AGENDA, 60, 62) == [1]
+        assert scheduled_items(AGENDA, 190, 200) == [2]
+
+
+class TestProtocolSummarizer:
+    """Test suite for ProtocolSummarizer."""
+
+    async def test_summary_merges_notes_per_item_and_outcome(self):
+        """Test map notes are reduced per agenda item and outcomes assessed once."""
+        # Given
+        claude = FakeClaudeService()
+        summarizer = ProtocolSummarizer(lambda: claude, group_tokens=60)
+        chunks = make_chunks(90)
+        chunks[-1].transcription = "nu tar vi beslut " * 12
+
+        # When
+        summary = await summarizer.summarize(make_meeting(), chunks)
+
+        # Then
+        assert claude.map_calls == 90
+        assert set(summary.agenda_summary) == {"Behov", "Alternativ", "Beslut"}
+        assert summary.agenda_summary["Behov"].startswith("del 0 + del 2")
+        assert summary.key_decisions == ["Vi köper maskin B"]
+        assert summary.action_items == [{"task": "Beställa", "owner": "Björn"}]
+        assert summary.goal_assessment == {
+            "Beslut om modell": {"status": "achieved", "comment": "Ja"}
+        }
+        assert len(claude.assess_calls) == 1
+        assert claude.assess_calls[0][2] == ["Vi köper maskin B"]
+
+    async def test_requests_grow_linearly_with_meeting_length(self):
+        """Test that the requests per chunk stay constant as the meeting grows."""
+        # Given
+        per_chunk = []
+        for count in (60, 120, 240, 480):
+            claude = FakeClaudeService()
+            summarizer = ProtocolSummarizer(
+                lambda claude=claude: claude, group_tokens=60, merge_tokens=100
+            )
+
+            # When
+            await summarizer.summarize(make_meeting(), make_chunks(count, minutes=180 / count))
+
+            # Then
+            # Each map request yields two notes and each merge folds at least two into one
+            assert claude.map_calls == count
+            assert claude.merge_calls < 2 * claude.map_calls
+            requests = claude.map_calls + claude.merge_calls + len(claude.assess_calls)
+            per_chunk.append(requests / count)
+        assert max(per_chunk) - min(per_chunk) < 0.1
+
+    async def test_concurrency_is_bounded(self):
+        """Test that no more than max_concurrency requests run at once."""
+        # Given
+        claude = FakeClaudeService(delay_seconds=0.01)
+        summarizer = ProtocolSummarizer(lambda: claude, max_concurrency=3, group_tokens=60)
+
+        # When
+        await summarizer.summarize(make_meeting(), make_chunks(30))
+
+        # Then
+        assert claude.max_in_flight == 3
+
+    async def test_failed_groups_are_skipped(self):
+        """Test that a failed map request leaves the other groups' notes intact."""
+        # Given
+        claude = FakeClaudeService(failing_groups={0.0})
+        summarizer = ProtocolSummarizer(lambda: claude, group_tokens=60)
+
+        # When
+        summary = await summarizer.summarize(make_meeting(), make_chunks(3))
+
+        # Then
+        assert summary.agenda_summary == {"Behov": "del 2 + del 4"}
+
+
+class TestTranscriptGroupParsing:
+    """Test suite for parsing map-step tool calls."""
+
+    def test_out_of_range_and_empty_entries_are_dropped(self):
+        """Test that only numbered entries for known items and outcomes are kept."""
+        # Given
+        message = Mock(content=[Mock(type="tool_use", input={
+            "agenda_items": [
+                {"item": 2, "summary": " Jämför  A och B "},
+                {"item": 9, "summary": "x"},
+            ],
+            "outcomes": [
+                {"outcome": 1, "evidence": "B är billigast"},
+                {"outcome": 1, "evidence": " "},
+            ],
+            "decisions": ["Vi köper B"],
+            "action_items": [{"task": "Beställa"}],
+        })])
+
+        # When
+        notes = ClaudeService._parse_transcript_group(message, agenda_size=3, outcome_count=1)
+
+        # Then
+        assert notes == {
+            "agenda_items": {1: "Jämför A och B"},
+            "outcomes": {0: "B är billigast"},
+            "decisions": ["Vi köper B"],
+            "action_items": [{"task": "Beställa", "owner": ""}],
+        }
+
+    def test_invalid_tool_call_or_text_reply_is_rejected(self):
+        """Test that nothing is kept from a tool call failing validation or a text reply."""
+        # Given
+        invalid = Mock(content=[Mock(type="tool_use", input={"agenda_items": [{"item": "2"}]})])
+        text = Mock(content=[Mock(type="text", text='{"agenda_items": []}')])
+
+        # When/Then
+        assert ClaudeService._parse_transcript_group(invalid, 3, 1) is None
+        assert ClaudeService._parse_transcript_group(text, 3, 1) is None
@@ -0,0 +1,179 @@
+"""Test persistent Claude response cache."""
+
+import sqlite3
+import threading
+import time
+from unittest.mock import Mock, patch
+
+from anthropic.types import Message
+
+from app.services.claude_service import ClaudeService
+from app.services.response_cache import ResponseCache
+
+
+def make_message(text: str = '{"triggers": []}') -> Message:
+    """Build a Messages API response."""
+    return Message.model_validate({
+        "id": "msg_test",
+        "type": "message",
+        "role": "assistant",
+        "model": "claude-sonnet-4-20250514",
+        "content": [{"type": "text", "text": text}],
+        "stop_reason": "end_turn",
+        "stop_sequence": None,
+        "usage": {"input_tokens": 1200, "output_tokens": 30},
+    })
+
+
+def make_request(text: str = "Chunk", temperature: float = 0.3) -> dict:
+    """Build Messages API arguments."""
+    return {
+        "model": "claude-sonnet-4-20250514",
+        "max_tokens": 1024,
+        "temperature": temperature,
+        "messages": [{"role": "user", "content": text}],
+    }
+
+
+class TestResponseCache:
+    """Test suite for ResponseCache."""
+
+    def test_miss_then_hit(self):
+        """Test that a stored response is returned for the same request."""
+        # Given
+        cache = ResponseCache(":memory:")
+        request = make_request()
+
+        # When
+        first = cache.get(request)
+        cache.put(request, make_message("Svar"))
+        second = cache.get(request)
+
+        # Then
+        assert first is None
+        assert second.content[0].text == "Svar"
+        assert cache.stats()["hits"] == 1
+        assert cache.stats()["misses"] == 1
+        assert cache.hit_ratio == 0.5
+
+    def test_key_depends_on_prompt_model_and_temperature(self):
+        """Test that different prompts or sampling settings do not collide."""
+        # Given
+        base = make_request()
+
+        # When / Then
+        assert ResponseCache.key(base) == ResponseCache.key(dict(base))
+        assert ResponseCache.key(base) != ResponseCache.key(make_request("Annan chunk"))
+        assert ResponseCache.key(base) != ResponseCache.key(make_request(temperature=0.2))
+        assert ResponseCache.key(base) != ResponseCache.key({**base, "model": "other"})
+
+    def test_high_temperature_requests_bypass_cache(self):
+        """Test that creative (high-temperature) calls are never cached."""
+        # Given
+        cache = ResponseCache(":memory:")
+        request = make_request(temperature=0.7)
+
+        # When
+        cache.put(request, make_message())
+        result = cache.get(request)
+
+        # Then
+        assert result is None
+        assert len(cache) == 0
+        assert cache.stats()["bypassed"] == 1
+
+    def test_entries_expire_after_ttl(self):
+        """Test that stale entries are not returned."""
+        # Given
+        cache = ResponseCache(":memory:", ttl_seconds=0.05)
+        request = make_request()
+        cache.put(request, make_message())
+
+        # When
+        time.sleep(0.1)
+
+        # Then
+        assert cache.get(request) is None
+
+    def test_least_recently_used_entry_is_evicted(self):
+        """Test that the cache keeps at most max_entries, dropping the coldest."""
+        # Given
+        cache = ResponseCache(":memory:", max_entries=2)
+        a, b, c = make_request("a"), make_request("b"), make_request("c")
+        cache.put(a, make_message())
+        time.sleep(0.01)
+        cache.put(b, make_message())
+        time.sleep(0.01)
+        cache.get(a)
+
+        # When
+        cache.put(c, make_message())
+
+        # Then
+        assert len(cache) == 2
+        assert cache.get(b) is None
+        assert cache.get(a) is not None
+
+    def test_responses_persist_encrypted(self, tmp_path):
+        """Test that responses survive a restart and are not stored in plaintext."""
+        # Given
+        path = str(tmp_path / "cache.db")
+        request = make_request()
+        cache = ResponseCache(path)
+        cache.put(request, make_message("Hemlig mötesanalys"))
+        cache.close()
+
+        # When
+        reopened = ResponseCache(path)
+
+        # Then
+        assert reopened.get(request).content[0].text == "Hemlig mötesanalys"
+        raw = sqlite3.connect(path).execute("SELECT response FROM claude_responses").fetchone()[0]
+        assert b"Hemlig" not in raw
+
+    async def test_async_lookups_run_off_the_event_loop(self):
+        """Test that aget and aput do the SQLite work in a worker thread."""
+        # Given
+        cache = ResponseCache(":memory:")
+        request = make_request()
+        threads = []
+        original_get = cache.get
+
+        def get(request):
+            threads.append(threading.get_ident())
+            return original_get(request)
+
+        cache.get = get
+
+        # When
+        await cache.aput(request, make_message("Svar"))
+        cached = await cache.aget(request)
+        uncacheable = await cache.aget(make_request(temperature=0.7))
+
+        # Then
+        assert cached.content[0].text == "Svar"
+        assert uncacheable is None
+        assert threads and threading.get_ident() not in threads
+        assert cache.stats()["bypassed"] == 1
+
+    @patch('app.services.claude_service.Anthropic')
+    def test_replayed_analysis_skips_api(self, mock_anthropic):
+        """Test that ClaudeService answers a replayed chunk from the cache."""
+        # Given
+        mock_client = Mock()
+        mock_anthropic.return_value = mock_client
+        mock_client.messages.create.return_value = make_message()
+        with patch.dict('os.environ', {'ANTHROPIC_API_KEY': 'test-key'}):
+            service = ClaudeService()
+        service.response_cache = ResponseCache(":memory:")
+        context = {"intent": "Test"}
+
+        # When
+        first = service.analyze_transcription_for_triggers("Chunk", context, [])
+        second = service.analyze_transcription_for_triggers("Chunk", context, [])
+
+        # Then
+        assert first == second
+        assert mock_client.messages.create.call_count == 1
+        assert service.usage.requests == 1
+        assert service.response_cache.stats()["hits"] == 1
@@ -0,0 +1,102 @@
+"""Test bulk transcript decryption and decrypted-value caching."""
+
+from unittest.mock import patch
+
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from app.core.encryption import db_encryption
+from app.db.session import Base
+from app.models.meeting import AudioChunk, Meeting
+from app.services.transcript_service import TranscriptService
+
+
+@pytest.fixture
+def session():
+    """Create an isolated in-memory database session."""
+    engine = create_engine("sqlite:///:memory:")
+    Base.metadata.create_all(bind=engine)
+    db = sessionmaker(bind=engine)()
+    try:
+        yield db
+    finally:
+        db.close()
+
+
+@pytest.fixture
+def meeting_id(session) -> str:
+    """Create a meeting with five chunks, one of them untranscribed."""
+    meeting = Meeting(
+        intent="Test",
+        desired_outcomes=["Test"],
+        agenda=[{"topic": "Test", "duration_minutes": 10}],
+        roles={"Facilitator": "Anna"},
+        rules=["Test"],
+        total_duration_minutes=10,
+    )
+    session.add(meeting)
+    session.flush()
+    for number in range(1, 6):
+        session.add(
+            AudioChunk(
+                meeting_id=meeting.id,
+                chunk_number=number,
+                audio_blob=b"webm",
+                duration_seconds=120.0,
+                transcription="" if number == 3 else f"chunk {number}",
+            )
+        )
+    session.commit()
+    meeting_id = meeting.id
+    session.expunge_all()
+    return meeting_id
+
+
+class TestTranscriptService:
+    """Test suite for transcript loading."""
+
+    def test_repeated_access_decrypts_once(self, session, meeting_id):
+        """Test that the per-instance cache serves repeated reads."""
+        # Given
+        chunk = session.query(AudioChunk).filter(AudioChunk.chunk_number == 1).one()
+
+        # When
+        with patch.object(db_encryption, "decrypt_field", wraps=db_encryption.decrypt_field) as spy:
+            values = [chunk.transcription for _ in range(5)]
+
+        # Then
+        assert values == ["chunk 1"] * 5
+        assert spy.call_count == 1
+
+    @pytest.mark.parametrize("max_workers", [None, 4])
+    def test_load_chunks_prefetches_all_transcriptions(self, session, meeting_id, max_workers):
+        """Test bulk loading decrypts in one pass and preserves order."""
+        # When
+        chunks = TranscriptService.load_chunks(session, meeting_id, max_workers=max_workers)
+        with patch.object(db_encryption, "decrypt_field") as spy:
+            texts = [chunk.transcription for chunk in chunks]
+
+        # Then
+        assert texts == ["chunk 1", "chunk 2", "", "chunk 4", "chunk 5"]
+        spy.assert_not_called()
+
+    def test_load_transcriptions_skips_empty_chunks(self, session, meeting_id):
+        """Test that untranscribed chunks are left out."""
+        # When
+        texts = TranscriptService.load_transcriptions(session, meeting_id)
+
+        # Then
+        assert texts == ["chunk 1", "chunk 2", "chunk 4", "chunk 5"]
+
+    def test_cache_follows_reassignment(self, session, meeting_id):
+        """Test that setting a new value replaces the cached plaintext."""
+        # Given
+        chunk = session.query(AudioChunk).filter(AudioChunk.chunk_number == 2).one()
+        assert chunk.transcription == "chunk 2"
+
+        # When
+        chunk.transcription = "updated"
+
+        # Then
+        assert chunk.transcription == "updated"
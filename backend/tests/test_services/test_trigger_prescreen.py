@@ -0,0 +1,85 @@
+"""Test local trigger pre-screening."""
+
+from app.services.trigger_prescreen import TriggerPrescreener, tokenize
+
+CONTEXT = {
+    "intent": "Välja en ny kaffemaskin till kontoret",
+    "desired_outcomes": ["Beslut om kaffemaskin", "Budget för inköp"],
+}
+
+ON_TOPIC = (
+    "Vilken kaffemaskin ska vi välja? Jag tycker budgeten räcker för en bättre kaffemaskin. "
+    "Ja, men inköpet måste godkännas. Precis, vi fattar beslut om kaffemaskinen idag. "
+    "Okej. Vad säger du om budgeten?"
+)
+OFF_TOPIC = (
+    "Förra helgen åkte jag till fjällen och vandrade längs leden upp mot toppen. "
+    "Vädret var fantastiskt hela vägen och utsikten över dalen var enorm. "
+    "Sedan grillade vi korv vid stugan och spelade kort till sent på kvällen. "
+    "Söndagen tillbringade vi mest med att packa ihop och köra hem igen."
+)
+
+
+class TestTriggerPrescreener:
+    """Test suite for the trigger prescreener."""
+
+    def test_tokenize_stems_and_drops_stopwords(self):
+        """Test that inflected forms share a stem and stopwords are removed."""
+        # When
+        tokens = tokenize("Och kaffemaskinen, kaffemaskiner och en kaffemaskin")
+
+        # Then
+        assert tokens == ["kaffem", "kaffem", "kaffem"]
+
+    def test_on_topic_discussion_is_skipped(self):
+        """Test that lively on-topic chunks do not call Claude."""
+        # Given
+        prescreener = TriggerPrescreener()
+
+        # When
+        first = prescreener.evaluate("m1", ON_TOPIC, CONTEXT)
+        second = prescreener.evaluate("m1", ON_TOPIC, CONTEXT)
+
+        # Then
+        assert not first.should_analyze
+        assert not second.should_analyze
+        assert prescreener.stats()["skipped"] == 2
+
+    def test_off_topic_monologue_is_forwarded(self):
+        """Test that a drifting monologue crosses the threshold."""
+        # Given
+        prescreener = TriggerPrescreener()
+        prescreener.evaluate("m1", ON_TOPIC, CONTEXT)
+
+        # When
+        result = prescreener.evaluate("m1", OFF_TOPIC, CONTEXT)
+
+        # Then
+        assert result.should_analyze
+        assert result.reason == "score"
+        assert result.goal_distance == 1.0
+        assert result.topic_drift > 0.9
+
+    def test_claude_is_called_after_max_consecutive_skips(self):
+        """Test the safety net for slow drifts below the threshold."""
+        # Given
+        prescreener = TriggerPrescreener(max_consecutive_skips=2)
+
+        # When
+        results = [prescreener.evaluate("m1", ON_TOPIC, CONTEXT) for _ in range(3)]
+
+        # Then
+        assert [r.should_analyze for r in results] == [False, False, True]
+        assert results[2].reason == "max_skips"
+
+    def test_state_is_kept_per_meeting(self):
+        """Test that topic drift compares against the same meeting only."""
+        # Given
+        prescreener = TriggerPrescreener()
+        prescreener.evaluate("m1", ON_TOPIC, CONTEXT)
+
+        # When
+        result = prescreener.evaluate("m2", OFF_TOPIC, CONTEXT)
+
+        # Then
+        assert result.topic_drift == 0.0